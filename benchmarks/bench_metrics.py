@@ -0,0 +1,115 @@
+# benchmarks/bench_metrics.py
+
+"""
+What the metrics and request logging cost.
+
+1. Primitives: one counter increment, one histogram observation (with the
+   label lookup each call makes), one JSON log line, one /metrics render.
+2. The HTTP middleware: a trivial ASGI endpoint served through
+   `RequestInstrumentation` (with and without the access log) against the
+   bare endpoint, called in-process so that only the middleware differs.
+
+Usage:
+    python benchmarks/bench_metrics.py --iterations 100000 --requests 5000
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from career_forge.api.instrumentation import RequestInstrumentation
+from career_forge.engine import metrics
+from career_forge.engine.logs import JSONFormatter, request_id
+
+
+def per_call_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def quiet_json_logger(name: str) -> logging.Logger:
+    # JSON lines formatted as in production, written to memory instead of stderr.
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(JSONFormatter())
+    logger.addHandler(handler)
+    return logger
+
+
+def bench_primitives(iterations: int) -> dict:
+    counter = metrics.Counter("bench_total", "Benchmark counter.", ("route", "status"))
+    histogram = metrics.Histogram("bench_seconds", "Benchmark histogram.", ("route",))
+
+    logger = quiet_json_logger("bench_metrics")
+    request_id.set("3f2a9c1e5b7d4e60")
+
+    # A registry about as full as a busy server's.
+    for route in range(20):
+        for status in (200, 404, 422, 500):
+            metrics.HTTP_REQUESTS.labels("POST", f"/route/{route}", status).inc()
+        metrics.HTTP_DURATION.labels("POST", f"/route/{route}").observe(0.1)
+
+    return {
+        "counter_inc_us": per_call_us(lambda: counter.labels("/api/v1/hackrx/run", 200).inc(), iterations),
+        "histogram_observe_us": per_call_us(lambda: histogram.labels("/api/v1/hackrx/run").observe(0.2), iterations),
+        "json_log_line_us": per_call_us(
+            lambda: logger.info("POST /api/v1/hackrx/run 200", extra={"status": 200, "duration_ms": 812.4}),
+            iterations // 10),
+        "render_ms": per_call_us(metrics.REGISTRY.render, 100) / 1000,
+    }
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def call(app, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/health", "headers": [], "route": None}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def bench_middleware(requests: int) -> dict:
+    quiet_json_logger("career_forge.access")
+    bare = asyncio.run(call(endpoint, requests))
+    instrumented = asyncio.run(call(RequestInstrumentation(endpoint, access_log=False), requests))
+    logged = asyncio.run(call(RequestInstrumentation(endpoint, access_log=True), requests))
+    return {
+        "bare_us": bare,
+        "metrics_overhead_us": instrumented - bare,
+        "metrics_and_access_log_overhead_us": logged - bare,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=100_000)
+    arg_parser.add_argument("--requests", type=int, default=5_000)
+    args = arg_parser.parse_args()
+
+    for name, value in {**bench_primitives(args.iterations), **bench_middleware(args.requests)}.items():
+        print(f"{name:>36}: {value:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
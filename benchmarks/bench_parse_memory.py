@@ -0,0 +1,138 @@
+# benchmarks/bench_parse_memory.py
+
+"""
+Peak RSS of a worker holding N parse results at once, as it does under N
+concurrent requests: N threads each parse a different resume with the NER
+profile and hold the result until all of them have one.
+
+Variants, each in a fresh subprocess:
+
+- doc:   results keep the spaCy Doc (how ParsedResume used to work);
+- spans: results keep token and entity spans only (the default now);
+- text:  the text profile used by the request path, no spaCy at all.
+
+Reported: the peak RSS above the process's RSS once the model is loaded,
+that growth per in-flight request, the pickled size of one result (what a
+parse worker sends back) and, for spans, the time to rebuild the Doc.
+
+Usage:
+    python benchmarks/bench_parse_memory.py --concurrency 8 64 256
+"""
+
+import argparse
+import json
+import pickle
+import resource
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+VARIANTS = ["doc", "spans", "text"]
+
+PARAGRAPH = (
+    "Senior Software Engineer at {org} Corp, London (2019 - 2024)\n"
+    "Built microservices in Python and Go, deployed with Docker and Kubernetes on AWS. "
+    "Led a team of six engineers and mentored interns. Previously worked at Google "
+    "in Zurich from 2015 to 2019 on search infrastructure, ticket {index}.\n"
+)
+
+
+def synthetic_resume(index: int) -> str:
+    body = "".join(PARAGRAPH.format(org=f"Acme{index}x{part}", index=index * 100 + part) for part in range(10))
+    return f"Jane Doe {index}\nEXPERIENCE\n{body}EDUCATION\nUniversity of Somewhere (2011 - 2015)\n"
+
+
+def _status_kb(field: str) -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def _reset_peak() -> bool:
+    # Writing 5 to clear_refs resets VmHWM (Linux 4.0+).
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def run_variant(variant: str, concurrency: int) -> dict:
+    """Executed inside the subprocess."""
+    from career_forge.engine.parser import ProcessingProfile, get_nlp, parse_text
+
+    profile = ProcessingProfile.TEXT if variant == "text" else ProcessingProfile.NER
+    if profile != ProcessingProfile.TEXT:
+        get_nlp()
+    # Warm up the pipeline and the string store once, outside the measurement.
+    parse_text(synthetic_resume(-1), profile)
+
+    baseline_kb = _status_kb("VmRSS")
+    peak_resettable = _reset_peak()
+    barrier = threading.Barrier(concurrency)
+    results = [None] * concurrency
+
+    def request(index: int):
+        results[index] = parse_text(synthetic_resume(index), profile, keep_doc=variant == "doc")
+        # Hold the result until every request has one, like concurrent uploads.
+        barrier.wait()
+
+    threads = [threading.Thread(target=request, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    peak_kb = _status_kb("VmHWM") if peak_resettable else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result = {
+        "variant": variant,
+        "concurrency": concurrency,
+        "baseline_rss_mb": round(baseline_kb / 1024, 1),
+        "peak_growth_mb": round((peak_kb - baseline_kb) / 1024, 1),
+        "kb_per_request": round((peak_kb - baseline_kb) / concurrency, 1),
+        "pickled_kb": round(len(pickle.dumps(results[0])) / 1024, 1),
+    }
+    if variant == "doc":
+        # The old result was pickled with its Doc.
+        result["pickled_kb"] = round(len(pickle.dumps((results[0].raw_text, results[0].doc))) / 1024, 1)
+    if variant == "spans":
+        started = time.perf_counter()
+        for parsed in results:
+            parsed.doc
+            parsed.release_doc()
+        result["rebuild_doc_ms"] = round((time.perf_counter() - started) / concurrency * 1000, 3)
+    return result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 64, 256])
+    arg_parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.concurrency[0])))
+        return
+
+    for concurrency in args.concurrency:
+        for variant in VARIANTS:
+            output = subprocess.run(
+                [sys.executable, __file__, "--variant", variant, "--concurrency", str(concurrency)],
+                capture_output=True, text=True, check=True, cwd=ROOT,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            rebuild = f"  rebuild Doc {result['rebuild_doc_ms']:.2f} ms" if "rebuild_doc_ms" in result else ""
+            print(f"N={concurrency:<4} {result['variant']:>5}: peak RSS +{result['peak_growth_mb']:7.1f} MB "
+                  f"({result['kb_per_request']:7.1f} KB/request)  pickled {result['pickled_kb']:6.1f} KB{rebuild}")
+
+
+if __name__ == "__main__":
+    main()
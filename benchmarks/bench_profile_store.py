@@ -0,0 +1,106 @@
+# benchmarks/bench_profile_store.py
+
+"""
+Profile store at scale: fills a SQLite store with synthetic profiles, then
+times the operations the API serves.
+
+- dashboard read (`get`), re-upload merge (unchanged and with new skills);
+- batched XP awards (awards per second, in batches of --batch);
+- leaderboard: first page, a deep page reached with the cursor, a rank's
+  page, a user's position, a skill leaderboard.
+
+Usage:
+    python benchmarks/bench_profile_store.py --profiles 1000000 --path /tmp/profiles.sqlite3
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from career_forge.engine.llm_analyzer import ExperienceDetail, LLMAnalysis
+from career_forge.engine.profile_store import SQLiteProfileStore
+from career_forge.gamification.progression import RANKS, XPAward
+
+SKILLS = [f"Skill {index}" for index in range(400)]
+
+
+def analysis(rng: random.Random, extra_skill: str = "") -> LLMAnalysis:
+    skills = rng.sample(SKILLS, 8) + ([extra_skill] if extra_skill else [])
+    return LLMAnalysis(
+        user_name="Synthetic User", job_title="Engineer", summary="",
+        suggested_rank=rng.choice(RANKS[:4]), suggested_level=rng.randint(1, 99),
+        skills={"TechnicalSkills": skills[:6], "SoftSkills": skills[6:]},
+        experiences=[ExperienceDetail(category="Project", title=f"Project {rng.randint(0, 50)}",
+                                      organization="Acme", description="Built things.") for _ in range(3)],
+        inferred_strengths=[],
+    )
+
+
+def timed(fn, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {"p50_ms": round(statistics.median(samples) * 1000, 3),
+            "p95_ms": round(samples[int(0.95 * (len(samples) - 1))] * 1000, 3)}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--profiles", type=int, default=100_000)
+    arg_parser.add_argument("--path", default="/tmp/bench_profiles.sqlite3")
+    arg_parser.add_argument("--batch", type=int, default=1000, help="XP awards per transaction.")
+    arg_parser.add_argument("--runs", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(args.path + suffix):
+            os.remove(args.path + suffix)
+    store = SQLiteProfileStore(args.path)
+    rng = random.Random(7)
+    users = [f"user-{index:08d}" for index in range(args.profiles)]
+
+    started = time.perf_counter()
+    for user_id in users:
+        store.merge_analysis(user_id, "digest-1", analysis(rng))
+    fill = time.perf_counter() - started
+    print(f"filled {args.profiles} profiles in {fill:.1f} s ({args.profiles / fill:,.0f}/s)")
+
+    awards = [XPAward(rng.choice(users), rng.choice(SKILLS), rng.randint(10, 300))
+              for _ in range(args.batch * 20)]
+    started = time.perf_counter()
+    for start in range(0, len(awards), args.batch):
+        store.award(awards[start:start + args.batch])
+    elapsed = time.perf_counter() - started
+    print(f"awarded {len(awards)} XP awards in batches of {args.batch}: {len(awards) / elapsed:,.0f} awards/s")
+
+    cursor = None
+    for _ in range(100):
+        cursor = store.leaderboard(limit=50, after=cursor).next_cursor
+
+    results = {
+        "get": timed(lambda: store.get(rng.choice(users)), args.runs),
+        "merge_unchanged": timed(lambda: store.merge_analysis(rng.choice(users), "digest-1", analysis(rng)), args.runs),
+        "merge_new_skills": timed(
+            lambda: store.merge_analysis(rng.choice(users), f"digest-{rng.random()}", analysis(rng, "New Skill")),
+            args.runs),
+        "leaderboard_top50": timed(lambda: store.leaderboard(limit=50), args.runs),
+        "leaderboard_page101": timed(lambda: store.leaderboard(limit=50, after=cursor), args.runs),
+        "leaderboard_rank_C": timed(lambda: store.leaderboard(rank="C", limit=50), args.runs),
+        "position": timed(lambda: store.position(rng.choice(users)), max(10, args.runs // 10)),
+        "skill_leaderboard": timed(lambda: store.skill_leaderboard(rng.choice(SKILLS), 50), args.runs),
+    }
+    for name, result in results.items():
+        print(f"{name:>20}: p50 {result['p50_ms']:8.3f} ms  p95 {result['p95_ms']:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_quest_catalog.py
+
+"""
+Quest catalog hit rate and lookup cost on a synthetic population.
+
+Profiles are drawn from a few role archetypes (backend, frontend, data...):
+each takes most of its archetype's core skills plus some random ones. They
+go through the catalog one by one, as the quests stage would: a lookup,
+and on a miss a (simulated, not slept) LLM call of --llm-latency seconds
+whose quests are added.
+
+Reported: the hit rate per slice of the stream, LLM time saved per request,
+the MinHash/LSH lookup time against a brute-force Jaccard scan of the whole
+catalog, and the catalog size.
+
+Usage:
+    python benchmarks/bench_quest_catalog.py --profiles 20000 --threshold 0.6
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from career_forge.engine.llm_analyzer import LLMAnalysis
+from career_forge.engine.similarity import jaccard
+from career_forge.gamification.quest_catalog import QuestCatalog, skill_set
+from career_forge.schemas.quest import Quest
+
+ARCHETYPES = {
+    "backend": ["Python", "Django", "PostgreSQL", "Docker", "REST", "Redis", "Celery", "Git"],
+    "frontend": ["JavaScript", "TypeScript", "React", "CSS", "HTML", "Webpack", "Jest", "Git"],
+    "data": ["Python", "Pandas", "SQL", "Spark", "Airflow", "Tableau", "Statistics", "NumPy"],
+    "ml": ["Python", "PyTorch", "TensorFlow", "NumPy", "Scikit-learn", "MLOps", "Docker", "Statistics"],
+    "devops": ["Kubernetes", "Docker", "Terraform", "AWS", "Linux", "Prometheus", "Bash", "CI/CD"],
+    "mobile": ["Kotlin", "Swift", "Android", "iOS", "Firebase", "REST", "Git", "UI Design"],
+    "java": ["Java", "Spring", "Hibernate", "Maven", "Microservices", "Kafka", "SQL", "Docker"],
+}
+OTHER_SKILLS = [f"Skill {index}" for index in range(500)]
+
+
+def synthetic_analysis(rng: random.Random, core_share: float, extras: int) -> LLMAnalysis:
+    core = ARCHETYPES[rng.choice(sorted(ARCHETYPES))]
+    skills = rng.sample(core, max(1, round(len(core) * core_share))) + rng.sample(OTHER_SKILLS, rng.randint(0, extras))
+    return LLMAnalysis(user_name="Synthetic User", job_title="Engineer", summary="", suggested_rank="D",
+                       suggested_level=10, skills={"TechnicalSkills": skills}, experiences=[], inferred_strengths=[])
+
+
+def generated_quests(analysis: LLMAnalysis):
+    skills = analysis.skills["TechnicalSkills"]
+    return [Quest(title=f"Daily {skill} Practice", description=f"Solve one small problem with {skill}.",
+                  category="TechnicalSkills", rewards=[f"+50 XP {skill}"]) for skill in skills[:3]]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--profiles", type=int, default=20000)
+    arg_parser.add_argument("--threshold", type=float, default=0.6)
+    arg_parser.add_argument("--core-share", type=float, default=0.75, help="Share of the archetype's skills.")
+    arg_parser.add_argument("--extras", type=int, default=2, help="Up to this many random extra skills.")
+    arg_parser.add_argument("--llm-latency", type=float, default=2.0, help="Seconds of a quest LLM call.")
+    args = arg_parser.parse_args()
+
+    rng = random.Random(11)
+    catalog = QuestCatalog(":memory:", threshold=args.threshold, max_entries=10 ** 9)
+    slices = 5
+    slice_size = max(1, args.profiles // slices)
+    hits_per_slice = [0] * slices
+    lookup_seconds, saved = [], 0.0
+
+    for index in range(args.profiles):
+        analysis = synthetic_analysis(rng, args.core_share, args.extras)
+        started = time.perf_counter()
+        result = catalog.lookup(analysis)
+        lookup_seconds.append(time.perf_counter() - started)
+        if result.hit:
+            hits_per_slice[min(index // slice_size, slices - 1)] += 1
+            saved += result.saved_seconds
+        else:
+            catalog.record_generation(args.llm_latency)
+            catalog.add(analysis, generated_quests(analysis))
+
+    # Brute force: the exact Jaccard similarity against every entry.
+    entries = [skills for skills, _ in catalog._entries.values()]
+    probes = [skill_set(synthetic_analysis(rng, args.core_share, args.extras)) for _ in range(200)]
+    started = time.perf_counter()
+    for probe in probes:
+        max((jaccard(probe, skills) for skills in entries), default=0.0)
+    brute_force = (time.perf_counter() - started) / len(probes)
+
+    lookup_seconds.sort()
+    stats = catalog.stats()
+    print(f"profiles {args.profiles}, catalog entries {stats['entries']}, overall hit rate {stats['hit_rate']:.1%}")
+    print("hit rate by slice of the stream: " + "  ".join(
+        f"{hits / slice_size:.1%}" for hits in hits_per_slice))
+    print(f"LLM time saved: {saved:.0f} s in total, {saved / args.profiles * 1000:.0f} ms per request")
+    print(f"lookup p50 {statistics.median(lookup_seconds) * 1e6:.0f} us, "
+          f"p95 {lookup_seconds[int(0.95 * (len(lookup_seconds) - 1))] * 1e6:.0f} us; "
+          f"brute-force scan {brute_force * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
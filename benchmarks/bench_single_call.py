@@ -0,0 +1,126 @@
+# benchmarks/bench_single_call.py
+
+"""
+Two LLM calls (analysis, then quests) vs. one schema-constrained call for
+both, per resume: latency, LLM calls and estimated prompt/response tokens.
+
+The LLM is the synthetic provider, whose latency is a fixed part
+(--base-latency) plus a part per output token (--token-latency), like a
+real model's time to first token plus its decoding time.
+
+It also cuts valid single-call answers off at random points (as the output
+token limit would) and counts how many still yield an analysis with strict
+`json.loads` vs. the lenient parser with partial validation.
+
+Usage:
+    python benchmarks/bench_single_call.py --resumes 50 --base-latency 0.4 --token-latency 0.004
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from career_forge.engine.combined_analyzer import analyze_resume_and_quests_with_llm, parse_combined
+from career_forge.engine.llm_analyzer import analyze_resume_with_llm
+from career_forge.engine.llm_client import LLMClient, set_llm_client
+from career_forge.engine.llm_providers import TASK_ANALYSIS_AND_QUESTS, SyntheticProvider
+from career_forge.gamification.quest_generator import generate_quests_with_llm
+
+FIRST_NAMES = ["Jane", "Arjun", "Mei", "Lucas", "Amara", "Oskar", "Priya", "Tomás"]
+TITLES = ["Software Engineer", "Data Analyst", "B.E. Computer Science Student", "DevOps Engineer"]
+SKILLS = ["Python", "Java", "SQL", "Django", "React", "AWS", "Docker", "Kubernetes", "Git", "Linux"]
+
+
+def synthetic_resume(rng: random.Random) -> str:
+    skills = rng.sample(SKILLS, 4)
+    return "\n".join([
+        f"{rng.choice(FIRST_NAMES)} Doe",
+        rng.choice(TITLES),
+        "Experience",
+        f"Built services in {skills[0]} and {skills[1]}, deployed with {skills[2]}.",
+        "Led a team of four engineers; mentored two interns.",
+        "Projects",
+        f"Resume ranker using {skills[3]}; problem solving and data analysis.",
+    ])
+
+
+def run(resumes, single_call: bool) -> list:
+    latencies = []
+    for text in resumes:
+        started = time.perf_counter()
+        if single_call:
+            analysis, quests = analyze_resume_and_quests_with_llm(text)
+        else:
+            analysis = analyze_resume_with_llm(text)
+            quests = generate_quests_with_llm(analysis)
+        assert analysis is not None and quests
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def truncation(resume: str, cuts: int, rng: random.Random) -> dict:
+    provider = SyntheticProvider("constant:0")
+    answer = provider.generate("model", f"---\n{resume}\n---", 0.0, 10.0, TASK_ANALYSIS_AND_QUESTS)
+    strict = lenient = with_quests = 0
+    for _ in range(cuts):
+        cut = answer[:rng.randint(len(answer) // 4, len(answer) - 1)]
+        try:
+            json.loads(cut)
+            strict += 1
+        except ValueError:
+            pass
+        # parse_combined reports every repair; keep the output readable.
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = parse_combined(cut)
+        if result is not None:
+            lenient += 1
+            with_quests += bool(result[1])
+    return {"cuts": cuts, "strict": strict, "lenient": lenient, "lenient_with_quests": with_quests}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--resumes", type=int, default=50)
+    arg_parser.add_argument("--base-latency", type=float, default=0.4, help="Seconds per call before the first token.")
+    arg_parser.add_argument("--token-latency", type=float, default=0.004, help="Seconds per output token.")
+    arg_parser.add_argument("--cuts", type=int, default=200, help="Truncated answers for the repair check.")
+    args = arg_parser.parse_args()
+
+    rng = random.Random(7)
+    resumes = [synthetic_resume(rng) for _ in range(args.resumes)]
+    results = {}
+    for name, single_call in (("two calls", False), ("single call", True)):
+        provider = SyntheticProvider(f"constant:{args.base_latency}", token_latency=args.token_latency)
+        client = LLMClient(provider, rpm=0, tpm=0)
+        set_llm_client(client)
+        latencies = sorted(run(resumes, single_call))
+        stats = client.stats()
+        results[name] = {
+            "p50_ms": round(statistics.median(latencies) * 1000, 1),
+            "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1),
+            "llm_calls_per_resume": stats["calls"] / len(resumes),
+            "prompt_tokens_per_resume": round(stats["prompt_tokens"] / len(resumes)),
+            "response_tokens_per_resume": round(stats["response_tokens"] / len(resumes)),
+        }
+    set_llm_client(None)
+
+    for name, result in results.items():
+        print(f"{name:>12}: p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+              f"calls {result['llm_calls_per_resume']:.1f}  prompt tokens {result['prompt_tokens_per_resume']}  "
+              f"response tokens {result['response_tokens_per_resume']}")
+
+    repair = truncation(resumes[0], args.cuts, rng)
+    print(f"truncated answers still usable: strict json.loads {repair['strict']}/{repair['cuts']}, "
+          f"lenient {repair['lenient']}/{repair['cuts']} ({repair['lenient_with_quests']} with quests)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_skill_matcher.py
+
+"""
+Microbenchmark for skill extraction: per-resume cost of building a fresh
+PhraseMatcher on every call (the old behaviour) versus matching with the
+shared, precompiled SkillMatcher.
+
+Usage:
+    python benchmarks/bench_skill_matcher.py --iterations 200
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from spacy.matcher import PhraseMatcher
+
+from career_forge.engine.parser import get_nlp
+from career_forge.engine.skill_matcher import SkillMatcher
+from career_forge.engine.taxonomy import SkillTaxonomy
+
+NLP = get_nlp()
+
+TAXONOMY = SkillTaxonomy.from_file()
+# The old hard-coded {category: [skill, ...]} dictionary.
+SKILL_PATTERNS = TAXONOMY.category_patterns()
+
+SAMPLE_RESUME = (
+    "Jane Doe - Senior Software Engineer. Built microservices in Python, Go and Java with "
+    "Django, Flask and Spring Boot. Deployed on AWS (EC2, S3, Lambda) with Docker, Kubernetes "
+    "and Terraform through GitHub Actions. Data work with PostgreSQL, Redis, Kafka and Apache "
+    "Spark; dashboards in Tableau. Machine Learning with PyTorch, Scikit-learn and Pandas. "
+    "Led Agile teams using Jira and Confluence; strong Communication and Problem Solving. "
+) * 8
+
+
+def legacy_match(doc):
+    # The pre-SkillMatcher code path: rebuild the matcher for every resume.
+    matcher = PhraseMatcher(NLP.vocab, attr="LOWER")
+    for category, skills in SKILL_PATTERNS.items():
+        matcher.add(category, [NLP.make_doc(skill) for skill in skills])
+    return matcher(doc)
+
+
+def timed(fn, doc, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(doc)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), statistics.mean(samples)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    doc = NLP.make_doc(SAMPLE_RESUME)
+
+    started = time.perf_counter()
+    skill_matcher = SkillMatcher(NLP, TAXONOMY)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "skills.matcher")
+        skill_matcher.save(path)
+        started = time.perf_counter()
+        SkillMatcher.load(NLP, path, TAXONOMY)
+        load_ms = (time.perf_counter() - started) * 1000
+
+    legacy_median, legacy_mean = timed(legacy_match, doc, args.iterations)
+    shared_median, shared_mean = timed(skill_matcher.match, doc, args.iterations)
+
+    print(f"resume tokens: {len(doc)}, skills: {len(TAXONOMY)}, surface forms: {sum(1 for _ in TAXONOMY.surface_forms())}")
+    print(f"one-time build: {build_ms:.2f} ms, load from file: {load_ms:.2f} ms")
+    print(f"per resume (rebuild every call): median {legacy_median:.3f} ms, mean {legacy_mean:.3f} ms")
+    print(f"per resume (shared matcher):     median {shared_median:.3f} ms, mean {shared_mean:.3f} ms")
+    print(f"speedup: {legacy_median / shared_median:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
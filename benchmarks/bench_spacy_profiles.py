@@ -0,0 +1,84 @@
+# benchmarks/bench_spacy_profiles.py
+
+"""
+Compares the full en_core_web_sm pipeline with the trimmed processing
+profiles used by parse_resume: model load time, peak RSS and per-resume CPU.
+Every variant runs in a fresh subprocess so load time and memory are not
+shared between them.
+
+Usage:
+    python benchmarks/bench_spacy_profiles.py --iterations 50
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+VARIANTS = ["full", "ner", "tokenize", "text"]
+
+SAMPLE_RESUME = (
+    "Jane Doe\nSenior Software Engineer at Acme Corp, London (2019 - 2024)\n"
+    "Built microservices in Python and Go, deployed with Docker and Kubernetes on AWS. "
+    "Led a team of six engineers and mentored interns. Previously worked at Google "
+    "in Zurich from 2015 to 2019 on search infrastructure.\n"
+) * 10
+
+
+def run_variant(variant: str, iterations: int) -> dict:
+    """Executed inside the subprocess."""
+    import spacy
+    from career_forge.engine import parser
+
+    started = time.perf_counter()
+    if variant == "full":
+        nlp = spacy.load(parser.SPACY_MODEL)
+        process = nlp
+    else:
+        nlp = parser.get_nlp()
+        process = lambda text: parser._process_text(text, parser.ProcessingProfile(variant))
+    load_ms = (time.perf_counter() - started) * 1000
+
+    cpu_started = time.process_time()
+    for _ in range(iterations):
+        process(SAMPLE_RESUME)
+    cpu_ms = (time.process_time() - cpu_started) / iterations * 1000
+
+    return {
+        "variant": variant,
+        "components": nlp.pipe_names if variant in ("full", "ner") else [],
+        "load_ms": round(load_ms, 1),
+        "cpu_ms_per_resume": round(cpu_ms, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--iterations", type=int, default=50)
+    arg_parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.iterations)))
+        return
+
+    for variant in VARIANTS:
+        output = subprocess.run(
+            [sys.executable, __file__, "--variant", variant, "--iterations", str(args.iterations)],
+            capture_output=True, text=True, check=True, cwd=ROOT,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{result['variant']:>9}: load {result['load_ms']:8.1f} ms  "
+              f"cpu/resume {result['cpu_ms_per_resume']:8.3f} ms  "
+              f"peak RSS {result['peak_rss_mb']:7.1f} MB  {result['components']}")
+
+
+if __name__ == "__main__":
+    main()
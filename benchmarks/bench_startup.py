@@ -0,0 +1,62 @@
+# benchmarks/bench_startup.py
+
+"""
+Start-up benchmark: how long `import career_forge.api.main` takes in a fresh
+interpreter, which heavy libraries it pulls in, and how long warm-up of each
+lazily loaded resource takes afterwards.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ["spacy", "google.generativeai", "pypdf", "docx"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import career_forge.api.main
+import_ms = (time.perf_counter() - started) * 1000
+heavy = {name: name in sys.modules for name in %r}
+from career_forge.engine.resources import registry
+started = time.perf_counter()
+registry.warm_up()
+warmup_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({"import_ms": import_ms, "heavy_modules_imported": heavy,
+                  "warmup_ms": warmup_ms, "resources": registry.status()["resources"]}))
+""" % (HEAVY_MODULES,)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--runs", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True, cwd=ROOT,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    import_times = [r["import_ms"] for r in results]
+    warmup_times = [r["warmup_ms"] for r in results]
+    print(f"import career_forge.api.main: median {statistics.median(import_times):.1f} ms "
+          f"(min {min(import_times):.1f}, max {max(import_times):.1f}) over {args.runs} runs")
+    print(f"heavy modules imported at import time: {results[-1]['heavy_modules_imported']}")
+    print(f"warm-up: median {statistics.median(warmup_times):.1f} ms")
+    for name, resource in results[-1]["resources"].items():
+        state = f"{resource['load_ms']} ms" if resource["loaded"] else f"failed ({resource['error']})"
+        print(f"  {name}: {state}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/bench_streaming.py
+
+"""
+Time to first meaningful content vs. total latency: `POST /hackrx/run`
+(one JSON answer) against `POST /hackrx/run/stream` (NDJSON events as the
+LLM writes its answer).
+
+The app runs under uvicorn on a local port, so the client sees the bytes
+when the network would deliver them (an in-process ASGI transport would
+buffer the whole stream). The LLM is the synthetic provider: --base-latency
+seconds to the first token, then --token-latency seconds per output token.
+
+For the stream, "first content" is the first `field` (or `preview`) event
+and "profile" the validated `profile` event; for the plain endpoint all
+three are the same moment.
+
+Usage:
+    python benchmarks/bench_streaming.py --requests 20 --base-latency 0.4 --token-latency 0.01
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+import uvicorn
+
+from career_forge.api.main import app
+from career_forge.engine.cache import get_analysis_cache
+from career_forge.engine.llm_client import LLMClient, set_llm_client
+from career_forge.engine.llm_providers import SyntheticProvider
+from load_test import DOCX_TYPE, build_payload
+
+
+def start_server() -> str:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/api/v1"
+
+
+def plain(client: httpx.Client, payload: bytes) -> dict:
+    started = time.perf_counter()
+    response = client.post("/hackrx/run?mode=llm", files={"file": ("resume.docx", payload, DOCX_TYPE)})
+    response.raise_for_status()
+    elapsed = time.perf_counter() - started
+    return {"first_content": elapsed, "profile": elapsed, "total": elapsed}
+
+
+def streamed(client: httpx.Client, payload: bytes) -> dict:
+    timings = {}
+    started = time.perf_counter()
+    with client.stream("POST", "/hackrx/run/stream?mode=llm",
+                       files={"file": ("resume.docx", payload, DOCX_TYPE)}) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)["event"]
+            now = time.perf_counter() - started
+            if event == "error":
+                raise RuntimeError(line)
+            if event in ("field", "preview", "profile"):
+                timings.setdefault("first_content", now)
+            if event == "profile":
+                timings["profile"] = now
+    timings["total"] = time.perf_counter() - started
+    return timings
+
+
+def summarize(samples: list) -> dict:
+    summary = {}
+    for name in ("first_content", "profile", "total"):
+        values = sorted(sample[name] for sample in samples)
+        summary[name] = {
+            "p50_ms": round(statistics.median(values) * 1000, 1),
+            "p95_ms": round(values[int(0.95 * (len(values) - 1))] * 1000, 1),
+        }
+    return summary
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--requests", type=int, default=20)
+    arg_parser.add_argument("--base-latency", type=float, default=0.4, help="Seconds before the first token.")
+    arg_parser.add_argument("--token-latency", type=float, default=0.01, help="Seconds per output token.")
+    args = arg_parser.parse_args()
+
+    provider = SyntheticProvider(f"constant:{args.base_latency}", token_latency=args.token_latency)
+    set_llm_client(LLMClient(provider, rpm=0, tpm=0))
+    # Every request uploads the same file; with the cache on, only the first would reach the LLM.
+    app.dependency_overrides[get_analysis_cache] = lambda: None
+    payload = build_payload()
+
+    with httpx.Client(base_url=start_server(), timeout=60) as client:
+        # One warm-up request each, so worker start-up isn't measured.
+        plain(client, payload)
+        streamed(client, payload)
+        results = {
+            "hackrx/run": summarize([plain(client, payload) for _ in range(args.requests)]),
+            "hackrx/run/stream": summarize([streamed(client, payload) for _ in range(args.requests)]),
+        }
+
+    for name, result in results.items():
+        print(f"{name:>18}: " + "  ".join(
+            f"{stage} p50 {result[stage]['p50_ms']:7.1f} ms p95 {result[stage]['p95_ms']:7.1f} ms"
+            for stage in ("first_content", "profile", "total")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+# benchmarks/bench_suite.py
+
+"""
+End-to-end benchmark suite, with machine-readable results to compare
+commits.
+
+1. Microbenchmarks, each in a fresh process so its peak RSS is its own:
+   - parse_resume on PDF and DOCX, with the text and NER profiles;
+   - extract_features on NER-parsed resumes;
+   - generate_profile_from_llm_analysis on local analyses of the corpus.
+2. HTTP load: a real uvicorn server with the synthetic LLM provider (no
+   network, no API key) gets POST /api/v1/hackrx/run from --concurrency
+   clients, each upload a different corpus file. The server's CPU time and
+   peak RSS are read from /proc for it and its worker processes.
+
+Every part reports p50/p95/p99 and mean latency, throughput, CPU time per
+operation and peak RSS. The corpus comes from benchmarks/corpus.py and is
+seeded, so two runs with the same arguments see the same files.
+
+Usage:
+    python benchmarks/bench_suite.py --output results/$(git rev-parse --short HEAD).json
+    python benchmarks/bench_suite.py --skip-http --iterations 200 --pages 1 5
+    python benchmarks/bench_suite.py --compare results/base.json results/head.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+MICROBENCHMARKS = [
+    "parse_resume[pdf,text]", "parse_resume[docx,text]", "parse_resume[pdf,ner]", "parse_resume[docx,ner]",
+    "extract_features", "generate_profile_from_llm_analysis",
+]
+
+
+# -----------------------------------------------------------------------------
+# Statistics
+# -----------------------------------------------------------------------------
+
+def percentile(ordered: List[float], share: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(share * len(ordered)) - 1))]
+
+
+def summarize(latencies: List[float], wall_seconds: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "throughput_per_s": round(len(ordered) / wall_seconds, 2) if wall_seconds else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+    }
+
+
+def peak_rss_mb() -> float:
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+# -----------------------------------------------------------------------------
+# 1. Microbenchmarks
+# -----------------------------------------------------------------------------
+
+def run_microbenchmark(name: str, args) -> dict:
+    """Executed inside the subprocess."""
+    from corpus import build_corpus, render
+    from career_forge.engine.feature_extractor import extract_features, get_skill_matcher
+    from career_forge.engine.local_analyzer import analyze_parsed_resume
+    from career_forge.engine.parser import ProcessingProfile, parse_resume, parse_text
+    from career_forge.gamification.profile_generator import generate_profile_from_llm_analysis
+
+    if name.startswith("parse_resume"):
+        fmt, profile = name[len("parse_resume["):-1].split(",")
+        corpus = build_corpus(args.corpus_size, args.pages, args.skill_density, [fmt], args.seed)
+        inputs = [render(resume, fmt) for resume, _ in corpus]
+        if profile != "text":
+            parse_text("warm up", ProcessingProfile(profile))
+        operation = lambda item: parse_resume(item[0], item[1], ProcessingProfile(profile))
+    else:
+        corpus = build_corpus(args.corpus_size, args.pages, args.skill_density, ["docx"], args.seed)
+        get_skill_matcher()
+        parsed = [parse_text(resume.text, ProcessingProfile.NER, keep_doc=True) for resume, _ in corpus]
+        if name == "extract_features":
+            inputs, operation = parsed, extract_features
+        else:
+            inputs = [analyze_parsed_resume(resume) for resume in parsed]
+            operation = generate_profile_from_llm_analysis
+
+    for item in inputs[:min(len(inputs), 5)]:
+        operation(item)
+
+    latencies = []
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    for iteration in range(args.iterations):
+        item = inputs[iteration % len(inputs)]
+        started = time.perf_counter()
+        operation(item)
+        latencies.append(time.perf_counter() - started)
+    wall = time.perf_counter() - wall_started
+    result = summarize(latencies, wall)
+    result["cpu_ms_per_op"] = round((time.process_time() - cpu_started) / args.iterations * 1000, 3)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def microbenchmarks(args) -> Dict[str, dict]:
+    results = {}
+    for name in MICROBENCHMARKS:
+        command = [sys.executable, __file__, "--micro", name, "--iterations", str(args.iterations),
+                   "--corpus-size", str(args.corpus_size), "--skill-density", str(args.skill_density),
+                   "--seed", str(args.seed), "--pages", *map(str, args.pages)]
+        completed = subprocess.run(command, capture_output=True, text=True, cwd=ROOT)
+        if completed.returncode != 0:
+            # e.g. the spaCy model is not installed; the other benchmarks still run.
+            error = (completed.stderr.strip().splitlines() or ["failed"])[-1]
+            results[name] = {"error": error}
+            print(f"{name:>36}: skipped ({error})", file=sys.stderr)
+            continue
+        results[name] = result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f"{name:>36}: p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f}  p99 {result['p99_ms']:8.2f}  "
+              f"{result['throughput_per_s']:9.1f}/s  cpu {result['cpu_ms_per_op']:7.2f} ms/op  "
+              f"peak RSS {result['peak_rss_mb']:6.1f} MB", file=sys.stderr)
+    return results
+
+
+# -----------------------------------------------------------------------------
+# 2. HTTP load
+# -----------------------------------------------------------------------------
+
+_PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _process_tree(root: int) -> List[int]:
+    """The process and all its descendants, from /proc."""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as stat:
+                    ppid = int(stat.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    tree, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(children.get(pid, ()))
+    return tree
+
+
+class ServerSampler:
+    """Samples the server tree's RSS and CPU ticks in a background thread (Linux only)."""
+
+    def __init__(self, pid: int, interval: float = 0.1):
+        self.pid = pid
+        self.interval = interval
+        self.available = os.path.exists(f"/proc/{pid}/stat")
+        self.peak_rss_kb = 0
+        self._ticks: Dict[int, List[int]] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> None:
+        rss_kb = 0
+        for pid in _process_tree(self.pid):
+            try:
+                with open(f"/proc/{pid}/statm") as statm:
+                    rss_kb += int(statm.read().split()[1]) * _PAGE_KB
+                with open(f"/proc/{pid}/stat") as stat:
+                    fields = stat.read().rsplit(")", 1)[1].split()
+            except (OSError, IndexError, ValueError):
+                continue
+            # utime and stime, fields 14 and 15 of /proc/<pid>/stat.
+            ticks = int(fields[11]) + int(fields[12])
+            self._ticks.setdefault(pid, [ticks, ticks])[1] = ticks
+        self.peak_rss_kb = max(self.peak_rss_kb, rss_kb)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._sample()
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        if self.available:
+            self._sample()
+            self._thread.start()
+
+    def stop(self) -> dict:
+        if not self.available:
+            return {}
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        # Processes that appeared during the run started from zero ticks.
+        cpu = sum(last - first for first, last in self._ticks.values()) / _TICKS
+        return {"cpu_seconds": round(cpu, 3), "peak_rss_mb": round(self.peak_rss_kb / 1024, 1)}
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(args, port: int, workdir: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": str(ROOT) + os.pathsep + env.get("PYTHONPATH", ""),
+        "CAREER_FORGE_LLM_PROVIDER": "synthetic",
+        "CAREER_FORGE_LLM_SYNTHETIC_LATENCY": args.llm_latency,
+        "CAREER_FORGE_LLM_SYNTHETIC_SEED": str(args.seed),
+        "CAREER_FORGE_LLM_RPM": "0",
+        "CAREER_FORGE_LLM_TPM": "0",
+        # Every upload is different anyway; caches would only blur run-to-run comparisons.
+        "CAREER_FORGE_CACHE_BACKEND": "none",
+        "CAREER_FORGE_QUEST_CATALOG": "false",
+        "CAREER_FORGE_PROFILE_STORE": "none",
+        "CAREER_FORGE_ACCESS_LOG": "false",
+        "CAREER_FORGE_LOG_LEVEL": "WARNING",
+        "CAREER_FORGE_MAX_IN_FLIGHT": str(args.concurrency),
+        "CAREER_FORGE_MAX_PENDING": str(args.requests),
+        "CAREER_FORGE_QUEUE_TIMEOUT": "600",
+        # Keep the job queue's files out of the repository's .cache.
+        "CAREER_FORGE_JOB_STORE_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "CAREER_FORGE_JOB_UPLOAD_DIR": os.path.join(workdir, "job-uploads"),
+    })
+    command = [sys.executable, "-m", "uvicorn", "career_forge.api.main:app", "--host", "127.0.0.1",
+               "--port", str(port), "--log-level", "warning", "--no-access-log"]
+    # The app serves frontend/ relative to the working directory.
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+async def _wait_ready(client, server: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"the server exited: {server.stderr.read().decode(errors='replace')[-2000:]}")
+        try:
+            if (await client.get("/readyz")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("the server did not become ready in time")
+
+
+async def _load(args, base_url: str, server: subprocess.Popen, files: List[tuple]) -> dict:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+        await _wait_ready(client, server, args.server_timeout)
+        url = f"/api/v1/hackrx/run?mode={args.mode}"
+        latencies, statuses = [], {}
+        counter = iter(range(args.warmup + args.requests))
+
+        async def worker(record: bool, stop_at: int):
+            for index in counter:
+                if index >= stop_at:
+                    return
+                name, content, content_type = files[index % len(files)]
+                started = time.perf_counter()
+                response = await client.post(url, files={"file": (name, content, content_type)})
+                if record:
+                    latencies.append(time.perf_counter() - started)
+                    statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+        # Warm-up: model loading, pool start-up and first-call costs are not measured.
+        await asyncio.gather(*(worker(False, args.warmup) for _ in range(args.concurrency)))
+        counter = iter(range(args.requests))
+        sampler = ServerSampler(server.pid)
+        sampler.start()
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(True, args.requests) for _ in range(args.concurrency)))
+        wall = time.perf_counter() - started
+        server_stats = sampler.stop()
+
+    result = summarize(latencies, wall)
+    result.update({"statuses": statuses, "duration_s": round(wall, 3)})
+    if server_stats:
+        result.update({
+            "server_cpu_seconds": server_stats["cpu_seconds"],
+            "server_cpu_ms_per_request": round(server_stats["cpu_seconds"] / len(latencies) * 1000, 3),
+            # Average cores busy during the run.
+            "server_cpu_utilization": round(server_stats["cpu_seconds"] / wall, 3),
+            "server_peak_rss_mb": server_stats["peak_rss_mb"],
+        })
+    return result
+
+
+def http_benchmark(args) -> dict:
+    from corpus import build_corpus, render
+
+    corpus = build_corpus(args.corpus_size, args.pages, args.skill_density, ["pdf", "docx"], args.seed)
+    files = []
+    for index, (resume, fmt) in enumerate(corpus):
+        content, content_type = render(resume, fmt)
+        files.append((f"resume-{index}.{fmt}", content, content_type))
+
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(args, port, workdir)
+        try:
+            result = asyncio.run(_load(args, f"http://127.0.0.1:{port}", server, files))
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server.kill()
+    result.update({"mode": args.mode, "concurrency": args.concurrency, "llm_latency": args.llm_latency})
+    server_line = (f"  server cpu {result['server_cpu_ms_per_request']:.1f} ms/req "
+                   f"({result['server_cpu_utilization']:.2f} cores), peak RSS {result['server_peak_rss_mb']:.1f} MB"
+                   if "server_cpu_seconds" in result else "")
+    print(f"{'POST /api/v1/hackrx/run':>36}: p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f}  "
+          f"p99 {result['p99_ms']:8.2f}  {result['throughput_per_s']:9.1f}/s  statuses {result['statuses']}"
+          f"{server_line}", file=sys.stderr)
+    return result
+
+
+# -----------------------------------------------------------------------------
+# 3. Results
+# -----------------------------------------------------------------------------
+
+def environment() -> dict:
+    def git(*command: str) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *command], capture_output=True, text=True, cwd=ROOT,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+COMPARED = [("p50_ms", False), ("p95_ms", False), ("p99_ms", False), ("throughput_per_s", True)]
+
+
+def compare(base_path: str, head_path: str) -> None:
+    """Prints the relative change of each latency and throughput figure."""
+    base, head = (json.loads(Path(path).read_text()) for path in (base_path, head_path))
+    print(f"base {base['environment'].get('commit', '?')[:10]}  head {head['environment'].get('commit', '?')[:10]}")
+    rows = [(name, base["micro"].get(name), result) for name, result in head.get("micro", {}).items()]
+    if base.get("http") and head.get("http"):
+        rows.append(("http", base["http"], head["http"]))
+    for name, before, after in rows:
+        if not before or "error" in before or "error" in after:
+            continue
+        changes = []
+        for metric, higher_is_better in COMPARED:
+            if before.get(metric):
+                change = (after[metric] - before[metric]) / before[metric] * 100
+                better = change > 0 if higher_is_better else change < 0
+                changes.append(f"{metric} {before[metric]:.2f} -> {after[metric]:.2f} "
+                               f"({change:+.1f}%{'' if abs(change) < 5 else ' better' if better else ' worse'})")
+        print(f"{name:>36}: " + "  ".join(changes))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--output", help="Write the JSON results here instead of stdout.")
+    arg_parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="Compare two result files.")
+    arg_parser.add_argument("--pages", type=int, nargs="+", default=[1, 2], help="Page counts of the corpus.")
+    arg_parser.add_argument("--skill-density", type=float, default=0.5, help="Share of sentences naming skills.")
+    arg_parser.add_argument("--corpus-size", type=int, default=40, help="Distinct resumes per benchmark.")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--iterations", type=int, default=100, help="Calls per microbenchmark.")
+    arg_parser.add_argument("--requests", type=int, default=200, help="Measured HTTP requests.")
+    arg_parser.add_argument("--warmup", type=int, default=20, help="HTTP requests sent before measuring.")
+    arg_parser.add_argument("--concurrency", type=int, default=16)
+    arg_parser.add_argument("--mode", choices=["llm", "local", "hybrid"], default="llm")
+    arg_parser.add_argument("--llm-latency", default="lognormal:0.8,0.35",
+                            help="Synthetic LLM latency distribution, e.g. constant:0.3.")
+    arg_parser.add_argument("--server-timeout", type=float, default=120, help="Seconds to wait for /readyz.")
+    arg_parser.add_argument("--skip-micro", action="store_true")
+    arg_parser.add_argument("--skip-http", action="store_true")
+    arg_parser.add_argument("--micro", choices=MICROBENCHMARKS, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.micro:
+        print(json.dumps(run_microbenchmark(args.micro, args)))
+        return
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    config = {key: value for key, value in vars(args).items() if key not in ("output", "compare", "micro")}
+    results = {"environment": environment(), "config": config, "micro": {}, "http": None}
+    if not args.skip_micro:
+        results["micro"] = microbenchmarks(args)
+    if not args.skip_http:
+        results["http"] = http_benchmark(args)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_taxonomy.py
+
+"""
+Scaling benchmark for the skill taxonomy: load time, memory, alias lookups
+and matcher build/load time for a synthetic taxonomy of N entries.
+
+Usage:
+    python benchmarks/bench_taxonomy.py --entries 50000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from career_forge.engine.parser import get_nlp
+from career_forge.engine.skill_matcher import SkillMatcher
+from career_forge.engine.taxonomy import SkillTaxonomy, DEFAULT_TAXONOMY_PATH
+
+NLP = get_nlp()
+
+
+def synthetic_taxonomy(entries: int, seed: int = 7) -> dict:
+    """The shipped taxonomy padded with made-up skills up to `entries` entries."""
+    rng = random.Random(seed)
+    data = json.loads(DEFAULT_TAXONOMY_PATH.read_text(encoding="utf-8"))
+    categories = data["categories"]
+    syllables = ["ka", "lo", "mi", "ne", "ro", "ta", "vu", "zen", "qua", "tri", "dex", "lux"]
+    for i in range(len(data["skills"]), entries):
+        name = "".join(rng.choice(syllables) for _ in range(3)).title() + f" {i}"
+        data["skills"].append({
+            "id": f"synthetic-{i}",
+            "name": name,
+            "aliases": [f"{name[:3]}{i}"] if i % 3 == 0 else [],
+            "categories": rng.sample(categories, k=1 + (i % 2)),
+        })
+    return data
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--entries", type=int, default=50000)
+    arg_parser.add_argument("--lookups", type=int, default=200000)
+    args = arg_parser.parse_args()
+
+    data = synthetic_taxonomy(args.entries)
+    with tempfile.TemporaryDirectory() as tmp:
+        taxonomy_path = Path(tmp) / "taxonomy.json"
+        taxonomy_path.write_text(json.dumps(data), encoding="utf-8")
+
+        started = time.perf_counter()
+        taxonomy = SkillTaxonomy.from_file(taxonomy_path)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        # Measure memory on a second load; tracemalloc distorts timings.
+        tracemalloc.start()
+        measured = SkillTaxonomy.from_file(taxonomy_path)
+        taxonomy_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del measured
+
+        probes = [entry["name"].lower() for entry in data["skills"]] + ["k8s", "JS", "not a skill"]
+        started = time.perf_counter()
+        for i in range(args.lookups):
+            taxonomy.lookup(probes[i % len(probes)])
+        lookup_ns = (time.perf_counter() - started) / args.lookups * 1e9
+
+        started = time.perf_counter()
+        skill_matcher = SkillMatcher(NLP, taxonomy)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        matcher_path = str(Path(tmp) / "skills.matcher")
+        skill_matcher.save(matcher_path)
+        started = time.perf_counter()
+        SkillMatcher.load(NLP, matcher_path, taxonomy)
+        matcher_load_ms = (time.perf_counter() - started) * 1000
+
+    doc = NLP.make_doc("Kubernetes (k8s), JS and python on AWS. " * 50)
+    started = time.perf_counter()
+    found = skill_matcher.match(doc)
+    match_ms = (time.perf_counter() - started) * 1000
+
+    print(f"entries: {len(taxonomy)}, surface forms: {sum(1 for _ in taxonomy.surface_forms())}")
+    print(f"taxonomy load: {load_ms:.1f} ms, taxonomy memory: {taxonomy_bytes / 1e6:.1f} MB")
+    print(f"alias lookup: {lookup_ns:.0f} ns")
+    print(f"matcher build: {build_ms:.1f} ms, matcher load from file: {matcher_load_ms:.1f} ms")
+    print(f"match ({len(doc)} tokens): {match_ms:.2f} ms -> {found}")
+
+
+if __name__ == "__main__":
+    main()
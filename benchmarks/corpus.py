@@ -0,0 +1,221 @@
+# benchmarks/corpus.py
+
+"""
+Synthetic resume corpus: realistic-looking resumes as PDF or DOCX files,
+with a configurable number of pages and skill density.
+
+Skills are drawn from the skill taxonomy, so the skill matcher finds them;
+each resume's manifest entry lists the skills it mentions, for checking
+extraction. Everything is seeded, so the same arguments give the same files.
+PDFs are written by hand (one Helvetica text stream per page), so no PDF
+library is needed.
+
+Usage:
+    python benchmarks/corpus.py --out /tmp/corpus --count 200 --pages 1 3 --skill-density 0.5
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+import textwrap
+from pathlib import Path
+from typing import List, NamedTuple, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from career_forge.engine.extraction import DOCX_CONTENT_TYPE, PDF_CONTENT_TYPE
+from career_forge.engine.taxonomy import DEFAULT_TAXONOMY_PATH, SkillTaxonomy
+
+FORMATS = {"pdf": PDF_CONTENT_TYPE, "docx": DOCX_CONTENT_TYPE}
+
+# A4 in points, 10 pt Helvetica on a 12 pt grid: about 64 lines of 95 characters.
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+LINES_PER_PAGE = 64
+CHARS_PER_LINE = 95
+
+FIRST_NAMES = ["Jane", "John", "Priya", "Wei", "Amara", "Lucas", "Sofia", "Omar", "Hana", "Mateo"]
+LAST_NAMES = ["Doe", "Smith", "Sharma", "Chen", "Okafor", "Silva", "Rossi", "Haddad", "Sato", "Garcia"]
+TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "Frontend Developer",
+          "DevOps Engineer", "Machine Learning Engineer", "Mobile Developer", "QA Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech"]
+CITIES = ["London", "Berlin", "Bangalore", "Toronto", "Lagos", "Sao Paulo", "Tokyo"]
+
+# {skill} placeholders are filled from the taxonomy; sentences without one
+# are used when the skill density says this sentence mentions nothing.
+SKILL_SENTENCES = [
+    "Built and operated services in {skill} and {skill} used by {n} teams.",
+    "Cut p95 latency by {n}0% by reworking the hot path with {skill}.",
+    "Migrated the legacy stack to {skill}, with zero downtime over {n} releases.",
+    "Introduced {skill} for the team and ran weekly sessions on {skill}.",
+    "Designed the data model and pipelines with {skill}, serving {n} million requests a day.",
+]
+PLAIN_SENTENCES = [
+    "Worked closely with product and design on a roadmap for {n} quarters.",
+    "Mentored {n} junior engineers and led the hiring loop.",
+    "Wrote the on-call runbooks and reduced pages by {n}0%.",
+    "Presented results to leadership every {n} weeks.",
+]
+HOBBIES = ["Chess, trail running and photography.", "Cooking, cycling and volunteering at a coding club."]
+
+
+class SyntheticResume(NamedTuple):
+    text: str
+    # Canonical names of the taxonomy skills the text mentions.
+    skills: List[str]
+    pages: int
+
+
+def taxonomy_skills() -> List[str]:
+    # Names that start with a capital, so they read like skills in a sentence.
+    names = SkillTaxonomy.from_file(str(DEFAULT_TAXONOMY_PATH)).names
+    return sorted(name for name in names if name[:1].isupper() and len(name) > 1)
+
+
+def generate_resume(rng: random.Random, skills: Sequence[str], pages: int = 1,
+                    skill_density: float = 0.5) -> SyntheticResume:
+    """
+    A resume filling about `pages` pages. `skill_density` is the share of
+    sentences that mention skills (two on average).
+    """
+    mentioned: List[str] = []
+
+    def sentence() -> str:
+        n = rng.randint(2, 9)
+        if rng.random() < skill_density:
+            template = rng.choice(SKILL_SENTENCES)
+            while "{skill}" in template:
+                skill = rng.choice(skills)
+                mentioned.append(skill)
+                template = template.replace("{skill}", skill, 1)
+            return template.format(n=n)
+        return rng.choice(PLAIN_SENTENCES).format(n=n)
+
+    lines: List[str] = []
+    # Printed lines so far, counting wrapped ones.
+    used = 0
+
+    def add(line: str) -> None:
+        nonlocal used
+        lines.append(line)
+        used += len(textwrap.wrap(line, CHARS_PER_LINE)) or 1
+
+    for line in (f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                 f"{rng.choice(TITLES)} | {rng.choice(CITIES)} | person{rng.randint(0, 99999)}@example.com",
+                 "SUMMARY", sentence(), "EXPERIENCE"):
+        add(line)
+    # Room for the closing sections, whose skill list may wrap.
+    budget = pages * LINES_PER_PAGE - 14
+    year = 2024
+    while used < budget * 0.7:
+        start = year - rng.randint(1, 4)
+        add(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({start} - {year})")
+        for _ in range(rng.randint(2, 4)):
+            add(f"- {sentence()}")
+        year = start
+    add("PROJECTS")
+    while used < budget - 2:
+        add(f"Project {rng.randint(1, 999)}: {sentence()}")
+    core = rng.sample(list(skills), rng.randint(4, 10))
+    mentioned.extend(core)
+    for line in ("EDUCATION", f"B.Sc. Computer Science, University of {rng.choice(CITIES)} ({year - 4} - {year})",
+                 "SKILLS", ", ".join(core), "ACHIEVEMENTS", sentence(), "HOBBIES", rng.choice(HOBBIES)):
+        add(line)
+    unique = list(dict.fromkeys(mentioned))
+    return SyntheticResume("\n".join(lines) + "\n", unique, pages)
+
+
+# -----------------------------------------------------------------------------
+# Rendering
+# -----------------------------------------------------------------------------
+
+def to_docx(text: str) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_string(line: str) -> bytes:
+    escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return b"(" + escaped.encode("latin-1", "replace") + b")"
+
+
+def to_pdf(text: str) -> bytes:
+    """A minimal PDF: long lines are wrapped and pages hold LINES_PER_PAGE lines."""
+    lines: List[str] = []
+    for line in text.splitlines():
+        lines.extend(textwrap.wrap(line, CHARS_PER_LINE) or [""])
+    pages = [lines[start:start + LINES_PER_PAGE] for start in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content per page.
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for page_lines in pages:
+        stream = b"BT /F1 10 Tf 12 TL 50 %d Td " % (PAGE_HEIGHT - 50)
+        stream += b" ".join(_pdf_string(line) + b" Tj T*" for line in page_lines) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >>"
+                       b" /Contents %d 0 R >>" % (PAGE_WIDTH, PAGE_HEIGHT, content_id))
+        kids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+def render(resume: SyntheticResume, fmt: str) -> Tuple[bytes, str]:
+    """The file's bytes and content type."""
+    return (to_pdf if fmt == "pdf" else to_docx)(resume.text), FORMATS[fmt]
+
+
+def build_corpus(count: int, pages: Sequence[int] = (1,), skill_density: float = 0.5,
+                 formats: Sequence[str] = ("pdf", "docx"), seed: int = 0) -> List[Tuple[SyntheticResume, str]]:
+    """`count` resumes with the page counts and formats taken in turn."""
+    rng = random.Random(seed)
+    skills = taxonomy_skills()
+    return [(generate_resume(rng, skills, pages[index % len(pages)], skill_density), formats[index % len(formats)])
+            for index in range(count)]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--out", required=True, help="Directory for the files and manifest.json.")
+    arg_parser.add_argument("--count", type=int, default=100)
+    arg_parser.add_argument("--pages", type=int, nargs="+", default=[1, 2])
+    arg_parser.add_argument("--skill-density", type=float, default=0.5)
+    arg_parser.add_argument("--formats", nargs="+", choices=sorted(FORMATS), default=["pdf", "docx"])
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for index, (resume, fmt) in enumerate(build_corpus(args.count, args.pages, args.skill_density, args.formats, args.seed)):
+        content, content_type = render(resume, fmt)
+        name = f"resume-{index:05d}.{fmt}"
+        (out / name).write_bytes(content)
+        manifest.append({"file": name, "content_type": content_type, "pages": resume.pages,
+                         "bytes": len(content), "chars": len(resume.text), "skills": resume.skills})
+    (out / "manifest.json").write_text(json.dumps(manifest, indent=1))
+    print(f"wrote {len(manifest)} resumes and manifest.json to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# benchmarks/fake_llm_server.py
+
+"""
+A local stand-in for the Gemini REST API that injects latency and errors.
+
+It answers `POST /v1beta/models/{model}:generateContent` (and its streaming
+twin `:streamGenerateContent?alt=sse`) like Gemini does, with a canned resume analysis, a canned quest list, or both when the request
+carries a response schema with quests (the single-call prompt), so the whole
+service can run against it without an API key:
+
+    python benchmarks/fake_llm_server.py --port 8089 --latency 0.4 --error-rate 0.1
+    CAREER_FORGE_LLM_BASE_URL=http://127.0.0.1:8089 uvicorn career_forge.api.main:app
+
+Faults:
+- latency: log-normal around --latency, plus --tail-rate of the requests
+  taking --tail-latency instead (to exercise hedging);
+- errors: --error-rate of the requests fail with --error-status (429 sends
+  a Retry-After header when --retry-after is set);
+- decoding: --token-latency seconds per output token. Streamed answers
+  arrive in pieces at that pace; other answers wait for all of it.
+
+The faults can be changed while it runs with `POST /control` and a JSON
+body of the same names (e.g. {"error_rate": 1.0} for an outage), and
+`GET /stats` counts the answers by status.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ANALYSIS = {
+    "user_name": "Jane Doe",
+    "job_title": "Software Engineer",
+    "summary": "A backend engineer with data pipeline experience.",
+    "suggested_rank": "C",
+    "suggested_level": 12,
+    "skills": {"TechnicalSkills": ["Python", "Django"], "SoftSkills": ["Leadership"], "Intelligence": []},
+    "experiences": [{"category": "Project", "title": "Resume Ranker",
+                     "organization": "N/A", "description": "Ranked resumes with NLP."}],
+    "inferred_strengths": ["Backend development"],
+}
+
+QUESTS = [
+    {"title": "Daily Python Practice", "description": "Solve one kata.",
+     "category": "TechnicalSkills", "rewards": ["+50 XP Python"]},
+]
+
+
+class Faults:
+    def __init__(self, latency=0.3, jitter=0.25, tail_rate=0.0, tail_latency=3.0,
+                 error_rate=0.0, error_status=429, retry_after=0, token_latency=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.token_latency = token_latency
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def update(self, values: dict) -> None:
+        for name, value in values.items():
+            if name != "counts" and hasattr(self, name):
+                setattr(self, name, type(getattr(self, name))(value))
+
+    def delay(self) -> float:
+        if random.random() < self.tail_rate:
+            return self.tail_latency
+        return self.latency * random.lognormvariate(0, self.jitter) if self.latency > 0 else 0.0
+
+    def count(self, status: int) -> None:
+        with self.lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+
+# Characters per streamed piece.
+STREAM_CHUNK = 16
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def build_handler(faults: Faults):
+    class Handler(BaseHTTPRequestHandler):
+        fault_settings = faults
+        # Keep-alive, so clients can reuse connections like they would with Gemini.
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, payload, headers=None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                with faults.lock:
+                    self._send(200, {str(status): n for status, n in sorted(faults.counts.items())})
+            else:
+                self._send(404, {"error": {"code": 404, "message": "Not found"}})
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path == "/control":
+                faults.update(json.loads(body or b"{}"))
+                self._send(200, {"ok": True})
+                return
+            streaming = self.path.split("?", 1)[0].endswith(":streamGenerateContent")
+            if not (streaming or self.path.endswith(":generateContent")):
+                self._send(404, {"error": {"code": 404, "message": "Not found"}})
+                return
+
+            time.sleep(faults.delay())
+            if random.random() < faults.error_rate:
+                headers = {"Retry-After": str(faults.retry_after)} if faults.retry_after else None
+                faults.count(faults.error_status)
+                self._send(faults.error_status,
+                           {"error": {"code": faults.error_status, "message": "Injected failure"}}, headers)
+                return
+
+            request = json.loads(body)
+            prompt = request["contents"][0]["parts"][0]["text"]
+            schema = request.get("generationConfig", {}).get("responseSchema") or {}
+            if "quests" in schema.get("properties", {}):
+                answer = {**ANALYSIS, "quests": QUESTS}
+            else:
+                answer = QUESTS if "Quest Master" in prompt else ANALYSIS
+            text = json.dumps(answer)
+            faults.count(200)
+            if streaming:
+                self._stream(text)
+                return
+            time.sleep(faults.token_latency * estimate_tokens(text))
+            self._send(200, {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]})
+
+        def _stream(self, text: str) -> None:
+            # Server-sent events over chunked transfer encoding, one event per piece.
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for start in range(0, len(text), STREAM_CHUNK):
+                    piece = text[start:start + STREAM_CHUNK]
+                    time.sleep(faults.token_latency * estimate_tokens(piece))
+                    event = {"candidates": [{"content": {"role": "model", "parts": [{"text": piece}]}}]}
+                    self._chunk(f"data: {json.dumps(event)}\r\n\r\n".encode("utf-8"))
+                self._chunk(b"")
+            except (BrokenPipeError, ConnectionResetError):
+                # The client stopped reading mid-answer.
+                self.close_connection = True
+
+        def _chunk(self, data: bytes) -> None:
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def start_fake_llm_server(port: int = 0, **faults) -> ThreadingHTTPServer:
+    """
+    Starts the server on a daemon thread. `server.RequestHandlerClass.fault_settings`
+    changes the faults in-process; `server.server_port` is the port.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), build_handler(Faults(**faults)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--port", type=int, default=8089)
+    arg_parser.add_argument("--latency", type=float, default=0.3, help="Median latency in seconds.")
+    arg_parser.add_argument("--jitter", type=float, default=0.25, help="Log-normal sigma of the latency.")
+    arg_parser.add_argument("--tail-rate", type=float, default=0.0, help="Share of requests that are very slow.")
+    arg_parser.add_argument("--tail-latency", type=float, default=3.0)
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--error-status", type=int, default=429)
+    arg_parser.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with errors.")
+    arg_parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds per output token.")
+    args = arg_parser.parse_args()
+
+    faults = Faults(args.latency, args.jitter, args.tail_rate, args.tail_latency,
+                    args.error_rate, args.error_status, args.retry_after, args.token_latency)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), build_handler(faults))
+    server.daemon_threads = True
+    print(f"Fake Gemini listening on http://127.0.0.1:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
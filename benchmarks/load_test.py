@@ -0,0 +1,155 @@
+# benchmarks/load_test.py
+
+"""
+Load test for POST /api/v1/hackrx/run with a synthetic LLM provider.
+
+It drives the real FastAPI app in-process (no network, no API key) and
+compares two execution modes:
+
+- inline: every call runs on the event loop, like the original endpoint.
+- pooled: parsing runs in the process pool and LLM calls in the thread pool.
+
+The LLM calls go through the real LLM client to a `SyntheticProvider`
+(career_forge/engine/llm_providers.py) that answers after a latency drawn
+from --llm-latency-dist, or a constant --llm-latency.
+
+Usage:
+    python benchmarks/load_test.py --requests 64 --concurrency 16 --llm-latency 0.3
+    python benchmarks/load_test.py --llm-latency-dist lognormal:0.8,0.35 --llm-error-rate 0.05
+
+If the spaCy model is not installed, pass --stub-parser-ms to replace the
+parser with a CPU-bound stub of the given duration.
+"""
+
+import argparse
+import asyncio
+import functools
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+from docx import Document
+
+from career_forge.api.main import app
+from career_forge.api.endpoints import profile
+from career_forge.engine.executor import PipelineExecutor, get_executor
+from career_forge.engine.cache import get_analysis_cache
+from career_forge.engine.llm_client import LLMClient, set_llm_client
+from career_forge.engine.llm_providers import SyntheticProvider
+from career_forge.engine.parser import ParsedResume
+
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+SAMPLE_RESUME = """Jane Doe
+Software Engineer
+Experience
+Built data pipelines in Python, Django and PostgreSQL on AWS.
+Led a team of four engineers using Agile and Scrum.
+Projects
+AI-Based Resume Ranker using spaCy and scikit-learn.
+Education
+B.E. Computer Science, 2019 - 2023
+"""
+
+# -----------------------------------------------------------------------------
+# Stubs (module level so they can be pickled into the process pool)
+# -----------------------------------------------------------------------------
+
+def stub_parse(source, content_type: str, profile=None, limits=None, pool=None, *, stub_ms: float) -> ParsedResume:
+    # Burn CPU for roughly `stub_ms` milliseconds, like a PDF + spaCy pass would.
+    deadline = time.perf_counter() + stub_ms / 1000
+    while time.perf_counter() < deadline:
+        pass
+    return ParsedResume(SAMPLE_RESUME)
+
+
+# -----------------------------------------------------------------------------
+# Driver
+# -----------------------------------------------------------------------------
+
+def build_payload() -> bytes:
+    document = Document()
+    for line in SAMPLE_RESUME.splitlines():
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+async def run_mode(executor: PipelineExecutor, payload: bytes, total: int, concurrency: int) -> dict:
+    app.dependency_overrides[get_executor] = lambda: executor
+    # Every request uploads the same file, so the analysis cache must be off
+    # or all but the first request would skip the pipeline.
+    app.dependency_overrides[get_analysis_cache] = lambda: None
+    transport = httpx.ASGITransport(app=app)
+    latencies, statuses = [], {}
+    gate = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def one_request():
+            async with gate:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/hackrx/run?mode=llm", files={"file": ("resume.docx", payload, DOCX_TYPE)}
+                )
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    executor.shutdown()
+    app.dependency_overrides.clear()
+    latencies.sort()
+    return {
+        "requests_per_sec": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "statuses": statuses,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--requests", type=int, default=64)
+    arg_parser.add_argument("--concurrency", type=int, default=16)
+    arg_parser.add_argument("--llm-latency", type=float, default=0.3, help="Constant LLM latency in seconds.")
+    arg_parser.add_argument("--llm-latency-dist", default="",
+                            help="LLM latency distribution, e.g. uniform:0.2,0.8 (overrides --llm-latency).")
+    arg_parser.add_argument("--llm-error-rate", type=float, default=0.0,
+                            help="Share of LLM calls failing with a retryable 503.")
+    arg_parser.add_argument("--stub-parser-ms", type=float, default=0.0,
+                            help="Replace the real parser with a CPU stub of this many milliseconds.")
+    arg_parser.add_argument("--parse-workers", type=int, default=4)
+    arg_parser.add_argument("--llm-workers", type=int, default=32)
+    args = arg_parser.parse_args()
+
+    provider = SyntheticProvider(args.llm_latency_dist or f"constant:{args.llm_latency}", args.llm_error_rate)
+    # No rate limits: this measures the service, not the quota.
+    set_llm_client(LLMClient(provider, rpm=0, tpm=0, backoff_base=0.05))
+    if args.stub_parser_ms:
+        # functools.partial (unlike a lambda) can be pickled into the process pool.
+        profile.parse_resume = functools.partial(stub_parse, stub_ms=args.stub_parser_ms)
+
+    payload = build_payload()
+    limits = dict(max_in_flight=args.concurrency, max_pending=args.requests, queue_timeout=600)
+
+    modes = {
+        "inline": PipelineExecutor(parse_workers=0, llm_workers=1, inline=True, **limits),
+        "pooled": PipelineExecutor(parse_workers=args.parse_workers, llm_workers=args.llm_workers, **limits),
+    }
+
+    for name, executor in modes.items():
+        result = asyncio.run(run_mode(executor, payload, args.requests, args.concurrency))
+        print(f"{name:>7}: {result['requests_per_sec']:7.2f} req/s  "
+              f"p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms  statuses {result['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
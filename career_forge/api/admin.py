@@ -0,0 +1,23 @@
+# career_forge/api/admin.py
+
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from career_forge.config import get_settings
+
+
+def require_admin(authorization: Optional[str] = Header(default=None)) -> None:
+    """
+    Dependency of the admin endpoints: they need the header
+    `Authorization: Bearer <CAREER_FORGE_ADMIN_TOKEN>`. Without a configured
+    token they answer 403, so a default deployment doesn't expose them.
+    """
+    token = get_settings().admin_token
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled; set CAREER_FORGE_ADMIN_TOKEN.")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.strip().encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Missing or invalid admin token.",
+                            headers={"WWW-Authenticate": "Bearer"})
@@ -0,0 +1,116 @@
+# career_forge/api/endpoints/batch.py
+
+import asyncio
+import json
+import zipfile
+from contextlib import AsyncExitStack
+from typing import Iterator, List, Optional, Tuple
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+
+from career_forge.config import get_settings
+from career_forge.engine.batch import (
+    BatchDocument, BatchRunner, SUPPORTED_EXTENSIONS, content_type_for, iter_zip_documents
+)
+from career_forge.engine.cache import AnalysisCache, get_analysis_cache
+from career_forge.engine.executor import (
+    PipelineExecutor, ExecutorOverloaded, ExecutorUnavailable, get_executor
+)
+from career_forge.engine.extraction import DocumentTooLarge, SpooledUpload, spool_upload
+from career_forge.engine.local_analyzer import AnalysisMode, default_analysis_mode
+
+router = APIRouter()
+
+ZIP_CONTENT_TYPES = ["application/zip", "application/x-zip-compressed"]
+
+
+def _documents(uploads: List[Tuple[str, SpooledUpload]], max_bytes: int) -> Iterator[BatchDocument]:
+    for name, upload in uploads:
+        if upload.content_type in ZIP_CONTENT_TYPES or name.lower().endswith(".zip"):
+            try:
+                yield from iter_zip_documents(upload.path, name, max_bytes)
+            except zipfile.BadZipFile:
+                yield BatchDocument(name, b"", None, "Not a valid ZIP archive.")
+            continue
+        content_type = content_type_for(name)
+        if content_type is None and upload.content_type in SUPPORTED_EXTENSIONS.values():
+            content_type = upload.content_type
+        if content_type is None:
+            yield BatchDocument(name, b"", None, "Unsupported file type. Please upload a PDF or DOCX.")
+        elif upload.size > max_bytes:
+            yield BatchDocument(name, b"", content_type, "The file is larger than the upload limit.")
+        else:
+            yield BatchDocument(name, upload.path, content_type)
+
+
+@router.post("/batch")
+async def run_batch(
+    files: List[UploadFile] = File(...),
+    mode: Optional[AnalysisMode] = None,
+    executor: PipelineExecutor = Depends(get_executor),
+    cache: Optional[AnalysisCache] = Depends(get_analysis_cache),
+):
+    """
+    Analyzes many resumes in one request: any mix of PDF and DOCX files and
+    ZIP archives of them. The response is NDJSON, streamed as each resume
+    finishes (completion order), one record per resume:
+
+        {"id": "cohort.zip/jane.pdf", "status": "ok", "result": {...AnalysisResult}}
+        {"id": "notes.txt", "status": "error", "error": "..."}
+
+    followed by a final `{"summary": {"ok": ..., "error": ..., "failed": ...}}`.
+    A batch occupies one analysis slot for as long as it runs.
+    """
+    settings = get_settings()
+    admission = AsyncExitStack()
+    try:
+        await admission.enter_async_context(executor.admit())
+        uploads = []
+        seen = {}
+        for file in files:
+            upload = await spool_upload(file, settings.batch_max_upload_bytes)
+            admission.callback(upload.cleanup)
+            # Two uploads with the same name still get distinct IDs.
+            name = file.filename or "upload"
+            seen[name] = seen.get(name, 0) + 1
+            uploads.append((name if seen[name] == 1 else f"{name}#{seen[name]}", upload))
+    except ExecutorOverloaded as e:
+        await admission.aclose()
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except ExecutorUnavailable as e:
+        await admission.aclose()
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except DocumentTooLarge as e:
+        await admission.aclose()
+        raise HTTPException(status_code=413, detail=str(e))
+    except BaseException:
+        await admission.aclose()
+        raise
+
+    runner = BatchRunner.from_settings(executor, mode or default_analysis_mode(), cache)
+    # Bounded, so a slow client slows the batch down instead of piling up results.
+    records: asyncio.Queue = asyncio.Queue(64)
+
+    async def produce():
+        try:
+            final = {"summary": await runner.run(_documents(uploads, settings.max_upload_bytes), records.put)}
+        except Exception as e:
+            final = {"error": f"The batch stopped unexpectedly: {e}", "summary": runner.counts}
+        await records.put(final)
+        await records.put(None)
+
+    async def stream():
+        task = asyncio.create_task(produce())
+        try:
+            while (entry := await records.get()) is not None:
+                yield json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        finally:
+            # Also runs when the client disconnects: stop the work, wait until it
+            # has unwound (its threads and pools are still in use until then), and
+            # only then free the slot.
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await admission.aclose()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -0,0 +1,41 @@
+# career_forge/api/endpoints/cache.py
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends
+
+from career_forge.api.admin import require_admin
+from career_forge.engine.cache import AnalysisCache, get_analysis_cache
+
+# Admin endpoints (see career_forge/api/admin.py). Plain `def`: FastAPI runs
+# them on a thread, so the SQLite backend's reads and deletes don't hold up
+# the event loop.
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def _require_cache(cache: Optional[AnalysisCache]) -> AnalysisCache:
+    if cache is None:
+        raise HTTPException(status_code=404, detail="The analysis cache is disabled.")
+    return cache
+
+
+@router.get("/cache/stats")
+def get_cache_stats(cache: Optional[AnalysisCache] = Depends(get_analysis_cache)):
+    """Hit/miss counters per cache namespace plus the number of stored entries."""
+    return _require_cache(cache).stats()
+
+
+@router.delete("/cache/{digest}")
+def invalidate_resume(digest: str, cache: Optional[AnalysisCache] = Depends(get_analysis_cache)):
+    """
+    Drops everything cached for one resume. The digest is returned in the
+    `X-Resume-Digest` header of `POST /hackrx/run`.
+    """
+    return {"removed": _require_cache(cache).invalidate(digest)}
+
+
+@router.delete("/cache")
+def clear_cache(cache: Optional[AnalysisCache] = Depends(get_analysis_cache)):
+    """Empties the whole analysis cache."""
+    _require_cache(cache).clear()
+    return {"cleared": True}
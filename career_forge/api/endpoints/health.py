@@ -0,0 +1,24 @@
+# career_forge/api/endpoints/health.py
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from career_forge.engine.resources import registry
+
+router = APIRouter()
+
+
+@router.get("/healthz")
+async def liveness():
+    """The process is up and serving HTTP. Models may still be loading."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readiness():
+    """
+    200 once the required resources (e.g. the Gemini client) are loaded,
+    503 while warm-up is still running or if a required resource failed.
+    """
+    status = registry.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
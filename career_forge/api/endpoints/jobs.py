@@ -0,0 +1,242 @@
+# career_forge/api/endpoints/jobs.py
+
+import asyncio
+import json
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Response
+from fastapi.responses import StreamingResponse
+
+from career_forge.config import get_settings
+from career_forge.engine.cache import get_analysis_cache
+from career_forge.engine.executor import get_executor
+from career_forge.engine.extraction import DocumentTooLarge, ExtractionError, SpooledUpload
+from career_forge.engine.jobs import (
+    FINISHED_STATES, Job, JobFailed, JobQueue, JobState, QueueFull, ReportFn, WebhookRejected, check_webhook_url
+)
+from career_forge.engine.local_analyzer import AnalysisMode, default_analysis_mode
+from career_forge.engine.pipeline import PipelineRun
+from career_forge.gamification.profile_generator import generate_profile_from_llm_analysis
+from career_forge.gamification.quest_catalog import get_quest_catalog
+from career_forge.gamification.quest_generator import generate_quests_locally
+from career_forge.schemas.analysis import AnalysisResult
+from career_forge.schemas.job import JobStatus, JobSubmitted
+from .profile import SUPPORTED_CONTENT_TYPES, build_analysis_pipeline
+
+router = APIRouter()
+
+
+# -----------------------------------------------------------------------------
+# 1. Running one job
+# -----------------------------------------------------------------------------
+# A job runs the same DAG as `POST /hackrx/run`. Every stage start and end is
+# saved as a progress event, and the profile (or, in hybrid mode, the
+# rule-based preview) is saved as a partial result as soon as it exists, so
+# clients polling a slow LLM call already have something to show.
+
+async def analyze_job(job: Job, report: ReportFn) -> dict:
+    mode = AnalysisMode(job.mode)
+    upload = SpooledUpload(job.upload_path, job.upload_size, job.upload_sha256, job.content_type)
+    pipeline = build_analysis_pipeline(get_executor(), get_analysis_cache(), mode, catalog=get_quest_catalog())
+
+    def observe(run: PipelineRun, stage: str, event: str) -> None:
+        report({"type": "stage", "stage": stage, "state": event}, None)
+        if event != "finished":
+            return
+        if stage == "local" and run.context["local"] is not None and not run.is_done("profile"):
+            preview = run.context["local"]
+            partial = AnalysisResult(
+                profile=generate_profile_from_llm_analysis(preview),
+                quests=generate_quests_locally(preview),
+                experiences=preview.experiences,
+                source="local",
+            )
+            report({"type": "partial", "source": "local"}, partial.model_dump())
+        elif stage == "profile" and not run.is_done("quests"):
+            partial = AnalysisResult(
+                profile=run.context["profile"],
+                quests=[],
+                experiences=run.context["analyze"].experiences,
+                source=run.context.get("source", "llm"),
+            )
+            report({"type": "partial", "source": partial.source}, partial.model_dump())
+
+    try:
+        run = await pipeline.run({"upload": upload}, observer=observe)
+    except HTTPException as e:
+        raise JobFailed(e.detail)
+    except (DocumentTooLarge, ExtractionError) as e:
+        raise JobFailed(str(e))
+
+    if "resume_digest" in run.context:
+        report({"type": "cache", "resume_digest": run.context["resume_digest"],
+                "cache": run.context["cache_status"]}, None)
+    return AnalysisResult(
+        profile=run.result("profile"),
+        quests=run.result("quests"),
+        experiences=run.result("analyze").experiences,
+        source=run.context.get("source", "llm"),
+    ).model_dump()
+
+
+# -----------------------------------------------------------------------------
+# 2. Process-wide queue
+# -----------------------------------------------------------------------------
+
+_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """Returns the shared job queue. Also a FastAPI dependency, so tests can swap it out."""
+    global _queue
+    if _queue is None:
+        _queue = JobQueue.from_settings(analyze_job)
+    return _queue
+
+
+async def shutdown_job_queue() -> None:
+    global _queue
+    if _queue is not None:
+        await _queue.stop()
+        _queue = None
+
+
+def _status(queue: JobQueue, job: Job) -> JobStatus:
+    return JobStatus(
+        job_id=job.job_id,
+        state=job.state.value,
+        mode=job.mode,
+        filename=job.filename,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        attempts=job.attempts,
+        position=queue.store.position(job) if job.state == JobState.QUEUED else None,
+        stage=job.stage,
+        events=job.events,
+        partial=job.partial,
+        result=job.result,
+        error=job.error,
+    )
+
+
+def _read(queue: JobQueue, job_id: str) -> Tuple[Optional[Job], Optional[int]]:
+    """The job and its queue position; runs on a thread."""
+    job = queue.store.get(job_id)
+    return job, (queue.store.position(job) if job is not None and job.state == JobState.QUEUED else None)
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+# -----------------------------------------------------------------------------
+# 3. Endpoints
+# -----------------------------------------------------------------------------
+
+@router.post("/jobs", status_code=202, response_model=JobSubmitted)
+async def submit_job(
+    response: Response,
+    file: UploadFile = File(...),
+    mode: Optional[AnalysisMode] = None,
+    webhook_url: Optional[str] = None,
+    queue: JobQueue = Depends(get_job_queue),
+):
+    """
+    Queues a resume for analysis and answers at once with a job ID.
+
+    Follow the job with `GET /jobs/{job_id}` (state, progress and partial
+    results), `GET /jobs/{job_id}/events` (server-sent events), or pass a
+    `webhook_url` that receives `{"job_id", "state", "result", "error"}` as a
+    JSON POST when the job is done.
+    """
+    if file.content_type not in SUPPORTED_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type: {file.content_type}. Please upload a PDF or DOCX."
+        )
+    if webhook_url:
+        try:
+            # Resolves the host, so it runs on a thread.
+            await asyncio.to_thread(check_webhook_url, webhook_url)
+        except WebhookRejected as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    mode = mode or default_analysis_mode()
+    try:
+        job = await queue.submit(file, get_settings().max_upload_bytes, mode.value, webhook_url)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except DocumentTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    status_url = f"/api/v1/jobs/{job.job_id}"
+    response.headers["Location"] = status_url
+    return JobSubmitted(
+        job_id=job.job_id, state=job.state.value, status_url=status_url, events_url=f"{status_url}/events"
+    )
+
+
+# The read-only endpoints are plain `def`: FastAPI runs them on a thread, so
+# the SQLite reads don't hold up the event loop.
+
+@router.get("/jobs/metrics")
+def get_job_metrics(queue: JobQueue = Depends(get_job_queue)):
+    """Queue depth, queue wait times and worker utilization, for sizing the worker pool."""
+    return queue.metrics()
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+def get_job(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """The state of a job, its progress events and its (partial) result."""
+    job = queue.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job ID.")
+    return _status(queue, job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    """
+    Server-sent events for one job:
+
+    - `state`: the job's state (and queue position) whenever it changes,
+    - `stage`, `retry`, `cache`: progress events as they are recorded,
+    - `partial`: a partial AnalysisResult,
+    - `done` with the AnalysisResult, or `failed` with the error, after
+      which the stream ends.
+    """
+    if await asyncio.to_thread(queue.store.get, job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job ID.")
+
+    async def stream():
+        sent = 0
+        last_state = None
+        while True:
+            job, position = await asyncio.to_thread(_read, queue, job_id)
+            if job is None:
+                yield _sse("failed", {"error": "The job expired."})
+                return
+            if (job.state, position) != last_state:
+                last_state = (job.state, position)
+                yield _sse("state", {"state": job.state.value, "position": position, "attempts": job.attempts})
+            for event in job.events[sent:]:
+                if event["type"] == "partial":
+                    yield _sse("partial", job.partial)
+                else:
+                    yield _sse(event["type"], event)
+            sent = len(job.events)
+            if job.state in FINISHED_STATES:
+                if job.state == JobState.DONE:
+                    yield _sse("done", job.result)
+                else:
+                    yield _sse("failed", {"error": job.error})
+                return
+            if not await queue.wait_for_change(15.0):
+                # A comment line keeps proxies from closing an idle stream.
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        stream(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
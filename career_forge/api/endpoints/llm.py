@@ -0,0 +1,16 @@
+# career_forge/api/endpoints/llm.py
+
+from fastapi import APIRouter
+
+from career_forge.engine.llm_client import get_llm_client
+
+router = APIRouter()
+
+
+@router.get("/llm/stats")
+async def get_llm_stats():
+    """
+    Counters of the shared LLM client (calls, retries, hedges, time spent
+    throttled), recent call latencies and the circuit breaker state.
+    """
+    return get_llm_client().stats()
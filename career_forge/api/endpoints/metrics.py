@@ -0,0 +1,93 @@
+# career_forge/api/endpoints/metrics.py
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from career_forge.api.endpoints import jobs
+from career_forge.config import get_settings
+from career_forge.engine import cache, executor, llm_client
+from career_forge.engine.metrics import REGISTRY
+from career_forge.gamification import quest_catalog
+
+router = APIRouter()
+
+
+# -----------------------------------------------------------------------------
+# Collectors: state kept elsewhere, read on every scrape
+# -----------------------------------------------------------------------------
+# They only look at instances that already exist; a scrape never starts the
+# worker pools, the LLM client or the job queue.
+
+def collect_executor():
+    shared = executor._executor
+    if shared is None:
+        return []
+    return [(
+        "career_forge_analyses", "gauge", "Admitted analyses: running, or waiting for a free slot.",
+        [({"state": "running"}, shared.in_flight), ({"state": "waiting"}, shared.pending)],
+    )]
+
+
+def collect_llm_client():
+    client = llm_client._client
+    if client is None:
+        return []
+    stats = client.stats()
+    events = ("calls", "streams", "attempts", "retries", "failures", "rejected", "hedges", "hedge_wins")
+    return [
+        ("career_forge_llm_client_events_total", "counter",
+         "LLM client events: calls, attempts, retries, failures, calls rejected by the breaker, hedges.",
+         [({"event": event}, stats[event]) for event in events]),
+        ("career_forge_llm_throttled_seconds_total", "counter",
+         "Seconds LLM calls waited for the rate limits.", [({}, stats["throttled_seconds"])]),
+        ("career_forge_llm_breaker_state", "gauge", "1 for the circuit breaker's current state.",
+         [({"state": state}, int(stats["breaker"] == state)) for state in ("closed", "open", "half_open")]),
+    ]
+
+
+def collect_cache():
+    shared = cache._cache
+    if shared is None:
+        return []
+    return [("career_forge_cache_entries", "gauge", "Entries in the analysis cache.", [({}, len(shared.backend))])]
+
+
+def collect_job_queue():
+    queue = jobs._queue
+    if queue is None:
+        return []
+    queue_metrics = queue.metrics()
+    return [
+        ("career_forge_jobs", "gauge", "Background jobs by state.",
+         [({"state": state}, count) for state, count in queue_metrics["jobs"].items()]),
+        ("career_forge_job_workers_busy", "gauge", "Job workers running a job.",
+         [({}, queue_metrics["workers"]["busy"])]),
+        ("career_forge_job_oldest_queued_seconds", "gauge", "Age of the oldest queued job.",
+         [({}, queue_metrics["oldest_queued_seconds"])]),
+    ]
+
+
+def collect_quest_catalog():
+    catalog = quest_catalog._catalog
+    if catalog is None:
+        return []
+    return [("career_forge_quest_catalog_entries", "gauge", "Reusable quest sets in the quest catalog.",
+             [({}, len(catalog))])]
+
+
+for _collector in (collect_executor, collect_llm_client, collect_cache, collect_job_queue, collect_quest_catalog):
+    REGISTRY.add_collector(_collector)
+
+
+# A plain `def`: FastAPI runs it on a thread, so the job queue's SQLite reads
+# don't hold up the event loop.
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Prometheus metrics: request rates and latencies by route, pipeline stage
+    and parse step durations, LLM call latencies and token usage, cache hits,
+    in-flight requests and errors by type (see career_forge/engine/metrics.py).
+    """
+    if not get_settings().metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
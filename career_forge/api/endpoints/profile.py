@@ -1,59 +1,687 @@
 # career_forge/api/endpoints/profile.py
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import asyncio
+import json
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import List, Optional
 
-from career_forge.engine.parser import parse_resume
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from career_forge.engine.parser import parse_resume, ProcessingProfile
+from career_forge.engine.extraction import (
+    DocumentTooLarge, ExtractionError, ExtractionLimits, SpooledUpload, spool_upload, PDF_CONTENT_TYPE
+)
+from career_forge.engine.executor import (
+    PipelineExecutor, ExecutorOverloaded, ExecutorUnavailable, get_executor
+)
+from career_forge.engine import metrics
+from career_forge.engine.pipeline import Pipeline, PipelineRun, Stage, DeferredRuns
+from career_forge.engine.cache import AnalysisCache, get_analysis_cache, resume_digest
+from career_forge.engine.combined_analyzer import analyze_resume_and_quests_with_llm
+from career_forge.engine.compaction import compact_resume, estimate_tokens
 from career_forge.engine.llm_analyzer import analyze_resume_with_llm
+from career_forge.engine.llm_client import LLMUnavailable, get_llm_client
+from career_forge.engine.local_analyzer import AnalysisMode, analyze_resume_locally, default_analysis_mode
+from career_forge.engine.profile_store import ProfileStore, get_profile_store
+from career_forge.config import get_settings
 
 from career_forge.gamification.profile_generator import generate_profile_from_llm_analysis
-from career_forge.gamification.quest_generator import generate_quests_with_llm
+from career_forge.gamification.quest_catalog import QuestCatalog, get_quest_catalog
+from career_forge.gamification.quest_generator import (
+    generate_quests_with_llm, generate_quests_locally, build_quest_context, FALLBACK_QUEST
+)
 
 from career_forge.schemas.analysis import AnalysisResult
+from career_forge.schemas.quest import Quest
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+SUPPORTED_CONTENT_TYPES = [
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+]
+
+# Runs whose quests (or, in hybrid mode, LLM analysis) are still running after
+# the response was sent.
+deferred_runs = DeferredRuns()
+# Strong references to the background tasks that release admission slots.
+_background_tasks = set()
+
+
+# -----------------------------------------------------------------------------
+# 1. The analysis DAG
+# -----------------------------------------------------------------------------
+#
+#   read -> cache_lookup -> parse -> compact -> analyze -+-> profile
+#                                                       +-> quests
+#
+# `read` streams the upload into a temporary file (enforcing the size limit)
+# instead of holding it in memory; `parse` then reads it from there, splitting
+# long PDFs into page ranges for the worker processes. `compact` strips
+# boilerplate and fits the text into the prompt's token budget.
+#
+# Profile building and quest generation only depend on the LLM analysis, so
+# they run side by side instead of one after the other. When the exact same
+# file was analyzed before, `cache_lookup` finds it and both the parse and the
+# LLM calls are skipped.
+#
+# With CAREER_FORGE_LLM_SINGLE_CALL (the default), `analyze` gets the quests
+# from the same LLM call (see combined_analyzer.py) and `quests` only passes
+# them on; it calls the LLM itself only when they were missing from the answer.
+#
+# When the LLM is unavailable (retries used up or the circuit breaker open,
+# see llm_client.py), `analyze` falls back to the rule-based analyzer and
+# `quests` to template quests; `ctx["source"]` then says "local" and nothing
+# is cached.
+#
+# The streaming endpoint puts an `on_field` callback into the context;
+# `analyze` then streams the LLM answer and reports each field as it is
+# written.
+#
+# With a `user_id` in the context (and a profile store), `profile` merges the
+# analysis into the user's stored profile and returns that instead: earned XP
+# is kept and only new skills and experiences are added (see
+# profile_store.py). What changed is left in `ctx["profile_diff"]`. The
+# quests are recorded as issued to the user, so completing them awards XP.
+# The store also keeps the LLM analysis, so when the user re-uploads the same
+# resume text `analyze` returns it (`X-Cache: profile`) and `quests` returns
+# the quests still open, without calling the LLM.
+#
+# Before `quests` makes an LLM call of its own, it looks for reusable quests
+# of a profile with similar skills in the quest catalog (quest_catalog.py);
+# the lookup is left in `ctx["quest_catalog"]`. Quests the LLM writes, alone
+# or with the analysis, are added to the catalog.
+#
+# The analysis mode changes the graph:
+#
+#   local:   read -> parse -> analyze (rule-based) -+-> profile
+#                                                  +-> quests (templates)
+#   hybrid:  the llm graph above, plus parse -> local, a rule-based preview
+#            the endpoint can return before the LLM answers.
+
+def build_analysis_pipeline(
+    executor: PipelineExecutor,
+    cache: Optional[AnalysisCache],
+    mode: AnalysisMode = AnalysisMode.LLM,
+    profiles: Optional[ProfileStore] = None,
+    catalog: Optional[QuestCatalog] = None,
+) -> Pipeline:
+    limits = ExtractionLimits.from_settings()
+    token_budget = get_settings().llm_token_budget
+    single_call = get_settings().llm_single_call
+
+    async def read(ctx):
+        if "upload" in ctx:
+            # Already on disk (a queued job); its owner deletes the file.
+            return ctx["upload"]
+        upload = await spool_upload(ctx["file"], limits.max_bytes)
+        # The temporary file is deleted when the caller closes its exit stack.
+        ctx["exit_stack"].callback(upload.cleanup)
+        return upload
+
+    # The cache calls below run on the I/O threads: with the SQLite backend
+    # each one reads from disk or commits.
+
+    def find_upload(sha256: str):
+        digest = cache.lookup_upload(sha256)
+        analysis = cache.get_analysis(digest) if digest else None
+        return (digest, analysis) if analysis else None
+
+    def find_text(sha256: str, digest: str):
+        cache.remember_upload(sha256, digest)
+        return cache.get_analysis(digest)
+
+    async def cache_lookup(ctx):
+        # Returns (digest, analysis) for a byte-identical re-upload, else None.
+        if cache is None:
+            return None
+        return await executor.run_io(find_upload, ctx["read"].sha256)
+
+    async def parse(ctx):
+        if ctx.get("cache_lookup"):
+            return None
+        upload: SpooledUpload = ctx["read"]
+        # The LLM only reads the text, so skip spaCy entirely on this path.
+        if upload.content_type == PDF_CONTENT_TYPE:
+            parsed_resume = await executor.run_split(
+                parse_resume, upload.path, upload.content_type, ProcessingProfile.TEXT, limits
+            )
+        else:
+            parsed_resume = await executor.run_cpu(
+                parse_resume, upload.path, upload.content_type, ProcessingProfile.TEXT, limits
+            )
+        # Measured in the worker process, recorded here where /metrics is served.
+        document_format = "pdf" if upload.content_type == PDF_CONTENT_TYPE else "docx"
+        for step, seconds in parsed_resume.timings.items():
+            metrics.PARSE_STEP_DURATION.labels(step, document_format).observe(seconds)
+        if not parsed_resume.raw_text:
+            raise HTTPException(status_code=422, detail="Failed to extract text from the document.")
+        return parsed_resume
+
+    async def compact(ctx):
+        if ctx["cache_lookup"]:
+            return None
+        return await executor.run_cpu(compact_resume, ctx["parse"].raw_text, token_budget)
+
+    async def analyze(ctx):
+        # Besides its result, this stage records the resume digest and whether
+        # the analysis came from the cache, for the quests stage and headers.
+        if ctx["cache_lookup"]:
+            ctx["resume_digest"], ctx["cache_status"] = ctx["cache_lookup"][0], "hit"
+            return ctx["cache_lookup"][1]
+
+        digest = ctx["resume_digest"] = resume_digest(ctx["parse"].raw_text)
+        ctx["cache_status"] = "miss"
+        if cache is not None:
+            # Same text from a different file (e.g. a re-export) still hits.
+            cached = await executor.run_io(find_text, ctx["read"].sha256, digest)
+            if cached is not None:
+                ctx["cache_status"] = "hit"
+                return cached
+        user_id = ctx.get("user_id")
+        if profiles is not None and user_id:
+            # The user re-uploaded the resume of their stored profile: its
+            # analysis still holds, even once the cache has forgotten it.
+            stored = await executor.run_io(profiles.stored_analysis, user_id, digest)
+            if stored is not None:
+                ctx["cache_status"] = "profile"
+                return stored
+
+        # Set by the streaming endpoint: the LLM answer is streamed and each
+        # field is reported as it completes (called on the I/O thread).
+        on_field = ctx.get("on_field")
+        try:
+            if single_call:
+                combined = await executor.run_io(analyze_resume_and_quests_with_llm, ctx["compact"].text, on_field)
+                llm_analysis, ctx["llm_quests"] = combined or (None, [])
+            else:
+                llm_analysis = await executor.run_io(analyze_resume_with_llm, ctx["compact"].text, on_field)
+        except LLMUnavailable as e:
+            if not get_settings().llm_fallback:
+                raise
+            logger.warning("LLM unavailable, falling back to the local analyzer: %s", e)
+            ctx["source"], ctx["cache_status"] = "local", "fallback"
+            return await executor.run_cpu(analyze_resume_locally, ctx["parse"].raw_text)
+        if not llm_analysis:
+            raise HTTPException(status_code=500, detail="Failed to get a valid analysis from the LLM.")
+        if cache is not None:
+            await executor.run_io(cache.set_analysis, digest, llm_analysis)
+        return llm_analysis
+
+    async def profile(ctx):
+        user_id = ctx.get("user_id")
+        if profiles is None or not user_id:
+            return generate_profile_from_llm_analysis(ctx["analyze"])
+        stored, ctx["profile_diff"] = await executor.run_io(
+            profiles.merge_analysis, user_id, ctx["resume_digest"], ctx["analyze"], ctx.get("source") != "local")
+        return stored.profile
+
+    # --- Rule-based stages (local and hybrid modes) ---
+
+    async def analyze_locally(ctx):
+        ctx["resume_digest"] = resume_digest(ctx["parse"].raw_text)
+        ctx["source"], ctx["cache_status"] = "local", "bypass"
+        return await executor.run_cpu(analyze_resume_locally, ctx["parse"].raw_text)
+
+    async def issue(ctx, issued: List[Quest]) -> List[Quest]:
+        user_id = ctx.get("user_id")
+        if profiles is not None and user_id and issued:
+            await executor.run_io(profiles.issue_quests, user_id, issued)
+        return issued
+
+    async def local_quests(ctx):
+        return await issue(ctx, generate_quests_locally(ctx["analyze"]))
+
+    async def local_preview(ctx):
+        # Only a preview: if it can't be built (cache hit, spaCy model
+        # missing) the endpoint simply waits for the LLM result.
+        if ctx["cache_lookup"]:
+            return None
+        try:
+            return await executor.run_cpu(analyze_resume_locally, ctx["parse"].raw_text)
+        except Exception:
+            logger.warning("Local preview analysis failed", exc_info=True)
+            return None
+
+    async def quests(ctx):
+        return await issue(ctx, await find_quests(ctx))
+
+    async def find_quests(ctx):
+        digest = ctx["resume_digest"]
+        if ctx.get("source") == "local":
+            # The analysis already fell back; don't wait on the LLM a second time.
+            return generate_quests_locally(ctx["analyze"])
+        if ctx.get("llm_quests"):
+            # Generated together with the analysis.
+            if cache is not None:
+                await executor.run_io(cache.set_quests, digest, ctx["llm_quests"])
+            if catalog is not None and ctx.get("cache_status") == "miss":
+                await executor.run_io(catalog.add, ctx["analyze"], ctx["llm_quests"], get_llm_client().model_id)
+            return ctx["llm_quests"]
+        if ctx.get("cache_status") == "profile":
+            # Same resume as last time: the quests the user hasn't finished
+            # yet, or new ones once all of them are done.
+            unfinished = await executor.run_io(profiles.open_quests, ctx["user_id"])
+            if unfinished:
+                return unfinished
+        if cache is not None:
+            cached = await executor.run_io(cache.get_quests, digest)
+            if cached is not None:
+                return cached
+        if catalog is not None:
+            lookup = ctx["quest_catalog"] = await executor.run_io(catalog.lookup, ctx["analyze"])
+            if lookup.hit:
+                if cache is not None:
+                    await executor.run_io(cache.set_quests, digest, lookup.quests)
+                return lookup.quests
+
+        # What the old pretty-printed prompt context would have cost, for the headers.
+        ctx["quest_tokens"] = (
+            estimate_tokens(ctx["analyze"].model_dump_json(indent=2)),
+            estimate_tokens(build_quest_context(ctx["analyze"])),
+        )
+
+        started = time.perf_counter()
+        generated = await executor.run_io(generate_quests_with_llm, ctx["analyze"])
+        if generated == [FALLBACK_QUEST] and get_settings().llm_fallback:
+            # The LLM failed; the closest catalog quests, or else template
+            # quests, beat the generic placeholder.
+            nearest = ctx["quest_catalog"].nearest if "quest_catalog" in ctx else None
+            return nearest or generate_quests_locally(ctx["analyze"])
+        # Empty or fallback quests mean the LLM was unavailable; don't keep them.
+        if generated and generated != [FALLBACK_QUEST]:
+            if cache is not None:
+                await executor.run_io(cache.set_quests, digest, generated)
+            if catalog is not None:
+                catalog.record_generation(time.perf_counter() - started)
+                await executor.run_io(catalog.add, ctx["analyze"], generated, get_llm_client().model_id)
+        return generated
+
+    if mode == AnalysisMode.LOCAL:
+        return Pipeline([
+            Stage("read", read),
+            Stage("parse", parse, deps=("read",)),
+            Stage("analyze", analyze_locally, deps=("parse",)),
+            Stage("profile", profile, deps=("analyze",)),
+            Stage("quests", local_quests, deps=("analyze",)),
+        ])
+
+    stages = [
+        Stage("read", read),
+        Stage("cache_lookup", cache_lookup, deps=("read",)),
+        Stage("parse", parse, deps=("cache_lookup",)),
+        Stage("compact", compact, deps=("parse",)),
+        Stage("analyze", analyze, deps=("compact",)),
+        Stage("profile", profile, deps=("analyze",)),
+        Stage("quests", quests, deps=("analyze",)),
+    ]
+    if mode == AnalysisMode.HYBRID:
+        stages.append(Stage("local", local_preview, deps=("parse",)))
+    return Pipeline(stages)
+
+
+def _set_timing_headers(response: Response, run: PipelineRun) -> None:
+    response.headers["Server-Timing"] = run.server_timing()
+    response.headers["X-Critical-Path"] = ">".join(run.critical_path())
+
+
+def _set_token_headers(response: Response, run: PipelineRun) -> None:
+    # Estimated prompt input tokens before and after compaction. Missing
+    # parts were skipped (cache hit) or are still running (deferred quests).
+    counts = []
+    compacted = run.context.get("compact")
+    if compacted is not None:
+        counts.append(f"resume;before={compacted.tokens_before};after={compacted.tokens_after}")
+    if "quest_tokens" in run.context:
+        before, after = run.context["quest_tokens"]
+        counts.append(f"quest_context;before={before};after={after}")
+    if counts:
+        response.headers["X-Token-Counts"] = ", ".join(counts)
+
+
+def _as_http_error(error: Exception) -> HTTPException:
+    """The HTTP error an analysis failure is answered with."""
+    if isinstance(error, HTTPException):
+        return error
+    if isinstance(error, DocumentTooLarge):
+        return HTTPException(status_code=413, detail=str(error))
+    if isinstance(error, ExtractionError):
+        return HTTPException(status_code=422, detail=str(error))
+    if isinstance(error, ExecutorOverloaded):
+        return HTTPException(status_code=429, detail=str(error), headers={"Retry-After": "1"})
+    if isinstance(error, ExecutorUnavailable):
+        return HTTPException(status_code=503, detail=str(error), headers={"Retry-After": "5"})
+    if isinstance(error, ConnectionError):
+        return HTTPException(status_code=503, detail=str(error))
+    return HTTPException(status_code=500, detail=f"An unexpected error occurred during analysis: {error}")
+
+
+def _profile_event(event: str, profile, analysis, source: str) -> dict:
+    return {
+        "event": event,
+        "profile": profile.model_dump(mode="json"),
+        "experiences": [experience.model_dump(mode="json") for experience in analysis.experiences],
+        "summary": analysis.summary,
+        "source": source,
+    }
+
+
+async def _release_when_done(run: PipelineRun, admission: AsyncExitStack) -> None:
+    try:
+        await asyncio.gather(*run.tasks.values(), return_exceptions=True)
+    finally:
+        await admission.aclose()
+
+
+def _defer(run: PipelineRun, admission: AsyncExitStack) -> str:
+    # Keep the slot until the run is done so backpressure still accounts for
+    # the LLM calls running in the background.
+    analysis_id = deferred_runs.add(run)
+    task = asyncio.create_task(_release_when_done(run, admission))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return analysis_id
+
+
+# -----------------------------------------------------------------------------
+# 2. Endpoints
+# -----------------------------------------------------------------------------
 
 @router.post("/hackrx/run", response_model=AnalysisResult)
-async def run_resume_analysis(file: UploadFile = File(...)):
+async def run_resume_analysis(
+    response: Response,
+    file: UploadFile = File(...),
+    defer_quests: bool = False,
+    mode: Optional[AnalysisMode] = None,
+    user_id: Optional[str] = Query(default=None, min_length=1, max_length=128),
+    executor: PipelineExecutor = Depends(get_executor),
+    cache: Optional[AnalysisCache] = Depends(get_analysis_cache),
+    profiles: Optional[ProfileStore] = Depends(get_profile_store),
+    catalog: Optional[QuestCatalog] = Depends(get_quest_catalog),
+):
     """
     This is the main endpoint for the LLM-powered AI engine.
     It orchestrates the full analysis workflow.
+
+    Parsing runs in the executor's process pool and the blocking LLM calls
+    run in its thread pool, so one slow upload never stalls the event loop.
+
+    With `defer_quests=true` the profile is returned as soon as it is ready,
+    together with an `analysis_id`; the quests are then collected from
+    `GET /hackrx/run/{analysis_id}/quests`. Per-stage timings are reported in
+    the `Server-Timing` and `X-Critical-Path` response headers.
+
+    Results are cached by resume content; `X-Cache` tells whether the LLM
+    analysis was served from the cache and `X-Resume-Digest` is the key to
+    invalidate it with `DELETE /cache/{digest}`.
+
+    Uploads larger than CAREER_FORGE_MAX_UPLOAD_BYTES or PDFs with more than
+    CAREER_FORGE_MAX_PAGES pages get 413; scanned PDFs without text get 422.
+
+    `mode` picks the analyzer (default: CAREER_FORGE_ANALYSIS_MODE):
+    - `llm`: Gemini analysis and quests (one call with
+      CAREER_FORGE_LLM_SINGLE_CALL, else two).
+    - `local`: rule-based analysis and template quests, no LLM calls.
+    - `hybrid`: returns the rule-based result (`source: "local"`) at once,
+      with an `analysis_id` to fetch the LLM result from
+      `GET /hackrx/run/{analysis_id}` when it is ready.
+
+    With a `user_id`, the result is merged into the user's stored profile
+    (created on the first upload) and the returned profile carries the XP
+    earned so far; `X-Profile-Diff` tells what the upload added, e.g.
+    `skills=+2;experiences=+1` or `unchanged`. See `GET /profiles/{user_id}`.
+
+    When the quests were looked up in the quest catalog, `X-Quest-Catalog`
+    reports the outcome, e.g. `hit;similarity=0.82;saved_ms=1480`.
     """
-    if file.content_type not in [
-        "application/pdf",
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    ]:
+    if file.content_type not in SUPPORTED_CONTENT_TYPES:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported file type: {file.content_type}. Please upload a PDF or DOCX."
         )
 
-    file_content = await file.read()
-
     try:
-        parsed_resume = parse_resume(file_content, file.content_type)
-        if not parsed_resume.raw_text:
-            raise HTTPException(status_code=422, detail="Failed to extract text from the document.")
-
-        llm_analysis = analyze_resume_with_llm(parsed_resume.raw_text)
-        if not llm_analysis:
-            raise HTTPException(status_code=500, detail="Failed to get a valid analysis from the LLM.")
+        # Reserve an analysis slot first. If the server is saturated we fail
+        # fast with 429/503 instead of queuing the upload without bound.
+        # The same stack owns the spooled upload, which goes with the slot.
+        admission = AsyncExitStack()
+        await admission.enter_async_context(executor.admit())
+        mode = mode or default_analysis_mode()
+        wait_for = ("profile",) if defer_quests else None
+        try:
+            pipeline = build_analysis_pipeline(executor, cache, mode, profiles, catalog)
+            run = await pipeline.run(
+                {"file": file, "exit_stack": admission, "user_id": user_id},
+                wait_for=("local",) if mode == AnalysisMode.HYBRID else wait_for
+            )
+            preview = mode == AnalysisMode.HYBRID and run.result("local") is not None and not run.is_done("profile")
+            if mode == AnalysisMode.HYBRID and not preview:
+                # No preview to show (e.g. a cache hit): answer like `llm` mode.
+                try:
+                    await (run.wait(*wait_for) if wait_for else run.wait_all())
+                except BaseException:
+                    run.cancel()
+                    raise
+        except BaseException:
+            await admission.aclose()
+            raise
 
-        user_profile = generate_profile_from_llm_analysis(llm_analysis)
+        analysis_id = None
+        source = run.context.get("source", "llm")
+        if preview:
+            llm_analysis = run.result("local")
+            user_profile = generate_profile_from_llm_analysis(llm_analysis)
+            quests = generate_quests_locally(llm_analysis)
+            analysis_id = _defer(run, admission)
+            source = "local"
+        elif defer_quests and not run.is_done("quests"):
+            analysis_id = _defer(run, admission)
+            llm_analysis, user_profile, quests = run.result("analyze"), run.result("profile"), []
+        else:
+            await admission.aclose()
+            llm_analysis, user_profile, quests = run.result("analyze"), run.result("profile"), run.result("quests")
 
-        quests = generate_quests_with_llm(llm_analysis)
+        _set_timing_headers(response, run)
+        _set_token_headers(response, run)
+        if cache is not None and "resume_digest" in run.context:
+            response.headers["X-Resume-Digest"] = run.result("resume_digest")
+            response.headers["X-Cache"] = run.result("cache_status")
+        if "quest_catalog" in run.context:
+            response.headers["X-Quest-Catalog"] = run.context["quest_catalog"].to_header()
+        if "profile_diff" in run.context:
+            response.headers["X-Profile-Diff"] = run.context["profile_diff"].to_header()
 
         # --- KEY CHANGE IS HERE ---
         # We now include the experiences list in the final result.
         analysis_result = AnalysisResult(
             profile=user_profile,
             quests=quests,
-            experiences=llm_analysis.experiences
+            experiences=llm_analysis.experiences,
+            analysis_id=analysis_id,
+            source=source
         )
 
         return analysis_result
 
+    except Exception as e:
+        raise _as_http_error(e)
+
+
+@router.post("/hackrx/run/stream")
+async def stream_resume_analysis(
+    file: UploadFile = File(...),
+    mode: Optional[AnalysisMode] = None,
+    user_id: Optional[str] = Query(default=None, min_length=1, max_length=128),
+    executor: PipelineExecutor = Depends(get_executor),
+    cache: Optional[AnalysisCache] = Depends(get_analysis_cache),
+    profiles: Optional[ProfileStore] = Depends(get_profile_store),
+    catalog: Optional[QuestCatalog] = Depends(get_quest_catalog),
+):
+    """
+    The analysis of `POST /hackrx/run`, streamed as newline-delimited JSON
+    (`application/x-ndjson`) so the client can render it while the LLM is
+    still writing. One event per line:
+
+    - `{"event": "field", "path": ["skills", "TechnicalSkills"], "value": [...]}`
+      for each field of the LLM answer as soon as it is complete (raw and
+      unvalidated: a preview);
+    - `{"event": "preview", ...}` in `hybrid` mode, the rule-based profile;
+    - `{"event": "profile", "profile": ..., "experiences": ..., "summary": ..., "source": ...}`
+      once the analysis is validated; it replaces any field previews;
+    - `{"event": "quests", "quests": [...]}`;
+    - `{"event": "done", "result": <AnalysisResult>, "timing": {...}}` last,
+      with the time to the first event and the total in milliseconds;
+    - `{"event": "error", "status": 503, "detail": "..."}` instead of the
+      rest when the analysis fails.
+
+    Errors before the stream starts (bad file type, upload too large, server
+    saturated) are answered with the usual status codes. A `user_id` is
+    handled as in `POST /hackrx/run`.
+    """
+    if file.content_type not in SUPPORTED_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type: {file.content_type}. Please upload a PDF or DOCX."
+        )
+
+    started = time.perf_counter()
+    admission = AsyncExitStack()
+    try:
+        await admission.enter_async_context(executor.admit())
+        # The upload is closed once this handler returns, before the stream
+        # is sent, so spool it now; the file goes with the slot.
+        upload = await spool_upload(file, ExtractionLimits.from_settings().max_bytes)
+        admission.callback(upload.cleanup)
+    except Exception as e:
+        await admission.aclose()
+        raise _as_http_error(e)
+
+    mode = mode or default_analysis_mode()
+    pipeline = build_analysis_pipeline(executor, cache, mode, profiles, catalog)
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_field(path, value):
+        # Called on an I/O thread while the LLM answer streams in.
+        loop.call_soon_threadsafe(events.put_nowait, {"event": "field", "path": list(path), "value": value})
+
+    def observer(run: PipelineRun, stage: str, event: str):
+        if event != "finished":
+            return
+        if stage == "quests":
+            quests = [quest.model_dump(mode="json") for quest in run.result("quests")]
+            events.put_nowait({"event": "quests", "quests": quests})
+        elif stage == "profile":
+            events.put_nowait(_profile_event("profile", run.result("profile"), run.result("analyze"),
+                                             run.context.get("source", "llm")))
+        elif stage == "local" and run.result("local") is not None and "profile" not in run.context:
+            # The hybrid mode's rule-based preview, unless the LLM was faster.
+            analysis = run.result("local")
+            profile = generate_profile_from_llm_analysis(analysis)
+            events.put_nowait(_profile_event("preview", profile, analysis, "local"))
+
+    async def lines():
+        task = asyncio.create_task(pipeline.run(
+            {"upload": upload, "exit_stack": admission, "on_field": on_field, "user_id": user_id},
+            observer=observer))
+        # Queued after every event the run puts in, so it marks the end.
+        task.add_done_callback(lambda _: events.put_nowait(None))
+        first_content_ms = None
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                if first_content_ms is None:
+                    first_content_ms = round((time.perf_counter() - started) * 1000, 1)
+                yield json.dumps(event) + "\n"
+
+            try:
+                run = task.result()
+            except Exception as e:
+                error = _as_http_error(e)
+                yield json.dumps({"event": "error", "status": error.status_code, "detail": error.detail}) + "\n"
+                return
+            result = AnalysisResult(
+                profile=run.result("profile"),
+                quests=run.result("quests"),
+                experiences=run.result("analyze").experiences,
+                source=run.context.get("source", "llm"),
+            )
+            yield json.dumps({
+                "event": "done",
+                "result": result.model_dump(mode="json"),
+                "timing": {
+                    "first_content_ms": first_content_ms,
+                    "total_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "server_timing": run.server_timing(),
+                },
+            }) + "\n"
+        finally:
+            # The client went away mid-stream: stop the analysis.
+            if not task.done():
+                task.cancel()
+            await admission.aclose()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/hackrx/run/{analysis_id}/quests", response_model=List[Quest])
+async def get_deferred_quests(analysis_id: str, response: Response, wait: float = 30.0):
+    """
+    Collects the quests of an analysis started with `defer_quests=true`.
+    Waits up to `wait` seconds; answers 202 if they are still being generated.
+    """
+    run = deferred_runs.get(analysis_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired analysis ID.")
+
+    try:
+        # shield() keeps a client disconnect from cancelling the shared task.
+        await asyncio.wait_for(asyncio.shield(run.tasks["quests"]), timeout=max(0.0, wait))
+    except asyncio.TimeoutError:
+        return JSONResponse(status_code=202, content={"detail": "Quests are still being generated."})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Quest generation failed: {e}")
+
+    _set_timing_headers(response, run)
+    _set_token_headers(response, run)
+    return run.result("quests")
+
+
+@router.get("/hackrx/run/{analysis_id}", response_model=AnalysisResult)
+async def get_refined_analysis(analysis_id: str, response: Response, wait: float = 30.0):
+    """
+    Collects the LLM result of an analysis started in `hybrid` mode (or with
+    `defer_quests=true`). Waits up to `wait` seconds; answers 202 while the
+    LLM is still working.
+    """
+    run = deferred_runs.get(analysis_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired analysis ID.")
+
+    try:
+        pending = asyncio.gather(run.tasks["profile"], run.tasks["quests"])
+        await asyncio.wait_for(asyncio.shield(pending), timeout=max(0.0, wait))
+    except asyncio.TimeoutError:
+        return JSONResponse(status_code=202, content={"detail": "The LLM analysis is still running."})
     except ConnectionError as e:
         raise HTTPException(status_code=503, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred during analysis: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"LLM analysis failed: {e}")
+
+    _set_timing_headers(response, run)
+    _set_token_headers(response, run)
+    return AnalysisResult(
+        profile=run.result("profile"),
+        quests=run.result("quests"),
+        experiences=run.result("analyze").experiences,
+        source=run.context.get("source", "llm")
+    )
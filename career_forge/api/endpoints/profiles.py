@@ -0,0 +1,107 @@
+# career_forge/api/endpoints/profiles.py
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+
+from career_forge.api.admin import require_admin
+from career_forge.engine.profile_store import ProfileStore, UnknownUser, get_profile_store
+from career_forge.gamification.progression import RANKS, XPAward
+from career_forge.schemas.user import CompletedQuests, Leaderboard, StoredProfile, XPAwardBatch
+
+router = APIRouter()
+
+# Plain `def` endpoints: FastAPI runs them on a thread, so the SQLite calls
+# don't hold up the event loop.
+
+
+def _require_store(profiles: Optional[ProfileStore]) -> ProfileStore:
+    if profiles is None:
+        raise HTTPException(status_code=404, detail="The profile store is disabled.")
+    return profiles
+
+
+def _require_profile(profiles: ProfileStore, user_id: str) -> StoredProfile:
+    stored = profiles.get(user_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"No profile for user '{user_id}'.")
+    return stored
+
+
+@router.get("/profiles/{user_id}", response_model=StoredProfile)
+def get_profile(user_id: str, profiles: Optional[ProfileStore] = Depends(get_profile_store)):
+    """
+    The stored profile for the dashboard: skills with their levels, the XP
+    earned so far and every experience from the uploaded resumes. Created by
+    `POST /hackrx/run?user_id=...`.
+    """
+    return _require_profile(_require_store(profiles), user_id)
+
+
+@router.delete("/profiles/{user_id}")
+def delete_profile(user_id: str, profiles: Optional[ProfileStore] = Depends(get_profile_store)):
+    """Deletes the profile and all its progress."""
+    return {"deleted": _require_store(profiles).delete(user_id)}
+
+
+@router.get("/profiles/{user_id}/position")
+def get_position(user_id: str, profiles: Optional[ProfileStore] = Depends(get_profile_store)):
+    """The user's place on the overall leaderboard and on their rank's."""
+    store = _require_store(profiles)
+    try:
+        return {"position": store.position(user_id), "rank_position": store.position(user_id, within_rank=True)}
+    except UnknownUser:
+        raise HTTPException(status_code=404, detail=f"No profile for user '{user_id}'.")
+
+
+@router.post("/profiles/{user_id}/quests/completed", response_model=StoredProfile)
+def complete_quests(user_id: str, completed: CompletedQuests, response: Response,
+                    profiles: Optional[ProfileStore] = Depends(get_profile_store)):
+    """
+    Applies the XP rewards ('+50 XP Python') of the quests the user finished
+    and returns the updated profile. Other rewards are ignored.
+
+    Only quests issued to the user by `POST /hackrx/run?user_id=...` count,
+    each one once, with the rewards it was issued with; the others award
+    nothing. `X-Quests-Completed` is the number of quests that counted.
+    """
+    store = _require_store(profiles)
+    _require_profile(store, user_id)
+    response.headers["X-Quests-Completed"] = str(len(store.complete_quests(user_id, completed.quests)))
+    return _require_profile(store, user_id)
+
+
+@router.post("/profiles/xp", dependencies=[Depends(require_admin)])
+def award_xp(batch: XPAwardBatch, profiles: Optional[ProfileStore] = Depends(get_profile_store)):
+    """
+    Applies many XP awards, for any number of users, in one transaction.
+    Returns the XP applied per user and the users that have no profile.
+    Admin only: it bypasses the check that quests were issued.
+    """
+    awards = [XPAward(a.user_id, a.skill, a.xp, a.category) for a in batch.awards]
+    applied = _require_store(profiles).award(awards)
+    unknown = sorted({award.user_id for award in awards} - set(applied))
+    return {"applied": applied, "unknown_users": unknown}
+
+
+@router.get("/leaderboard", response_model=Leaderboard)
+def get_leaderboard(
+    rank: Optional[str] = Query(default=None, description="Only profiles of this rank (E, D, C, B, A, S)."),
+    limit: int = Query(default=50, ge=1, le=500),
+    after: Optional[str] = Query(default=None, description="`next_cursor` of the previous page."),
+    profiles: Optional[ProfileStore] = Depends(get_profile_store),
+):
+    """Profiles by rank, then level, then XP; page with `after`."""
+    if rank is not None and rank.upper() not in RANKS:
+        raise HTTPException(status_code=400, detail=f"Unknown rank: {rank}. Use one of {', '.join(RANKS)}.")
+    try:
+        return _require_store(profiles).leaderboard(rank.upper() if rank else None, limit, after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/leaderboard/skills/{skill}")
+def get_skill_leaderboard(skill: str, limit: int = Query(default=50, ge=1, le=500),
+                          profiles: Optional[ProfileStore] = Depends(get_profile_store)):
+    """The users with a skill (any spelling case), most XP in it first."""
+    return _require_store(profiles).skill_leaderboard(skill, limit)
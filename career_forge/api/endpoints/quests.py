@@ -0,0 +1,38 @@
+# career_forge/api/endpoints/quests.py
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+
+from career_forge.gamification.quest_catalog import QuestCatalog, get_quest_catalog
+
+router = APIRouter()
+
+
+def _require_catalog(catalog: Optional[QuestCatalog]) -> QuestCatalog:
+    if catalog is None:
+        raise HTTPException(status_code=404, detail="The quest catalog is disabled.")
+    return catalog
+
+
+@router.get("/quests/catalog/stats")
+def get_catalog_stats(catalog: Optional[QuestCatalog] = Depends(get_quest_catalog)):
+    """
+    Entries, lookups, hits and hit rate, and the estimated LLM time saved
+    (hits times the recent average duration of an LLM quest call).
+    """
+    return _require_catalog(catalog).stats()
+
+
+@router.get("/quests/catalog")
+def browse_catalog(category: str, limit: int = Query(default=20, ge=1, le=200),
+                   catalog: Optional[QuestCatalog] = Depends(get_quest_catalog)):
+    """The most reused quest sets with quests in a category (e.g. TechnicalSkills)."""
+    return _require_catalog(catalog).by_category(category, limit)
+
+
+@router.delete("/quests/catalog")
+def clear_catalog(catalog: Optional[QuestCatalog] = Depends(get_quest_catalog)):
+    """Empties the quest catalog, e.g. after a prompt change."""
+    _require_catalog(catalog).clear()
+    return {"cleared": True}
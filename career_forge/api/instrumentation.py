@@ -0,0 +1,84 @@
+# career_forge/api/instrumentation.py
+
+import logging
+import time
+
+from starlette.routing import Mount
+
+from career_forge.engine import metrics
+from career_forge.engine.logs import new_request_id, request_id
+
+logger = logging.getLogger("career_forge.access")
+
+
+def _route_label(scope) -> str:
+    # The route template (/api/v1/hackrx/run/{analysis_id}), never the raw
+    # path, so IDs in URLs don't create a time series each.
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    if isinstance(route, Mount):
+        return "static"
+    return getattr(route, "path", "unmatched")
+
+
+class RequestInstrumentation:
+    """
+    ASGI middleware around every HTTP request:
+
+    - assigns the request ID (from `X-Request-ID`, else a new one), returns
+      it in the `X-Request-ID` response header and puts it on every log line
+      of the request;
+    - counts requests by route and status, times them up to the end of the
+      response body (streams included) and tracks how many are in flight;
+    - logs one access line per request when CAREER_FORGE_ACCESS_LOG is on.
+
+    Plain ASGI rather than `BaseHTTPMiddleware`, which would buffer
+    streamed responses and cost an extra task per request.
+    """
+
+    def __init__(self, app, access_log: bool = True):
+        self.app = app
+        self.access_log = access_log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope.get("headers", ()):
+            if name == b"x-request-id":
+                incoming = value.decode("latin-1")
+                break
+        current = new_request_id(incoming)
+        token = request_id.set(current)
+        status = 500
+        started = time.perf_counter()
+        metrics.HTTP_IN_FLIGHT.inc()
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", current.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        except BaseException as e:
+            metrics.record_error("http", e)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.HTTP_IN_FLIGHT.dec()
+            method, route = scope["method"], _route_label(scope)
+            metrics.HTTP_REQUESTS.labels(method, route, status).inc()
+            metrics.HTTP_DURATION.labels(method, route).observe(elapsed)
+            if self.access_log:
+                logger.info("%s %s %s", method, scope["path"], status, extra={
+                    "method": method, "route": route, "path": scope["path"], "status": status,
+                    "duration_ms": round(elapsed * 1000, 1),
+                })
+            request_id.reset(token)
@@ -1,9 +1,48 @@
 # career_forge/api/main.py
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.staticfiles import StaticFiles # <-- NEW IMPORT
-from .endpoints import profile
-import os
+from .endpoints import profile, profiles, quests, batch, jobs, cache, llm, health, metrics
+from .instrumentation import RequestInstrumentation
+from career_forge.config import get_settings
+from career_forge.engine.executor import shutdown_executor
+from career_forge.engine.logs import configure_logging
+from career_forge.engine.resources import registry
+# Imported for its side effect: it registers the skill matcher for warm-up.
+from career_forge.engine import feature_extractor  # noqa: F401
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifecycle.
+
+    Nothing heavy is loaded at import time, so the server binds its port right
+    away. Warm-up then loads the models in a background thread, and /readyz
+    reports 200 once it is done. The executor's worker pools are created
+    lazily on the first request and torn down here when the server stops.
+    The background job workers run for the lifetime of the app.
+    """
+    settings = get_settings()
+    if settings.job_workers > 0:
+        jobs.get_job_queue().start()
+    if settings.warmup:
+        warmup = asyncio.create_task(asyncio.to_thread(registry.warm_up))
+    else:
+        registry.lazy = True
+        warmup = None
+    yield
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    await jobs.shutdown_job_queue()
+    shutdown_executor()
+
+
+# JSON logs with request IDs (see career_forge/engine/logs.py).
+configure_logging()
 
 # Initialize the main FastAPI application
 app = FastAPI(
@@ -12,12 +51,24 @@ app = FastAPI(
     version="1.0.0",
     # Hide the default /docs and /redoc URLs from the public
     docs_url=None, 
-    redoc_url=None
+    redoc_url=None,
+    lifespan=lifespan
 )
 
+# Request IDs, per-route metrics and the access log for every request.
+app.add_middleware(RequestInstrumentation, access_log=get_settings().access_log)
+
 # --- KEY CHANGE IS HERE ---
 # First, we define our API routes. They must come before the static files mount.
 app.include_router(profile.router, prefix="/api/v1", tags=["Analysis"])
+app.include_router(profiles.router, prefix="/api/v1", tags=["Profiles"])
+app.include_router(quests.router, prefix="/api/v1", tags=["Quests"])
+app.include_router(batch.router, prefix="/api/v1", tags=["Batch"])
+app.include_router(jobs.router, prefix="/api/v1", tags=["Jobs"])
+app.include_router(cache.router, prefix="/api/v1", tags=["Cache"])
+app.include_router(llm.router, prefix="/api/v1", tags=["LLM"])
+app.include_router(health.router, tags=["Health"])
+app.include_router(metrics.router, tags=["Health"])
 
 # Second, we mount the 'public' directory to the root path.
 # This tells FastAPI to serve files like index.html, style.css, and script.js.
@@ -0,0 +1,106 @@
+# career_forge/batch.py
+
+"""
+Analyzes every resume in a directory (PDF, DOCX, and the PDF/DOCX files
+inside ZIP archives) and writes one JSON record per resume to an NDJSON file.
+
+Usage:
+    python -m career_forge.batch resumes/ -o results.ndjson --mode llm
+
+Records are appended as soon as each resume is done. If the run stops for
+any reason, running the same command again skips the resumes that already
+have a result and retries the ones whose LLM calls failed.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from career_forge.config import get_settings
+from career_forge.engine.batch import BatchRunner, NDJSONResults, iter_directory_documents, iter_zip_documents
+from career_forge.engine.cache import get_analysis_cache
+from career_forge.engine.executor import PipelineExecutor
+from career_forge.engine.local_analyzer import AnalysisMode, default_analysis_mode
+from career_forge.engine.logs import configure_logging
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    settings = get_settings()
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m career_forge.batch", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    arg_parser.add_argument("input", help="A directory of resumes, or a ZIP archive.")
+    arg_parser.add_argument("-o", "--output", default="results.ndjson", help="NDJSON file to append results to.")
+    arg_parser.add_argument("--mode", choices=[m.value for m in AnalysisMode], default=None,
+                            help="Analyzer to use (default: CAREER_FORGE_ANALYSIS_MODE).")
+    arg_parser.add_argument("--parse-workers", type=int, default=settings.parse_workers,
+                            help="Worker processes for text extraction and spaCy.")
+    arg_parser.add_argument("--concurrency", type=int, default=settings.batch_llm_concurrency,
+                            help="Concurrent LLM calls.")
+    arg_parser.add_argument("--rate", type=float, default=settings.batch_rate_limit,
+                            help="LLM calls per second (0 = unlimited).")
+    arg_parser.add_argument("--batch-size", type=int, default=settings.batch_parse_size,
+                            help="Documents per parse task.")
+    arg_parser.add_argument("--restart", action="store_true", help="Discard existing results and start over.")
+    return arg_parser
+
+
+async def run(args) -> dict:
+    mode = AnalysisMode(args.mode) if args.mode else default_analysis_mode()
+    max_bytes = get_settings().max_upload_bytes
+    if os.path.isdir(args.input):
+        documents = iter_directory_documents(args.input, max_bytes)
+    else:
+        documents = iter_zip_documents(args.input, os.path.basename(args.input), max_bytes)
+
+    executor = PipelineExecutor(
+        parse_workers=args.parse_workers,
+        llm_workers=args.concurrency,
+        max_in_flight=1,
+        max_pending=0,
+        queue_timeout=0,
+    )
+    runner = BatchRunner(
+        executor, mode, get_analysis_cache(),
+        llm_concurrency=args.concurrency,
+        rate_limit=args.rate,
+        parse_batch_size=args.batch_size,
+    )
+    results = NDJSONResults(args.output, restart=args.restart)
+    if results.completed:
+        print(f"Resuming: {len(results.completed)} resumes already done.", file=sys.stderr)
+
+    started = time.monotonic()
+    done = 0
+
+    async def emit(entry: dict) -> None:
+        nonlocal done
+        await results.write(entry)
+        done += 1
+        if done % 25 == 0:
+            rate = done / max(1e-9, time.monotonic() - started)
+            print(f"{done} resumes processed ({rate:.1f}/s) {runner.counts}", file=sys.stderr)
+
+    try:
+        return await runner.run(documents, emit, skip=results.completed)
+    finally:
+        results.close()
+        executor.shutdown()
+
+
+def main(argv=None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    configure_logging()
+    if not os.path.exists(args.input):
+        print(f"No such file or directory: {args.input}", file=sys.stderr)
+        return 2
+    counts = asyncio.run(run(args))
+    print(f"Done: {counts}", file=sys.stderr)
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
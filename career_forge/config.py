@@ -0,0 +1,228 @@
+# career_forge/config.py
+
+import logging
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+# -----------------------------------------------------------------------------
+# Runtime settings
+# -----------------------------------------------------------------------------
+# Every knob is read from an environment variable prefixed with CAREER_FORGE_,
+# so deployments can tune the service without code changes. The defaults are
+# sized for a single Uvicorn worker on a small machine. A `.env` file in the
+# working directory is loaded once, the first time settings are read.
+#
+# Settings are read before logging is configured, so invalid values are
+# reported through the `logging` module's last-resort handler (stderr).
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Invalid integer for %s: %r. Falling back to %s.", name, value, default)
+        return default
+
+
+def _env_str(name: str, default: str) -> str:
+    value = os.environ.get(name)
+    return value.strip() if value and value.strip() else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("Invalid number for %s: %r. Falling back to %s.", name, value, default)
+        return default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    The tunable limits of the service. Build it with `get_settings()` so the
+    environment is only read once per process.
+    """
+    # --- Credentials ---
+    google_api_key: str = field(default_factory=lambda: _env_str("GOOGLE_API_KEY", ""))
+    # Bearer token of the admin endpoints (cache management, direct XP awards);
+    # empty disables them.
+    admin_token: str = field(default_factory=lambda: _env_str("CAREER_FORGE_ADMIN_TOKEN", ""))
+
+    # --- Start-up (see career_forge/engine/resources.py) ---
+    # Load models in the background right after start-up instead of on the first request.
+    warmup: bool = field(default_factory=lambda: _env_str("CAREER_FORGE_WARMUP", "true").lower() in ("1", "true", "yes"))
+
+    # --- Observability (see career_forge/engine/metrics.py and logs.py) ---
+    # Serve Prometheus metrics at GET /metrics.
+    metrics_enabled: bool = field(
+        default_factory=lambda: _env_str("CAREER_FORGE_METRICS", "true").lower() in ("1", "true", "yes"))
+    # DEBUG, INFO, WARNING or ERROR.
+    log_level: str = field(default_factory=lambda: _env_str("CAREER_FORGE_LOG_LEVEL", "INFO").upper())
+    # json (one object per line, with the request ID) or text.
+    log_format: str = field(default_factory=lambda: _env_str("CAREER_FORGE_LOG_FORMAT", "json").lower())
+    # Log one line per HTTP request (method, route, status, duration).
+    access_log: bool = field(
+        default_factory=lambda: _env_str("CAREER_FORGE_ACCESS_LOG", "true").lower() in ("1", "true", "yes"))
+
+    # --- Execution layer (see career_forge/engine/executor.py) ---
+    # Number of worker processes used for CPU-bound parsing (PDF + spaCy).
+    parse_workers: int = field(default_factory=lambda: _env_int(
+        "CAREER_FORGE_PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+    # Number of threads available for blocking LLM calls.
+    llm_workers: int = field(default_factory=lambda: _env_int("CAREER_FORGE_LLM_WORKERS", 16))
+    # How many analyses may run at the same time.
+    max_in_flight: int = field(default_factory=lambda: _env_int("CAREER_FORGE_MAX_IN_FLIGHT", 8))
+    # How many extra requests may wait for a free slot before we answer 429.
+    max_pending: int = field(default_factory=lambda: _env_int("CAREER_FORGE_MAX_PENDING", 16))
+    # How long (seconds) a waiting request may queue before we answer 503.
+    queue_timeout: float = field(default_factory=lambda: _env_float("CAREER_FORGE_QUEUE_TIMEOUT", 10.0))
+
+    # --- Document extraction (see career_forge/engine/extraction.py) ---
+    # Largest accepted upload; bigger files are rejected with 413 while streaming.
+    max_upload_bytes: int = field(default_factory=lambda: _env_int("CAREER_FORGE_MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+    # PDFs with more pages are rejected with 413 before any text is extracted.
+    max_pages: int = field(default_factory=lambda: _env_int("CAREER_FORGE_MAX_PAGES", 30))
+    # Seconds spent extracting one document; later pages are dropped.
+    extraction_time_budget: float = field(default_factory=lambda: _env_float("CAREER_FORGE_EXTRACTION_TIME_BUDGET", 10.0))
+    # A PDF whose first N pages have no text is rejected as scanned; 0 disables the check.
+    scan_probe_pages: int = field(default_factory=lambda: _env_int("CAREER_FORGE_SCAN_PROBE_PAGES", 2))
+    # Pages per worker task when a PDF is split across the parse pool.
+    pages_per_chunk: int = field(default_factory=lambda: _env_int("CAREER_FORGE_PAGES_PER_CHUNK", 4))
+
+    # --- Analysis mode (see career_forge/engine/local_analyzer.py) ---
+    # local, llm or hybrid; empty means llm when GOOGLE_API_KEY is set, else local.
+    analysis_mode: str = field(default_factory=lambda: _env_str("CAREER_FORGE_ANALYSIS_MODE", "").lower())
+
+    # --- Prompt size (see career_forge/engine/compaction.py) ---
+    # Estimated tokens of resume text sent to the analysis prompt; 0 only cleans the text.
+    llm_token_budget: int = field(default_factory=lambda: _env_int("CAREER_FORGE_LLM_TOKEN_BUDGET", 1500))
+
+    # --- LLM client (see career_forge/engine/llm_client.py and llm_providers.py) ---
+    # Who answers the prompts: gemini, openai (any OpenAI-compatible server), synthetic or replay.
+    llm_provider: str = field(default_factory=lambda: _env_str("CAREER_FORGE_LLM_PROVIDER", "gemini").lower())
+    # Model name sent to the provider; part of the analysis and quest cache keys.
+    llm_model: str = field(default_factory=lambda: _env_str("CAREER_FORGE_LLM_MODEL", "gemini-2.0-flash"))
+    # gemini: empty uses the SDK; a URL sends REST generateContent calls there instead
+    # (e.g. http://127.0.0.1:8089 for benchmarks/fake_llm_server.py).
+    # openai: the API base, e.g. https://api.openai.com/v1 or http://127.0.0.1:11434/v1.
+    llm_base_url: str = field(default_factory=lambda: _env_str("CAREER_FORGE_LLM_BASE_URL", ""))
+    # Bearer token for the openai provider.
+    llm_api_key: str = field(default_factory=lambda: _env_str("CAREER_FORGE_LLM_API_KEY", ""))
+    # JSON Lines file of recorded answers: written by any provider, read by replay. Empty disables.
+    llm_record_path: str = field(default_factory=lambda: _env_str("CAREER_FORGE_LLM_RECORD_PATH", ""))
+    # Replayed answers take as long as the recorded call did.
+    llm_replay_latency: bool = field(
+        default_factory=lambda: _env_str("CAREER_FORGE_LLM_REPLAY_LATENCY", "false").lower() in ("1", "true", "yes"))
+    # synthetic: latency distribution (e.g. constant:0.3, uniform:0.2,0.8, lognormal:0.8,0.35),
+    # share of calls failing with a retryable 503, and the random seed.
+    llm_synthetic_latency: str = field(
+        default_factory=lambda: _env_str("CAREER_FORGE_LLM_SYNTHETIC_LATENCY", "lognormal:0.8,0.35"))
+    llm_synthetic_error_rate: float = field(
+        default_factory=lambda: _env_float("CAREER_FORGE_LLM_SYNTHETIC_ERROR_RATE", 0.0))
+    llm_synthetic_seed: int = field(default_factory=lambda: _env_int("CAREER_FORGE_LLM_SYNTHETIC_SEED", 0))
+    # Seconds one LLM call may take, retries and rate-limit waits included.
+    llm_timeout: float = field(default_factory=lambda: _env_float("CAREER_FORGE_LLM_TIMEOUT", 30.0))
+    # Retries after a 429, a 5xx or a network error, with jittered exponential backoff.
+    llm_max_retries: int = field(default_factory=lambda: _env_int("CAREER_FORGE_LLM_MAX_RETRIES", 3))
+    # Requests and (estimated) tokens per minute sent to the LLM by this process; 0 disables.
+    llm_rpm: float = field(default_factory=lambda: _env_float("CAREER_FORGE_LLM_RPM", 120))
+    llm_tpm: float = field(default_factory=lambda: _env_float("CAREER_FORGE_LLM_TPM", 1_000_000))
+    # Send a second, identical request when the first takes longer than this (seconds); 0 disables.
+    llm_hedge_after: float = field(default_factory=lambda: _env_float("CAREER_FORGE_LLM_HEDGE_AFTER", 0.0))
+    # Failed attempts in a row that open the circuit breaker (0 disables it), and seconds it stays open.
+    llm_breaker_threshold: int = field(default_factory=lambda: _env_int("CAREER_FORGE_LLM_BREAKER_THRESHOLD", 5))
+    llm_breaker_reset: float = field(default_factory=lambda: _env_float("CAREER_FORGE_LLM_BREAKER_RESET", 30.0))
+    # Ask for the analysis and the quests in one schema-constrained call instead of two in series
+    # (see career_forge/engine/combined_analyzer.py).
+    llm_single_call: bool = field(
+        default_factory=lambda: _env_str("CAREER_FORGE_LLM_SINGLE_CALL", "true").lower() in ("1", "true", "yes"))
+    # Answer with the rule-based analysis when the LLM is unavailable instead of failing with 503.
+    llm_fallback: bool = field(
+        default_factory=lambda: _env_str("CAREER_FORGE_LLM_FALLBACK", "true").lower() in ("1", "true", "yes"))
+
+    # --- Batch analysis (see career_forge/engine/batch.py) ---
+    # Concurrent LLM calls per batch.
+    batch_llm_concurrency: int = field(default_factory=lambda: _env_int("CAREER_FORGE_BATCH_LLM_CONCURRENCY", 4))
+    # LLM calls per second per batch (the analysis and quests calls both count); 0 disables the limit.
+    batch_rate_limit: float = field(default_factory=lambda: _env_float("CAREER_FORGE_BATCH_RATE_LIMIT", 1.0))
+    # Documents sent to a parse worker (and through nlp.pipe) together.
+    batch_parse_size: int = field(default_factory=lambda: _env_int("CAREER_FORGE_BATCH_PARSE_SIZE", 8))
+    # Largest accepted upload (e.g. a ZIP archive) for the batch endpoint.
+    batch_max_upload_bytes: int = field(
+        default_factory=lambda: _env_int("CAREER_FORGE_BATCH_MAX_UPLOAD_BYTES", 500 * 1024 * 1024))
+
+    # --- Background jobs (see career_forge/engine/jobs.py) ---
+    # Jobs analyzed at the same time by this process; 0 accepts jobs but never runs them.
+    job_workers: int = field(default_factory=lambda: _env_int("CAREER_FORGE_JOB_WORKERS", 2))
+    # SQLite file holding the queue; processes on one host can share it.
+    job_store_path: str = field(default_factory=lambda: _env_str("CAREER_FORGE_JOB_STORE_PATH", ".cache/jobs.sqlite3"))
+    # Where uploads wait until their job runs.
+    job_upload_dir: str = field(default_factory=lambda: _env_str("CAREER_FORGE_JOB_UPLOAD_DIR", ".cache/job-uploads"))
+    # Queued jobs allowed before POST /jobs answers 429.
+    job_max_queued: int = field(default_factory=lambda: _env_int("CAREER_FORGE_JOB_MAX_QUEUED", 1000))
+    # Seconds one attempt may run before it is failed.
+    job_timeout: float = field(default_factory=lambda: _env_float("CAREER_FORGE_JOB_TIMEOUT", 300.0))
+    # Attempts per job; transient errors and crashed workers use up one each.
+    job_max_attempts: int = field(default_factory=lambda: _env_int("CAREER_FORGE_JOB_MAX_ATTEMPTS", 3))
+    # Seconds finished jobs (and their results) are kept.
+    job_ttl: float = field(default_factory=lambda: _env_float("CAREER_FORGE_JOB_TTL", 24 * 3600))
+    # Comma-separated webhook hosts allowed even though they resolve to private,
+    # loopback or link-local addresses (e.g. a receiver inside the cluster).
+    webhook_allowed_hosts: str = field(
+        default_factory=lambda: _env_str("CAREER_FORGE_WEBHOOK_ALLOWED_HOSTS", "").lower())
+
+    # --- Analysis cache (see career_forge/engine/cache.py) ---
+    # One of: memory, sqlite, none.
+    cache_backend: str = field(default_factory=lambda: _env_str("CAREER_FORGE_CACHE_BACKEND", "memory").lower())
+    cache_path: str = field(default_factory=lambda: _env_str("CAREER_FORGE_CACHE_PATH", ".cache/analysis.sqlite3"))
+    # Seconds before a cached analysis expires (default: one week).
+    cache_ttl: float = field(default_factory=lambda: _env_float("CAREER_FORGE_CACHE_TTL", 7 * 24 * 3600))
+    # Maximum entries kept by the in-memory backend.
+    cache_max_entries: int = field(default_factory=lambda: _env_int("CAREER_FORGE_CACHE_MAX_ENTRIES", 1024))
+
+    # --- Profile store (see career_forge/engine/profile_store.py) ---
+    # sqlite or none (profiles are not kept and `user_id` is ignored).
+    profile_store: str = field(default_factory=lambda: _env_str("CAREER_FORGE_PROFILE_STORE", "sqlite").lower())
+    # Database file; ":memory:" keeps the profiles for the life of the process only.
+    profile_store_path: str = field(
+        default_factory=lambda: _env_str("CAREER_FORGE_PROFILE_STORE_PATH", ".cache/profiles.sqlite3"))
+
+    # --- Quest catalog (see career_forge/gamification/quest_catalog.py) ---
+    # Reuse generated quests for profiles with similar skills instead of calling the LLM.
+    quest_catalog: bool = field(
+        default_factory=lambda: _env_str("CAREER_FORGE_QUEST_CATALOG", "true").lower() in ("1", "true", "yes"))
+    quest_catalog_path: str = field(
+        default_factory=lambda: _env_str("CAREER_FORGE_QUEST_CATALOG_PATH", ".cache/quests.sqlite3"))
+    # Skill-set Jaccard similarity from which a catalog entry's quests are reused.
+    quest_catalog_threshold: float = field(
+        default_factory=lambda: _env_float("CAREER_FORGE_QUEST_CATALOG_THRESHOLD", 0.6))
+    # Quest sets kept; once full, new ones are no longer added.
+    quest_catalog_max_entries: int = field(
+        default_factory=lambda: _env_int("CAREER_FORGE_QUEST_CATALOG_MAX_ENTRIES", 50000))
+
+    # --- Skill extraction (see career_forge/engine/taxonomy.py and skill_matcher.py) ---
+    # Taxonomy file; empty means the one shipped in career_forge/data.
+    skill_taxonomy_path: str = field(default_factory=lambda: _env_str("CAREER_FORGE_SKILL_TAXONOMY_PATH", ""))
+    # How often (seconds) to check the taxonomy file for changes; 0 disables hot reload.
+    skill_taxonomy_reload_interval: float = field(
+        default_factory=lambda: _env_float("CAREER_FORGE_SKILL_TAXONOMY_RELOAD_INTERVAL", 30.0))
+    # Optional file written by SkillMatcher.save(); skips tokenizing the patterns at startup.
+    skill_matcher_path: str = field(default_factory=lambda: _env_str("CAREER_FORGE_SKILL_MATCHER_PATH", ""))
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    load_dotenv()
+    return Settings()
@@ -0,0 +1,437 @@
+# career_forge/engine/batch.py
+
+import asyncio
+import json
+import os
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from career_forge.config import get_settings
+from career_forge.gamification.profile_generator import generate_profile_from_llm_analysis
+from career_forge.gamification.quest_generator import (
+    generate_quests_with_llm, generate_quests_locally, FALLBACK_QUEST
+)
+from career_forge.schemas.analysis import AnalysisResult
+from career_forge.schemas.quest import Quest
+from .cache import AnalysisCache, resume_digest
+from .combined_analyzer import analyze_resume_and_quests_with_llm
+from .compaction import compact_resume
+from .executor import PipelineExecutor
+from .extraction import DOCX_CONTENT_TYPE, PDF_CONTENT_TYPE, ExtractionLimits, Source
+from .llm_analyzer import LLMAnalysis, analyze_resume_with_llm
+from .local_analyzer import AnalysisMode, analyze_parsed_resume
+from .parser import ParsedResume, extract_text, get_nlp
+
+# -----------------------------------------------------------------------------
+# Bulk analysis
+# -----------------------------------------------------------------------------
+# Documents stream through three bounded stages, so memory stays flat no
+# matter how many resumes a batch has:
+#
+#   producer --(parse queue)--> parse workers --(LLM queue)--> LLM workers
+#                                      |                            |
+#                                      +------------> emit <--------+
+#
+# - Parse workers take documents in small batches and send each batch to the
+#   process pool in one call, where the texts go through `nlp.pipe` together.
+# - LLM workers call Gemini concurrently, but never faster than the rate limit.
+# - Every finished document is emitted as one JSON record right away.
+
+SUPPORTED_EXTENSIONS = {".pdf": PDF_CONTENT_TYPE, ".docx": DOCX_CONTENT_TYPE}
+
+
+@dataclass
+class BatchDocument:
+    doc_id: str
+    # A file path, or the bytes of a ZIP member.
+    source: Source
+    content_type: Optional[str]
+    # Set when the document was rejected before reading it.
+    error: Optional[str] = None
+
+
+@dataclass
+class PreparedDocument:
+    """The result of the CPU-bound part for one document (built in a worker process)."""
+    doc_id: str
+    digest: str = ""
+    compact_text: str = ""
+    local: Optional[LLMAnalysis] = None
+    error: Optional[str] = None
+
+
+# -----------------------------------------------------------------------------
+# 1. Finding documents
+# -----------------------------------------------------------------------------
+
+def content_type_for(name: str) -> Optional[str]:
+    return SUPPORTED_EXTENSIONS.get(Path(name).suffix.lower())
+
+
+def _is_junk(name: str) -> bool:
+    # Folders, macOS resource forks and hidden files that zip tools add.
+    parts = Path(name).parts
+    return name.endswith("/") or any(part.startswith(".") or part == "__MACOSX" for part in parts)
+
+
+def iter_zip_documents(path: str, prefix: str, max_bytes: int) -> Iterator[BatchDocument]:
+    """
+    Yields the members of a ZIP archive one at a time. A member is only
+    read when it is reached, and members larger than `max_bytes` once
+    uncompressed are reported instead of read.
+    """
+    with zipfile.ZipFile(path) as archive:
+        for member in archive.infolist():
+            if _is_junk(member.filename):
+                continue
+            doc_id = f"{prefix}/{member.filename}"
+            content_type = content_type_for(member.filename)
+            if content_type is None:
+                yield BatchDocument(doc_id, b"", None, "Unsupported file type. Please upload a PDF or DOCX.")
+            elif member.file_size > max_bytes:
+                yield BatchDocument(doc_id, b"", content_type, "The file is larger than the upload limit.")
+            else:
+                yield BatchDocument(doc_id, archive.read(member), content_type)
+
+
+def iter_directory_documents(root: str, max_bytes: int) -> Iterator[BatchDocument]:
+    """Yields every PDF, DOCX and ZIP member under `root`, in a stable order."""
+    root_path = Path(root)
+    for path in sorted(p for p in root_path.rglob("*") if p.is_file()):
+        doc_id = path.relative_to(root_path).as_posix()
+        if _is_junk(doc_id):
+            continue
+        if path.suffix.lower() == ".zip":
+            yield from iter_zip_documents(str(path), doc_id, max_bytes)
+        elif content_type_for(path.name):
+            yield BatchDocument(doc_id, str(path), content_type_for(path.name))
+
+
+# -----------------------------------------------------------------------------
+# 2. The CPU-bound part (runs in the process pool)
+# -----------------------------------------------------------------------------
+
+def prepare_documents(
+    documents: List[BatchDocument],
+    mode: AnalysisMode,
+    limits: ExtractionLimits,
+    token_budget: int,
+    nlp_batch_size: int = 32,
+) -> List[PreparedDocument]:
+    """
+    Extracts the text of every document, then, depending on the mode, runs
+    the whole batch through `nlp.pipe` for the local analysis and compacts
+    the texts for the LLM prompt. Failures are recorded per document.
+    """
+    prepared: List[PreparedDocument] = []
+    texts: List[str] = []
+    for document in documents:
+        item = PreparedDocument(document.doc_id)
+        prepared.append(item)
+        if document.error:
+            item.error = document.error
+        else:
+            try:
+                text = extract_text(document.source, document.content_type, limits)
+                if not text:
+                    item.error = "Failed to extract text from the document."
+            except Exception as e:
+                item.error = str(e)
+        texts.append("" if item.error else text)
+
+    usable = [(item, text) for item, text in zip(prepared, texts) if not item.error]
+    for item, text in usable:
+        item.digest = resume_digest(text)
+
+    if mode != AnalysisMode.LLM and usable:
+        nlp = get_nlp()
+        if nlp is not None:
+            docs = nlp.pipe((text for _, text in usable), batch_size=nlp_batch_size)
+            for (item, text), doc in zip(usable, docs):
+                try:
+                    item.local = analyze_parsed_resume(ParsedResume(raw_text=text, doc=doc))
+                except Exception as e:
+                    if mode == AnalysisMode.LOCAL:
+                        item.error = f"Local analysis failed: {e}"
+        elif mode == AnalysisMode.LOCAL:
+            for item, _ in usable:
+                item.error = "The spaCy model is not installed; local analysis is unavailable."
+
+    if mode != AnalysisMode.LOCAL:
+        for item, text in usable:
+            item.compact_text = compact_resume(text, token_budget).text
+    return prepared
+
+
+# -----------------------------------------------------------------------------
+# 3. Rate limiting
+# -----------------------------------------------------------------------------
+
+class RateLimiter:
+    """
+    An asyncio token bucket: on average at most `rate` acquisitions per
+    second, with bursts of up to `burst`. A rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# -----------------------------------------------------------------------------
+# 4. The runner
+# -----------------------------------------------------------------------------
+
+Emit = Callable[[dict], Awaitable[None]]
+
+
+class BatchRunner:
+    """
+    Analyzes a stream of documents and emits one record per document:
+
+        {"id": ..., "status": "ok", "cache": "hit|miss|bypass", "result": AnalysisResult}
+        {"id": ..., "status": "error", "error": ...}    # the document itself is bad
+        {"id": ..., "status": "failed", "error": ...}   # transient (LLM); retried on resume
+
+    Records are emitted in completion order, not input order.
+    """
+
+    def __init__(
+        self,
+        executor: PipelineExecutor,
+        mode: AnalysisMode,
+        cache: Optional[AnalysisCache] = None,
+        llm_concurrency: int = 4,
+        rate_limit: float = 1.0,
+        parse_batch_size: int = 8,
+        queue_size: int = 64,
+    ):
+        self.executor = executor
+        self.mode = mode
+        self.cache = cache
+        self.llm_concurrency = max(1, llm_concurrency)
+        self.limiter = RateLimiter(rate_limit, burst=self.llm_concurrency)
+        self.parse_batch_size = max(1, parse_batch_size)
+        self.queue_size = max(1, queue_size)
+        self.limits = ExtractionLimits.from_settings()
+        self.token_budget = get_settings().llm_token_budget
+        self.single_call = get_settings().llm_single_call
+        self.counts: Dict[str, int] = {"ok": 0, "error": 0, "failed": 0, "skipped": 0}
+
+    @classmethod
+    def from_settings(cls, executor: PipelineExecutor, mode: AnalysisMode,
+                      cache: Optional[AnalysisCache] = None) -> "BatchRunner":
+        settings = get_settings()
+        return cls(
+            executor, mode, cache,
+            llm_concurrency=settings.batch_llm_concurrency,
+            rate_limit=settings.batch_rate_limit,
+            parse_batch_size=settings.batch_parse_size,
+        )
+
+    async def run(self, documents: Iterable[BatchDocument], emit: Emit,
+                  skip: Optional[Set[str]] = None) -> Dict[str, int]:
+        """Processes every document not in `skip` and returns the status counts."""
+        skip = skip or set()
+        parse_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        llm_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        parse_workers = max(1, self.executor.parse_workers)
+
+        async def record(entry: dict) -> None:
+            self.counts[entry["status"]] += 1
+            await emit(entry)
+
+        async def produce():
+            iterator = iter(documents)
+            while True:
+                # Listing a directory or reading a ZIP member blocks, so do it off the loop.
+                document = await asyncio.to_thread(next, iterator, None)
+                if document is None:
+                    break
+                if document.doc_id in skip:
+                    self.counts["skipped"] += 1
+                    continue
+                await parse_queue.put(document)
+            for _ in range(parse_workers):
+                await parse_queue.put(None)
+
+        async def parse_worker():
+            done = False
+            while not done:
+                batch = []
+                document = await parse_queue.get()
+                while document is not None:
+                    batch.append(document)
+                    if len(batch) >= self.parse_batch_size or parse_queue.empty():
+                        break
+                    document = parse_queue.get_nowait()
+                done = document is None
+                if batch:
+                    await self._prepare(batch, record, llm_queue)
+
+        async def llm_worker():
+            while (item := await llm_queue.get()) is not None:
+                await self._analyze(item, record)
+
+        producer = asyncio.create_task(produce())
+        parsers = [asyncio.create_task(parse_worker()) for _ in range(parse_workers)]
+        llm_workers = [asyncio.create_task(llm_worker()) for _ in range(self.llm_concurrency)]
+        try:
+            await asyncio.gather(producer, *parsers)
+            for _ in llm_workers:
+                await llm_queue.put(None)
+            await asyncio.gather(*llm_workers)
+        finally:
+            for task in (producer, *parsers, *llm_workers):
+                task.cancel()
+        return dict(self.counts)
+
+    # --- Stages ---
+
+    async def _prepare(self, batch: List[BatchDocument], record, llm_queue: asyncio.Queue) -> None:
+        try:
+            prepared = await self.executor.run_cpu(
+                prepare_documents, batch, self.mode, self.limits, self.token_budget
+            )
+        except Exception as e:
+            for document in batch:
+                await record({"id": document.doc_id, "status": "failed", "error": f"Parsing failed: {e}"})
+            return
+
+        for item in prepared:
+            if item.error:
+                await record({"id": item.doc_id, "status": "error", "error": item.error})
+            elif self.mode == AnalysisMode.LOCAL:
+                await record(self._result(item, item.local, generate_quests_locally(item.local), "local", "bypass"))
+            else:
+                await llm_queue.put(item)
+
+    async def _analyze(self, item: PreparedDocument, record) -> None:
+        cache_status = "miss"
+        # Only filled by a single-call analysis.
+        quests: List[Quest] = []
+        try:
+            # On the I/O threads: with the SQLite backend these are disk reads and commits.
+            analysis = await self.executor.run_io(self.cache.get_analysis, item.digest) if self.cache else None
+            if analysis is not None:
+                cache_status = "hit"
+            else:
+                await self.limiter.acquire()
+                if self.single_call:
+                    analysis, quests = await self.executor.run_io(
+                        analyze_resume_and_quests_with_llm, item.compact_text
+                    ) or (None, [])
+                else:
+                    analysis = await self.executor.run_io(analyze_resume_with_llm, item.compact_text)
+                if not analysis:
+                    raise ValueError("Failed to get a valid analysis from the LLM.")
+                if self.cache:
+                    await self.executor.run_io(self.cache.set_analysis, item.digest, analysis)
+                    if quests:
+                        await self.executor.run_io(self.cache.set_quests, item.digest, quests)
+
+            if not quests and self.cache:
+                quests = await self.executor.run_io(self.cache.get_quests, item.digest)
+            if not quests:
+                await self.limiter.acquire()
+                quests = await self.executor.run_io(generate_quests_with_llm, analysis)
+                if quests == [FALLBACK_QUEST] and get_settings().llm_fallback:
+                    # The LLM failed; template quests beat the generic placeholder.
+                    quests = generate_quests_locally(analysis)
+                elif self.cache and quests and quests != [FALLBACK_QUEST]:
+                    await self.executor.run_io(self.cache.set_quests, item.digest, quests)
+        except Exception as e:
+            if self.mode == AnalysisMode.HYBRID and item.local is not None:
+                # The LLM is unavailable; the rule-based analysis is better than nothing.
+                await record(self._result(item, item.local, generate_quests_locally(item.local), "local", "bypass"))
+            else:
+                await record({"id": item.doc_id, "status": "failed", "error": str(e)})
+            return
+        await record(self._result(item, analysis, quests, "llm", cache_status))
+
+    @staticmethod
+    def _result(item: PreparedDocument, analysis: LLMAnalysis, quests, source: str, cache_status: str) -> dict:
+        result = AnalysisResult(
+            profile=generate_profile_from_llm_analysis(analysis),
+            quests=quests,
+            experiences=analysis.experiences,
+            source=source,
+        )
+        return {
+            "id": item.doc_id,
+            "status": "ok",
+            "resume_digest": item.digest,
+            "cache": cache_status,
+            "result": result.model_dump(),
+        }
+
+
+# -----------------------------------------------------------------------------
+# 5. NDJSON output that survives crashes
+# -----------------------------------------------------------------------------
+
+class NDJSONResults:
+    """
+    Appends one record per line and flushes after every record, so a crash
+    loses at most the line being written. On open, a torn last line is cut
+    off and the IDs that are already finished ('ok' or 'error') are
+    collected so the run can skip them. 'failed' documents are retried;
+    readers should keep the last record per ID.
+    """
+
+    def __init__(self, path: str, restart: bool = False):
+        self.path = path
+        self.completed: Set[str] = set()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if restart and os.path.exists(path):
+            os.unlink(path)
+        if os.path.exists(path):
+            self._recover()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _recover(self) -> None:
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+                if entry.get("status") in ("ok", "error"):
+                    self.completed.add(entry["id"])
+                else:
+                    self.completed.discard(entry.get("id"))
+        with open(self.path, "r+b") as f:
+            f.truncate(valid_bytes)
+
+    async def write(self, entry: dict) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
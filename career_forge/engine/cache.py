@@ -0,0 +1,281 @@
+# career_forge/engine/cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from career_forge.config import get_settings
+from career_forge.engine import combined_analyzer, llm_analyzer, metrics
+from career_forge.engine.llm_analyzer import LLMAnalysis
+from career_forge.engine.llm_client import get_llm_client
+from career_forge.gamification import quest_generator
+from career_forge.schemas.quest import Quest
+
+# -----------------------------------------------------------------------------
+# 1. Storage backends
+# -----------------------------------------------------------------------------
+# Backends only store strings. Every entry also remembers the digest of the
+# resume text it belongs to, so all entries of one resume can be dropped at once.
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: str, resume_digest: str, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete_resume(self, resume_digest: str) -> int:
+        """Removes every entry that belongs to a resume. Returns how many were removed."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryLRUBackend(CacheBackend):
+    """An in-process LRU with per-entry expiry. Lost on restart."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, _, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, resume_digest: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, resume_digest, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_resume(self, resume_digest: str) -> int:
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry[1] == resume_digest]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend(CacheBackend):
+    """An on-disk store that survives restarts and can be shared by workers on one host."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " resume_digest TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_resume ON cache (resume_digest)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return row[0]
+
+    def set(self, key: str, value: str, resume_digest: str, ttl: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, resume_digest, expires_at) VALUES (?, ?, ?, ?)",
+                (key, value, resume_digest, time.time() + ttl),
+            )
+            self._conn.commit()
+
+    def delete_resume(self, resume_digest: str) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache WHERE resume_digest = ?", (resume_digest,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+# -----------------------------------------------------------------------------
+# 2. The analysis cache
+# -----------------------------------------------------------------------------
+
+def normalize_resume_text(raw_text: str) -> str:
+    """Collapses Unicode variants and whitespace so trivial re-exports hash the same."""
+    return " ".join(unicodedata.normalize("NFKC", raw_text).split())
+
+
+def resume_digest(raw_text: str) -> str:
+    return hashlib.sha256(normalize_resume_text(raw_text).encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache for the two LLM stages.
+
+    Entries are keyed by the digest of the normalized resume text plus the
+    prompt version and provider/model of the stage, so changing a prompt or a
+    model never serves stale results. Analyses are also keyed by the token
+    budget: the LLM only saw the part of the resume that fit into it. In
+    single-call mode both keys carry the combined prompt's version too. A
+    byte-for-byte re-upload is also remembered, which lets a hit skip the
+    parse step as well.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    # --- Keys and counters ---
+
+    @staticmethod
+    def _key(namespace: str, digest: str, prompt_version: str = "", model_name: str = "") -> str:
+        return hashlib.sha256(f"{namespace}|{model_name}|{prompt_version}|{digest}".encode("utf-8")).hexdigest()
+
+    def _count(self, namespace: str, hit: bool) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(namespace, {"hits": 0, "misses": 0})
+            counters["hits" if hit else "misses"] += 1
+        metrics.CACHE_LOOKUPS.labels(namespace, "hit" if hit else "miss").inc()
+
+    def _get(self, namespace: str, key: str) -> Optional[str]:
+        value = self.backend.get(key)
+        self._count(namespace, value is not None)
+        return value
+
+    # --- Uploads (SHA-256 of the file bytes -> resume digest) ---
+
+    def lookup_upload(self, upload_sha256: str) -> Optional[str]:
+        return self._get("upload", self._key("upload", upload_sha256))
+
+    def remember_upload(self, upload_sha256: str, digest: str) -> None:
+        self.backend.set(self._key("upload", upload_sha256), digest, digest, self.ttl)
+
+    @staticmethod
+    def _prompt(prompt_version: str) -> str:
+        # With CAREER_FORGE_LLM_SINGLE_CALL the answers come from another prompt.
+        if get_settings().llm_single_call:
+            return f"{prompt_version}|combined={combined_analyzer.PROMPT_VERSION}"
+        return prompt_version
+
+    # --- LLM analysis ---
+
+    def _analysis_key(self, digest: str) -> str:
+        prompt = self._prompt(f"{llm_analyzer.PROMPT_VERSION}|budget={get_settings().llm_token_budget}")
+        return self._key("analysis", digest, prompt, get_llm_client().model_id)
+
+    def get_analysis(self, digest: str) -> Optional[LLMAnalysis]:
+        value = self._get("analysis", self._analysis_key(digest))
+        return LLMAnalysis.model_validate_json(value) if value is not None else None
+
+    def set_analysis(self, digest: str, analysis: LLMAnalysis) -> None:
+        self.backend.set(self._analysis_key(digest), analysis.model_dump_json(), digest, self.ttl)
+
+    # --- Quests ---
+
+    def _quests_key(self, digest: str) -> str:
+        return self._key("quests", digest, self._prompt(quest_generator.PROMPT_VERSION), get_llm_client().model_id)
+
+    def get_quests(self, digest: str) -> Optional[List[Quest]]:
+        value = self._get("quests", self._quests_key(digest))
+        return [Quest.model_validate(q) for q in json.loads(value)] if value is not None else None
+
+    def set_quests(self, digest: str, quests: List[Quest]) -> None:
+        value = json.dumps([q.model_dump() for q in quests], separators=(",", ":"))
+        self.backend.set(self._quests_key(digest), value, digest, self.ttl)
+
+    # --- Administration ---
+
+    def invalidate(self, digest: str) -> int:
+        return self.backend.delete_resume(digest)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = {namespace: dict(values) for namespace, values in self._counters.items()}
+        return {"backend": type(self.backend).__name__, "entries": len(self.backend), "counters": counters}
+
+
+# -----------------------------------------------------------------------------
+# 3. Process-wide instance
+# -----------------------------------------------------------------------------
+
+_cache: Optional[AnalysisCache] = None
+_cache_built = False
+
+
+def build_cache_from_settings() -> Optional[AnalysisCache]:
+    settings = get_settings()
+    if settings.cache_backend == "memory":
+        backend = MemoryLRUBackend(max_entries=settings.cache_max_entries)
+    elif settings.cache_backend == "sqlite":
+        backend = SQLiteBackend(settings.cache_path)
+    elif settings.cache_backend == "none":
+        return None
+    else:
+        raise ValueError(f"Unknown cache backend: {settings.cache_backend}. Use memory, sqlite or none.")
+    return AnalysisCache(backend, ttl=settings.cache_ttl)
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """
+    Returns the shared cache, or None when caching is disabled. Also used as a
+    FastAPI dependency so it can be overridden in benchmarks.
+    """
+    global _cache, _cache_built
+    if not _cache_built:
+        _cache = build_cache_from_settings()
+        _cache_built = True
+    return _cache
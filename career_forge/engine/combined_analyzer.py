@@ -0,0 +1,140 @@
+# career_forge/engine/combined_analyzer.py
+
+import logging
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from career_forge.gamification.quest_generator import parse_quests
+from career_forge.schemas.quest import Quest
+from .llm_analyzer import ANALYSIS_DEFAULTS, ExperienceDetail, FieldCallback, LLMAnalysis
+from .llm_client import get_llm_client, llm_configured
+from .llm_providers import TASK_ANALYSIS_AND_QUESTS, LLMError
+from .structured_output import MalformedOutput, parse_json_lenient, read_stream, response_schema, validate_partial
+
+logger = logging.getLogger(__name__)
+
+# Part of the analysis and quest cache keys while CAREER_FORGE_LLM_SINGLE_CALL
+# is set; bump it whenever the prompt below changes in a meaningful way.
+PROMPT_VERSION = "1"
+
+# -----------------------------------------------------------------------------
+# Analysis and quests in one LLM call
+# -----------------------------------------------------------------------------
+# The two-call flow sends the resume, waits for the analysis, then sends the
+# analysis back to get 3-4 quests: two round-trips in series, and the second
+# prompt repeats what the model just wrote. Here one prompt asks for both,
+# with the answer constrained to the schema of `CombinedAnalysis` (generated
+# from the Pydantic models below, so prompt and validation can't drift).
+#
+# The answer is parsed leniently (structured_output.py): an answer cut off
+# in the quests still yields the analysis, and the pipeline then asks for the
+# quests separately.
+#
+# Enabled by CAREER_FORGE_LLM_SINGLE_CALL. Results go to the same analysis
+# and quest caches as the two-call flow, but under keys that carry this
+# module's PROMPT_VERSION: a different prompt gives different answers.
+
+
+class SkillBuckets(BaseModel):
+    # Spelled-out categories instead of LLMAnalysis' Dict, which a response schema can't express.
+    TechnicalSkills: List[str] = Field(
+        default_factory=list,
+        description="Specific software, tools, programming languages and methodologies like Agile or Scrum.")
+    SoftSkills: List[str] = Field(
+        default_factory=list, description="Interpersonal abilities like Communication, Teamwork or Leadership.")
+    Intelligence: List[str] = Field(
+        default_factory=list, description="Cognitive skills like Problem Solving, Critical Thinking or Data Analysis.")
+
+
+class CombinedAnalysis(BaseModel):
+    """The answer of the single-call prompt: an LLMAnalysis plus its quests."""
+    user_name: str = Field(description="The candidate's full name, usually at the very top; 'User' if none is found.")
+    job_title: str = Field(description="The candidate's current job title or professional headline.")
+    summary: str = Field(description="A 2-3 sentence professional summary of the candidate's profile.")
+    suggested_rank: str = Field(description="A starting rank: E, D, C, B, A or S.")
+    suggested_level: int = Field(description="A starting level between 1 and 99.")
+    skills: SkillBuckets = Field(description="The candidate's skills by category.")
+    experiences: List[ExperienceDetail] = Field(description="Experiences, projects, achievements and leadership roles.")
+    inferred_strengths: List[str] = Field(description="2-3 key strengths inferred from the content.")
+    quests: List[Quest] = Field(description="3-4 personalized quests for this candidate.")
+
+    def to_analysis(self) -> LLMAnalysis:
+        return LLMAnalysis(
+            **self.model_dump(exclude={"skills", "quests", "experiences"}),
+            skills=self.skills.model_dump(),
+            experiences=self.experiences,
+        )
+
+
+COMBINED_DEFAULTS = {**ANALYSIS_DEFAULTS, "skills": SkillBuckets(), "quests": []}
+
+
+def parse_combined(response_text: str) -> Optional[Tuple[LLMAnalysis, List[Quest]]]:
+    """
+    Parses a single-call answer into the analysis and the quests, keeping
+    whatever is valid. The quests may be empty (e.g. the answer was cut
+    off); None means not even the analysis was usable.
+    """
+    try:
+        data, repaired = parse_json_lenient(response_text)
+    except MalformedOutput as e:
+        logger.warning("Error parsing LLM response: %s", e)
+        return None
+    if not isinstance(data, dict):
+        logger.warning("Error parsing LLM response: expected an object, got %s", type(data).__name__)
+        return None
+
+    # Quests are validated one by one so a single bad quest doesn't cost the rest.
+    quests = parse_quests(data.get("quests"))
+    combined, problems = validate_partial(CombinedAnalysis, {**data, "quests": []}, COMBINED_DEFAULTS)
+    if combined is None:
+        logger.warning("Error parsing LLM response", extra={"problems": problems})
+        return None
+    if repaired or problems:
+        logger.info("Repaired the LLM analysis", extra={"json_repaired": repaired, "problems": problems})
+    return combined.to_analysis(), quests
+
+
+def analyze_resume_and_quests_with_llm(
+    resume_text: str, on_field: Optional[FieldCallback] = None,
+) -> Optional[Tuple[LLMAnalysis, List[Quest]]]:
+    """
+    Analyzes resume text and generates its quests with a single LLM call.
+    Returns (analysis, quests), or None when the LLM answer is unusable.
+    With `on_field`, the answer is streamed and each field (each quest too)
+    is reported as soon as the model has written it.
+    """
+    if not llm_configured():
+        raise ConnectionError("Google AI client is not configured. Please set your GOOGLE_API_KEY.")
+
+    master_prompt = f"""
+    You are an expert tech recruiter and the 'Quest Master' of a career development platform called 'Career Forge'.
+
+    Analyze the following resume text:
+    ---
+    {resume_text}
+    ---
+
+    Return one JSON object following the response schema:
+    - The analysis: the candidate's name, title, summary, a suggested rank and level, their skills by
+      category, their experiences (a school role like 'Prefect' is a 'Leadership Role'; use 'N/A' for a
+      missing organization) and 2-3 inferred strengths.
+    - "quests": 3-4 actionable, specific quests that build on this analysis. Mix 'Daily', 'Side Mission'
+      and 'Weekly Challenge' quests, mention the candidate's strengths or projects where relevant, set the
+      category to the skill category the quest improves and give rewards like '+50 XP Python'.
+    """
+
+    # The prompt explains the fields, so the schema only pins down the shape.
+    request = dict(temperature=0.2, task=TASK_ANALYSIS_AND_QUESTS,
+                   schema=response_schema(CombinedAnalysis, descriptions=False))
+    try:
+        client = get_llm_client()
+        if on_field is None:
+            response_text = client.generate(master_prompt, **request)
+        else:
+            response_text = read_stream(client.stream(master_prompt, **request), on_field)
+    except LLMError as e:
+        logger.warning("Error calling the LLM: %s", e, extra={"error": type(e).__name__})
+        return None
+    return parse_combined(response_text)
@@ -0,0 +1,192 @@
+# career_forge/engine/compaction.py
+
+import math
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .resources import registry
+from .segmentation import SectionKind, heading_kind, is_section_heading
+
+# -----------------------------------------------------------------------------
+# Shrinking resume text before it goes into a prompt
+# -----------------------------------------------------------------------------
+# Every input token costs latency and money, and extracted PDF text is full
+# of noise: page numbers, repeated headers and footers, separator lines and
+# runs of whitespace. This module removes that noise and, when the text is
+# still over the token budget, trims each section to a fair share of it.
+
+# Gemini averages about four characters per token for English text. This is
+# only an estimate, but it needs no API call and is consistent between the
+# before/after numbers we report.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    # Lines removed as boilerplate or duplicates.
+    lines_removed: int
+    # Whether sentences had to be dropped to fit the budget.
+    truncated: bool
+
+
+# -----------------------------------------------------------------------------
+# 1. Cleaning
+# -----------------------------------------------------------------------------
+
+_BULLET_PREFIX = re.compile(r"^[•▪◦●‣⁃∙·*\-–—>]+\s*")
+_WHITESPACE = re.compile(r"[ \t\u00a0\u2000-\u200b\u202f\u205f\u3000]+")
+
+# Whole lines that carry no information for the analysis.
+_BOILERPLATE = re.compile(
+    r"""^(
+        page\s*\d+(\s*(of|/)\s*\d+)?      # Page 2, Page 2 of 3
+      | \d+\s*(of|/)\s*\d+                # 2 / 3
+      | -?\s*\d{1,3}\s*-?                 # a lone page number
+      | curriculum\s+vitae | r[eé]sum[eé] | cv
+      | references?\s+(are\s+)?available\s+(up)?on\s+request\.?
+      | [\W_]+                            # separators and stray bullets
+    )$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def clean_lines(text: str) -> Tuple[List[str], int]:
+    """
+    Normalizes whitespace and bullet glyphs, drops boilerplate lines and
+    repeated lines (e.g. a name and phone number printed on every page).
+    Returns the kept lines and how many were removed.
+    """
+    kept: List[str] = []
+    seen = set()
+    removed = 0
+    for line in text.splitlines():
+        line = _WHITESPACE.sub(" ", line).strip()
+        if not line:
+            continue
+        line = _BULLET_PREFIX.sub("", line)
+        key = line.casefold()
+        if not line or _BOILERPLATE.match(line) or key in seen:
+            removed += 1
+            continue
+        seen.add(key)
+        kept.append(line)
+    return kept, removed
+
+
+# -----------------------------------------------------------------------------
+# 2. Sections and sentences
+# -----------------------------------------------------------------------------
+
+def split_sections(lines: List[str]) -> List[Tuple[Optional[str], List[str]]]:
+    """
+    Groups lines under their section heading. Lines before the first heading
+    (name, contact details, headline) form a section with no heading.
+    """
+    sections: List[Tuple[Optional[str], List[str]]] = [(None, [])]
+    for line in lines:
+        # A capitalized name at the top is not a heading, so unknown headings
+        # only count once a known one has been seen.
+        if is_section_heading(line, known_only=len(sections) == 1):
+            sections.append((line, []))
+        else:
+            sections[-1][1].append(line)
+    return [(heading, body) for heading, body in sections if heading or body]
+
+
+def _load_sentencizer():
+    # A blank pipeline with the rule-based sentencizer: no statistical model
+    # to load, so it is cheap even in a fresh worker process.
+    import spacy
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+sentencizer_resource = registry.register("sentencizer", _load_sentencizer, required=False)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9])")
+
+
+def _split_sentences(lines: List[str]) -> List[List[str]]:
+    """Splits each line into sentences with spaCy, or a regex if spaCy is unavailable."""
+    try:
+        nlp = sentencizer_resource.get()
+    except Exception:
+        return [_SENTENCE_END.split(line) for line in lines]
+    return [[sent.text for sent in doc.sents] for doc in nlp.pipe(lines)]
+
+
+def _fit(lines: List[List[str]], allowance: int) -> Tuple[List[str], int]:
+    """
+    Keeps the leading sentences of a section that fit in `allowance` tokens.
+    The result is always a prefix of the section: earlier entries (usually
+    the most recent roles) matter most.
+    """
+    used = 0
+    output: List[str] = []
+    for line in lines:
+        kept = []
+        for sentence in line:
+            cost = estimate_tokens(sentence) + 1
+            if used + cost > allowance:
+                break
+            used += cost
+            kept.append(sentence)
+        if kept:
+            output.append(" ".join(kept))
+        if len(kept) < len(line):
+            break
+    return output, used
+
+
+# -----------------------------------------------------------------------------
+# 3. Putting it together
+# -----------------------------------------------------------------------------
+
+def compact_resume(raw_text: str, token_budget: int) -> CompactionResult:
+    """
+    Cleans the resume text and, if it is still longer than `token_budget`
+    tokens (0 means no limit), keeps the first sentences of every section
+    within that section's share of the budget. Headings are always kept.
+    """
+    tokens_before = estimate_tokens(raw_text)
+    lines, removed = clean_lines(raw_text)
+    text = "\n".join(lines)
+    if token_budget <= 0 or estimate_tokens(text) <= token_budget:
+        return CompactionResult(text, tokens_before, estimate_tokens(text), removed, False)
+
+    sections = split_sections(lines)
+    heading_tokens = sum(estimate_tokens(heading) + 1 for heading, _ in sections if heading)
+    sentences = [_split_sentences(body) for _, body in sections]
+    sizes = [sum(estimate_tokens(s) + 1 for line in body for s in line) for body in sentences]
+
+    # Fill the smallest sections first, each with an equal share of what is
+    # left; whatever a section doesn't use carries over to the larger ones.
+    # Sections of other kinds (interests, languages, ...) only share what the
+    # rest leave over.
+    remaining = max(0, token_budget - heading_tokens)
+    fitted: List[List[str]] = [[] for _ in sections]
+    low_priority = [heading_kind(heading) is SectionKind.OTHER for heading, _ in sections]
+    order = sorted(range(len(sections)), key=lambda i: (low_priority[i], sizes[i]))
+    for position, index in enumerate(order):
+        sharing = sum(1 for later in order[position:] if low_priority[later] == low_priority[index])
+        fitted[index], used = _fit(sentences[index], remaining // sharing)
+        remaining -= used
+
+    output: List[str] = []
+    for (heading, _), body in zip(sections, fitted):
+        if heading:
+            output.append(heading)
+        output.extend(body)
+
+    text = "\n".join(output)
+    return CompactionResult(text, tokens_before, estimate_tokens(text), removed, True)
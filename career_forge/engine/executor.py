@@ -0,0 +1,211 @@
+# career_forge/engine/executor.py
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Optional, TypeVar
+
+from career_forge.config import get_settings
+
+T = TypeVar("T")
+
+# -----------------------------------------------------------------------------
+# 1. Errors surfaced to the API layer
+# -----------------------------------------------------------------------------
+
+
+class ExecutorOverloaded(Exception):
+    """Raised when both the in-flight slots and the waiting room are full (HTTP 429)."""
+
+
+class ExecutorUnavailable(Exception):
+    """Raised when a request waited too long for a slot or a pool is broken (HTTP 503)."""
+
+
+# -----------------------------------------------------------------------------
+# 2. The execution layer
+# -----------------------------------------------------------------------------
+
+def _worker_context():
+    """
+    Parse workers are not forked from the server: a fork copies the locks
+    other threads hold at that moment (warm-up may be halfway through loading
+    spaCy), and a worker that inherits a held lock waits on it forever. The
+    forkserver starts them from a clean, single-threaded process instead.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class PipelineExecutor:
+    """
+    Keeps blocking work off the event loop.
+
+    - CPU-bound work (PDF extraction, spaCy) runs in a bounded process pool.
+    - Blocking I/O (the Gemini SDK) runs in a bounded thread pool.
+    - `admit()` caps how many analyses run at once. A limited number of extra
+      requests may wait for a slot; everything beyond that is rejected right
+      away instead of piling up in memory.
+
+    With `inline=True` every call runs directly on the event loop, which is
+    exactly how the endpoint behaved before this layer existed. It is only
+    meant as a baseline for the load test.
+    """
+
+    def __init__(
+        self,
+        parse_workers: int,
+        llm_workers: int,
+        max_in_flight: int,
+        max_pending: int,
+        queue_timeout: float,
+        inline: bool = False,
+    ):
+        self.parse_workers = parse_workers
+        self.llm_workers = llm_workers
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_pending = max(0, max_pending)
+        self.queue_timeout = queue_timeout
+        self.inline = inline
+
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._admitted = 0  # running + waiting requests
+        self._cpu_pool: Optional[Executor] = None
+        self._io_pool: Optional[Executor] = None
+
+    @classmethod
+    def from_settings(cls) -> "PipelineExecutor":
+        settings = get_settings()
+        return cls(
+            parse_workers=settings.parse_workers,
+            llm_workers=settings.llm_workers,
+            max_in_flight=settings.max_in_flight,
+            max_pending=settings.max_pending,
+            queue_timeout=settings.queue_timeout,
+        )
+
+    # --- Pool lifecycle ---
+
+    def _get_cpu_pool(self) -> Executor:
+        if self._cpu_pool is None:
+            # A worker count of 0 keeps parsing in-process (on a thread), which
+            # is handy on platforms where process pools are awkward.
+            if self.parse_workers > 0:
+                self._cpu_pool = ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=_worker_context())
+            else:
+                self._cpu_pool = self._get_io_pool()
+        return self._cpu_pool
+
+    def _get_io_pool(self) -> Executor:
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=max(1, self.llm_workers), thread_name_prefix="career-forge-io"
+            )
+        return self._io_pool
+
+    def shutdown(self) -> None:
+        if self._cpu_pool is not None and self._cpu_pool is not self._io_pool:
+            self._cpu_pool.shutdown(wait=False, cancel_futures=True)
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self._cpu_pool = None
+        self._io_pool = None
+
+    # --- Admission control (backpressure) ---
+
+    @property
+    def in_flight(self) -> int:
+        return min(self._admitted, self.max_in_flight)
+
+    @property
+    def pending(self) -> int:
+        return max(0, self._admitted - self.max_in_flight)
+
+    @asynccontextmanager
+    async def admit(self):
+        """
+        Reserves one analysis slot for the duration of the `async with` block.
+        """
+        if self._admitted >= self.max_in_flight + self.max_pending:
+            raise ExecutorOverloaded("The server is busy analyzing other resumes. Please retry shortly.")
+
+        self._admitted += 1
+        try:
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise ExecutorUnavailable("Timed out waiting for a free analysis slot. Please retry shortly.")
+            try:
+                yield self
+            finally:
+                self._slots.release()
+        finally:
+            self._admitted -= 1
+
+    # --- Running work ---
+
+    async def run_cpu(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Runs a CPU-bound, picklable callable in the process pool."""
+        if self.inline:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_cpu_pool(), functools.partial(fn, *args, **kwargs))
+        except BrokenProcessPool:
+            # A crashed worker poisons the whole pool, so replace it for the next request.
+            self._cpu_pool = None
+            raise ExecutorUnavailable("The parsing worker pool crashed. Please retry.")
+
+    async def run_io(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Runs a blocking I/O callable (e.g. an LLM call) in the thread pool."""
+        if self.inline:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        # Like asyncio.to_thread: the thread sees the caller's context vars
+        # (e.g. the request ID its log lines carry).
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._get_io_pool(), functools.partial(context.run, fn, *args, **kwargs))
+
+    async def run_split(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Runs a callable that splits its own work into chunks for the process
+        pool (e.g. PDF pages). `fn` is called on the thread pool with the
+        process pool as `pool=`; without worker processes it gets `pool=None`
+        and does all the work in a single `run_cpu` call.
+        """
+        if self.inline or self.parse_workers <= 0:
+            return await self.run_cpu(fn, *args, pool=None, **kwargs)
+        try:
+            return await self.run_io(fn, *args, pool=self._get_cpu_pool(), **kwargs)
+        except BrokenProcessPool:
+            self._cpu_pool = None
+            raise ExecutorUnavailable("The parsing worker pool crashed. Please retry.")
+
+
+# -----------------------------------------------------------------------------
+# 3. Process-wide instance
+# -----------------------------------------------------------------------------
+
+_executor: Optional[PipelineExecutor] = None
+
+
+def get_executor() -> PipelineExecutor:
+    """
+    Returns the shared executor. It is also used as a FastAPI dependency, so
+    tests and benchmarks can swap it out with `app.dependency_overrides`.
+    """
+    global _executor
+    if _executor is None:
+        _executor = PipelineExecutor.from_settings()
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
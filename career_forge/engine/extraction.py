@@ -0,0 +1,281 @@
+# career_forge/engine/extraction.py
+
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+import time
+from concurrent.futures import Executor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional, Union
+
+from docx import Document
+from pypdf import PdfReader
+
+from career_forge.config import get_settings
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# A document is either a path to a spooled file or the raw bytes.
+Source = Union[str, bytes]
+
+# -----------------------------------------------------------------------------
+# 1. Errors and limits
+# -----------------------------------------------------------------------------
+
+
+class ExtractionError(Exception):
+    """The document can't be turned into text."""
+
+
+class DocumentTooLarge(ExtractionError):
+    """The upload exceeds the configured byte or page limit (HTTP 413)."""
+
+
+class ScannedDocument(ExtractionError):
+    """The document has no text layer, e.g. a scanned image PDF (HTTP 422)."""
+
+
+@dataclass(frozen=True)
+class ExtractionLimits:
+    max_bytes: int
+    max_pages: int
+    # Seconds allowed for one document; pages not done by then are dropped.
+    time_budget: float
+    # If this many leading pages have no text layer, the document is treated as scanned.
+    scan_probe_pages: int
+    # Pages per task when a PDF is split across the process pool.
+    pages_per_chunk: int
+
+    @classmethod
+    def from_settings(cls) -> "ExtractionLimits":
+        settings = get_settings()
+        return cls(
+            max_bytes=settings.max_upload_bytes,
+            max_pages=settings.max_pages,
+            time_budget=settings.extraction_time_budget,
+            scan_probe_pages=settings.scan_probe_pages,
+            pages_per_chunk=settings.pages_per_chunk,
+        )
+
+
+def _too_many_bytes(max_bytes: int) -> DocumentTooLarge:
+    return DocumentTooLarge(f"The file exceeds the upload limit of {max_bytes / (1024 * 1024):.1f} MB.")
+
+
+@dataclass
+class PageText:
+    number: int
+    text: str
+    # False for pages without fonts (pure images); their text is never extracted.
+    has_text_layer: bool
+
+
+# -----------------------------------------------------------------------------
+# 2. Spooling uploads to disk
+# -----------------------------------------------------------------------------
+
+class SpooledUpload:
+    """
+    An upload copied to a named temporary file in fixed-size chunks, so it is
+    never held in memory as a whole and worker processes can open it by path.
+    The SHA-256 of the bytes is computed on the way.
+    """
+
+    def __init__(self, path: str, size: int, sha256: str, content_type: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.content_type = content_type
+
+    def cleanup(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+async def spool_upload(
+    upload, max_bytes: int, chunk_size: int = 64 * 1024, directory: Optional[str] = None
+) -> SpooledUpload:
+    """
+    Copies an UploadFile to disk, enforcing `max_bytes` while reading so an
+    oversized upload is rejected without being stored in full. The file goes
+    to the system temp directory unless `directory` is given. The file calls
+    run on a thread, so a slow disk doesn't stall the event loop.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    handle = await asyncio.to_thread(
+        tempfile.NamedTemporaryFile, prefix="career-forge-", suffix=".upload", delete=False, dir=directory)
+    try:
+        try:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_many_bytes(max_bytes)
+                digest.update(chunk)
+                await asyncio.to_thread(handle.write, chunk)
+        finally:
+            await asyncio.to_thread(handle.close)
+    except BaseException:
+        os.unlink(handle.name)
+        raise
+    return SpooledUpload(handle.name, size, digest.hexdigest(), upload.content_type)
+
+
+# -----------------------------------------------------------------------------
+# 3. PDF pages
+# -----------------------------------------------------------------------------
+
+def _open(source: Source) -> BinaryIO:
+    return open(source, "rb") if isinstance(source, str) else io.BytesIO(source)
+
+
+def _has_text_layer(page) -> bool:
+    """
+    A page can only contain extractable text if it references a font, either
+    directly or through a form XObject. Image-only (scanned) pages don't.
+    """
+    resources = page.get("/Resources")
+    if resources is None:
+        return False
+    resources = resources.get_object()
+    if resources.get("/Font"):
+        return True
+    xobjects = resources.get("/XObject")
+    if xobjects:
+        for xobject in xobjects.get_object().values():
+            xobject = xobject.get_object()
+            if xobject.get("/Subtype") == "/Form" and xobject.get("/Resources"):
+                if xobject["/Resources"].get_object().get("/Font"):
+                    return True
+    return False
+
+
+def _extract_page(reader: PdfReader, index: int) -> PageText:
+    page = reader.pages[index]
+    if not _has_text_layer(page):
+        return PageText(index + 1, "", False)
+    return PageText(index + 1, page.extract_text() or "", True)
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[PageText]:
+    """Runs in a worker process: opens the spooled PDF and extracts pages [start, stop)."""
+    with open(path, "rb") as f:
+        reader = PdfReader(f)
+        return [_extract_page(reader, index) for index in range(start, stop)]
+
+
+def iter_pdf_pages(
+    source: Source,
+    limits: ExtractionLimits,
+    pool: Optional[Executor] = None,
+) -> Iterator[PageText]:
+    """
+    Yields the pages of a PDF in order, as soon as each one is available.
+
+    - More than `limits.max_pages` pages raises DocumentTooLarge up front.
+    - If the first `limits.scan_probe_pages` pages have no text layer the
+      document is treated as scanned and ScannedDocument is raised, without
+      touching the remaining pages.
+    - Extraction stops at `limits.time_budget`; the pages done so far are kept.
+    - With a `pool` and a file path, page ranges are extracted in parallel
+      by worker processes; otherwise pages are extracted one by one here.
+    """
+    deadline = time.monotonic() + limits.time_budget
+    probe = max(0, limits.scan_probe_pages)
+
+    with _open(source) as f:
+        reader = PdfReader(f)
+        page_count = len(reader.pages)
+        if page_count > limits.max_pages:
+            raise DocumentTooLarge(
+                f"The document has {page_count} pages; the limit is {limits.max_pages}."
+            )
+
+        if pool is not None and isinstance(source, str) and page_count > 0:
+            pages = _iter_pages_parallel(source, page_count, limits, pool, deadline)
+        else:
+            pages = _iter_pages_sequential(reader, page_count, deadline)
+
+        # Length of the run of empty pages at the start of the document.
+        leading_empty = 0
+        for page in pages:
+            if leading_empty == page.number - 1 and not page.text.strip():
+                leading_empty += 1
+                if leading_empty == min(probe, page_count):
+                    raise ScannedDocument("The document has no text layer (is it a scanned image?).")
+            yield page
+
+
+def _iter_pages_sequential(reader: PdfReader, page_count: int, deadline: float) -> Iterator[PageText]:
+    for index in range(page_count):
+        if time.monotonic() >= deadline:
+            return
+        yield _extract_page(reader, index)
+
+
+def _iter_pages_parallel(
+    path: str, page_count: int, limits: ExtractionLimits, pool: Executor, deadline: float
+) -> Iterator[PageText]:
+    chunk = max(1, limits.pages_per_chunk)
+    futures = [
+        pool.submit(_extract_page_range, path, start, min(start + chunk, page_count))
+        for start in range(0, page_count, chunk)
+    ]
+    try:
+        for future in futures:
+            try:
+                chunk_pages = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                return
+            yield from chunk_pages
+    finally:
+        # Out of time or the consumer stopped early: drop work that hasn't started.
+        for future in futures:
+            future.cancel()
+
+
+# -----------------------------------------------------------------------------
+# 4. Whole documents
+# -----------------------------------------------------------------------------
+
+def extract_docx_text(source: Source) -> str:
+    with _open(source) as f:
+        document = Document(f)
+        return "\n".join(para.text for para in document.paragraphs)
+
+
+def extract_document_text(
+    source: Source,
+    content_type: str,
+    limits: Optional[ExtractionLimits] = None,
+    pool: Optional[Executor] = None,
+) -> str:
+    """
+    Extracts the full text of a PDF or DOCX, enforcing the limits. Raises
+    ExtractionError subclasses for limit violations and scanned documents.
+
+    PDF pages are joined here rather than passed on one by one: every later
+    stage needs the whole text. Compaction keeps a header or footer once only
+    after seeing it on every page, and the LLM prompt is a single request.
+    What the page generator buys is stopping early: a scanned document is
+    rejected after its first pages, and the time budget cuts extraction off
+    without waiting for the remaining chunks.
+    """
+    limits = limits or ExtractionLimits.from_settings()
+    if isinstance(source, bytes) and len(source) > limits.max_bytes:
+        raise _too_many_bytes(limits.max_bytes)
+
+    if content_type == PDF_CONTENT_TYPE:
+        return "".join(page.text for page in iter_pdf_pages(source, limits, pool))
+    if content_type == DOCX_CONTENT_TYPE:
+        return extract_docx_text(source)
+    # For simplicity, we'll only handle PDF and DOCX for now.
+    raise ValueError(f"Unsupported file type for AI parsing: {content_type}")
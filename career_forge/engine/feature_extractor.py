@@ -1,94 +1,28 @@
 # career_forge/engine/feature_extractor.py
 
-from typing import List, Dict
+import logging
+import os
+import threading
+import time
+from typing import Iterable, List, Dict, Optional
 from pydantic import BaseModel, Field
-from spacy.matcher import PhraseMatcher
 
 # Import the tools we created in the last step
-from .parser import ParsedResume, NLP
+from .parser import ParsedResume, get_nlp
+from .resources import registry
+from .segmentation import SECTION_WEIGHTS, SectionKind
+from .taxonomy import SkillTaxonomy, DEFAULT_TAXONOMY_PATH
+from career_forge.config import get_settings
 
-# --- A small setup note ---
-# Ensure the spaCy model is available, as this file depends on it.
-if NLP is None:
-    raise ImportError("spaCy model 'en_core_web_sm' not loaded. Please run the download command.")
+logger = logging.getLogger(__name__)
 
 # -----------------------------------------------------------------------------
-# 1. Define Known Skills & Output Schema
+# 1. Known Skills & Output Schema
 # -----------------------------------------------------------------------------
 
-# This is the comprehensive, high-end skill dictionary.
-SKILL_PATTERNS = {
-    "PROGRAMMING": [
-        "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "C", "Go", "Rust", "Ruby",
-        "PHP", "Swift", "Kotlin", "Scala", "Perl", "R", "MATLAB", "Lua", "Objective-C", "Bash",
-        "Shell Scripting", "PowerShell"
-    ],
-    "WEB_DEVELOPMENT": [
-        "HTML", "CSS", "Sass", "LESS", "Node.js", "Express.js", "React", "Angular", "Vue.js",
-        "jQuery", "ASP.NET", "Django", "Flask", "Ruby on Rails", "Spring Boot", "Next.js",
-        "Nuxt.js", "Svelte", "Gatsby", "Bootstrap", "Tailwind CSS", "Redux", "MobX", "Webpack",
-        "Vite", "WebSockets", "SEO", "Web Accessibility", "WCAG", "Progressive Web Apps", "PWA"
-    ],
-    "DATABASE": [
-        "SQL", "MySQL", "PostgreSQL", "SQLite", "Microsoft SQL Server", "Oracle", "MongoDB",
-        "Redis", "Cassandra", "DynamoDB", "Firebase", "Elasticsearch", "SQLAlchemy", "Prisma",
-        "InfluxDB", "Neo4j", "Graph Databases", "DBeaver"
-    ],
-    "AI_MACHINE_LEARNING": [
-        "Machine Learning", "Deep Learning", "Natural Language Processing", "NLP", "Computer Vision",
-        "Reinforcement Learning", "TensorFlow", "PyTorch", "Keras", "Scikit-learn", "Pandas",
-        "NumPy", "SciPy", "Matplotlib", "Seaborn", "spaCy", "NLTK", "OpenCV", "XGBoost",
-        "LightGBM", "Hugging Face", "Transformers", "Generative AI", "LLM", "Large Language Models"
-    ],
-    "DATA_SCIENCE": [
-        "Data Analysis", "Data Mining", "ETL", "Data Warehousing", "Business Intelligence",
-        "Apache Spark", "Hadoop", "Kafka", "Tableau", "Power BI", "Looker", "Airflow", "dbt",
-        "Data Bricks"
-    ],
-    "DEVOPS_CLOUD": [
-        "CI/CD", "Jenkins", "GitLab CI", "GitHub Actions", "Docker", "Kubernetes", "Terraform",
-        "Ansible", "Puppet", "Chef", "AWS", "Amazon Web Services", "Azure", "Google Cloud Platform",
-        "GCP", "Heroku", "DigitalOcean", "Vercel", "Netlify", "Linux", "EC2", "S3", "Lambda",
-        "RDS", "VPC", "CloudFormation", "Azure VMs", "Blob Storage", "Azure Functions", "Prometheus",
-        "Grafana", "Datadog", "Splunk"
-    ],
-    "MOBILE_DEVELOPMENT": [
-        "Swift", "SwiftUI", "Objective-C", "Kotlin", "Java", "React Native", "Flutter", "Xamarin",
-        "Android SDK", "iOS SDK"
-    ],
-    "ARCHITECTURE_DESIGN": [
-        "Microservices", "REST API", "GraphQL", "gRPC", "Agile", "Scrum", "Kanban", "Waterfall",
-        "Design Patterns", "SOLID", "TDD", "BDD", "Domain-Driven Design", "DDD", "SOA"
-    ],
-    "DESIGN_UI_UX": [
-        "Figma", "Sketch", "Adobe XD", "InVision", "Zeplin", "User Interface Design", "UI",
-        "User Experience Design", "UX", "Wireframing", "Prototyping", "User Research"
-    ],
-    "TESTING_QA": [
-        "Selenium", "JUnit", "TestNG", "PyTest", "Cypress", "Jest", "Mocha", "Chai", "Postman",
-        "SoapUI", "JMeter", "Quality Assurance", "QA", "Automated Testing", "Manual Testing",
-        "Performance Testing", "End-to-End Testing", "Unit Testing", "Integration Testing"
-    ],
-    "CYBER_SECURITY": [
-        "Cybersecurity", "Network Security", "Penetration Testing", "Ethical Hacking", "SIEM",
-        "Vulnerability Assessment", "Encryption", "Cryptography", "OWASP", "Wireshark",
-        "Metasploit", "Burp Suite", "Nmap", "Firewalls"
-    ],
-    "BUSINESS_TOOLS": [
-        "Microsoft Office Suite", "MS Office", "Microsoft Excel", "Microsoft Word", "PowerPoint",
-        "Google Workspace", "Salesforce", "SAP", "SharePoint"
-    ],
-    "PROJECT_MANAGEMENT_TOOLS": [
-        "Jira", "Confluence", "Trello", "Asana", "Slack", "Monday.com", "ClickUp", "Microsoft Project"
-    ],
-    "SOFT_SKILL": [
-        "Leadership", "Teamwork", "Collaboration", "Communication", "Problem Solving",
-        "Creativity", "Adaptability", "Time Management", "Critical Thinking", "Detail-oriented",
-        "Emotional Intelligence", "Mentorship", "Public Speaking", "Negotiation",
-        "Conflict Resolution", "Stakeholder Management", "Client Relations", "Active Listening",
-        "Interpersonal Skills", "Strategic Thinking"
-    ]
-}
+# The skill dictionary lives in a versioned data file (career_forge/data/
+# skill_taxonomy.json by default) with canonical IDs, aliases such as
+# "k8s" -> Kubernetes, and multi-category membership. See engine/taxonomy.py.
 
 
 class ExtractedFeatures(BaseModel):
@@ -100,51 +34,142 @@ class ExtractedFeatures(BaseModel):
     skills: Dict[str, List[str]] = Field(default_factory=dict, description="Skills categorized by type.")
     entities: Dict[str, List[str]] = Field(default_factory=dict,
                                            description="Named entities like organizations or locations.")
+    skill_sections: Dict[str, List[str]] = Field(
+        default_factory=dict, description="The kinds of section each skill was found in, e.g. ['experience', 'skills'].")
+
+    def skill_weight(self, skill: str) -> float:
+        """How much a skill counts: the weight of the best section it appears in (1.0 if unknown)."""
+        kinds = self.skill_sections.get(skill)
+        if not kinds:
+            return 1.0
+        return max(SECTION_WEIGHTS[SectionKind(kind)] for kind in kinds)
 
 
 # -----------------------------------------------------------------------------
-# 2. The Core AI Analysis Logic
+# 2. The Shared Skill Matcher
 # -----------------------------------------------------------------------------
+# The matcher is built once per process from the taxonomy file, or loaded from
+# CAREER_FORGE_SKILL_MATCHER_PATH (written by SkillMatcher.save) when that file
+# matches the taxonomy. If the taxonomy file changes on disk it is reloaded,
+# checked at most once every CAREER_FORGE_SKILL_TAXONOMY_RELOAD_INTERVAL seconds.
+
+_taxonomy_check_lock = threading.Lock()
+_taxonomy_mtime: Optional[float] = None
+_next_taxonomy_check = 0.0
+
+
+def _taxonomy_path() -> str:
+    return get_settings().skill_taxonomy_path or str(DEFAULT_TAXONOMY_PATH)
+
+
+def _build_skill_matcher():
+    global _taxonomy_mtime
+    # Imported here because it pulls in spaCy.
+    from .skill_matcher import SkillMatcher
+
+    nlp = get_nlp()
+    if nlp is None:
+        # --- A small setup note ---
+        # Skill matching needs the spaCy tokenizer and vocabulary.
+        raise RuntimeError("spaCy model 'en_core_web_sm' not loaded. Please run the download command.")
+
+    path = _taxonomy_path()
+    _taxonomy_mtime = os.path.getmtime(path)
+    taxonomy = SkillTaxonomy.from_file(path)
+    matcher_path = get_settings().skill_matcher_path
+    if matcher_path and os.path.exists(matcher_path):
+        return SkillMatcher.load(nlp, matcher_path, taxonomy)
+    return SkillMatcher(nlp, taxonomy)
+
+
+skill_matcher_resource = registry.register("skill_matcher", _build_skill_matcher, required=False)
+
 
-def extract_features(resume: ParsedResume) -> ExtractedFeatures:
+def get_skill_matcher():
+    """Returns the shared SkillMatcher, building it on first use."""
+    return skill_matcher_resource.get()
+
+
+def reload_skill_taxonomy(taxonomy: Optional[SkillTaxonomy] = None) -> bool:
     """
-    Analyzes a parsed resume to extract structured features like skills
-    and named entities using spaCy's powerful toolset.
+    Hot-swaps the taxonomy used by `extract_features` (re-reading the file
+    when none is given). Safe to call while other threads are extracting.
+    Returns False if nothing changed.
     """
-    # 1. Initialize the PhraseMatcher for Skill Extraction
-    matcher = PhraseMatcher(NLP.vocab, attr="LOWER")
-    for category, skills in SKILL_PATTERNS.items():
-        patterns = [NLP.make_doc(skill) for skill in skills]
-        matcher.add(category, patterns)
-
-    # 2. Process the Document to Find Matches
-    matches = matcher(resume.doc)
+    global _taxonomy_mtime
+    if taxonomy is None:
+        path = _taxonomy_path()
+        _taxonomy_mtime = os.path.getmtime(path)
+        taxonomy = SkillTaxonomy.from_file(path)
+    return get_skill_matcher().reload(taxonomy)
+
+
+def _reload_taxonomy_if_changed() -> None:
+    global _next_taxonomy_check
+    interval = get_settings().skill_taxonomy_reload_interval
+    now = time.monotonic()
+    if interval <= 0 or now < _next_taxonomy_check:
+        return
+    # Only one thread checks; the others keep matching with the current taxonomy.
+    if not _taxonomy_check_lock.acquire(blocking=False):
+        return
+    try:
+        _next_taxonomy_check = now + interval
+        if os.path.getmtime(_taxonomy_path()) != _taxonomy_mtime:
+            reload_skill_taxonomy()
+    except OSError as e:
+        logger.warning("Could not check the skill taxonomy for changes: %s", e)
+    finally:
+        _taxonomy_check_lock.release()
 
-    # 3. Organize Found Skills
-    found_skills = {}
-    for match_id, start, end in matches:
-        category_id = NLP.vocab.strings[match_id]
-        skill_text = resume.doc[start:end].text
 
-        if category_id not in found_skills:
-            found_skills[category_id] = []
+# -----------------------------------------------------------------------------
+# 3. The Core AI Analysis Logic
+# -----------------------------------------------------------------------------
 
-        # Add skill only if it's not already listed to avoid duplicates
-        if skill_text not in found_skills[category_id]:
-            found_skills[category_id].append(skill_text)
+def extract_features(resume: ParsedResume, sections: Optional[Iterable[SectionKind]] = None) -> ExtractedFeatures:
+    """
+    Analyzes a parsed resume to extract structured features like skills
+    and named entities using spaCy's powerful toolset.
 
-    # 4. Extract Named Entities (e.g., Universities, Companies)
+    With `sections`, skills are only looked for in sections of those kinds
+    (e.g. SKILL_SECTIONS, to leave out hobbies and languages).
+    """
+    # 1. Find skills with the shared, precompiled PhraseMatcher. Skills come
+    # back under their canonical names, so "python" and "Python" are one skill.
+    skill_matcher = get_skill_matcher()
+    _reload_taxonomy_if_changed()
+    doc = resume.doc
+    targets = [doc] if sections is None else resume.sections.doc_spans(doc, sections)
+
+    # Each skill is listed once, in order of first appearance, and remembers
+    # every kind of section it was mentioned in.
+    found_skills: Dict[str, List[str]] = {}
+    skill_sections: Dict[str, List[str]] = {}
+    for target in targets:
+        for mention in skill_matcher.mentions(target):
+            kind = resume.sections.kind_at(mention.start_char).value
+            kinds = skill_sections.get(mention.name)
+            if kinds is None:
+                skill_sections[mention.name] = [kind]
+                for category in mention.categories:
+                    found_skills.setdefault(category, []).append(mention.name)
+            elif kind not in kinds:
+                kinds.append(kind)
+
+    # 2. Extract Named Entities (e.g., Universities, Companies)
     # This uses spaCy's built-in NER model. It automatically finds things
     # like organizations (ORG), locations (GPE), and dates (DATE).
     found_entities = {}
     # We're interested in specific entity types
     interesting_labels = ["ORG", "GPE", "DATE"]
-    for ent in resume.doc.ents:
-        if ent.label_ in interesting_labels:
-            if ent.label_ not in found_entities:
-                found_entities[ent.label_] = []
+    # The entities were recorded when the resume was parsed, so this needs no Doc.
+    for ent in resume.entities or ():
+        if ent.label in interesting_labels:
+            if ent.label not in found_entities:
+                found_entities[ent.label] = []
 
-            if ent.text not in found_entities[ent.label_]:
-                found_entities[ent.label_].append(ent.text)
+            if ent.text not in found_entities[ent.label]:
+                found_entities[ent.label].append(ent.text)
 
-    return ExtractedFeatures(skills=found_skills, entities=found_entities)
\ No newline at end of file
+    return ExtractedFeatures(skills=found_skills, entities=found_entities, skill_sections=skill_sections)
\ No newline at end of file
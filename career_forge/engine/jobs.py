@@ -0,0 +1,643 @@
+# career_forge/engine/jobs.py
+
+import logging
+import asyncio
+import ipaddress
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from career_forge.config import get_settings
+from .executor import ExecutorUnavailable
+from .extraction import spool_upload
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# Background analysis jobs
+# -----------------------------------------------------------------------------
+# `POST /jobs` stores the upload on disk and a row in a SQLite table, then
+# answers right away. Worker tasks in the server process claim queued jobs
+# and run them, saving every progress event and partial result to the row.
+# `GET /jobs/{id}` and the SSE stream only read that row. Because all state
+# lives in SQLite:
+#
+# - server processes on one host can share one queue (a claim is a single
+#   IMMEDIATE transaction, so two workers never get the same job);
+# - jobs survive a restart: a running job whose worker stopped sending
+#   heartbeats goes back to the queue, up to `max_attempts` times.
+#
+# The queue does not know what a job does; the API layer passes in the
+# handler that runs the analysis.
+#
+# Several processes may share the SQLite file, so a store call can wait up to
+# `busy_timeout` for another one's write lock. The queue makes every store
+# call on a thread, never on the event loop.
+
+
+class JobState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+FINISHED_STATES = (JobState.DONE, JobState.FAILED)
+
+
+class QueueFull(Exception):
+    """Raised when too many jobs are already waiting (HTTP 429)."""
+
+
+class JobFailed(Exception):
+    """Raised by a handler for a permanent failure; the message is shown to the client."""
+
+
+@dataclass
+class Job:
+    job_id: str
+    state: JobState
+    mode: str
+    filename: str
+    content_type: str
+    upload_path: str
+    upload_size: int
+    upload_sha256: str
+    webhook_url: Optional[str]
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    attempts: int = 0
+    # Progress events in order, e.g. {"type": "stage", "stage": "parse", "state": "finished", "at": ...}.
+    events: List[dict] = field(default_factory=list)
+    # The best result so far (e.g. the profile before the quests are ready).
+    partial: Optional[dict] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+    @property
+    def stage(self) -> Optional[str]:
+        """The stage that most recently started or finished."""
+        for event in reversed(self.events):
+            if event.get("type") == "stage":
+                return event["stage"]
+        return None
+
+
+# Reports one progress event, optionally with a new partial result.
+ReportFn = Callable[[dict, Optional[dict]], None]
+# Runs one job and returns its result.
+JobHandler = Callable[[Job, ReportFn], Awaitable[dict]]
+
+
+# -----------------------------------------------------------------------------
+# 1. The SQLite store
+# -----------------------------------------------------------------------------
+
+_COLUMNS = (
+    "job_id, state, mode, filename, content_type, upload_path, upload_size, upload_sha256,"
+    " webhook_url, created_at, started_at, finished_at, attempts, events, partial, result, error"
+)
+
+
+class JobStore:
+    """The job table. Every method is one short statement or transaction."""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit; claims open their own IMMEDIATE transaction.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY, state TEXT NOT NULL, mode TEXT NOT NULL,"
+            " filename TEXT NOT NULL, content_type TEXT NOT NULL,"
+            " upload_path TEXT NOT NULL, upload_size INTEGER NOT NULL, upload_sha256 TEXT NOT NULL,"
+            " webhook_url TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL,"
+            " attempts INTEGER NOT NULL DEFAULT 0, not_before REAL NOT NULL DEFAULT 0,"
+            " heartbeat_at REAL, events TEXT NOT NULL DEFAULT '[]',"
+            " partial TEXT, result TEXT, error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created_at)")
+
+    @staticmethod
+    def _to_job(row: tuple) -> Job:
+        (job_id, state, mode, filename, content_type, upload_path, upload_size, upload_sha256,
+         webhook_url, created_at, started_at, finished_at, attempts, events, partial, result, error) = row
+        return Job(
+            job_id, JobState(state), mode, filename, content_type, upload_path, upload_size, upload_sha256,
+            webhook_url, created_at, started_at, finished_at, attempts, json.loads(events),
+            json.loads(partial) if partial else None, json.loads(result) if result else None, error,
+        )
+
+    # --- Submitting and reading ---
+
+    def add(self, job: Job) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, state, mode, filename, content_type, upload_path, upload_size,"
+                " upload_sha256, webhook_url, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.job_id, job.state.value, job.mode, job.filename, job.content_type, job.upload_path,
+                 job.upload_size, job.upload_sha256, job.webhook_url, job.created_at),
+            )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def position(self, job: Job) -> int:
+        """1-based place of a queued job in the queue."""
+        with self._lock:
+            ahead = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = 'queued' AND created_at < ?", (job.created_at,)
+            ).fetchone()[0]
+        return ahead + 1
+
+    # --- Running ---
+
+    def claim(self) -> Optional[Job]:
+        """Marks the oldest runnable queued job as running and returns it."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT job_id FROM jobs WHERE state = 'queued' AND not_before <= ?"
+                    " ORDER BY created_at LIMIT 1", (now,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET state = 'running', started_at = ?, heartbeat_at = ?,"
+                        " attempts = attempts + 1 WHERE job_id = ?", (now, now, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row[0]) if row else None
+
+    def add_event(self, job_id: str, event: dict, partial: Optional[dict] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET events = json_insert(events, '$[#]', json(?)),"
+                " partial = COALESCE(?, partial), heartbeat_at = ? WHERE job_id = ?",
+                (json.dumps(event), json.dumps(partial) if partial is not None else None, time.time(), job_id),
+            )
+
+    def heartbeat(self, job_ids: List[str]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE jobs SET heartbeat_at = ? WHERE job_id = ?", [(time.time(), job_id) for job_id in job_ids]
+            )
+
+    def finish(self, job_id: str, state: JobState, result: Optional[dict] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, result = ?, error = ? WHERE job_id = ?",
+                (state.value, time.time(), json.dumps(result) if result is not None else None, error, job_id),
+            )
+
+    def retry(self, job_id: str, delay: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = 'queued', started_at = NULL, not_before = ? WHERE job_id = ?",
+                (time.time() + delay, job_id),
+            )
+
+    def release(self, job_id: str) -> None:
+        """Puts a job back in the queue without counting the attempt (graceful shutdown)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = 'queued', started_at = NULL, attempts = MAX(0, attempts - 1)"
+                " WHERE job_id = ? AND state = 'running'", (job_id,)
+            )
+
+    # --- Housekeeping ---
+
+    def requeue_stale(self, lease: float, max_attempts: int) -> List[str]:
+        """
+        Requeues running jobs without a heartbeat for `lease` seconds (their
+        process died). Jobs out of attempts fail instead; their upload paths
+        are returned so the caller can delete them.
+        """
+        cutoff = time.time() - lease
+        with self._lock:
+            failed = [row[0] for row in self._conn.execute(
+                "SELECT upload_path FROM jobs WHERE state = 'running' AND heartbeat_at < ? AND attempts >= ?",
+                (cutoff, max_attempts),
+            )]
+            self._conn.execute(
+                "UPDATE jobs SET state = 'failed', finished_at = ?,"
+                " error = 'The worker running this job stopped too many times.'"
+                " WHERE state = 'running' AND heartbeat_at < ? AND attempts >= ?",
+                (time.time(), cutoff, max_attempts),
+            )
+            self._conn.execute(
+                "UPDATE jobs SET state = 'queued', started_at = NULL WHERE state = 'running' AND heartbeat_at < ?",
+                (cutoff,),
+            )
+        return failed
+
+    def purge(self, ttl: float) -> List[str]:
+        """Deletes jobs finished more than `ttl` seconds ago and returns their upload paths."""
+        cutoff = time.time() - ttl
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute(
+                "SELECT upload_path FROM jobs WHERE state IN ('done', 'failed') AND finished_at < ?", (cutoff,)
+            )]
+            self._conn.execute("DELETE FROM jobs WHERE state IN ('done', 'failed') AND finished_at < ?", (cutoff,))
+        return paths
+
+    # --- Metrics ---
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = {state.value: 0 for state in JobState}
+        counts.update(dict(rows))
+        return counts
+
+    def oldest_queued(self) -> Optional[float]:
+        with self._lock:
+            return self._conn.execute("SELECT MIN(created_at) FROM jobs WHERE state = 'queued'").fetchone()[0]
+
+    def recent_waits(self, window: float) -> List[float]:
+        """Seconds spent in the queue by the jobs started in the last `window` seconds."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT started_at - created_at FROM jobs WHERE started_at >= ?", (time.time() - window,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+# -----------------------------------------------------------------------------
+# 2. Webhooks
+# -----------------------------------------------------------------------------
+# Any client can pass a webhook URL, so without checks the server would POST
+# wherever it is told: the cloud metadata service (169.254.169.254), admin
+# ports on localhost, other hosts on the private network. A webhook host must
+# resolve to public addresses only, unless it is listed in
+# CAREER_FORGE_WEBHOOK_ALLOWED_HOSTS. The check runs when the job is submitted
+# and again before every delivery (DNS answers can change in between), and
+# redirects are not followed.
+
+
+class WebhookRejected(ValueError):
+    """The webhook URL is not allowed (HTTP 400)."""
+
+
+def check_webhook_url(url: str) -> None:
+    """Raises WebhookRejected unless `url` is http(s) and its host is public or allowed."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise WebhookRejected("The webhook URL must be an http or https URL.")
+    host = parsed.hostname.lower()
+    allowed = {entry.strip() for entry in get_settings().webhook_allowed_hosts.split(",") if entry.strip()}
+    if host in allowed:
+        return
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parsed.port or 80, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError, ValueError):
+        raise WebhookRejected(f"The webhook host {host!r} does not resolve.")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global:
+            raise WebhookRejected(
+                f"The webhook host {host!r} resolves to a private, loopback or link-local address.")
+
+
+class _NoRedirects(urllib.request.HTTPRedirectHandler):
+    # A redirect could point at an address the URL check would have rejected.
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+_webhook_opener = urllib.request.build_opener(_NoRedirects)
+
+
+def _post_json(url: str, payload: bytes, timeout: float = 10.0) -> int:
+    check_webhook_url(url)
+    request = urllib.request.Request(
+        url, data=payload, method="POST",
+        headers={"Content-Type": "application/json", "User-Agent": "career-forge-jobs"},
+    )
+    try:
+        with _webhook_opener.open(request, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# -----------------------------------------------------------------------------
+# 3. The queue and its workers
+# -----------------------------------------------------------------------------
+
+class JobQueue:
+    """
+    Accepts jobs and runs them on `workers` asyncio tasks. Jobs that fail
+    with a transient error (LLM unreachable, worker pool crashed, timeout)
+    are retried with exponential backoff; other failures are final.
+    """
+
+    transient_errors: Tuple[type, ...] = (ConnectionError, ExecutorUnavailable, asyncio.TimeoutError)
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: JobHandler,
+        upload_dir: str,
+        workers: int = 2,
+        max_queued: int = 1000,
+        timeout: float = 300.0,
+        max_attempts: int = 3,
+        ttl: float = 24 * 3600,
+        lease: float = 30.0,
+        poll_interval: float = 1.0,
+    ):
+        self.store = store
+        self.handler = handler
+        self.upload_dir = upload_dir
+        self.workers = max(0, workers)
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self.ttl = ttl
+        self.lease = lease
+        self.poll_interval = poll_interval
+
+        self._tasks: List[asyncio.Task] = []
+        self._deliveries = set()
+        self._work = asyncio.Event()
+        self._change = asyncio.Event()
+        # Worker utilization: (start, end) of runs that ended recently, plus the running ones.
+        self._running: Dict[str, float] = {}
+        self._busy_spans: Deque[Tuple[float, float]] = deque()
+        self._started_at = time.monotonic()
+
+    @classmethod
+    def from_settings(cls, handler: JobHandler) -> "JobQueue":
+        settings = get_settings()
+        return cls(
+            JobStore(settings.job_store_path),
+            handler,
+            upload_dir=settings.job_upload_dir,
+            workers=settings.job_workers,
+            max_queued=settings.job_max_queued,
+            timeout=settings.job_timeout,
+            max_attempts=settings.job_max_attempts,
+            ttl=settings.job_ttl,
+        )
+
+    # --- Submitting ---
+
+    async def submit(self, upload, max_bytes: int, mode: str, webhook_url: Optional[str] = None) -> Job:
+        """Stores an UploadFile and queues a job for it."""
+        counts = await asyncio.to_thread(self.store.counts)
+        if counts[JobState.QUEUED.value] >= self.max_queued:
+            raise QueueFull("Too many analyses are waiting. Please retry later.")
+        os.makedirs(self.upload_dir, exist_ok=True)
+        spooled = await spool_upload(upload, max_bytes, directory=self.upload_dir)
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            state=JobState.QUEUED,
+            mode=mode,
+            filename=upload.filename or "upload",
+            content_type=spooled.content_type,
+            upload_path=spooled.path,
+            upload_size=spooled.size,
+            upload_sha256=spooled.sha256,
+            webhook_url=webhook_url,
+            created_at=time.time(),
+        )
+        try:
+            await asyncio.to_thread(self.store.add, job)
+        except BaseException:
+            spooled.cleanup()
+            raise
+        self._work.set()
+        self._changed()
+        return job
+
+    # --- Change notifications (for the SSE stream) ---
+
+    def _changed(self) -> None:
+        self._change.set()
+        self._change = asyncio.Event()
+
+    async def wait_for_change(self, timeout: float) -> bool:
+        """
+        Waits until a job of this process changes, or `timeout` passes (jobs
+        run by other processes are only seen by polling). Returns False on timeout.
+        """
+        change = self._change
+        try:
+            await asyncio.wait_for(change.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    # --- Lifecycle ---
+
+    def start(self) -> None:
+        if self._tasks or self.workers == 0:
+            return
+        self._started_at = time.monotonic()
+        self._tasks = [asyncio.create_task(self._worker(), name=f"job-worker-{n}") for n in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._housekeeping(), name="job-housekeeping"))
+
+    async def stop(self) -> None:
+        """Stops the workers. Jobs they were running go back to the queue."""
+        for task in (*self._tasks, *self._deliveries):
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._deliveries, return_exceptions=True)
+        self._tasks = []
+
+    # --- Workers ---
+
+    async def _worker(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self.store.claim)
+            if job is None:
+                # A local submit wakes us up at once; the timeout picks up
+                # jobs submitted by other processes and retries that are due.
+                try:
+                    await asyncio.wait_for(self._work.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._work.clear()
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        # The handler reports from the event loop; the events are saved in
+        # order by `save_events`, on a thread.
+        reported: asyncio.Queue = asyncio.Queue()
+
+        def report(event: dict, partial: Optional[dict] = None) -> None:
+            reported.put_nowait((dict(event, at=time.time()), partial))
+
+        async def save_events() -> None:
+            while True:
+                event, partial = await reported.get()
+                try:
+                    await asyncio.to_thread(self.store.add_event, job.job_id, event, partial)
+                except Exception:
+                    # Keep draining, or the `join()`s below would wait forever.
+                    logger.exception("Saving a progress event of job %s failed", job.job_id,
+                                     extra={"job_id": job.job_id})
+                finally:
+                    reported.task_done()
+                self._changed()
+
+        saver = asyncio.create_task(save_events())
+        self._running[job.job_id] = time.monotonic()
+        self._changed()
+        finished = True
+        try:
+            try:
+                result = await asyncio.wait_for(self.handler(job, report), timeout=self.timeout)
+            except asyncio.CancelledError:
+                # The server is stopping; another worker picks the job up later.
+                await asyncio.to_thread(self.store.release, job.job_id)
+                raise
+            except self.transient_errors as e:
+                message = str(e) or "The analysis timed out."
+                if job.attempts < self.max_attempts:
+                    delay = 2.0 ** job.attempts
+                    report({"type": "retry", "attempt": job.attempts, "error": message, "delay": delay})
+                    await reported.join()
+                    await asyncio.to_thread(self.store.retry, job.job_id, delay)
+                    finished = False
+                else:
+                    await reported.join()
+                    await asyncio.to_thread(self.store.finish, job.job_id, JobState.FAILED, error=message)
+            except Exception as e:
+                await reported.join()
+                await asyncio.to_thread(
+                    self.store.finish, job.job_id, JobState.FAILED, error=str(e) or type(e).__name__)
+            else:
+                await reported.join()
+                await asyncio.to_thread(self.store.finish, job.job_id, JobState.DONE, result=result)
+        finally:
+            saver.cancel()
+            self._busy_spans.append((self._running.pop(job.job_id), time.monotonic()))
+            self._changed()
+
+        if finished:
+            _remove(job.upload_path)
+            if job.webhook_url:
+                task = asyncio.create_task(self._deliver(job.job_id))
+                self._deliveries.add(task)
+                task.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, job_id: str, attempts: int = 4) -> None:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            return
+        payload = json.dumps({
+            "job_id": job.job_id, "state": job.state.value, "result": job.result, "error": job.error,
+        }).encode("utf-8")
+        status = None
+        for attempt in range(attempts):
+            try:
+                status = await asyncio.to_thread(_post_json, job.webhook_url, payload)
+            except WebhookRejected as e:
+                logger.warning("Webhook for job %s not sent: %s", job_id, e, extra={"job_id": job_id})
+                break
+            except Exception as e:
+                logger.warning("Webhook for job %s failed: %s", job_id, e, extra={"job_id": job_id})
+                status = None
+            # 4xx means the receiver rejected it; sending it again won't help.
+            if status is not None and status < 500:
+                break
+            await asyncio.sleep(2.0 ** attempt)
+        await asyncio.to_thread(self.store.add_event, job_id, {"type": "webhook", "status": status, "at": time.time()})
+        self._changed()
+
+    async def _housekeeping(self) -> None:
+        last_purge = 0.0
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            purge = time.monotonic() - last_purge > 600
+            if purge:
+                last_purge = time.monotonic()
+            try:
+                await asyncio.to_thread(self._tidy, list(self._running), purge)
+                self._work.set()
+            except sqlite3.Error:
+                logger.exception("Job queue housekeeping failed")
+
+    def _tidy(self, running: List[str], purge: bool) -> None:
+        """Runs on a thread: heartbeats, stale jobs and (every 10 minutes) expired ones."""
+        self.store.heartbeat(running)
+        for path in self.store.requeue_stale(self.lease, self.max_attempts):
+            _remove(path)
+        if purge:
+            for path in self.store.purge(self.ttl):
+                _remove(path)
+
+    # --- Metrics ---
+
+    def utilization(self, window: float = 60.0) -> float:
+        """Share of worker time spent running jobs over the last `window` seconds."""
+        now = time.monotonic()
+        start = max(now - window, self._started_at)
+        while self._busy_spans and self._busy_spans[0][1] < start:
+            self._busy_spans.popleft()
+        spans = list(self._busy_spans) + [(begin, now) for begin in self._running.values()]
+        busy = sum(end - max(begin, start) for begin, end in spans)
+        capacity = self.workers * (now - start)
+        return min(1.0, busy / capacity) if capacity > 0 else 0.0
+
+    def metrics(self, window: float = 300.0) -> dict:
+        """Reads the store: call it from a thread (or a plain `def` endpoint)."""
+        counts = self.store.counts()
+        oldest = self.store.oldest_queued()
+        waits = self.store.recent_waits(window)
+        return {
+            "queue_depth": counts[JobState.QUEUED.value],
+            "jobs": counts,
+            "oldest_queued_seconds": round(time.time() - oldest, 3) if oldest else 0.0,
+            "wait_seconds": {
+                "window": window,
+                "count": len(waits),
+                "p50": round(_percentile(waits, 0.50), 3) if waits else None,
+                "p95": round(_percentile(waits, 0.95), 3) if waits else None,
+                "max": round(max(waits), 3) if waits else None,
+            },
+            "workers": {
+                "total": self.workers,
+                "busy": len(self._running),
+                "utilization_60s": round(self.utilization(), 3),
+            },
+        }
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -1,18 +1,20 @@
 # career_forge/engine/llm_analyzer.py
 
-import os
-import json
-import google.generativeai as genai
+import logging
 from pydantic import BaseModel, Field
-from typing import List, Dict
-from dotenv import load_dotenv
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-load_dotenv()
+from .llm_client import get_llm_client, llm_configured
+from .llm_providers import TASK_RESUME_ANALYSIS, LLMError
+from .structured_output import MalformedOutput, parse_json_lenient, read_stream, validate_partial
 
-try:
-    genai.configure(api_key=os.environ.get("GOOGLE_API_KEY"))
-except TypeError:
-    print("GOOGLE_API_KEY environment variable not set. LLM Analyzer will not work.")
+logger = logging.getLogger(__name__)
+
+# The provider and model (LLMClient.model_id) and prompt revision are part of the
+# analysis cache key, so bump PROMPT_VERSION whenever the prompt below changes
+# in a meaningful way.
+# "2": the resume text is compacted before it is sent (see compaction.py).
+PROMPT_VERSION = "2"
 
 
 class ExperienceDetail(BaseModel):
@@ -35,15 +37,51 @@ class LLMAnalysis(BaseModel):
         description="A list of 2-3 key strengths inferred from projects and experience.")
 
 
-def analyze_resume_with_llm(resume_text: str) -> LLMAnalysis:
+# Stand-ins for fields missing from (or invalid in) an otherwise usable LLM
+# answer, e.g. one cut off at the output token limit. The name and title
+# defaults are the ones the prompt asks for.
+ANALYSIS_DEFAULTS = {
+    "user_name": "User",
+    "job_title": "Professional",
+    "summary": "",
+    "suggested_rank": "E",
+    "suggested_level": 1,
+    "skills": {},
+    "experiences": [],
+    "inferred_strengths": [],
+}
+
+
+def parse_analysis(response_text: str) -> LLMAnalysis:
+    """
+    Parses an analysis answer, repairing broken JSON and keeping the valid
+    fields of a partly invalid one. Returns None if nothing is usable.
+    """
+    try:
+        data, repaired = parse_json_lenient(response_text)
+    except MalformedOutput as e:
+        logger.warning("Error parsing LLM response: %s", e)
+        return None
+    analysis, problems = validate_partial(LLMAnalysis, data, ANALYSIS_DEFAULTS)
+    if repaired or problems:
+        logger.info("Repaired the LLM analysis", extra={"json_repaired": repaired, "problems": problems})
+    return analysis
+
+
+# Called with (path, value) for each field of a streamed answer as it completes,
+# e.g. (("user_name",), "Jane Doe") or (("skills", "TechnicalSkills"), ["Python"]).
+FieldCallback = Callable[[Tuple[Any, ...], Any], None]
+
+
+def analyze_resume_with_llm(resume_text: str, on_field: Optional[FieldCallback] = None) -> LLMAnalysis:
     """
     Analyzes resume text using Google's Gemini model to extract structured data and insights.
+    With `on_field`, the answer is streamed and each field is reported as
+    soon as the model has written it.
     """
-    if not os.environ.get("GOOGLE_API_KEY"):
+    if not llm_configured():
         raise ConnectionError("Google AI client is not configured. Please set your GOOGLE_API_KEY.")
 
-    model = genai.GenerativeModel('gemini-2.0-flash')
-
     master_prompt = f"""
     You are an expert tech recruiter analyzing a resume. Provide a structured analysis in a valid JSON format.
 
@@ -76,19 +114,17 @@ def analyze_resume_with_llm(resume_text: str) -> LLMAnalysis:
     }}
     """
 
-    generation_config = genai.types.GenerationConfig(
-        response_mime_type="application/json",
-        temperature=0.0
-    )
-
-    response = model.generate_content(
-        master_prompt,
-        generation_config=generation_config
-    )
-
+    # The shared client handles rate limits, retries, deadlines and the
+    # circuit breaker; LLMUnavailable (a ConnectionError) means it gave up.
     try:
-        analysis_json = json.loads(response.text)
-        return LLMAnalysis(**analysis_json)
-    except (json.JSONDecodeError, TypeError) as e:
-        print(f"Error parsing LLM response: {e}")
-        return None
\ No newline at end of file
+        client = get_llm_client()
+        if on_field is None:
+            response_text = client.generate(master_prompt, temperature=0.0, task=TASK_RESUME_ANALYSIS)
+        else:
+            response_text = read_stream(
+                client.stream(master_prompt, temperature=0.0, task=TASK_RESUME_ANALYSIS), on_field)
+    except LLMError as e:
+        logger.warning("Error calling the LLM: %s", e, extra={"error": type(e).__name__})
+        return None
+
+    return parse_analysis(response_text)
\ No newline at end of file
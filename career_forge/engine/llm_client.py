@@ -0,0 +1,531 @@
+# career_forge/engine/llm_client.py
+
+import json
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Deque, Dict, Iterator, Optional
+
+from career_forge.config import get_settings
+from . import metrics
+from .compaction import estimate_tokens
+from .llm_providers import LLMError, LLMProvider, TransientLLMError, build_provider
+
+# -----------------------------------------------------------------------------
+# The shared LLM client
+# -----------------------------------------------------------------------------
+# Every LLM call in the service goes through one `LLMClient`, which adds
+# what a bare provider call lacks (providers: see llm_providers.py):
+#
+#   caller -> circuit breaker -> RPM/TPM token buckets -> [hedged] attempt
+#                 ^                                            |
+#                 +------ retries with jittered backoff <------+
+#
+# - Providers create their models (SDK) or keep-alive HTTP connections
+#   (REST) once and reuse them instead of opening one per call.
+# - Each call has a deadline covering every retry and the time spent waiting
+#   for rate-limit tokens.
+# - A hedged call sends a second identical request when the first one is
+#   slower than `hedge_after`, and takes whichever answers first.
+# - After `breaker_threshold` failed attempts in a row the breaker opens and
+#   calls fail at once with `CircuitOpen`, so callers can switch to their
+#   fallback (the local analyzer) instead of waiting on a dead service. After
+#   `breaker_reset` seconds a single probe call decides whether to close it.
+#
+# - `stream()` yields the answer in pieces as the model writes it. Retries
+#   and the breaker apply until the first piece arrives; after that a
+#   failure can't be retried without repeating what the caller already got,
+#   so it ends the stream with `LLMUnavailable`. Streams are never hedged.
+#
+# The client is synchronous; callers run it on the executor's I/O threads.
+
+# The default model for both prompts (CAREER_FORGE_LLM_MODEL overrides it).
+MODEL_NAME = "gemini-2.0-flash"
+
+
+class LLMUnavailable(ConnectionError):
+    """The LLM could not be reached in time: retries exhausted, deadline passed or circuit open."""
+
+
+class CircuitOpen(LLMUnavailable):
+    """Raised without calling the LLM while the circuit breaker is open."""
+
+
+def llm_configured() -> bool:
+    """
+    True when there is something to call: an API key, a custom endpoint
+    (e.g. the fake server), or a provider that needs neither.
+    """
+    return get_llm_client().provider.configured()
+
+
+# -----------------------------------------------------------------------------
+# 1. Rate limiting and circuit breaking
+# -----------------------------------------------------------------------------
+
+class TokenBucket:
+    """
+    A thread-safe token bucket refilled at `per_minute / 60` tokens per
+    second, holding at most `burst` tokens. `reserve()` takes tokens right
+    away, possibly going into debt, and returns how long the caller has to
+    wait for them; callers therefore get served in arrival order. A rate of
+    0 disables the bucket.
+    """
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.burst = burst if burst is not None else max(1.0, per_minute / 6.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        if self.rate <= 0:
+            return 0.0
+        # A request larger than the bucket can never fit; let it through at full size.
+        amount = min(amount, self.burst)
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    def try_acquire(self, amount: float) -> bool:
+        """Takes the tokens only if they are available right now."""
+        if self.rate <= 0:
+            return True
+        amount = min(amount, self.burst)
+        with self._lock:
+            self._refill()
+            if self._tokens < amount:
+                return False
+            self._tokens -= amount
+            return True
+
+    def refund(self, amount: float) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + min(amount, self.burst))
+
+    def drain(self) -> None:
+        """Empties the bucket, e.g. when the server says we are over its limit."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+
+class CircuitBreaker:
+    """
+    closed -> (threshold failures in a row) -> open -> (reset_timeout) -> half-open
+    In half-open state a single probe call is let through; its outcome closes
+    or re-opens the circuit. A threshold of 0 disables the breaker.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if not self._probing and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """Gives up the probe slot without a verdict (the probe never reached the LLM)."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+# -----------------------------------------------------------------------------
+# 2. The client
+# -----------------------------------------------------------------------------
+
+class LLMClient:
+    def __init__(
+        self,
+        provider: LLMProvider,
+        model: str = MODEL_NAME,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        rpm: float = 0,
+        tpm: float = 0,
+        hedge_after: float = 0.0,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 8.0,
+        output_tokens: int = 800,
+        hedge_workers: int = 16,
+    ):
+        self.provider = provider
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.hedge_after = hedge_after
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        # Expected response size, charged to the TPM bucket with the prompt.
+        self.output_tokens = output_tokens
+        self._hedge_pool = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="career-forge-hedge") \
+            if hedge_after > 0 else None
+        self._latencies: Deque[float] = deque(maxlen=200)
+        # Time to the first piece of streamed calls.
+        self._first_pieces: Deque[float] = deque(maxlen=200)
+        self._counters: Dict[str, float] = {
+            "calls": 0, "streams": 0, "attempts": 0, "retries": 0, "failures": 0, "rejected": 0,
+            "hedges": 0, "hedge_wins": 0, "throttled_seconds": 0.0,
+            # Estimated tokens of successful calls (see compaction.estimate_tokens).
+            "prompt_tokens": 0, "response_tokens": 0,
+        }
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "LLMClient":
+        settings = get_settings()
+        return cls(
+            build_provider(),
+            model=settings.llm_model,
+            timeout=settings.llm_timeout,
+            max_retries=settings.llm_max_retries,
+            rpm=settings.llm_rpm,
+            tpm=settings.llm_tpm,
+            hedge_after=settings.llm_hedge_after,
+            breaker_threshold=settings.llm_breaker_threshold,
+            breaker_reset=settings.llm_breaker_reset,
+        )
+
+    @property
+    def model_id(self) -> str:
+        """
+        The provider and model, e.g. "gemini:gemini-2.0-flash". Cache keys use
+        it, so synthetic or replayed answers never mix with real ones.
+        """
+        return f"{self.provider.name}:{self.model}"
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    # --- Public API ---
+
+    def generate(self, prompt: str, temperature: float = 0.0, timeout: Optional[float] = None, task: str = "",
+                 schema: Optional[dict] = None) -> str:
+        """
+        Sends one JSON-mode prompt and returns the response text. `task`
+        names the prompt (see llm_providers) for providers that fake or
+        record answers; `schema` constrains the answer to a response schema
+        (see structured_output.py). Raises
+        `LLMError` when the LLM rejects the prompt or answers with nothing
+        usable, and `LLMUnavailable` (a ConnectionError) when no answer
+        arrived within the deadline.
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        cost = self._cost(prompt, schema)
+        self._count("calls")
+        last_error: Optional[TransientLLMError] = None
+
+        for attempt in range(self.max_retries + 1):
+            self._admit(cost, deadline)
+            try:
+                text = self._attempt(prompt, temperature, deadline, cost, task, schema)
+            except TransientLLMError as e:
+                last_error = e
+                if not self._retry_after_failure(e, attempt, deadline):
+                    break
+                continue
+            except LLMError:
+                # The service is up, it just didn't like this prompt.
+                self.breaker.record_success()
+                raise
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
+            self._count_tokens(cost, text, task)
+            return text
+
+        raise LLMUnavailable(f"The LLM did not answer in time ({attempt + 1} attempts): {last_error}")
+
+    def stream(self, prompt: str, temperature: float = 0.0, timeout: Optional[float] = None, task: str = "",
+               schema: Optional[dict] = None) -> Iterator[str]:
+        """
+        Like `generate()`, but yields the response text in pieces as the
+        LLM writes it. Failures before the first piece are retried; a
+        failure after it raises `LLMUnavailable`. Closing the generator
+        early abandons the call.
+        """
+        deadline = time.monotonic() + (timeout or self.timeout)
+        cost = self._cost(prompt, schema)
+        self._count("calls")
+        self._count("streams")
+        last_error: Optional[TransientLLMError] = None
+
+        for attempt in range(self.max_retries + 1):
+            self._admit(cost, deadline)
+            remaining = deadline - time.monotonic()
+            self._count("attempts")
+            started = time.monotonic()
+            pieces = None
+            try:
+                if remaining <= 0:
+                    raise TransientLLMError("The call deadline passed.")
+                pieces = self.provider.stream(self.model, prompt, temperature, remaining, task, schema)
+                first = next(pieces, "")
+            except TransientLLMError as e:
+                self._observe_attempt(task, started, e)
+                if pieces is not None:
+                    pieces.close()
+                last_error = e
+                if not self._retry_after_failure(e, attempt, deadline):
+                    break
+                continue
+            except LLMError as e:
+                self._observe_attempt(task, started, e)
+                self.breaker.record_success()
+                raise
+            except Exception as e:
+                self._observe_attempt(task, started, e)
+                self.breaker.record_failure()
+                raise
+            if not first:
+                self.breaker.record_success()
+                raise LLMError("The LLM returned no text.")
+            first_piece = time.monotonic() - started
+            metrics.LLM_FIRST_PIECE.labels(self.provider.name, task or "-").observe(first_piece)
+            with self._lock:
+                self._first_pieces.append(first_piece)
+
+            # From here on the caller has part of the answer: no more retries.
+            received = [first]
+            try:
+                yield first
+                for piece in pieces:
+                    received.append(piece)
+                    yield piece
+                    if time.monotonic() > deadline:
+                        raise TransientLLMError("The call deadline passed mid-answer.")
+            except TransientLLMError as e:
+                self._observe_attempt(task, started, e)
+                self._count("failures")
+                self.breaker.record_failure()
+                raise LLMUnavailable(f"The LLM answer broke off: {e}")
+            except LLMError as e:
+                self._observe_attempt(task, started, e)
+                self.breaker.record_success()
+                raise
+            finally:
+                pieces.close()
+            self.breaker.record_success()
+            self._observe_attempt(task, started)
+            with self._lock:
+                self._latencies.append(time.monotonic() - started)
+            self._count_tokens(cost, "".join(received), task)
+            return
+
+        raise LLMUnavailable(f"The LLM did not answer in time ({attempt + 1} attempts): {last_error}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            latencies = sorted(self._latencies)
+            first_pieces = sorted(self._first_pieces)
+        counters["throttled_seconds"] = round(counters["throttled_seconds"], 3)
+
+        def percentiles(samples: list) -> dict:
+            def percentile(q: float) -> Optional[float]:
+                return round(samples[min(len(samples) - 1, int(q * len(samples)))], 3) if samples else None
+            return {"p50": percentile(0.50), "p95": percentile(0.95), "samples": len(samples)}
+
+        return {
+            "model": self.model,
+            "provider": self.provider.name,
+            "breaker": self.breaker.state,
+            "latency_seconds": percentiles(latencies),
+            "first_piece_seconds": percentiles(first_pieces),
+            **counters,
+        }
+
+    # --- Internals ---
+
+    def _cost(self, prompt: str, schema: Optional[dict]) -> float:
+        cost = estimate_tokens(prompt) + self.output_tokens
+        if schema is not None:
+            # The schema travels with the prompt and counts against the quota too.
+            cost += estimate_tokens(json.dumps(schema, separators=(",", ":")))
+        return cost
+
+    def _admit(self, cost: float, deadline: float) -> None:
+        """Passes the breaker and the rate limits, or raises."""
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpen("The LLM is failing; calls are paused for a moment.")
+        try:
+            self._throttle(cost, deadline)
+        except LLMUnavailable:
+            self.breaker.release_probe()
+            raise
+
+    def _retry_after_failure(self, error: TransientLLMError, attempt: int, deadline: float) -> bool:
+        """Records a failed attempt and sleeps before the next one; False when there is none."""
+        self._count("failures")
+        self.breaker.record_failure()
+        if error.status == 429:
+            # Over the server's quota: make every caller wait, not just this one.
+            self.requests.drain()
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        delay = max(delay, error.retry_after or 0.0)
+        if attempt == self.max_retries or time.monotonic() + delay >= deadline:
+            return False
+        self._count("retries")
+        time.sleep(delay)
+        return True
+
+    def _throttle(self, cost: float, deadline: float) -> None:
+        wait_requests = self.requests.reserve(1)
+        wait_tokens = self.tokens.reserve(cost)
+        delay = max(wait_requests, wait_tokens)
+        if time.monotonic() + delay >= deadline:
+            self.requests.refund(1)
+            self.tokens.refund(cost)
+            raise LLMUnavailable("The LLM rate limit would delay this call past its deadline.")
+        if delay > 0:
+            self._count("throttled_seconds", delay)
+            time.sleep(delay)
+
+    def _call(self, prompt: str, temperature: float, deadline: float, task: str, schema: Optional[dict]) -> str:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TransientLLMError("The call deadline passed.")
+        self._count("attempts")
+        started = time.monotonic()
+        try:
+            text = self.provider.generate(self.model, prompt, temperature, remaining, task, schema)
+        except Exception as e:
+            self._observe_attempt(task, started, e)
+            raise
+        self._observe_attempt(task, started)
+        with self._lock:
+            self._latencies.append(time.monotonic() - started)
+        return text
+
+    def _observe_attempt(self, task: str, started: float, error: Optional[Exception] = None) -> None:
+        if error is None:
+            outcome = "ok"
+        else:
+            outcome = "transient" if isinstance(error, TransientLLMError) else "error"
+            metrics.record_error("llm", error)
+        metrics.LLM_CALL_DURATION.labels(self.provider.name, task or "-", outcome).observe(time.monotonic() - started)
+
+    def _count_tokens(self, cost: float, text: str, task: str) -> None:
+        prompt_tokens, response_tokens = cost - self.output_tokens, estimate_tokens(text)
+        with self._lock:
+            self._counters["prompt_tokens"] += prompt_tokens
+            self._counters["response_tokens"] += response_tokens
+        metrics.LLM_TOKENS.labels(self.provider.name, task or "-", "prompt").inc(prompt_tokens)
+        metrics.LLM_TOKENS.labels(self.provider.name, task or "-", "response").inc(response_tokens)
+
+    def _attempt(self, prompt: str, temperature: float, deadline: float, cost: float, task: str,
+                 schema: Optional[dict]) -> str:
+        if self._hedge_pool is None or deadline - time.monotonic() <= self.hedge_after:
+            return self._call(prompt, temperature, deadline, task, schema)
+
+        primary = self._hedge_pool.submit(self._call, prompt, temperature, deadline, task, schema)
+        done, _ = wait([primary], timeout=self.hedge_after)
+        # Hedge only when the rate limit has room right now; hedging while
+        # throttled would only make the overload worse.
+        if done or not (self.requests.try_acquire(1) and self.tokens.try_acquire(cost)):
+            return self._result(primary, deadline)
+
+        self._count("hedges")
+        hedge = self._hedge_pool.submit(self._call, prompt, temperature, deadline, task, schema)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count("hedge_wins")
+                    # The slower request keeps running on its thread; its answer is dropped.
+                    return future.result()
+                error = future.exception()
+        raise error or TransientLLMError("The call deadline passed.")
+
+    @staticmethod
+    def _result(future, deadline: float) -> str:
+        done, _ = wait([future], timeout=max(0.0, deadline - time.monotonic()))
+        if not done:
+            raise TransientLLMError("The call deadline passed.")
+        return future.result()
+
+
+# -----------------------------------------------------------------------------
+# 3. Process-wide instance
+# -----------------------------------------------------------------------------
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient.from_settings()
+    return _client
+
+
+def set_llm_client(client: Optional[LLMClient]) -> None:
+    """Replaces the shared client (tests, benchmarks); None rebuilds it from the settings."""
+    global _client
+    with _client_lock:
+        _client = client
@@ -0,0 +1,703 @@
+# career_forge/engine/llm_providers.py
+
+import logging
+import hashlib
+import http.client
+import json
+import os
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from career_forge.config import get_settings
+from .compaction import estimate_tokens
+from .resources import registry
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# LLM providers
+# -----------------------------------------------------------------------------
+# A provider turns one prompt into one response text; everything around the
+# call (rate limits, retries, hedging, the circuit breaker) lives in
+# `LLMClient`, so every provider gets it for free. Which provider runs is
+# configuration (CAREER_FORGE_LLM_PROVIDER, see `build_provider()`):
+#
+#   gemini     Google Gemini through the SDK, or its REST API when
+#              CAREER_FORGE_LLM_BASE_URL is set (e.g. the fake server).
+#   openai     Any OpenAI-compatible chat completions endpoint at
+#              CAREER_FORGE_LLM_BASE_URL: OpenAI, vLLM, Ollama, llama.cpp...
+#   synthetic  Valid, made-up answers after a configurable latency. No
+#              network, no key: for load tests of everything but the LLM.
+#   replay     Answers recorded earlier by CAREER_FORGE_LLM_RECORD_PATH.
+#
+# Setting CAREER_FORGE_LLM_RECORD_PATH with any other provider records every
+# answer to that file (and replays answers already in it).
+
+# The callers' prompts; providers that fake answers need to know what to fake.
+TASK_RESUME_ANALYSIS = "resume_analysis"
+TASK_QUESTS = "quests"
+TASK_ANALYSIS_AND_QUESTS = "analysis_and_quests"
+
+# HTTP statuses worth retrying: rate limited, and transient server errors.
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """The LLM answered, but not usefully (bad request, blocked or empty output). Not retried."""
+
+
+class TransientLLMError(Exception):
+    """One failed attempt that is worth retrying."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class LLMProvider(ABC):
+    """
+    One LLM backend. `generate()` is called from worker threads, so it must
+    be thread-safe. It raises `TransientLLMError` for failures worth a retry
+    (rate limits, 5xx, network errors) and `LLMError` for everything else.
+    `schema` (see structured_output.response_schema) constrains the answer
+    where the backend supports it; the prompt must still describe the shape.
+    """
+
+    # Part of the cache key, so answers of different providers never mix.
+    name: str = "provider"
+
+    @abstractmethod
+    def generate(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+                 schema: Optional[dict] = None) -> str:
+        ...
+
+    def stream(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+               schema: Optional[dict] = None) -> Iterator[str]:
+        """
+        Yields the answer in pieces as it is generated. Errors before the
+        first piece are classified like `generate()`'s. Providers without
+        streaming yield the whole answer at once.
+        """
+        yield self.generate(model, prompt, temperature, timeout, task, schema)
+
+    def configured(self) -> bool:
+        """False when calls cannot work, e.g. without an API key."""
+        return True
+
+
+# -----------------------------------------------------------------------------
+# 1. Gemini
+# -----------------------------------------------------------------------------
+
+def _configure_gemini():
+    """
+    Imports and configures the Gemini SDK. The SDK is slow to import, so this
+    runs on first use (or during start-up warm-up) instead of at import time.
+    """
+    import google.generativeai as genai
+
+    api_key = get_settings().google_api_key
+    if not api_key:
+        logger.warning("GOOGLE_API_KEY environment variable not set. LLM Analyzer will not work.")
+    genai.configure(api_key=api_key or None)
+    return genai
+
+
+gemini_resource = registry.register("gemini_client", _configure_gemini)
+
+
+def get_genai():
+    """Returns the configured `google.generativeai` module."""
+    return gemini_resource.get()
+
+
+def _status_of(error: Exception) -> Optional[int]:
+    # google.api_core exceptions carry the HTTP status as `code`.
+    code = getattr(error, "code", None)
+    return int(code) if isinstance(code, int) else None
+
+
+def _classify(error: Exception) -> Exception:
+    """Turns an SDK exception into a TransientLLMError (worth a retry) or an LLMError."""
+    status = _status_of(error)
+    if status in RETRYABLE_STATUSES or isinstance(error, (TimeoutError, ConnectionError, OSError)):
+        return TransientLLMError(f"{type(error).__name__}: {error}", status)
+    return LLMError(f"{type(error).__name__}: {error}")
+
+
+class GeminiSDKProvider(LLMProvider):
+    """Calls Gemini through `google.generativeai`, reusing one model object per model name."""
+
+    name = "gemini"
+
+    def __init__(self):
+        self._models: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def configured(self) -> bool:
+        return bool(get_settings().google_api_key)
+
+    def _model(self, name: str):
+        model = self._models.get(name)
+        if model is None:
+            with self._lock:
+                model = self._models.get(name)
+                if model is None:
+                    model = self._models[name] = get_genai().GenerativeModel(name)
+        return model
+
+    def _request(self, model: str, prompt: str, temperature: float, timeout: float, schema: Optional[dict],
+                 stream: bool):
+        genai = get_genai()
+        generation_config = genai.types.GenerationConfig(
+            response_mime_type="application/json", temperature=temperature, response_schema=schema
+        )
+        try:
+            return self._model(model).generate_content(
+                prompt, generation_config=generation_config, request_options={"timeout": timeout}, stream=stream
+            )
+        except Exception as e:
+            raise _classify(e)
+
+    def generate(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+                 schema: Optional[dict] = None) -> str:
+        response = self._request(model, prompt, temperature, timeout, schema, stream=False)
+        try:
+            return response.text
+        except ValueError as e:
+            # No candidates, e.g. the prompt was blocked.
+            raise LLMError(f"The LLM returned no text: {e}")
+
+    def stream(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+               schema: Optional[dict] = None) -> Iterator[str]:
+        response = self._request(model, prompt, temperature, timeout, schema, stream=True)
+        try:
+            for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # A chunk without text, e.g. only safety ratings.
+                    continue
+                if text:
+                    yield text
+        except (LLMError, TransientLLMError):
+            raise
+        except Exception as e:
+            raise _classify(e)
+
+
+class KeepAliveHTTP:
+    """JSON POSTs over persistent connections, one per calling thread."""
+
+    def __init__(self, base_url: str):
+        parsed = urlparse(base_url)
+        self.secure = parsed.scheme == "https"
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.prefix = parsed.path.rstrip("/")
+        self._local = threading.local()
+
+    def _connection(self, timeout: float) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.secure else http.client.HTTPConnection
+            connection = self._local.connection = connection_class(self.host, self.port, timeout=timeout)
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection
+
+    def _reset(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+        self._local.connection = None
+
+    def _send(self, path: str, payload: dict, headers: Dict[str, str], timeout: float):
+        """POSTs `payload` and returns the response once its status is OK, classifying failures."""
+        try:
+            connection = self._connection(timeout)
+            connection.request("POST", self.prefix + path, json.dumps(payload),
+                               {"Content-Type": "application/json", **headers})
+            response = connection.getresponse()
+        except (OSError, http.client.HTTPException) as e:
+            # The connection is in an unknown state; open a fresh one next time.
+            self._reset()
+            raise TransientLLMError(f"{type(e).__name__}: {e}")
+
+        if response.status >= 400:
+            data = response.read()
+            if response.status in RETRYABLE_STATUSES:
+                retry_after = response.getheader("Retry-After")
+                raise TransientLLMError(
+                    f"HTTP {response.status}", response.status,
+                    float(retry_after) if retry_after and retry_after.isdigit() else None,
+                )
+            raise LLMError(f"HTTP {response.status}: {data[:200].decode('utf-8', 'replace')}")
+        return response
+
+    def post_json(self, path: str, payload: dict, headers: Dict[str, str], timeout: float) -> dict:
+        """POSTs `payload` and returns the decoded answer."""
+        response = self._send(path, payload, headers, timeout)
+        try:
+            data = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            self._reset()
+            raise TransientLLMError(f"{type(e).__name__}: {e}")
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise LLMError(f"Unexpected response from the LLM: {e}")
+
+    def post_events(self, path: str, payload: dict, headers: Dict[str, str], timeout: float) -> Iterator[dict]:
+        """
+        POSTs `payload` and yields the decoded `data:` lines of the
+        server-sent events answer as they arrive. Stops at `data: [DONE]`.
+        """
+        response = self._send(path, payload, headers, timeout)
+        finished = False
+        try:
+            while True:
+                line = response.readline()
+                if not line:
+                    finished = True
+                    return
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    # Drain the rest so the connection can be reused.
+                    response.read()
+                    finished = True
+                    return
+                try:
+                    yield json.loads(data)
+                except ValueError as e:
+                    raise LLMError(f"Unexpected response from the LLM: {e}")
+        except (OSError, http.client.HTTPException) as e:
+            raise TransientLLMError(f"{type(e).__name__}: {e}")
+        finally:
+            if not finished:
+                # Abandoned or broken mid-answer: the connection can't be reused.
+                self._reset()
+
+
+class GeminiRESTProvider(LLMProvider):
+    """
+    Calls the Gemini REST API (`POST {base}/v1beta/models/{model}:generateContent`).
+    Also talks to the fake server in benchmarks/fake_llm_server.py.
+    """
+
+    name = "gemini"
+
+    def __init__(self, base_url: str, api_key: str = ""):
+        self.http = KeepAliveHTTP(base_url)
+        self.api_key = api_key
+
+    def _request(self, prompt: str, temperature: float, schema: Optional[dict]):
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {"temperature": temperature, "responseMimeType": "application/json"},
+        }
+        if schema is not None:
+            payload["generationConfig"]["responseSchema"] = schema
+        headers = {"x-goog-api-key": self.api_key} if self.api_key else {}
+        return payload, headers
+
+    @staticmethod
+    def _text(answer: dict) -> str:
+        try:
+            candidate = answer["candidates"][0]
+            return "".join(part.get("text", "") for part in candidate["content"]["parts"])
+        except (KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"Unexpected response from the LLM: {e}")
+
+    def generate(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+                 schema: Optional[dict] = None) -> str:
+        payload, headers = self._request(prompt, temperature, schema)
+        answer = self.http.post_json(f"/v1beta/models/{model}:generateContent", payload, headers, timeout)
+        text = self._text(answer)
+        if not text:
+            raise LLMError("The LLM returned no text.")
+        return text
+
+    def stream(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+               schema: Optional[dict] = None) -> Iterator[str]:
+        payload, headers = self._request(prompt, temperature, schema)
+        events = self.http.post_events(
+            f"/v1beta/models/{model}:streamGenerateContent?alt=sse", payload, headers, timeout)
+        for event in events:
+            # The last event may only carry the finish reason and usage.
+            if not event.get("candidates"):
+                continue
+            text = self._text(event)
+            if text:
+                yield text
+
+
+# -----------------------------------------------------------------------------
+# 2. OpenAI-compatible servers
+# -----------------------------------------------------------------------------
+
+class OpenAICompatibleProvider(LLMProvider):
+    """
+    Calls `POST {base}/chat/completions` in JSON mode. The base URL usually
+    ends in /v1 (e.g. http://127.0.0.1:11434/v1 for Ollama).
+    """
+
+    name = "openai"
+
+    def __init__(self, base_url: str, api_key: str = ""):
+        self.http = KeepAliveHTTP(base_url)
+        self.api_key = api_key
+
+    def _request(self, model: str, prompt: str, temperature: float, task: str, schema: Optional[dict]):
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "response_format": {"type": "json_object"},
+        }
+        if schema is not None:
+            payload["response_format"] = {
+                "type": "json_schema", "json_schema": {"name": task or "response", "schema": schema},
+            }
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        return payload, headers
+
+    def generate(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+                 schema: Optional[dict] = None) -> str:
+        payload, headers = self._request(model, prompt, temperature, task, schema)
+        answer = self.http.post_json("/chat/completions", payload, headers, timeout)
+        try:
+            text = answer["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"Unexpected response from the LLM: {e}")
+        if not text:
+            raise LLMError("The LLM returned no text.")
+        return text
+
+    def stream(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+               schema: Optional[dict] = None) -> Iterator[str]:
+        payload, headers = self._request(model, prompt, temperature, task, schema)
+        payload["stream"] = True
+        for event in self.http.post_events("/chat/completions", payload, headers, timeout):
+            try:
+                text = (event["choices"][0].get("delta") or {}).get("content")
+            except (KeyError, IndexError, TypeError, AttributeError) as e:
+                raise LLMError(f"Unexpected response from the LLM: {e}")
+            if text:
+                yield text
+
+
+# -----------------------------------------------------------------------------
+# 3. Synthetic answers
+# -----------------------------------------------------------------------------
+
+class LatencyDistribution:
+    """
+    Parsed from a spec like `constant:0.3`, `uniform:0.2,0.8`,
+    `normal:0.5,0.1`, `lognormal:0.8,0.4` (median, sigma) or
+    `exponential:0.5` (mean). Samples are in seconds and never negative.
+    """
+
+    KINDS = {"constant": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+
+    def __init__(self, spec: str):
+        kind, _, raw = spec.strip().partition(":")
+        kind = kind.lower()
+        try:
+            params = [float(value) for value in raw.split(",") if value.strip()]
+        except ValueError:
+            params = []
+        if kind not in self.KINDS or len(params) != self.KINDS[kind]:
+            raise ValueError(
+                f"Invalid latency distribution: {spec!r}. Use e.g. constant:0.3, uniform:0.2,0.8, "
+                "normal:0.5,0.1, lognormal:0.8,0.4 or exponential:0.5."
+            )
+        self.spec = spec
+        self.kind = kind
+        self.params = params
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        if self.kind == "constant":
+            value = p[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            value = rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            value = p[0] * rng.lognormvariate(0, p[1])
+        else:
+            value = rng.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+        return max(0.0, value)
+
+
+# Words the synthetic analysis recognizes as skills, by category.
+_SYNTHETIC_SKILLS = {
+    "TechnicalSkills": ["Python", "Java", "JavaScript", "TypeScript", "SQL", "Django", "React", "AWS",
+                        "Docker", "Kubernetes", "PostgreSQL", "Git", "Agile", "Scrum", "Linux"],
+    "SoftSkills": ["Leadership", "Communication", "Teamwork", "Mentoring"],
+    "Intelligence": ["Problem Solving", "Data Analysis", "Critical Thinking"],
+}
+
+
+# Characters per streamed piece: a few tokens, like real streaming APIs send.
+_SYNTHETIC_CHUNK = 16
+
+
+def _resume_block(prompt: str) -> str:
+    # Both prompts put their input between the first pair of --- lines.
+    parts = prompt.split("---")
+    return parts[1] if len(parts) >= 3 else prompt
+
+
+class SyntheticProvider(LLMProvider):
+    """
+    Sleeps for a sample of `latency` plus `token_latency` seconds per output
+    token, then answers with valid JSON shaped by the task: an analysis that
+    picks the name and known skills out of the resume text, a short quest
+    list, or both in one object. `error_rate` of the calls fail with a
+    retryable 503 instead. Seeded, so runs are reproducible.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, latency: str = "lognormal:0.8,0.35", error_rate: float = 0.0, seed: Optional[int] = 0,
+                 token_latency: float = 0.0):
+        self.latency = LatencyDistribution(latency)
+        self.error_rate = error_rate
+        self.token_latency = token_latency
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self) -> Tuple[float, bool]:
+        with self._lock:
+            return self.latency.sample(self._rng), self._rng.random() < self.error_rate
+
+    def _answer(self, prompt: str, task: str) -> str:
+        if task == TASK_ANALYSIS_AND_QUESTS:
+            analysis = self._analysis(prompt)
+            return json.dumps({**analysis, "quests": self._quests_for(analysis["skills"])})
+        if task == TASK_QUESTS or "Quest Master" in prompt:
+            return json.dumps(self._quests(prompt))
+        return json.dumps(self._analysis(prompt))
+
+    def generate(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+                 schema: Optional[dict] = None) -> str:
+        answer = self._answer(prompt, task)
+        delay, fail = self._draw()
+        # Real models take longer for longer answers.
+        delay += self.token_latency * estimate_tokens(answer)
+        if delay >= timeout:
+            time.sleep(timeout)
+            raise TransientLLMError("Synthetic call timed out.")
+        time.sleep(delay)
+        if fail:
+            raise TransientLLMError("Synthetic failure", status=503)
+        return answer
+
+    def stream(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+               schema: Optional[dict] = None) -> Iterator[str]:
+        # The latency sample is the time to the first piece; the rest arrives
+        # at `token_latency` per token, like a real model decoding.
+        answer = self._answer(prompt, task)
+        delay, fail = self._draw()
+        if delay >= timeout:
+            time.sleep(timeout)
+            raise TransientLLMError("Synthetic call timed out.")
+        time.sleep(delay)
+        if fail:
+            raise TransientLLMError("Synthetic failure", status=503)
+        for start in range(0, len(answer), _SYNTHETIC_CHUNK):
+            piece = answer[start:start + _SYNTHETIC_CHUNK]
+            if self.token_latency:
+                time.sleep(self.token_latency * estimate_tokens(piece))
+            yield piece
+
+    @staticmethod
+    def _analysis(prompt: str) -> dict:
+        text = _resume_block(prompt)
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        lowered = text.lower()
+        skills = {
+            category: [skill for skill in names if re.search(rf"\b{re.escape(skill.lower())}\b", lowered)]
+            for category, names in _SYNTHETIC_SKILLS.items()
+        }
+        # Stable per resume, so the same resume always gets the same rank.
+        seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+        return {
+            "user_name": lines[0] if lines else "User",
+            "job_title": lines[1] if len(lines) > 1 else "Professional",
+            "summary": "A synthetic summary generated for load testing.",
+            "suggested_rank": "EDCBAS"[seed % 6],
+            "suggested_level": 1 + seed % 99,
+            "skills": skills,
+            "experiences": [
+                {"category": "Project", "title": line[:60], "organization": "N/A",
+                 "description": "A synthetic experience generated for load testing."}
+                for line in lines[2:4]
+            ],
+            "inferred_strengths": [skill for names in skills.values() for skill in names][:3],
+        }
+
+    @classmethod
+    def _quests(cls, prompt: str) -> list:
+        try:
+            skills = json.loads(_resume_block(prompt)).get("skills", {})
+        except (ValueError, AttributeError):
+            skills = {}
+        return cls._quests_for(skills)
+
+    @staticmethod
+    def _quests_for(skills: Dict[str, list]) -> list:
+        names = [skill for category in skills.values() for skill in category]
+        skill = names[0] if names else "Problem Solving"
+        return [
+            {"title": f"Daily {skill} Practice", "description": f"Spend 30 minutes practicing {skill}.",
+             "category": "TechnicalSkills", "rewards": [f"+50 XP {skill}"]},
+            {"title": "Weekly Challenge: Ship Something", "description": "Finish and publish one small project.",
+             "category": "TechnicalSkills", "rewards": ["+100 XP Delivery"]},
+        ]
+
+
+# -----------------------------------------------------------------------------
+# 4. Record and replay
+# -----------------------------------------------------------------------------
+
+class RecordReplayProvider(LLMProvider):
+    """
+    Keeps prompt -> response pairs in a JSON Lines file ("cassette"), keyed
+    by a hash of the task, model, temperature and prompt.
+
+    - With an `inner` provider, recorded answers are replayed and new
+      prompts go to `inner`, whose answers are appended to the file.
+    - Without one, only recorded answers are served; an unknown prompt is
+      an `LLMError`.
+
+    With `replay_latency`, replayed answers take as long as the original
+    call did, which keeps load tests realistic. The file holds model output
+    derived from resumes: treat it as sensitive data.
+    """
+
+    def __init__(self, path: str, inner: Optional[LLMProvider] = None, replay_latency: bool = False):
+        self.path = path
+        self.inner = inner
+        self.replay_latency = replay_latency
+        self.name = f"replay+{inner.name}" if inner else "replay"
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def key(task: str, model: str, temperature: float, prompt: str, schema: Optional[dict] = None) -> str:
+        key = f"{task}|{model}|{temperature}|{prompt}"
+        if schema is not None:
+            key = f"{json.dumps(schema, sort_keys=True)}|{key}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry["key"]] = (entry["response"], entry.get("latency", 0.0))
+                except (ValueError, KeyError):
+                    # A torn last line from an interrupted recording.
+                    continue
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generate(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+                 schema: Optional[dict] = None) -> str:
+        key = self.key(task, model, temperature, prompt, schema)
+        recorded = self._entries.get(key)
+        if recorded is not None:
+            response, latency = recorded
+            if self.replay_latency:
+                time.sleep(min(latency, timeout))
+            return response
+        if self.inner is None:
+            raise LLMError(f"No recorded LLM response for this {task or 'prompt'} in {self.path}.")
+
+        started = time.monotonic()
+        response = self.inner.generate(model, prompt, temperature, timeout, task, schema)
+        self._record(key, task, model, temperature, response, time.monotonic() - started)
+        return response
+
+    def stream(self, model: str, prompt: str, temperature: float, timeout: float, task: str = "",
+               schema: Optional[dict] = None) -> Iterator[str]:
+        key = self.key(task, model, temperature, prompt, schema)
+        recorded = self._entries.get(key)
+        if recorded is not None:
+            response, latency = recorded
+            if self.replay_latency:
+                time.sleep(min(latency, timeout))
+            yield response
+            return
+        if self.inner is None:
+            raise LLMError(f"No recorded LLM response for this {task or 'prompt'} in {self.path}.")
+
+        started = time.monotonic()
+        pieces = []
+        for piece in self.inner.stream(model, prompt, temperature, timeout, task, schema):
+            pieces.append(piece)
+            yield piece
+        # Only complete answers are recorded; an abandoned stream records nothing.
+        self._record(key, task, model, temperature, "".join(pieces), time.monotonic() - started)
+
+    def _record(self, key: str, task: str, model: str, temperature: float, response: str, latency: float) -> None:
+        with self._lock:
+            self._entries[key] = (response, latency)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "key": key, "task": task, "model": model, "temperature": temperature,
+                    "latency": round(latency, 4), "recorded_at": time.time(), "response": response,
+                }, ensure_ascii=False) + "\n")
+
+
+# -----------------------------------------------------------------------------
+# 5. Configuration
+# -----------------------------------------------------------------------------
+
+def build_provider() -> LLMProvider:
+    """Builds the provider chosen by CAREER_FORGE_LLM_PROVIDER (see the top of this module)."""
+    settings = get_settings()
+    kind = settings.llm_provider
+    if kind == "gemini":
+        if settings.llm_base_url:
+            provider = GeminiRESTProvider(settings.llm_base_url, settings.google_api_key)
+        else:
+            provider = GeminiSDKProvider()
+    elif kind == "openai":
+        if not settings.llm_base_url:
+            raise ValueError("The openai provider needs CAREER_FORGE_LLM_BASE_URL.")
+        provider = OpenAICompatibleProvider(settings.llm_base_url, settings.llm_api_key)
+    elif kind == "synthetic":
+        provider = SyntheticProvider(
+            settings.llm_synthetic_latency, settings.llm_synthetic_error_rate, settings.llm_synthetic_seed
+        )
+    elif kind == "replay":
+        if not settings.llm_record_path:
+            raise ValueError("The replay provider needs CAREER_FORGE_LLM_RECORD_PATH.")
+        return RecordReplayProvider(settings.llm_record_path, replay_latency=settings.llm_replay_latency)
+    else:
+        raise ValueError(f"Unknown LLM provider: {kind}. Use gemini, openai, synthetic or replay.")
+
+    if settings.llm_record_path:
+        provider = RecordReplayProvider(settings.llm_record_path, provider, settings.llm_replay_latency)
+    return provider
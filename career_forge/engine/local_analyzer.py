@@ -0,0 +1,338 @@
+# career_forge/engine/local_analyzer.py
+
+import datetime
+import re
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+from career_forge.config import get_settings
+from .compaction import clean_lines, split_sections
+from .feature_extractor import extract_features, get_skill_matcher
+from .llm_analyzer import ExperienceDetail, LLMAnalysis
+from .llm_client import llm_configured
+from .parser import ParsedResume, ProcessingProfile, parse_text
+
+# -----------------------------------------------------------------------------
+# A rule-based analyzer that never calls the LLM
+# -----------------------------------------------------------------------------
+# It fills in the same LLMAnalysis the Gemini prompt produces, from the spaCy
+# skill matcher and NER plus a few layout heuristics. The result is rougher
+# than the LLM's, but it is deterministic, free, and takes milliseconds, so it
+# works without an API key and as an instant preview in hybrid mode.
+
+
+class AnalysisMode(str, Enum):
+    """Which analyzer answers a request."""
+    # Rule-based only; no LLM calls at all.
+    LOCAL = "local"
+    # Gemini only (the original behaviour).
+    LLM = "llm"
+    # Return the local result right away and the LLM result when it arrives.
+    HYBRID = "hybrid"
+
+
+def default_analysis_mode() -> AnalysisMode:
+    """
+    CAREER_FORGE_ANALYSIS_MODE, or `llm` when the LLM provider is configured
+    (an API key, a custom endpoint or a provider that needs neither) and
+    `local` otherwise.
+    """
+    settings = get_settings()
+    if settings.analysis_mode:
+        return AnalysisMode(settings.analysis_mode)
+    return AnalysisMode.LLM if llm_configured() else AnalysisMode.LOCAL
+
+
+# -----------------------------------------------------------------------------
+# 1. Skills
+# -----------------------------------------------------------------------------
+
+SOFT_SKILL_CATEGORY = "SOFT_SKILL"
+
+# Skills the LLM prompt files under "Intelligence" rather than technical/soft.
+INTELLIGENCE_SKILLS = {"Problem Solving", "Critical Thinking", "Strategic Thinking", "Data Analysis"}
+
+# Readable names for the taxonomy categories, used in strengths and summaries.
+CATEGORY_LABELS = {
+    "PROGRAMMING": "Programming",
+    "WEB_DEVELOPMENT": "Web development",
+    "DATABASE": "Databases",
+    "AI_MACHINE_LEARNING": "AI and machine learning",
+    "DATA_SCIENCE": "Data science",
+    "DEVOPS_CLOUD": "DevOps and cloud",
+    "MOBILE_DEVELOPMENT": "Mobile development",
+    "ARCHITECTURE_DESIGN": "Software architecture",
+    "DESIGN_UI_UX": "UI/UX design",
+    "TESTING_QA": "Testing and QA",
+    "CYBER_SECURITY": "Cyber security",
+    "BUSINESS_TOOLS": "Business tools",
+    "PROJECT_MANAGEMENT_TOOLS": "Project management",
+    SOFT_SKILL_CATEGORY: "Interpersonal skills",
+}
+
+
+def _bucket_skills(found: Dict[str, List[str]], weight: Callable[[str], float]) -> Dict[str, List[str]]:
+    """
+    Maps taxonomy categories onto the three buckets of the LLM analysis.
+    Within a bucket, skills from the main sections come before those only
+    mentioned under hobbies and the like.
+    """
+    buckets: Dict[str, List[str]] = {"TechnicalSkills": [], "SoftSkills": [], "Intelligence": []}
+    for category, names in found.items():
+        for name in names:
+            if name in INTELLIGENCE_SKILLS:
+                bucket = "Intelligence"
+            elif category == SOFT_SKILL_CATEGORY:
+                bucket = "SoftSkills"
+            else:
+                bucket = "TechnicalSkills"
+            if name not in buckets[bucket]:
+                buckets[bucket].append(name)
+    for names in buckets.values():
+        names.sort(key=lambda name: -weight(name))
+    return buckets
+
+
+def _top_categories(found: Dict[str, List[str]], limit: int) -> List[str]:
+    technical = [(len(names), category) for category, names in found.items() if category != SOFT_SKILL_CATEGORY]
+    # Ties go to the category that comes first in the taxonomy.
+    technical.sort(key=lambda item: -item[0])
+    return [CATEGORY_LABELS.get(category, category.replace("_", " ").title()) for _, category in technical[:limit]]
+
+
+# -----------------------------------------------------------------------------
+# 2. Name and job title from the top of the resume
+# -----------------------------------------------------------------------------
+
+HEADER_LINES = 6
+
+TITLE_WORDS = {
+    "engineer", "developer", "programmer", "student", "graduate", "intern", "manager", "analyst",
+    "scientist", "designer", "architect", "consultant", "specialist", "administrator", "lead",
+    "researcher", "director", "founder", "officer", "teacher", "technician", "tester", "devops",
+}
+
+_NAME_WORD = re.compile(r"^[A-Z][A-Za-z.'\-]*$")
+
+
+def _looks_like_name(line: str) -> bool:
+    words = line.split()
+    if not 2 <= len(words) <= 4:
+        return False
+    if any(word.casefold() in TITLE_WORDS for word in words):
+        return False
+    return all(_NAME_WORD.match(word) for word in words)
+
+
+def _find_name(header: List[str], resume: ParsedResume) -> str:
+    for line in header:
+        if _looks_like_name(line):
+            return line.title() if line.isupper() else line
+    # Fall back to the first PERSON entity near the top.
+    if resume.entities:
+        limit = sum(len(line) + 1 for line in header)
+        for ent in resume.entities:
+            if ent.label == "PERSON" and ent.start_char <= limit:
+                return ent.text
+    return "User"
+
+
+def _find_job_title(header: List[str], name: str) -> Optional[str]:
+    for line in header:
+        if line == name or "@" in line:
+            continue
+        # Headlines are often "Software Engineer | Python | AWS".
+        for part in re.split(r"\s*[|•·]\s*", line):
+            words = part.split()
+            if 0 < len(words) <= 8 and any(word.strip(",.").casefold() in TITLE_WORDS for word in words):
+                return part
+    return None
+
+
+# -----------------------------------------------------------------------------
+# 3. Experiences and date spans
+# -----------------------------------------------------------------------------
+
+# Section heading keyword -> ExperienceDetail.category, first match wins.
+EXPERIENCE_SECTIONS: List[Tuple[str, str]] = [
+    ("intern", "Internship"),
+    ("experience", "Work Experience"),
+    ("employment", "Work Experience"),
+    ("project", "Project"),
+    ("leadership", "Leadership Role"),
+    ("responsibilit", "Leadership Role"),
+    ("volunteer", "Leadership Role"),
+    ("activities", "Leadership Role"),
+    ("achievement", "Achievement"),
+    ("award", "Achievement"),
+    ("honor", "Achievement"),
+]
+
+# Only these sections count towards years of experience (not education).
+WORK_CATEGORIES = {"Work Experience", "Internship"}
+
+MAX_EXPERIENCES = 10
+
+_YEAR_SPAN = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|today|date)\b",
+    re.IGNORECASE,
+)
+_ENTRY_SEPARATOR = re.compile(r"\s+(?:-|–|—|\||@|at)\s+")
+
+
+def _section_category(heading: Optional[str]) -> Optional[str]:
+    if not heading:
+        return None
+    heading = heading.casefold()
+    for keyword, category in EXPERIENCE_SECTIONS:
+        if keyword in heading:
+            return category
+    return None
+
+
+def _year_spans(lines: List[str]) -> List[Tuple[int, int]]:
+    this_year = datetime.date.today().year
+    spans = []
+    for line in lines:
+        for start, end in _YEAR_SPAN.findall(line):
+            end_year = int(end) if end[:1].isdigit() else this_year
+            if int(start) <= end_year:
+                spans.append((int(start), end_year))
+    return spans
+
+
+def _years_covered(spans: List[Tuple[int, int]]) -> int:
+    """Total years covered by the spans, counting overlapping jobs once."""
+    total, current_end = 0, None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end:
+            total += end - start
+            current_end = end
+        elif end > current_end:
+            total += end - current_end
+            current_end = end
+    return total
+
+
+def _is_entry_header(line: str) -> bool:
+    # Titles are short and don't read like a sentence; dates and separators
+    # such as "Engineer - Acme" or "Intern | Beta" are strong hints.
+    if _YEAR_SPAN.search(line) or _ENTRY_SEPARATOR.search(line):
+        return True
+    return len(line.split()) <= 8 and not line.endswith(".")
+
+
+def _organization(line: str, resume: ParsedResume, offset: int) -> str:
+    if resume.entities:
+        for ent in resume.entities:
+            if ent.label == "ORG" and offset <= ent.start_char < offset + len(line):
+                return ent.text
+    parts = _ENTRY_SEPARATOR.split(_YEAR_SPAN.sub("", line).strip(" ,()"))
+    return parts[1].strip(" ,()") if len(parts) > 1 and parts[1].strip(" ,()") else "N/A"
+
+
+def _experiences(sections, resume: ParsedResume) -> Tuple[List[ExperienceDetail], List[Tuple[int, int]]]:
+    experiences: List[ExperienceDetail] = []
+    work_spans: List[Tuple[int, int]] = []
+    for heading, body in sections:
+        category = _section_category(heading)
+        if category is None:
+            continue
+        if category in WORK_CATEGORIES:
+            work_spans.extend(_year_spans(body))
+
+        current: Optional[dict] = None
+        for line in body:
+            if _is_entry_header(line) or current is None:
+                if current is not None:
+                    experiences.append(ExperienceDetail(**current))
+                title = _ENTRY_SEPARATOR.split(_YEAR_SPAN.sub("", line).strip(" ,()"))[0].strip(" ,()") or line
+                current = {
+                    "category": category,
+                    "title": title,
+                    "organization": _organization(line, resume, resume.raw_text.find(line)),
+                    "description": line,
+                }
+            elif current["description"] == current["title"] or _is_entry_header(current["description"]):
+                # The first detail line describes the entry better than its header.
+                current["description"] = re.split(r"(?<=[.!?])\s", line, maxsplit=1)[0]
+        if current is not None:
+            experiences.append(ExperienceDetail(**current))
+    return experiences[:MAX_EXPERIENCES], work_spans
+
+
+# -----------------------------------------------------------------------------
+# 4. Rank and level
+# -----------------------------------------------------------------------------
+
+# (rank, lowest score) from the top down; the level is the position in the band.
+RANK_BANDS = [("S", 95), ("A", 70), ("B", 45), ("C", 25), ("D", 10), ("E", 0)]
+MAX_SCORE = 120
+
+
+def suggest_rank(years: int, technical_skills: int, soft_skills: int) -> Tuple[str, int]:
+    """
+    Scores experience and skill breadth: six points per year of work, two per
+    technical skill (up to 40) and one per soft skill (up to 10).
+    """
+    score = min(MAX_SCORE, years * 6 + min(40, technical_skills * 2) + min(10, soft_skills))
+    upper = MAX_SCORE
+    for rank, lower in RANK_BANDS:
+        if score >= lower:
+            level = 1 + int(98 * (score - lower) / max(1, upper - lower))
+            return rank, min(99, level)
+        upper = lower
+    return "E", 1
+
+
+# -----------------------------------------------------------------------------
+# 5. Putting it together
+# -----------------------------------------------------------------------------
+
+def analyze_parsed_resume(resume: ParsedResume) -> LLMAnalysis:
+    """Builds an LLMAnalysis from a resume parsed with the NER profile."""
+    features = extract_features(resume)
+    lines, _ = clean_lines(resume.raw_text)
+    sections = split_sections(lines)
+    header = (sections[0][1] if sections and sections[0][0] is None else lines)[:HEADER_LINES]
+
+    name = _find_name(header, resume)
+    experiences, work_spans = _experiences(sections, resume)
+    job_title = _find_job_title(header, name) or (experiences[0].title if experiences else "Aspiring Professional")
+
+    skills = _bucket_skills(features.skills, features.skill_weight)
+    years = _years_covered(work_spans)
+    # Skills seen only in minor sections count for less towards the rank.
+    technical = round(sum(features.skill_weight(name) for name in skills["TechnicalSkills"]))
+    rank, level = suggest_rank(years, technical, len(skills["SoftSkills"]))
+    top = _top_categories(features.skills, 3)
+
+    summary = f"{job_title} with {sum(len(names) for names in skills.values())} identified skills"
+    summary += f", strongest in {' and '.join(top[:2])}." if top else "."
+    if years:
+        summary += f" About {years} year{'s' if years != 1 else ''} of work experience."
+    if experiences:
+        summary += f" Lists {len(experiences)} experience{'s' if len(experiences) != 1 else ''} and projects."
+
+    return LLMAnalysis(
+        user_name=name,
+        job_title=job_title,
+        summary=summary,
+        suggested_rank=rank,
+        suggested_level=level,
+        skills=skills,
+        experiences=experiences,
+        inferred_strengths=[f"{label} skills" for label in top] or ["Eagerness to learn"],
+    )
+
+
+def analyze_resume_locally(resume_text: str) -> LLMAnalysis:
+    """
+    Drop-in replacement for `analyze_resume_with_llm` that runs entirely on
+    this machine. Needs the spaCy model (for NER and the skill matcher);
+    raises RuntimeError if it isn't installed.
+    """
+    # Fail early with a clear message instead of deep inside feature extraction.
+    get_skill_matcher()
+    # The skill matcher reads the Doc, so keep the one NER builds rather than rebuilding it.
+    return analyze_parsed_resume(parse_text(resume_text, ProcessingProfile.NER, keep_doc=True))
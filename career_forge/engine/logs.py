@@ -0,0 +1,88 @@
+# career_forge/engine/logs.py
+
+import json
+import logging
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+from career_forge.config import get_settings
+
+# -----------------------------------------------------------------------------
+# Structured logs
+# -----------------------------------------------------------------------------
+# Every module logs through `logging.getLogger(__name__)`; the records of the
+# `career_forge` loggers go to stderr as one JSON object per line:
+#
+#   {"ts": "2025-01-01T12:00:00.123Z", "level": "WARNING", "logger": "career_forge.engine.llm_analyzer",
+#    "message": "Repaired the LLM analysis", "request_id": "3f2a9c1e5b7d4e60", "problems": "..."}
+#
+# Fields passed with `extra={...}` become keys of the object. The request ID
+# comes from the `X-Request-ID` header (or is generated) in the HTTP
+# middleware and follows the request into its tasks and the executor's I/O
+# threads, so every line of one request can be found with one filter.
+# CAREER_FORGE_LOG_FORMAT=text switches to plain lines for local development.
+
+# The ID of the request being served; "" outside of requests.
+request_id: ContextVar[str] = ContextVar("request_id", default="")
+
+# Attributes every LogRecord has; anything else on a record came from `extra`.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """Keeps a sane incoming ID (so IDs match across services), else makes a new one."""
+    if incoming and len(incoming) <= 64 and all(char.isalnum() or char in "-_." for char in incoming):
+        return incoming
+    return uuid.uuid4().hex[:16]
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        current_request = request_id.get()
+        if current_request:
+            entry["request_id"] = current_request
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _RequestIDFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get() or "-"
+        return True
+
+
+def configure_logging() -> None:
+    """
+    Sends the `career_forge` loggers to stderr at CAREER_FORGE_LOG_LEVEL in
+    the CAREER_FORGE_LOG_FORMAT format. Safe to call more than once.
+    """
+    settings = get_settings()
+    logger = logging.getLogger("career_forge")
+    for handler in list(logger.handlers):
+        if getattr(handler, "_career_forge", False):
+            logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(sys.stderr)
+    handler._career_forge = True
+    if settings.log_format == "text":
+        handler.addFilter(_RequestIDFilter())
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+    else:
+        handler.setFormatter(JSONFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(settings.log_level)
+    # Uvicorn configures the root logger too; don't print every line twice.
+    logger.propagate = False
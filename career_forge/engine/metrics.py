@@ -0,0 +1,307 @@
+# career_forge/engine/metrics.py
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# -----------------------------------------------------------------------------
+# Metrics
+# -----------------------------------------------------------------------------
+# Counters, gauges and histograms in the Prometheus text format, served by
+# GET /metrics (career_forge/api/endpoints/metrics.py). A small in-house
+# version instead of prometheus_client: the service needs three metric types
+# and one output format, and every update has to stay cheap enough to leave
+# on in production: a dict lookup for the label values, a lock and (for
+# histograms) a bisect over the bucket bounds, about a microsecond.
+#
+# Everything that is already counted elsewhere (LLM client, executor, job
+# queue) is read when /metrics is scraped, through collectors, instead of
+# being counted twice.
+#
+# Only processes that serve HTTP are scraped: work done in the parse worker
+# processes is measured there and reported back with the result (see
+# `ParsedResume.timings`).
+
+# Seconds; from a cache hit (~1 ms) to a slow LLM call with retries.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[str, ...]
+# (metric name, type, help, [(label names and values, value)])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# -----------------------------------------------------------------------------
+# 1. Metric types
+# -----------------------------------------------------------------------------
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Labels, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def labels(self, *values: str):
+        """The child for one combination of label values, created on first use."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {key}.")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _items(self) -> List[Tuple[Dict[str, str], object]]:
+        with self._lock:
+            children = list(self._children.items())
+        return [(dict(zip(self.labelnames, key)), child) for key, child in children]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, child in self._items():
+            lines.extend(self._render_child(labels, child))
+        return lines
+
+    def _render_child(self, labels: Dict[str, str], child) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(child.value)}"]
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    """A value that only goes up, e.g. requests served."""
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, e.g. requests in flight."""
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # One count per bucket, plus +Inf; cumulated when rendered.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    """Observations (usually durations in seconds) counted into buckets."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def _render_child(self, labels: Dict[str, str], child: _HistogramValue) -> List[str]:
+        with child._lock:
+            counts, total = list(child.counts), child.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            bucket_labels = {**labels, "le": _format_value(bound)}
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+# -----------------------------------------------------------------------------
+# 2. Registry
+# -----------------------------------------------------------------------------
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """`collector()` is called on every scrape and returns metric families to add."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics, collectors = list(self._metrics.values()), list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                # A broken collector must not take the other metrics down with it.
+                families = [("career_forge_collector_errors", "gauge", "Collectors that failed on this scrape.",
+                             [({"collector": getattr(collector, "__name__", "?"), "error": type(e).__name__}, 1)])]
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# -----------------------------------------------------------------------------
+# 3. The service's metrics
+# -----------------------------------------------------------------------------
+
+HTTP_REQUESTS = counter(
+    "career_forge_http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+HTTP_DURATION = histogram(
+    "career_forge_http_request_duration_seconds", "Time to the end of the response body.", ("method", "route"))
+HTTP_IN_FLIGHT = gauge("career_forge_http_requests_in_flight", "HTTP requests being served.")
+
+STAGE_DURATION = histogram(
+    "career_forge_stage_duration_seconds",
+    "Analysis pipeline stages (read, parse, compact, analyze, profile, quests...) by outcome.",
+    ("stage", "outcome"))
+PARSE_STEP_DURATION = histogram(
+    "career_forge_parse_step_duration_seconds",
+    "Document parsing by step: text extraction and spaCy processing.", ("step", "format"))
+
+LLM_CALL_DURATION = histogram(
+    "career_forge_llm_call_duration_seconds", "Single LLM attempts by outcome (ok, transient, error).",
+    ("provider", "task", "outcome"))
+LLM_FIRST_PIECE = histogram(
+    "career_forge_llm_first_piece_seconds", "Time to the first piece of streamed LLM answers.", ("provider", "task"))
+LLM_TOKENS = counter(
+    "career_forge_llm_tokens_total", "Estimated tokens of successful LLM calls (prompt or response).",
+    ("provider", "task", "kind"))
+
+CACHE_LOOKUPS = counter(
+    "career_forge_cache_lookups_total", "Analysis cache lookups by namespace and result (hit or miss).",
+    ("namespace", "result"))
+
+QUEST_CATALOG_LOOKUPS = counter(
+    "career_forge_quest_catalog_lookups_total", "Quest catalog lookups by result (hit or miss).", ("result",))
+QUEST_CATALOG_SAVED = counter(
+    "career_forge_quest_catalog_saved_seconds_total",
+    "Estimated LLM time saved by quests served from the catalog (recent average quest call per hit).")
+
+ERRORS = counter(
+    "career_forge_errors_total", "Failures by component (a pipeline stage, llm, http) and exception type.",
+    ("component", "type"))
+
+
+def observe_since(histogram_child, started: float) -> None:
+    """Observes the seconds since `started` (a `time.perf_counter()` value)."""
+    histogram_child.observe(time.perf_counter() - started)
+
+
+def record_error(component: str, error: BaseException) -> None:
+    ERRORS.labels(component, type(error).__name__).inc()
@@ -1,11 +1,19 @@
 # career_forge/engine/parser.py
 
-import io
-import spacy
-from docx import Document
-from pydantic import BaseModel, Field
-from pypdf import PdfReader
-from spacy.tokens import Doc
+import logging
+import time
+from array import array
+from concurrent.futures import Executor
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from .extraction import (
+    DOCX_CONTENT_TYPE, PDF_CONTENT_TYPE, ExtractionError, ExtractionLimits, Source, extract_document_text
+)
+from .resources import registry
+from .segmentation import SectionIndex, segment
+
+logger = logging.getLogger(__name__)
 
 # --- A small setup note ---
 # To make this code run, you'll need to install spaCy and its English model.
@@ -13,61 +21,267 @@ from spacy.tokens import Doc
 # pip install spacy
 # python -m spacy download en_core_web_sm
 
-# Load the spaCy AI model. We do this once when the module is loaded.
-# This model is lightweight and powerful for understanding text structure.
-try:
-    NLP = spacy.load("en_core_web_sm")
-except OSError:
-    print("spaCy model not found. Please run: python -m spacy download en_core_web_sm")
-    NLP = None
+SPACY_MODEL = "en_core_web_sm"
 
+# Nothing downstream uses part-of-speech tags, dependency parses or lemmas, so
+# those components are never loaded. In en_core_web_sm the NER component has
+# its own embedding layer and does not need the shared tok2vec either.
+EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
 
-class ParsedResume(BaseModel):
+
+def load_nlp(name: str = SPACY_MODEL):
     """
-    This is our high-end output. Instead of just text, we create a structured
-    object that includes the raw text AND the processed AI document ('doc' object).
-    This 'doc' object is incredibly powerful for the next steps.
+    Loads the trimmed pipeline: tokenizer + NER, plus a rule-based
+    sentencizer so `doc.sents` keeps working without the dependency parser.
     """
-    raw_text: str = Field(description="The complete, unmodified text from the resume.")
-    doc: Doc = Field(description="The resume text processed by the spaCy NLP model.")
+    # spaCy itself takes a while to import, so it is only imported here.
+    import spacy
+
+    nlp = spacy.load(name, exclude=EXCLUDED_COMPONENTS)
+    if "sentencizer" not in nlp.pipe_names:
+        nlp.add_pipe("sentencizer", first=True)
+    return nlp
 
-    class Config:
-        # Pydantic needs this to handle custom types like the spaCy Doc object.
-        arbitrary_types_allowed = True
 
+# The spaCy model is loaded on first use (or during start-up warm-up), not when
+# this module is imported. Only the skill and entity features need it.
+nlp_resource = registry.register("spacy_model", load_nlp, required=False)
 
-def parse_resume(file_content: bytes, content_type: str) -> ParsedResume:
+
+def get_nlp():
     """
-    The main parsing function. It takes the raw file, extracts text, and then
-    uses the spaCy AI model to process it into a structured format.
+    Returns the shared spaCy pipeline, or None if the model isn't installed.
     """
-    raw_text = ""
-    if content_type == "application/pdf":
-        try:
-            reader = PdfReader(io.BytesIO(file_content))
-            raw_text = "".join(page.extract_text() or "" for page in reader.pages)
-        except Exception:
-            # In a real system, you'd log this error.
-            raw_text = ""  # Return empty text on failure
-
-    elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        try:
-            doc = Document(io.BytesIO(file_content))
-            raw_text = "\n".join([para.text for para in doc.paragraphs])
-        except Exception:
-            raw_text = ""  # Return empty text on failure
+    try:
+        return nlp_resource.get()
+    except OSError:
+        logger.warning("spaCy model not found. Please run: python -m spacy download en_core_web_sm")
+        return None
 
-    else:
+
+class ProcessingProfile(str, Enum):
+    """
+    How much spaCy work `parse_resume` does. Pick the cheapest one that covers
+    what the caller reads from the result.
+    """
+    # Only extract text; `doc` is None. Enough for the LLM path.
+    TEXT = "text"
+    # Tokenize only (no statistical models). Enough for the skill PhraseMatcher.
+    TOKENIZE = "tokenize"
+    # Tokenize, split sentences and run NER. Needed for entity extraction.
+    NER = "ner"
+
+
+# -----------------------------------------------------------------------------
+# The parse result
+# -----------------------------------------------------------------------------
+# A spaCy Doc costs far more than its text: a C struct per token, interned
+# strings, and the NER model's outputs. Most callers only read the text, and
+# the ones that do need the Doc use it for a few milliseconds, yet a Doc in
+# the result lived as long as the request and was pickled back from the parse
+# worker. So the result keeps what the Doc told us as flat arrays (8 bytes a
+# token) and tuples, and `ParsedResume.doc` rebuilds a Doc from them, without
+# running any model, only when something asks for it.
+
+
+class EntitySpan(NamedTuple):
+    """A named entity, as character offsets into the resume text."""
+    start_char: int
+    end_char: int
+    label: str
+    text: str
+
+
+def _token_spans(doc) -> array:
+    from spacy.attrs import IDX, LENGTH
+
+    # One (start, end) pair per token, including whitespace tokens.
+    columns = doc.to_array([IDX, LENGTH]).astype("uint32")
+    columns[:, 1] += columns[:, 0]
+    spans = array("I")
+    spans.frombytes(columns.tobytes())
+    return spans
+
+
+def _rebuild_doc(raw_text: str, token_spans: array, entities: Optional[Tuple[EntitySpan, ...]]):
+    # The model first: loading it imports spaCy under the registry lock.
+    nlp = get_nlp()
+    if nlp is None:
+        return None
+    from spacy.tokens import Doc
+
+    starts, ends = token_spans[0::2], token_spans[1::2]
+    # A token is followed by a space exactly when the next token starts one
+    # character after it ends; any other whitespace is a token of its own.
+    next_starts = list(starts[1:]) + [len(raw_text)]
+    doc = Doc(nlp.vocab, words=[raw_text[start:end] for start, end in zip(starts, ends)],
+              spaces=[next_start - end == 1 for end, next_start in zip(ends, next_starts)])
+    if entities:
+        spans = (doc.char_span(ent.start_char, ent.end_char, label=ent.label) for ent in entities)
+        doc.set_ents([span for span in spans if span is not None])
+    return doc
+
+
+class ParsedResume:
+    """
+    The parsed resume: its text, its section index and, for the tokenize and
+    NER profiles, its token and entity spans.
+
+    Pass `doc` to take the spans from a Doc the caller already built; it is
+    kept unless `keep_doc` is False. Pickling (e.g. back from a parse worker)
+    only sends the spans.
+    """
+    __slots__ = ("raw_text", "timings", "sections", "token_spans", "entities", "_doc")
+
+    def __init__(self, raw_text: str, doc: Optional[Any] = None,
+                 timings: Optional[Dict[str, float]] = None, keep_doc: bool = True):
+        # The complete, unmodified text from the resume.
+        self.raw_text = raw_text
+        # Seconds per step: 'extract' (text) and 'nlp' (spaCy). Measured where
+        # the work ran (usually a parse worker process) and sent back with the
+        # result, since only the server process exports metrics.
+        self.timings: Dict[str, float] = timings or {}
+        # Where each section (Experience, Skills, ...) starts; see engine/segmentation.py.
+        self.sections: SectionIndex = segment(raw_text)
+        # Flat (start, end) character offsets per token; None for the text profile.
+        self.token_spans: Optional[array] = None
+        # The named entities; None unless NER ran.
+        self.entities: Optional[Tuple[EntitySpan, ...]] = None
+        self._doc = None
+        if doc is not None:
+            self.token_spans = _token_spans(doc)
+            if doc.has_annotation("ENT_IOB"):
+                self.entities = tuple(
+                    EntitySpan(ent.start_char, ent.end_char, ent.label_, ent.text) for ent in doc.ents)
+            if keep_doc:
+                self._doc = doc
+
+    @property
+    def doc(self):
+        """
+        A spacy.tokens.Doc of the text (None for the text profile), rebuilt
+        from the spans on first access. It has the tokens and entities but no
+        sentence boundaries. Call `release_doc()` when done with it.
+        """
+        if self._doc is None and self.token_spans is not None:
+            self._doc = _rebuild_doc(self.raw_text, self.token_spans, self.entities)
+        return self._doc
+
+    def release_doc(self) -> None:
+        self._doc = None
+
+    def __getstate__(self):
+        return self.raw_text, self.timings, self.sections, self.token_spans, self.entities
+
+    def __setstate__(self, state):
+        self.raw_text, self.timings, self.sections, self.token_spans, self.entities = state
+        self._doc = None
+
+
+def extract_text(
+    source: Source,
+    content_type: str,
+    limits: Optional[ExtractionLimits] = None,
+    pool: Optional[Executor] = None,
+) -> str:
+    """
+    Pulls the plain text out of a PDF or DOCX file, given as bytes or as the
+    path of a spooled upload. Returns '' if the file can't be read.
+
+    Limit violations (size, page count) and scanned documents raise an
+    ExtractionError, so the caller can tell the user what went wrong.
+    """
+    if content_type not in (PDF_CONTENT_TYPE, DOCX_CONTENT_TYPE):
         # For simplicity, we'll only handle PDF and DOCX for now.
         raise ValueError(f"Unsupported file type for AI parsing: {content_type}")
 
+    try:
+        return extract_document_text(source, content_type, limits, pool)
+    except ExtractionError:
+        raise
+    except Exception as e:
+        logger.warning("Could not extract text from a %s document: %s", content_type, e,
+                       extra={"error": type(e).__name__})
+        return ""  # Return empty text on failure
+
+
+def _process_text(raw_text: str, profile: ProcessingProfile):
+    if profile == ProcessingProfile.TEXT:
+        return None
+    nlp = get_nlp()
+    if nlp is None:
+        return None
+    if profile == ProcessingProfile.TOKENIZE:
+        return nlp.make_doc(raw_text)
+    return nlp(raw_text)
+
+
+def parse_text(raw_text: str, profile: ProcessingProfile = ProcessingProfile.NER,
+               keep_doc: bool = False) -> ParsedResume:
+    """
+    Processes text that was already extracted (e.g. by an earlier pipeline
+    stage). With `keep_doc`, the Doc built here is kept on the result instead
+    of being rebuilt when the caller reads `doc`.
+    """
+    return ParsedResume(raw_text, _process_text(raw_text, ProcessingProfile(profile)), keep_doc=keep_doc)
+
+
+def parse_resume(
+    source: Source,
+    content_type: str,
+    profile: ProcessingProfile = ProcessingProfile.NER,
+    limits: Optional[ExtractionLimits] = None,
+    pool: Optional[Executor] = None,
+) -> ParsedResume:
+    """
+    The main parsing function. It takes the raw file, extracts text, and then
+    uses the spaCy AI model to process it into a structured format.
+
+    `source` is the file's bytes or a path to it. With a process `pool`, the
+    pages of a PDF are extracted in parallel (see `PipelineExecutor.run_split`).
+    """
+    started = time.perf_counter()
+    raw_text = extract_text(source, content_type, limits, pool)
+    extracted = time.perf_counter()
+
     # This is the key AI step. We take the raw text and process it.
-    # The NLP model breaks the text into tokens, sentences, and adds
-    # linguistic features (like parts of speech) that we can use later.
-    if NLP and raw_text:
-        processed_doc = NLP(raw_text)
+    # The NLP model breaks the text into tokens and sentences, and finds
+    # named entities that we can use later.
+    doc = _process_text(raw_text, ProcessingProfile(profile))
+    timings = {"extract": extracted - started}
+    if doc is not None:
+        timings["nlp"] = time.perf_counter() - extracted
+    # The Doc is dropped here: this usually runs in a parse worker, and only
+    # the spans need to travel back.
+    return ParsedResume(raw_text, doc, timings, keep_doc=False)
+
+
+def parse_resumes(
+    files: Iterable[Tuple[Source, str]],
+    profile: ProcessingProfile = ProcessingProfile.NER,
+    n_process: int = 1,
+    batch_size: int = 32,
+) -> Iterator[ParsedResume]:
+    """
+    Bulk variant of `parse_resume` for `(file_content, content_type)` pairs.
+    Texts go through `nlp.pipe`, which batches the model work and can fan it
+    out over `n_process` processes. Results keep the input order.
+    """
+    profile = ProcessingProfile(profile)
+    texts: Iterator[str] = (extract_text(content, content_type) for content, content_type in files)
+
+    nlp = get_nlp() if profile != ProcessingProfile.TEXT else None
+    if nlp is None:
+        for raw_text in texts:
+            yield ParsedResume(raw_text=raw_text)
+        return
+
+    # spaCy keeps the text verbatim, so each Doc carries its own raw_text.
+    # The Docs are not kept: callers holding many results hold only spans.
+    if profile == ProcessingProfile.TOKENIZE:
+        docs = nlp.tokenizer.pipe(texts, batch_size=batch_size)
     else:
-        # Handle cases where spaCy isn't loaded or text is empty
-        processed_doc = NLP("") if NLP else None
+        docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
 
-    return ParsedResume(raw_text=raw_text, doc=processed_doc)
\ No newline at end of file
+    for doc in docs:
+        yield ParsedResume(doc.text, doc, keep_doc=False)
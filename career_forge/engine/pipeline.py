@@ -0,0 +1,231 @@
+# career_forge/engine/pipeline.py
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# -----------------------------------------------------------------------------
+# 1. Stage definitions
+# -----------------------------------------------------------------------------
+
+# A stage receives the shared context (the pipeline inputs plus the result of
+# every finished stage, keyed by stage name) and returns its own result.
+StageFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+# Called with (run, stage name, "started" | "finished" | "failed") as stages progress.
+StageObserver = Callable[["PipelineRun", str, str], None]
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the analysis DAG."""
+    name: str
+    run: StageFn
+    deps: Tuple[str, ...] = ()
+
+
+@dataclass
+class StageTiming:
+    """Start and end of a stage, in seconds since the pipeline started."""
+    start: float
+    end: float
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+
+# -----------------------------------------------------------------------------
+# 2. A single execution of the pipeline
+# -----------------------------------------------------------------------------
+
+class PipelineRun:
+    """
+    The live state of one pipeline execution. Stages run as asyncio tasks, so
+    every stage starts as soon as its dependencies are done and independent
+    stages overlap.
+    """
+
+    def __init__(self, pipeline: "Pipeline", inputs: Dict[str, Any], observer: Optional[StageObserver] = None):
+        self.pipeline = pipeline
+        self.context: Dict[str, Any] = dict(inputs)
+        self.timings: Dict[str, StageTiming] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.observer = observer
+        self._started = time.perf_counter()
+
+    def _start(self) -> None:
+        for stage in self.pipeline.stages:
+            self.tasks[stage.name] = asyncio.create_task(self._run_stage(stage), name=f"stage:{stage.name}")
+
+    async def _run_stage(self, stage: Stage) -> Any:
+        for dep in stage.deps:
+            await self.tasks[dep]
+        started = time.perf_counter()
+        self._notify(stage.name, "started")
+        outcome = "ok"
+        try:
+            result = await stage.run(self.context)
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            self._notify(stage.name, "failed")
+            raise
+        except BaseException as e:
+            outcome = "error"
+            metrics.record_error(stage.name, e)
+            self._notify(stage.name, "failed")
+            raise
+        finally:
+            ended = time.perf_counter()
+            self.timings[stage.name] = StageTiming(started - self._started, ended - self._started)
+            metrics.STAGE_DURATION.labels(stage.name, outcome).observe(ended - started)
+        self.context[stage.name] = result
+        self._notify(stage.name, "finished")
+        return result
+
+    def _notify(self, name: str, event: str) -> None:
+        if self.observer is None:
+            return
+        try:
+            self.observer(self, name, event)
+        except Exception:
+            # Progress reporting must never break the analysis itself.
+            logger.exception("Pipeline observer failed on %s/%s", name, event)
+
+    async def wait(self, *names: str) -> None:
+        """Waits until the named stages (and therefore their dependencies) are finished."""
+        await asyncio.gather(*(self.tasks[name] for name in names))
+
+    async def wait_all(self) -> None:
+        await asyncio.gather(*self.tasks.values())
+
+    def result(self, name: str) -> Any:
+        return self.context[name]
+
+    def is_done(self, name: str) -> bool:
+        return self.tasks[name].done()
+
+    def cancel(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+
+    # --- Reporting ---
+
+    def critical_path(self) -> List[str]:
+        """
+        The chain of stages that decided the total latency: start from the
+        stage that finished last and walk back through whichever dependency
+        finished last.
+        """
+        if not self.timings:
+            return []
+        by_name = {stage.name: stage for stage in self.pipeline.stages}
+        current = max(self.timings, key=lambda name: self.timings[name].end)
+        path = [current]
+        while True:
+            deps = [dep for dep in by_name[current].deps if dep in self.timings]
+            if not deps:
+                break
+            current = max(deps, key=lambda name: self.timings[name].end)
+            path.append(current)
+        return list(reversed(path))
+
+    def server_timing(self) -> str:
+        """Formats the finished stages as a `Server-Timing` header value."""
+        entries = [f"{name};dur={timing.duration_ms:.1f}" for name, timing in self.timings.items()]
+        entries.append(f"total;dur={(time.perf_counter() - self._started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+# -----------------------------------------------------------------------------
+# 3. The pipeline (a validated DAG of stages)
+# -----------------------------------------------------------------------------
+
+class Pipeline:
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages: List[Stage] = list(stages)
+        self._validate()
+
+    def _validate(self) -> None:
+        seen = set()
+        # Stages must be listed after their dependencies, which also rules out cycles.
+        for stage in self.stages:
+            if stage.name in seen:
+                raise ValueError(f"Duplicate pipeline stage: {stage.name}")
+            for dep in stage.deps:
+                if dep not in seen:
+                    raise ValueError(f"Stage '{stage.name}' depends on '{dep}', which is not declared before it.")
+            seen.add(stage.name)
+
+    async def run(
+        self,
+        inputs: Dict[str, Any],
+        wait_for: Optional[Iterable[str]] = None,
+        observer: Optional[StageObserver] = None,
+    ) -> PipelineRun:
+        """
+        Starts every stage and returns once the `wait_for` stages are done
+        (all stages by default). Stages that are not waited for keep running
+        in the background and can be awaited later through the returned run.
+        `observer`, if given, is told when each stage starts and ends.
+        """
+        run = PipelineRun(self, inputs, observer)
+        run._start()
+        try:
+            if wait_for is None:
+                await run.wait_all()
+            else:
+                await run.wait(*wait_for)
+        except BaseException:
+            run.cancel()
+            raise
+        return run
+
+
+# -----------------------------------------------------------------------------
+# 4. Registry of runs whose remaining stages finish after the response
+# -----------------------------------------------------------------------------
+
+@dataclass
+class _DeferredEntry:
+    run: PipelineRun
+    created: float = field(default_factory=time.monotonic)
+
+
+class DeferredRuns:
+    """
+    Keeps pipeline runs that still have background stages (e.g. quests) so a
+    follow-up request can collect their results. Entries expire after `ttl`
+    seconds and the registry never holds more than `max_entries` runs.
+    """
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, _DeferredEntry] = {}
+
+    def add(self, run: PipelineRun) -> str:
+        self._evict()
+        run_id = uuid.uuid4().hex
+        self._entries[run_id] = _DeferredEntry(run)
+        return run_id
+
+    def get(self, run_id: str) -> Optional[PipelineRun]:
+        self._evict()
+        entry = self._entries.get(run_id)
+        return entry.run if entry else None
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for run_id in [key for key, entry in self._entries.items() if now - entry.created > self.ttl]:
+            self._entries.pop(run_id).run.cancel()
+        # Dicts keep insertion order, so the oldest entries come first.
+        while len(self._entries) >= self.max_entries:
+            oldest = next(iter(self._entries))
+            self._entries.pop(oldest).run.cancel()
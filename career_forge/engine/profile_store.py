@@ -0,0 +1,600 @@
+# career_forge/engine/profile_store.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from career_forge.config import get_settings
+from career_forge.engine.llm_analyzer import ExperienceDetail, LLMAnalysis
+from career_forge.engine.taxonomy import normalize_surface
+from career_forge.gamification.progression import (
+    MAIN_LEVEL_XP, MAX_LEVEL, RANKS, XPAward, add_main_xp, higher_standing, quest_awards, quest_id, rank_index,
+    skill_progress,
+)
+from career_forge.schemas.quest import Quest
+from career_forge.schemas.user import Leaderboard, LeaderboardEntry, Skill, StoredProfile, UserProfile
+
+# -----------------------------------------------------------------------------
+# Profile store
+# -----------------------------------------------------------------------------
+# Keeps each user's gamified profile between visits, so the XP earned from
+# quests accumulates and the dashboard is a read instead of an analysis.
+#
+# - The first upload with a `user_id` creates the profile from the analysis.
+#   A re-upload merges only what is new: skills and experiences the profile
+#   doesn't have yet are added, earned XP is kept, and the rank and level only
+#   ever go up. An unchanged resume (same text digest) writes nothing.
+# - The LLM analysis of the last merged resume is kept with the profile, so
+#   re-uploading the same resume reuses it instead of calling the LLM again,
+#   whatever the analysis cache still holds.
+# - The quests shown to a user are recorded as issued. Completing one awards
+#   its XP once: quests that were never issued (or were edited by the client)
+#   and quests already completed award nothing.
+# - XP is awarded in batches: any number of awards, for any number of users,
+#   in one transaction.
+# - Leaderboards are index scans. Every profile has a single `score` that
+#   sorts like (rank, level, xp), so the top of a leaderboard and the next
+#   page (a keyset cursor, never OFFSET) are range queries on one index,
+#   whatever the number of profiles. A user's position needs the number of
+#   profiles ahead; triggers keep a count per (rank, level) band, so only the
+#   profiles in the user's own band are counted one by one.
+#
+# `ProfileStore` is the interface; SQLite is the implementation that ships.
+
+# Scores are ((rank * 100 + level) * _SCORE_XP) + xp; XP into a level is far
+# below this, except at S99 where it piles up and is capped in the score.
+_SCORE_XP = 10 ** 9
+
+
+def profile_score(rank: str, level: int, xp: int) -> int:
+    return (rank_index(rank) * 100 + level) * _SCORE_XP + min(xp, _SCORE_XP - 1)
+
+
+def _rank_bounds(rank: str) -> Tuple[int, int]:
+    """Lowest score of a rank, and the lowest score above it."""
+    index = rank_index(rank)
+    return index * 100 * _SCORE_XP, (index * 100 + MAX_LEVEL + 1) * _SCORE_XP
+
+
+def skill_key(name: str) -> str:
+    return normalize_surface(name)
+
+
+def experience_key(experience: ExperienceDetail) -> str:
+    return "|".join(normalize_surface(part) for part in (experience.category, experience.title, experience.organization))
+
+
+@dataclass
+class ProfileDiff:
+    """What a resume upload changed in a stored profile."""
+    created: bool = False
+    # Same resume text as the last merge: nothing was written.
+    unchanged: bool = False
+    new_skills: List[str] = field(default_factory=list)
+    new_experiences: List[str] = field(default_factory=list)
+    # (rank, level) before and after, when the new resume raised them.
+    promoted: Optional[Tuple[Tuple[str, int], Tuple[str, int]]] = None
+
+    def to_header(self) -> str:
+        """Compact form for the X-Profile-Diff response header."""
+        if self.created:
+            return "created"
+        if self.unchanged:
+            return "unchanged"
+        parts = [f"skills=+{len(self.new_skills)}", f"experiences=+{len(self.new_experiences)}"]
+        if self.promoted:
+            parts.append("promoted={}{}".format(*self.promoted[1]))
+        return ";".join(parts)
+
+
+class UnknownUser(KeyError):
+    """Raised for a user without a stored profile (HTTP 404)."""
+
+
+class ProfileStore(ABC):
+    @abstractmethod
+    def get(self, user_id: str) -> Optional[StoredProfile]:
+        ...
+
+    @abstractmethod
+    def resume_digest(self, user_id: str) -> Optional[str]:
+        """The digest of the last merged resume, without loading the profile."""
+
+    @abstractmethod
+    def stored_analysis(self, user_id: str, digest: str) -> Optional[LLMAnalysis]:
+        """The analysis last merged for the user, if it was of the resume with this digest."""
+
+    @abstractmethod
+    def merge_analysis(
+        self, user_id: str, digest: str, analysis: LLMAnalysis, keep_analysis: bool = True
+    ) -> Tuple[StoredProfile, ProfileDiff]:
+        """
+        Creates the profile, or merges what is new in `analysis` into it.
+        `keep_analysis=False` (e.g. for a rule-based fallback) doesn't keep
+        the analysis for `stored_analysis`.
+        """
+
+    @abstractmethod
+    def award(self, awards: Iterable[XPAward]) -> Dict[str, int]:
+        """
+        Applies XP awards atomically. Returns the XP applied per user; users
+        without a profile are left out.
+        """
+
+    @abstractmethod
+    def issue_quests(self, user_id: str, quests: List[Quest]) -> List[str]:
+        """
+        Records quests as issued to the user and returns their IDs. A quest
+        the user already completed stays completed.
+        """
+
+    @abstractmethod
+    def open_quests(self, user_id: str) -> List[Quest]:
+        """The quests issued to the user and not completed yet, oldest first."""
+
+    @abstractmethod
+    def complete_quests(self, user_id: str, quests: List[Quest]) -> List[str]:
+        """
+        Marks the quests completed and awards their XP, in one transaction.
+        Only quests issued to the user and not completed yet count; returns
+        the IDs of those.
+        """
+
+    @abstractmethod
+    def leaderboard(self, rank: Optional[str] = None, limit: int = 50, after: Optional[str] = None) -> Leaderboard:
+        """Best first, optionally within one rank; `after` is a cursor from the previous page."""
+
+    @abstractmethod
+    def position(self, user_id: str, within_rank: bool = False) -> int:
+        """The user's leaderboard position (1 = first), overall or within their rank."""
+
+    @abstractmethod
+    def skill_leaderboard(self, skill: str, limit: int = 50) -> List[dict]:
+        """The users with a skill, most XP first."""
+
+    @abstractmethod
+    def delete(self, user_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+# -----------------------------------------------------------------------------
+# SQLite implementation
+# -----------------------------------------------------------------------------
+
+class SQLiteProfileStore(ProfileStore):
+    """
+    Two tables: `profiles` (one row per user, experiences as JSON) and
+    `skills` (one row per user and skill, clustered by user so a profile's
+    skills are one range read, and indexed by skill for skill leaderboards).
+    Skill levels are derived from the skill's total XP when read. Issued
+    quests are kept in `quests`, one row per user and quest ID, and the last
+    merged analysis in `analyses`, one row per user.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit; writes open their own IMMEDIATE transaction.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            " user_id TEXT PRIMARY KEY, user_name TEXT NOT NULL, job_title TEXT NOT NULL,"
+            " main_rank TEXT NOT NULL, level INTEGER NOT NULL, xp INTEGER NOT NULL,"
+            " total_xp INTEGER NOT NULL DEFAULT 0, score INTEGER NOT NULL,"
+            " resume_digest TEXT NOT NULL, experiences TEXT NOT NULL DEFAULT '[]',"
+            " created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS profiles_score ON profiles (score, user_id)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS skills ("
+            " user_id TEXT NOT NULL, skill_key TEXT NOT NULL, name TEXT NOT NULL,"
+            " category TEXT NOT NULL, xp INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (user_id, skill_key)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS skills_by_skill ON skills (skill_key, xp)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quests ("
+            " user_id TEXT NOT NULL, quest_id TEXT NOT NULL, quest TEXT NOT NULL,"
+            " issued_at REAL NOT NULL, completed_at REAL,"
+            " PRIMARY KEY (user_id, quest_id)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " user_id TEXT PRIMARY KEY, resume_digest TEXT NOT NULL, analysis TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS score_bands (band INTEGER PRIMARY KEY, profiles INTEGER NOT NULL)")
+        band = f"score / {_SCORE_XP}"
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS profiles_band_insert AFTER INSERT ON profiles BEGIN"
+            f" INSERT INTO score_bands (band, profiles) VALUES (NEW.{band}, 1)"
+            " ON CONFLICT (band) DO UPDATE SET profiles = profiles + 1; END"
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS profiles_band_update AFTER UPDATE OF score ON profiles"
+            f" WHEN OLD.{band} != NEW.{band} BEGIN"
+            f" UPDATE score_bands SET profiles = profiles - 1 WHERE band = OLD.{band};"
+            f" INSERT INTO score_bands (band, profiles) VALUES (NEW.{band}, 1)"
+            " ON CONFLICT (band) DO UPDATE SET profiles = profiles + 1; END"
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS profiles_band_delete AFTER DELETE ON profiles BEGIN"
+            f" UPDATE score_bands SET profiles = profiles - 1 WHERE band = OLD.{band}; END"
+        )
+
+    # --- Reads ---
+
+    def get(self, user_id: str) -> Optional[StoredProfile]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT user_name, job_title, main_rank, level, xp, total_xp, resume_digest, experiences, updated_at"
+                " FROM profiles WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            skills = self._conn.execute(
+                "SELECT name, category, xp FROM skills WHERE user_id = ?", (user_id,)
+            ).fetchall()
+        user_name, job_title, main_rank, level, xp, total_xp, digest, experiences, updated_at = row
+        profile_skills = []
+        for name, category, skill_xp in skills:
+            progress = skill_progress(skill_xp)
+            profile_skills.append(Skill(name=name, category=category, level=progress.level,
+                                        xp=progress.xp, xp_to_next_level=progress.xp_to_next_level))
+        return StoredProfile(
+            user_id=user_id,
+            profile=UserProfile(user_name=user_name, job_title=job_title, main_rank=main_rank,
+                                level=level, xp=xp, skills=profile_skills),
+            xp_to_next_level=_main_xp_to_next(main_rank, level, xp),
+            total_xp=total_xp,
+            experiences=[ExperienceDetail.model_validate(e) for e in json.loads(experiences)],
+            resume_digest=digest,
+            updated_at=updated_at,
+        )
+
+    def resume_digest(self, user_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT resume_digest FROM profiles WHERE user_id = ?", (user_id,)).fetchone()
+        return row[0] if row else None
+
+    def stored_analysis(self, user_id: str, digest: str) -> Optional[LLMAnalysis]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analysis FROM analyses WHERE user_id = ? AND resume_digest = ?", (user_id, digest)
+            ).fetchone()
+        return LLMAnalysis.model_validate_json(row[0]) if row else None
+
+    # --- Resume uploads ---
+
+    def merge_analysis(
+        self, user_id: str, digest: str, analysis: LLMAnalysis, keep_analysis: bool = True
+    ) -> Tuple[StoredProfile, ProfileDiff]:
+        diff = ProfileDiff()
+        now = time.time()
+        analysis_skills = [
+            (skill_key(name), name, category)
+            for category, names in (analysis.skills or {}).items() for name in names if name.strip()
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT main_rank, level, xp, resume_digest, experiences FROM profiles WHERE user_id = ?",
+                    (user_id,)
+                ).fetchone()
+                if row is None:
+                    diff.created = True
+                    rank, level = higher_standing(("E", 1), (analysis.suggested_rank, analysis.suggested_level))
+                    level = min(max(level, 1), MAX_LEVEL)
+                    experiences = _unique_experiences([], analysis.experiences)
+                    self._conn.execute(
+                        "INSERT INTO profiles (user_id, user_name, job_title, main_rank, level, xp, total_xp, score,"
+                        " resume_digest, experiences, created_at, updated_at)"
+                        " VALUES (?, ?, ?, ?, ?, 0, 0, ?, ?, ?, ?, ?)",
+                        (user_id, analysis.user_name, analysis.job_title, rank, level,
+                         profile_score(rank, level, 0), digest, json.dumps(experiences), now, now),
+                    )
+                    diff.new_skills = self._insert_new_skills(user_id, analysis_skills)
+                    diff.new_experiences = [e["title"] for e in experiences]
+                elif row[3] == digest:
+                    diff.unchanged = True
+                else:
+                    current_rank, current_level, xp, _, stored = row
+                    stored = json.loads(stored)
+                    added = _unique_experiences(stored, analysis.experiences)
+                    diff.new_experiences = [e["title"] for e in added]
+                    rank, level = higher_standing(
+                        (current_rank, current_level),
+                        (analysis.suggested_rank, min(max(analysis.suggested_level, 1), MAX_LEVEL)))
+                    if (rank, level) != (current_rank, current_level):
+                        diff.promoted = ((current_rank, current_level), (rank, level))
+                        xp = 0
+                    self._conn.execute(
+                        "UPDATE profiles SET user_name = ?, job_title = ?, main_rank = ?, level = ?, xp = ?,"
+                        " score = ?, resume_digest = ?, experiences = ?, updated_at = ? WHERE user_id = ?",
+                        (analysis.user_name, analysis.job_title, rank, level, xp, profile_score(rank, level, xp),
+                         digest, json.dumps(stored + added), now, user_id),
+                    )
+                    diff.new_skills = self._insert_new_skills(user_id, analysis_skills)
+                if keep_analysis:
+                    # Also for an unchanged resume, which may predate the table;
+                    # the row is only written when it is missing or stale.
+                    self._conn.execute(
+                        "INSERT INTO analyses (user_id, resume_digest, analysis) VALUES (?, ?, ?)"
+                        " ON CONFLICT (user_id) DO UPDATE SET resume_digest = excluded.resume_digest,"
+                        " analysis = excluded.analysis WHERE resume_digest != excluded.resume_digest",
+                        (user_id, digest, analysis.model_dump_json()))
+                elif not diff.unchanged:
+                    self._conn.execute("DELETE FROM analyses WHERE user_id = ?", (user_id,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(user_id), diff
+
+    def _insert_new_skills(self, user_id: str, skills: List[Tuple[str, str, str]]) -> List[str]:
+        # Called inside a transaction. Known skills keep their XP (and category).
+        known = {key for (key,) in self._conn.execute("SELECT skill_key FROM skills WHERE user_id = ?", (user_id,))}
+        new = {}
+        for key, name, category in skills:
+            if key not in known and key not in new:
+                new[key] = (user_id, key, name, category)
+        self._conn.executemany(
+            "INSERT INTO skills (user_id, skill_key, name, category, xp) VALUES (?, ?, ?, ?, 0)", new.values())
+        return [name for _, _, name, _ in new.values()]
+
+    # --- Quests ---
+
+    def issue_quests(self, user_id: str, quests: List[Quest]) -> List[str]:
+        rows = {quest_id(quest): quest.model_dump_json() for quest in quests}
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO quests (user_id, quest_id, quest, issued_at) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (user_id, quest_id) DO NOTHING",
+                    ((user_id, key, quest, now) for key, quest in rows.items()))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return list(rows)
+
+    def open_quests(self, user_id: str) -> List[Quest]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT quest FROM quests WHERE user_id = ? AND completed_at IS NULL ORDER BY issued_at, quest_id",
+                (user_id,)).fetchall()
+        return [Quest.model_validate_json(quest) for (quest,) in rows]
+
+    def complete_quests(self, user_id: str, quests: List[Quest]) -> List[str]:
+        completed, issued = [], []
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key in dict.fromkeys(quest_id(quest) for quest in quests):
+                    # The rewards come from the quest as it was issued.
+                    row = self._conn.execute(
+                        "SELECT quest FROM quests WHERE user_id = ? AND quest_id = ? AND completed_at IS NULL",
+                        (user_id, key)).fetchone()
+                    if row is not None:
+                        self._conn.execute(
+                            "UPDATE quests SET completed_at = ? WHERE user_id = ? AND quest_id = ?", (now, user_id, key))
+                        completed.append(key)
+                        issued.append(Quest.model_validate_json(row[0]))
+                self._apply_awards(quest_awards(user_id, issued), now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return completed
+
+    # --- XP ---
+
+    def award(self, awards: Iterable[XPAward]) -> Dict[str, int]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                applied = self._apply_awards(awards, time.time())
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return applied
+
+    def _apply_awards(self, awards: Iterable[XPAward], now: float) -> Dict[str, int]:
+        # Called inside a transaction.
+        per_user: Dict[str, List[XPAward]] = {}
+        for award in awards:
+            if award.xp > 0 and award.skill.strip():
+                per_user.setdefault(award.user_id, []).append(award)
+        if not per_user:
+            return {}
+
+        rows = {}
+        user_ids = list(per_user)
+        # Stay under SQLite's limit on bound parameters.
+        for start in range(0, len(user_ids), 500):
+            chunk = user_ids[start:start + 500]
+            rows.update((row[0], row[1:]) for row in self._conn.execute(
+                f"SELECT user_id, main_rank, level, xp FROM profiles"
+                f" WHERE user_id IN ({','.join('?' * len(chunk))})", chunk))
+
+        applied: Dict[str, int] = {}
+        skill_rows, profile_rows = [], []
+        for user_id, user_awards in per_user.items():
+            if user_id not in rows:
+                continue
+            amount = sum(award.xp for award in user_awards)
+            rank, level, xp = add_main_xp(*rows[user_id], amount)
+            profile_rows.append((rank, level, xp, amount, profile_score(rank, level, xp), now, user_id))
+            skill_rows.extend(
+                (user_id, skill_key(award.skill), award.skill.strip(), award.category or "General", award.xp)
+                for award in user_awards)
+            applied[user_id] = amount
+
+        self._conn.executemany(
+            "INSERT INTO skills (user_id, skill_key, name, category, xp) VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT (user_id, skill_key) DO UPDATE SET xp = xp + excluded.xp", skill_rows)
+        self._conn.executemany(
+            "UPDATE profiles SET main_rank = ?, level = ?, xp = ?, total_xp = total_xp + ?, score = ?,"
+            " updated_at = ? WHERE user_id = ?", profile_rows)
+        return applied
+
+    # --- Leaderboards ---
+
+    def leaderboard(self, rank: Optional[str] = None, limit: int = 50, after: Optional[str] = None) -> Leaderboard:
+        low, high = _rank_bounds(rank) if rank else (0, len(RANKS) * 100 * _SCORE_XP)
+        cursor = _parse_cursor(after) if after else (high, "")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT score, user_id, user_name, main_rank, level, xp FROM profiles"
+                " WHERE score >= ? AND (score, user_id) < (?, ?)"
+                " ORDER BY score DESC, user_id DESC LIMIT ?",
+                (low, cursor[0], cursor[1], limit),
+            ).fetchall()
+            if not rows:
+                return Leaderboard(entries=[])
+            first_score, first_user = rows[0][0], rows[0][1]
+            # Positions: equal scores share one, like in sports tables.
+            better = self._count_ahead(first_score, None, high)
+            before_page = self._count_ahead(first_score, first_user, high)
+
+        entries, position = [], better + 1
+        for index, (score, user_id, user_name, main_rank, level, xp) in enumerate(rows):
+            if index and score != rows[index - 1][0]:
+                position = before_page + index + 1
+            entries.append(LeaderboardEntry(position=position, user_id=user_id, user_name=user_name,
+                                            main_rank=main_rank, level=level, xp=xp))
+        next_cursor = f"{rows[-1][0]}:{rows[-1][1]}" if len(rows) == limit else None
+        return Leaderboard(entries=entries, next_cursor=next_cursor)
+
+    def position(self, user_id: str, within_rank: bool = False) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT score, main_rank FROM profiles WHERE user_id = ?", (user_id,)).fetchone()
+            if row is None:
+                raise UnknownUser(user_id)
+            high = _rank_bounds(row[1])[1] if within_rank else len(RANKS) * 100 * _SCORE_XP
+            return self._count_ahead(row[0], None, high) + 1
+
+    def _count_ahead(self, score: int, user_id: Optional[str], high: int) -> int:
+        """
+        Profiles below `high` that sort before (score, user_id), or that have a
+        higher score when `user_id` is None. Whole bands come from
+        `score_bands`; only the profile's own band is counted row by row.
+        """
+        band = score // _SCORE_XP
+        in_bands = self._conn.execute(
+            "SELECT COALESCE(SUM(profiles), 0) FROM score_bands WHERE band > ? AND band < ?",
+            (band, high // _SCORE_XP)).fetchone()[0]
+        band_end = min((band + 1) * _SCORE_XP, high)
+        if user_id is None:
+            in_band = self._conn.execute(
+                "SELECT COUNT(*) FROM profiles WHERE score > ? AND score < ?", (score, band_end)).fetchone()[0]
+        else:
+            in_band = self._conn.execute(
+                "SELECT COUNT(*) FROM profiles WHERE (score, user_id) > (?, ?) AND score < ?",
+                (score, user_id, band_end)).fetchone()[0]
+        return in_bands + in_band
+
+    def skill_leaderboard(self, skill: str, limit: int = 50) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.user_id, p.user_name, s.name, s.xp FROM skills s JOIN profiles p USING (user_id)"
+                " WHERE s.skill_key = ? ORDER BY s.xp DESC LIMIT ?", (skill_key(skill), limit)
+            ).fetchall()
+        return [
+            {"user_id": user_id, "user_name": user_name, "skill": name, "level": skill_progress(xp).level, "xp": xp}
+            for user_id, user_name, name, xp in rows
+        ]
+
+    # --- Administration ---
+
+    def delete(self, user_id: str) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM skills WHERE user_id = ?", (user_id,))
+                self._conn.execute("DELETE FROM quests WHERE user_id = ?", (user_id,))
+                self._conn.execute("DELETE FROM analyses WHERE user_id = ?", (user_id,))
+                deleted = self._conn.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,)).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return deleted > 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+
+def _main_xp_to_next(rank: str, level: int, xp: int) -> int:
+    if rank_index(rank) == len(RANKS) - 1 and level == MAX_LEVEL:
+        return 0
+    return MAIN_LEVEL_XP - xp
+
+
+def _unique_experiences(stored: List[dict], incoming: List[ExperienceDetail]) -> List[dict]:
+    """The incoming experiences that aren't in `stored` yet (nor repeated), as dicts."""
+    seen = {experience_key(ExperienceDetail.model_validate(e)) for e in stored}
+    added = []
+    for experience in incoming:
+        key = experience_key(experience)
+        if key not in seen:
+            seen.add(key)
+            added.append(experience.model_dump())
+    return added
+
+
+def _parse_cursor(cursor: str) -> Tuple[int, str]:
+    score, _, user_id = cursor.partition(":")
+    try:
+        return int(score), user_id
+    except ValueError:
+        raise ValueError(f"Invalid leaderboard cursor: {cursor!r}")
+
+
+# -----------------------------------------------------------------------------
+# Process-wide instance
+# -----------------------------------------------------------------------------
+
+_store: Optional[ProfileStore] = None
+_store_built = False
+
+
+def build_profile_store_from_settings() -> Optional[ProfileStore]:
+    settings = get_settings()
+    if settings.profile_store == "sqlite":
+        return SQLiteProfileStore(settings.profile_store_path)
+    if settings.profile_store == "none":
+        return None
+    raise ValueError(f"Unknown profile store: {settings.profile_store}. Use sqlite or none.")
+
+
+def get_profile_store() -> Optional[ProfileStore]:
+    """
+    Returns the shared store, or None when profiles are not kept. Also used
+    as a FastAPI dependency so it can be overridden in benchmarks.
+    """
+    global _store, _store_built
+    if not _store_built:
+        _store = build_profile_store_from_settings()
+        _store_built = True
+    return _store
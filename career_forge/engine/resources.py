@@ -0,0 +1,130 @@
+# career_forge/engine/resources.py
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# -----------------------------------------------------------------------------
+# Lazily initialized, process-wide resources
+# -----------------------------------------------------------------------------
+# Heavy objects (the spaCy model, the Gemini client, the skill matcher) are
+# registered here by the module that owns them, but nothing is built at
+# import time. Each one is created on first use, exactly once per process,
+# or ahead of time by `warm_up()` from the FastAPI lifespan.
+#
+# All factories of a registry run under one lock. They import heavy packages
+# (spaCy, the Gemini SDK), and two threads importing the same package at once
+# can see it half-initialized ("cannot import name 'Language' from partially
+# initialized module"), e.g. a request building the sentencizer while warm-up
+# loads the model. The lock is re-entrant because factories use each other
+# (the skill matcher needs the spaCy model).
+
+
+class LazyResource(Generic[T]):
+    """A value built on first access, exactly once, even under concurrent access."""
+
+    def __init__(self, name: str, factory: Callable[[], T], required: bool = True,
+                 lock: Optional[threading.RLock] = None):
+        self.name = name
+        self.required = required
+        self._factory = factory
+        # Usually the registry's lock, shared with the other resources.
+        self._lock = lock or threading.RLock()
+        self._value: Optional[T] = None
+        self._loaded = False
+        self.load_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> T:
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                started = time.perf_counter()
+                try:
+                    self._value = self._factory()
+                except Exception as e:
+                    # Remember the failure for the readiness report, but let a
+                    # later call try again (e.g. after the model is installed).
+                    self.error = f"{type(e).__name__}: {e}"
+                    raise
+                self.load_ms = (time.perf_counter() - started) * 1000
+                self.error = None
+                self._loaded = True
+        return self._value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._value = None
+            self._loaded = False
+            self.load_ms = None
+
+
+class ResourceRegistry:
+    def __init__(self):
+        self._resources: Dict[str, LazyResource] = {}
+        # Held while any factory runs; see the note at the top.
+        self._lock = threading.RLock()
+        self.warmed_up = False
+        # With warm-up disabled resources load on first use, and the process
+        # counts as ready as soon as it serves requests.
+        self.lazy = False
+
+    def register(self, name: str, factory: Callable[[], T], required: bool = True) -> LazyResource[T]:
+        """
+        Registers a resource. `required` resources must load for the process
+        to report ready; optional ones only power secondary features.
+        """
+        if name in self._resources:
+            return self._resources[name]
+        resource = LazyResource(name, factory, required, self._lock)
+        self._resources[name] = resource
+        return resource
+
+    def get(self, name: str):
+        return self._resources[name].get()
+
+    def warm_up(self, names: Optional[List[str]] = None) -> None:
+        """Loads the named resources (all by default), recording failures instead of raising."""
+        for name, resource in list(self._resources.items()):
+            if names is not None and name not in names:
+                continue
+            try:
+                resource.get()
+            except Exception:
+                logger.exception("Warm-up of '%s' failed", name)
+        self.warmed_up = True
+
+    @property
+    def ready(self) -> bool:
+        if self.lazy:
+            return True
+        return self.warmed_up and all(r.loaded for r in self._resources.values() if r.required)
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "warmed_up": self.warmed_up,
+            "resources": {
+                name: {
+                    "loaded": resource.loaded,
+                    "required": resource.required,
+                    "load_ms": round(resource.load_ms, 1) if resource.load_ms is not None else None,
+                    "error": resource.error,
+                }
+                for name, resource in self._resources.items()
+            },
+        }
+
+
+# The registry shared by the whole process.
+registry = ResourceRegistry()
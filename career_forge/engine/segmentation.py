@@ -0,0 +1,228 @@
+# career_forge/engine/segmentation.py
+
+from array import array
+from bisect import bisect_right
+from enum import Enum
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# -----------------------------------------------------------------------------
+# Splitting a resume into sections
+# -----------------------------------------------------------------------------
+# A skill under "Experience" says more than the same word under "Hobbies", and
+# the prompt budget is better spent on roles than on interests. This module
+# finds the section headings in the raw text and builds an index of character
+# offsets: which section any offset (a token, an entity, a skill match) falls
+# in. Offsets are into `raw_text`, which spaCy keeps verbatim, so they line up
+# with `token.idx` and `span.start_char` as well.
+#
+# It is line-based and needs no model: a few string checks per line, so it
+# runs on every parse, including the text-only request path.
+
+
+class SectionKind(str, Enum):
+    """What a section is about, from its heading."""
+    # Everything before the first heading: name, contact details, headline.
+    HEADER = "header"
+    SUMMARY = "summary"
+    EXPERIENCE = "experience"
+    PROJECTS = "projects"
+    EDUCATION = "education"
+    SKILLS = "skills"
+    ACHIEVEMENTS = "achievements"
+    # Interests, languages, references and headings we don't recognize.
+    OTHER = "other"
+
+
+# Heading keyword -> kind, first match wins ("academic projects" is a project
+# section, not education).
+HEADING_KINDS: List[Tuple[str, SectionKind]] = [
+    ("project", SectionKind.PROJECTS),
+    ("portfolio", SectionKind.PROJECTS),
+    ("open source", SectionKind.PROJECTS),
+    ("experience", SectionKind.EXPERIENCE),
+    ("employment", SectionKind.EXPERIENCE),
+    ("work history", SectionKind.EXPERIENCE),
+    ("career history", SectionKind.EXPERIENCE),
+    ("intern", SectionKind.EXPERIENCE),
+    ("skill", SectionKind.SKILLS),
+    ("competenc", SectionKind.SKILLS),
+    ("expertise", SectionKind.SKILLS),
+    ("proficienc", SectionKind.SKILLS),
+    ("technologies", SectionKind.SKILLS),
+    ("tech stack", SectionKind.SKILLS),
+    ("education", SectionKind.EDUCATION),
+    ("academic", SectionKind.EDUCATION),
+    ("qualification", SectionKind.EDUCATION),
+    ("certific", SectionKind.EDUCATION),
+    ("course", SectionKind.EDUCATION),
+    ("training", SectionKind.EDUCATION),
+    ("achievement", SectionKind.ACHIEVEMENTS),
+    ("accomplishment", SectionKind.ACHIEVEMENTS),
+    ("award", SectionKind.ACHIEVEMENTS),
+    ("honor", SectionKind.ACHIEVEMENTS),
+    ("honour", SectionKind.ACHIEVEMENTS),
+    ("publication", SectionKind.ACHIEVEMENTS),
+    ("leadership", SectionKind.ACHIEVEMENTS),
+    ("responsibilit", SectionKind.ACHIEVEMENTS),
+    ("summary", SectionKind.SUMMARY),
+    ("profile", SectionKind.SUMMARY),
+    ("about", SectionKind.SUMMARY),
+    ("objective", SectionKind.SUMMARY),
+]
+
+# How much a mention counts, by the section it is in. A skill found in
+# several sections takes the highest weight.
+SECTION_WEIGHTS = {
+    SectionKind.HEADER: 1.0,
+    SectionKind.SUMMARY: 1.0,
+    SectionKind.EXPERIENCE: 1.0,
+    SectionKind.PROJECTS: 1.0,
+    SectionKind.SKILLS: 1.0,
+    SectionKind.EDUCATION: 0.75,
+    SectionKind.ACHIEVEMENTS: 0.75,
+    SectionKind.OTHER: 0.25,
+}
+
+# Sections worth matching skills in; OTHER is mostly hobbies and languages.
+SKILL_SECTIONS = frozenset(SECTION_WEIGHTS) - {SectionKind.OTHER}
+
+
+SECTION_HEADINGS = {
+    "summary", "professional summary", "profile", "about me", "objective", "career objective",
+    "experience", "work experience", "professional experience", "employment", "employment history",
+    "internships", "internship", "projects", "academic projects", "personal projects",
+    "education", "skills", "technical skills", "key skills", "core competencies",
+    "certifications", "certificates", "courses", "coursework", "achievements", "awards",
+    "honors", "leadership", "positions of responsibility", "activities", "extracurricular activities",
+    "volunteering", "volunteer experience", "publications", "languages", "interests", "hobbies",
+    "hobbies and interests", "interests and hobbies", "extracurriculars", "references",
+}
+
+
+def heading_kind(heading: Optional[str]) -> SectionKind:
+    if heading is None:
+        return SectionKind.HEADER
+    heading = heading.casefold()
+    for keyword, kind in HEADING_KINDS:
+        if keyword in heading:
+            return kind
+    return SectionKind.OTHER
+
+
+def is_section_heading(line: str, known_only: bool = False) -> bool:
+    words = line.rstrip(":").split()
+    if not words or len(words) > 4:
+        return False
+    if " ".join(words).casefold() in SECTION_HEADINGS:
+        return True
+    # A layout cue for headings not in the list ("Work History:", "Open Source
+    # Contributions:"): a short line ending with a colon that names a kind of
+    # section. Title Case alone is not enough; job titles such as "Machine
+    # Learning Intern" look the same.
+    if line.endswith(":") and not any(char.isdigit() for char in line) and heading_kind(line) is not SectionKind.OTHER:
+        return True
+    if known_only:
+        return False
+    # Headings not in the list are often short and in capitals ("OPEN SOURCE",
+    # "TECHNICAL PROFICIENCIES"). So are skill lists ("AWS, GCP, SQL, HTML") and
+    # company names ("IBM INDIA PVT LTD"), so the line must also name a kind of
+    # section and not be a list.
+    return (line.isupper() and len(line) > 3 and not any(char in ",/|" for char in line)
+            and heading_kind(line) is not SectionKind.OTHER)
+
+
+class Section(NamedTuple):
+    kind: SectionKind
+    # The heading line as written; None for the header section.
+    heading: Optional[str]
+    # Character offsets into the text: the heading starts at `start`, the
+    # body at `body_start`, and the section ends where the next one starts.
+    start: int
+    body_start: int
+    end: int
+
+
+class SectionIndex:
+    """
+    The sections of one text as parallel arrays of offsets, so it stays a few
+    bytes per section. Lookups by offset are a binary search.
+    """
+    __slots__ = ("starts", "body_starts", "kinds", "headings", "length")
+
+    def __init__(self, starts: array, body_starts: array, kinds: Tuple[SectionKind, ...],
+                 headings: Tuple[Optional[str], ...], length: int):
+        self.starts = starts
+        self.body_starts = body_starts
+        self.kinds = kinds
+        self.headings = headings
+        self.length = length
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, position: int) -> Section:
+        end = self.starts[position + 1] if position + 1 < len(self.starts) else self.length
+        return Section(self.kinds[position], self.headings[position],
+                       self.starts[position], self.body_starts[position], end)
+
+    def __iter__(self) -> Iterator[Section]:
+        return (self[position] for position in range(len(self.starts)))
+
+    def __getstate__(self):
+        return self.starts, self.body_starts, self.kinds, self.headings, self.length
+
+    def __setstate__(self, state):
+        self.starts, self.body_starts, self.kinds, self.headings, self.length = state
+
+    def section_at(self, offset: int) -> Optional[Section]:
+        """The section containing a character offset, or None for an empty text."""
+        position = bisect_right(self.starts, offset) - 1
+        return self[max(position, 0)] if self.starts else None
+
+    def kind_at(self, offset: int) -> SectionKind:
+        if not self.starts:
+            return SectionKind.HEADER
+        return self.kinds[max(bisect_right(self.starts, offset) - 1, 0)]
+
+    def of_kind(self, kinds: Iterable[SectionKind]) -> List[Section]:
+        kinds = set(kinds)
+        return [section for section in self if section.kind in kinds]
+
+    def doc_spans(self, doc, kinds: Optional[Iterable[SectionKind]] = None) -> List:
+        """The spaCy Spans of the sections (of the given kinds), for per-section matching or NER."""
+        sections = list(self) if kinds is None else self.of_kind(kinds)
+        spans = (doc.char_span(section.start, section.end, alignment_mode="expand") for section in sections)
+        return [span for span in spans if span is not None and len(span)]
+
+
+def segment(raw_text: str) -> SectionIndex:
+    """
+    Finds the section headings in `raw_text`. Unknown headings only count
+    once a known one has been seen, so a capitalized name at the top is not
+    taken for a heading.
+    """
+    starts, body_starts = array("I"), array("I")
+    kinds: List[SectionKind] = []
+    headings: List[Optional[str]] = []
+    position = 0
+    for line in raw_text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped and is_section_heading(stripped, known_only=not any(headings)):
+            start = position + line.index(stripped)
+            if not starts and start > 0 and raw_text[:start].strip():
+                # Text before the first heading is the header section.
+                starts.append(0)
+                body_starts.append(0)
+                kinds.append(SectionKind.HEADER)
+                headings.append(None)
+            starts.append(start)
+            body_starts.append(position + len(line))
+            kinds.append(heading_kind(stripped))
+            headings.append(stripped)
+        position += len(line)
+    if not starts and raw_text.strip():
+        starts.append(0)
+        body_starts.append(0)
+        kinds.append(SectionKind.HEADER)
+        headings.append(None)
+    return SectionIndex(starts, body_starts, tuple(kinds), tuple(headings), len(raw_text))
@@ -0,0 +1,111 @@
+# career_forge/engine/similarity.py
+
+import hashlib
+import random
+from array import array
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+# -----------------------------------------------------------------------------
+# MinHash and LSH over small sets of strings
+# -----------------------------------------------------------------------------
+# A MinHash signature keeps, for each of `num_perm` hash functions, the
+# smallest hash of the set's elements. Two sets agree on any one position with
+# probability equal to their Jaccard similarity |A & B| / |A | B|, so
+# signatures can be compared without the sets.
+#
+# LSH cuts the signature into `bands` bands of `rows` positions and files the
+# set under each band's values. Sets that share any band are candidates; the
+# chance of that is 1 - (1 - J^rows)^bands, an S-curve that is steepest
+# around (1 / bands) ^ (1 / rows). The default 32 bands of 3 rows find 99.9%
+# of sets with a similarity of 0.6, and 58% at 0.3; the exact similarity of
+# the candidates sorts out the rest. A lookup is one dict access per band,
+# however many sets are indexed.
+#
+# No embeddings and no numpy: the sets here are a profile's dozen skill
+# names, and each name's permuted hashes are computed once, so a signature
+# is the column minimums of a dozen short arrays.
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+class MinHasher:
+    """Computes signatures; every signature compared must come from the same parameters."""
+
+    MAX_CACHED_TOKENS = 50000
+
+    def __init__(self, num_perm: int = 96, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._permutations = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+        self._rows: Dict[str, array] = {}
+
+    def _row(self, token: str) -> array:
+        # The token's hash under every permutation. Skill vocabularies are
+        # small, so rows are kept (4 bytes per permutation) up to a bound.
+        row = self._rows.get(token)
+        if row is None:
+            h = _token_hash(token)
+            row = array("I", (((a * h + b) % _PRIME) & _MAX_HASH for a, b in self._permutations))
+            if len(self._rows) >= self.MAX_CACHED_TOKENS:
+                self._rows.clear()
+            self._rows[token] = row
+        return row
+
+    def signature(self, tokens: Iterable[str]) -> Tuple[int, ...]:
+        rows = [self._row(token) for token in set(tokens)]
+        if not rows:
+            return (_MAX_HASH,) * self.num_perm
+        # The signature is the column minimums of the elements' rows.
+        return tuple(map(min, zip(*rows)))
+
+
+def estimated_jaccard(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+class LSHIndex:
+    """Finds the keys whose signatures probably resemble a query signature."""
+
+    def __init__(self, bands: int = 32, rows: int = 3):
+        self.bands = bands
+        self.rows = rows
+        self._buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = [{} for _ in range(bands)]
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        if len(signature) != self.bands * self.rows:
+            raise ValueError(f"Signatures need {self.bands * self.rows} values, got {len(signature)}.")
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key: Hashable, signature: Tuple[int, ...]) -> None:
+        for band, values in self._band_keys(signature):
+            self._buckets[band].setdefault(values, set()).add(key)
+
+    def remove(self, key: Hashable, signature: Tuple[int, ...]) -> None:
+        for band, values in self._band_keys(signature):
+            bucket = self._buckets[band].get(values)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][values]
+
+    def candidates(self, signature: Tuple[int, ...]) -> Set[Hashable]:
+        found: Set[Hashable] = set()
+        for band, values in self._band_keys(signature):
+            found.update(self._buckets[band].get(values, ()))
+        return found
+
+    def clear(self) -> None:
+        for bucket in self._buckets:
+            bucket.clear()
@@ -0,0 +1,172 @@
+# career_forge/engine/skill_matcher.py
+
+import json
+import os
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from spacy.language import Language
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
+
+from .taxonomy import SkillTaxonomy
+
+# -----------------------------------------------------------------------------
+# A reusable, precompiled skill matcher
+# -----------------------------------------------------------------------------
+# Building a PhraseMatcher means tokenizing every skill name and alias, which
+# costs more than matching a whole resume. This class does it once and then
+# only matches. It can also be saved to disk so workers skip even that build.
+
+# All surface forms share one match key; the matched text is then resolved
+# to its canonical skill through the taxonomy's alias index.
+MATCH_KEY = "SKILL"
+
+
+class SkillMention(NamedTuple):
+    """One occurrence of a skill: its canonical name, categories and character offsets."""
+    name: str
+    categories: Tuple[str, ...]
+    start_char: int
+    end_char: int
+
+
+class _CompiledMatcher:
+    """An immutable PhraseMatcher plus the taxonomy and tokenized forms it was built from."""
+    __slots__ = ("matcher", "taxonomy", "forms")
+
+    def __init__(self, matcher: PhraseMatcher, taxonomy: SkillTaxonomy, forms: List[List[str]]):
+        self.matcher = matcher
+        self.taxonomy = taxonomy
+        self.forms = forms
+
+
+class SkillMatcher:
+    """
+    Wraps a PhraseMatcher built from a SkillTaxonomy.
+
+    `match()` is safe to call from many threads. `reload()` builds the new
+    matcher on the side and swaps it in with a single reference assignment,
+    so in-flight matches keep using the old one and never see a half-built
+    matcher.
+    """
+
+    def __init__(self, nlp: Language, taxonomy: Optional[SkillTaxonomy] = None):
+        self.nlp = nlp
+        self._reload_lock = threading.Lock()
+        self._compiled: Optional[_CompiledMatcher] = None
+        if taxonomy is not None:
+            self.reload(taxonomy)
+
+    # --- Building ---
+
+    def _compile(self, taxonomy: SkillTaxonomy, forms: List[List[str]]) -> _CompiledMatcher:
+        matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        # Whitespace between tokens does not matter for LOWER matching, so
+        # the pattern Docs can be rebuilt from bare token lists.
+        matcher.add(MATCH_KEY, [Doc(self.nlp.vocab, words=words) for words in forms])
+        return _CompiledMatcher(matcher, taxonomy, forms)
+
+    def reload(self, taxonomy: SkillTaxonomy) -> bool:
+        """
+        Rebuilds the matcher for a new taxonomy. Returns False (and does
+        nothing) when the taxonomy is unchanged.
+        """
+        with self._reload_lock:
+            if self._compiled is not None and self._compiled.taxonomy.fingerprint == taxonomy.fingerprint:
+                return False
+            surfaces = [surface for surface, _ in taxonomy.surface_forms()]
+            forms = [[token.text for token in doc] for doc in self.nlp.tokenizer.pipe(surfaces)]
+            self._compiled = self._compile(taxonomy, forms)
+            return True
+
+    @property
+    def taxonomy(self) -> Optional[SkillTaxonomy]:
+        return self._compiled.taxonomy if self._compiled else None
+
+    # --- Matching ---
+
+    def match_indices(self, doc: Doc) -> List[int]:
+        """Taxonomy indices of the skills found in `doc`, unique, in order of appearance."""
+        compiled = self._compiled
+        if compiled is None:
+            raise RuntimeError("SkillMatcher has no taxonomy loaded.")
+
+        seen = set()
+        found: List[int] = []
+        for _, start, end in compiled.matcher(doc):
+            index = compiled.taxonomy.lookup(doc[start:end].text)
+            if index is not None and index not in seen:
+                seen.add(index)
+                found.append(index)
+        return found
+
+    def mentions(self, doclike) -> List[SkillMention]:
+        """
+        Every skill mention in a Doc or Span, in order, with character offsets
+        into the whole Doc's text (so they can be placed in a section).
+        """
+        compiled = self._compiled
+        if compiled is None:
+            raise RuntimeError("SkillMatcher has no taxonomy loaded.")
+
+        taxonomy = compiled.taxonomy
+        # Matches in a Span come back as token indices into its Doc.
+        doc = getattr(doclike, "doc", doclike)
+        found: List[SkillMention] = []
+        for _, start, end in compiled.matcher(doclike):
+            span = doc[start:end]
+            index = taxonomy.lookup(span.text)
+            if index is not None:
+                found.append(SkillMention(taxonomy.names[index], tuple(taxonomy.categories_of(index)),
+                                          span.start_char, span.end_char))
+        return found
+
+    def match(self, doc: Doc) -> Dict[str, List[str]]:
+        """
+        Returns the canonical names of the skills found in `doc`, grouped by
+        category. A skill in several categories is listed under each of them.
+        """
+        compiled = self._compiled
+        if compiled is None:
+            raise RuntimeError("SkillMatcher has no taxonomy loaded.")
+
+        taxonomy = compiled.taxonomy
+        found_skills: Dict[str, List[str]] = {}
+        for index in self.match_indices(doc):
+            for category in taxonomy.categories_of(index):
+                found_skills.setdefault(category, []).append(taxonomy.names[index])
+        return found_skills
+
+    # --- Serialization ---
+
+    def save(self, path: str) -> None:
+        """
+        Writes the tokenized surface forms to disk. `load()` rebuilds the
+        pattern Docs straight from the stored tokens, without the tokenizer.
+        """
+        compiled = self._compiled
+        if compiled is None:
+            raise RuntimeError("SkillMatcher has no taxonomy loaded.")
+
+        payload = {"fingerprint": compiled.taxonomy.fingerprint, "forms": compiled.forms}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, nlp: Language, path: str, taxonomy: SkillTaxonomy) -> "SkillMatcher":
+        """
+        Loads a saved matcher. If it was built for a different taxonomy the
+        file is ignored and the matcher is rebuilt from `taxonomy`.
+        """
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+
+        if payload.get("fingerprint") != taxonomy.fingerprint:
+            return cls(nlp, taxonomy)
+        skill_matcher = cls(nlp)
+        skill_matcher._compiled = skill_matcher._compile(taxonomy, payload["forms"])
+        return skill_matcher
@@ -0,0 +1,394 @@
+# career_forge/engine/structured_output.py
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# -----------------------------------------------------------------------------
+# Structured LLM output
+# -----------------------------------------------------------------------------
+# JSON mode makes the LLM answer with JSON, but not necessarily with *valid*
+# or *complete* JSON: answers get cut off at the output token limit, wrapped
+# in ``` fences or given a trailing comma, and single fields come back with
+# the wrong type. Throwing the whole answer away for that wastes a call that
+# was paid for, so the helpers here:
+#
+# 1. turn a Pydantic model into a response schema the LLM is constrained to,
+# 2. recover a JSON value from a slightly broken answer,
+# 3. validate the value field by field, keeping what is valid, dropping bad
+#    list items and filling missing fields from defaults,
+# 4. parse a streamed answer incrementally, reporting each field as soon as
+#    its value is complete.
+
+
+class MalformedOutput(ValueError):
+    """No JSON value could be recovered from the LLM output."""
+
+
+# -----------------------------------------------------------------------------
+# 1. Response schemas
+# -----------------------------------------------------------------------------
+
+# JSON Schema keywords that Gemini's response schema (an OpenAPI subset) rejects.
+_UNSUPPORTED_KEYWORDS = {"title", "default", "additionalProperties", "$defs", "examples"}
+
+
+@lru_cache(maxsize=None)
+def response_schema(model: Type[BaseModel], descriptions: bool = True) -> Dict[str, Any]:
+    """
+    The JSON schema of `model` with every `$ref` inlined and unsupported
+    keywords removed, so Gemini and OpenAI-compatible servers both accept it.
+    The schema is sent (and billed) with every prompt; when the prompt already
+    explains the fields, `descriptions=False` leaves the field descriptions out.
+    Dict fields are not expressible (Gemini needs fixed properties), so models
+    used for schema output should spell their keys out as fields.
+    Shared between calls: don't modify the result.
+    """
+    schema = model.model_json_schema()
+    definitions = schema.get("$defs", {})
+
+    def inline(node):
+        if isinstance(node, list):
+            return [inline(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+        if "$ref" in node:
+            target = dict(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            # Keep the field's own description over the model's.
+            target.update({key: value for key, value in node.items() if key != "$ref"})
+            node = target
+        cleaned = {}
+        for key, value in node.items():
+            if key in _UNSUPPORTED_KEYWORDS or (key == "description" and not descriptions):
+                continue
+            if key == "properties":
+                # Property names are not keywords: a field may well be called "title".
+                cleaned[key] = {name: inline(sub_schema) for name, sub_schema in value.items()}
+            else:
+                cleaned[key] = inline(value)
+        return cleaned
+
+    return inline(schema)
+
+
+# -----------------------------------------------------------------------------
+# 2. JSON repair
+# -----------------------------------------------------------------------------
+
+_FENCE = re.compile(r"```(?:json)?", re.IGNORECASE)
+# Truncated answers are cut back one element at a time; give up after this many.
+_MAX_CUTS = 64
+
+
+def _scan(text: str) -> Tuple[str, List[Tuple[int, str]], str, bool]:
+    """
+    Walks `text` (which starts at its first `{` or `[`) outside of strings.
+    Returns the text up to the end of the first complete value with trailing
+    commas removed, the places it can be cut back to (with the containers open
+    there), the containers still open at the end and whether it ends inside a
+    string.
+    """
+    out: List[str] = []
+    cuts: List[Tuple[int, str]] = []
+    stack: List[str] = []
+    in_string = escaped = False
+
+    for char in text:
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+            out.append(char)
+            cuts.append((len(out), "".join(stack)))
+            continue
+        elif char in "}]":
+            # `[1, 2,]` -> `[1, 2]`
+            end = len(out) - 1
+            while end >= 0 and out[end].isspace():
+                end -= 1
+            if end >= 0 and out[end] == ",":
+                del out[end]
+            if stack:
+                stack.pop()
+            out.append(char)
+            if not stack:
+                # Anything after the value is prose.
+                return "".join(out), cuts, "", False
+            continue
+        elif char == ",":
+            cuts.append((len(out), "".join(stack)))
+        out.append(char)
+
+    return "".join(out), cuts, "".join(stack), in_string
+
+
+def _closers(stack: str) -> str:
+    return "".join("}" if opener == "{" else "]" for opener in reversed(stack))
+
+
+def parse_json_lenient(text: str) -> Tuple[Any, bool]:
+    """
+    Parses LLM output as JSON, repairing it if needed: code fences and
+    surrounding prose are dropped, trailing commas removed, and an answer
+    that was cut off is closed after its last complete element (a string
+    cut off mid-value is kept). Returns `(value, repaired)`; raises
+    `MalformedOutput` when nothing can be recovered.
+    """
+    try:
+        return json.loads(text), False
+    except (TypeError, ValueError):
+        pass
+    if not isinstance(text, str):
+        raise MalformedOutput(f"Expected text, got {type(text).__name__}.")
+
+    text = _FENCE.sub("", text)
+    starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+    if not starts:
+        raise MalformedOutput("No JSON object or array in the LLM output.")
+    body, cuts, open_stack, in_string = _scan(text[min(starts):])
+
+    candidates = [body + ('"' if in_string else "") + _closers(open_stack)]
+    candidates += [body[:position] + _closers(stack) for position, stack in reversed(cuts[-_MAX_CUTS:])]
+    for candidate in candidates:
+        try:
+            return json.loads(candidate), True
+        except ValueError:
+            continue
+    raise MalformedOutput("Could not repair the JSON in the LLM output.")
+
+
+# -----------------------------------------------------------------------------
+# 3. Partial validation
+# -----------------------------------------------------------------------------
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def _is_model(annotation) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _first_error(error: ValidationError) -> str:
+    detail = error.errors()[0]
+    return detail["msg"]
+
+
+def _salvage(annotation, value, path: str, problems: List[str]):
+    """Validates `value`; if it fails, keeps the valid parts of lists, dicts and models."""
+    try:
+        return _adapter(annotation).validate_python(value)
+    except ValidationError as e:
+        error = e
+
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is list and isinstance(value, list) and args:
+        kept = []
+        for index, item in enumerate(value):
+            item_value = _salvage(args[0], item, f"{path}[{index}]", problems)
+            if item_value is not _MISSING:
+                kept.append(item_value)
+        return kept
+    if origin is dict and isinstance(value, dict) and len(args) == 2:
+        kept = {}
+        for key, item in value.items():
+            item_value = _salvage(args[1], item, f"{path}.{key}", problems)
+            if item_value is not _MISSING:
+                kept[str(key)] = item_value
+        return kept
+    if _is_model(annotation) and isinstance(value, dict):
+        instance, model_problems = validate_partial(annotation, value, path=path)
+        problems.extend(model_problems)
+        return instance if instance is not None else _MISSING
+
+    problems.append(f"{path}: dropped ({_first_error(error)})")
+    return _MISSING
+
+
+def validate_partial(
+    model: Type[BaseModel],
+    data: Any,
+    defaults: Optional[Dict[str, Any]] = None,
+    path: str = "",
+) -> Tuple[Optional[BaseModel], List[str]]:
+    """
+    Validates `data` against `model` one field at a time. Invalid list
+    items and dict entries are dropped, and missing or invalid fields take
+    their value from `defaults` (or the model's own default). Returns the
+    instance and a list of what was repaired; the instance is None when a
+    required field has no fallback or nothing in `data` was usable.
+    """
+    if not isinstance(data, dict):
+        return None, [f"{path or model.__name__}: expected an object, got {type(data).__name__}"]
+    defaults = defaults or {}
+    values: Dict[str, Any] = {}
+    problems: List[str] = []
+    recovered = 0
+
+    for name, field in model.model_fields.items():
+        field_path = f"{path}.{name}" if path else name
+        value = _MISSING
+        if name in data:
+            value = _salvage(field.annotation, data[name], field_path, problems)
+        else:
+            problems.append(f"{field_path}: missing")
+        if value is not _MISSING:
+            values[name] = value
+            recovered += 1
+        elif name in defaults:
+            values[name] = defaults[name]
+        elif field.is_required():
+            return None, problems
+
+    if not recovered:
+        return None, problems
+    return model.model_validate(values), problems
+
+
+# -----------------------------------------------------------------------------
+# 4. Incremental parsing
+# -----------------------------------------------------------------------------
+
+JSONPath = Tuple[Union[str, int], ...]
+
+
+class _Frame:
+    __slots__ = ("opener", "start", "key", "expecting_key")
+
+    def __init__(self, opener: str, start: int):
+        self.opener = opener
+        self.start = start
+        # The key (objects) or index (arrays) of the value being read.
+        self.key: Union[str, int, None] = 0 if opener == "[" else None
+        self.expecting_key = opener == "{"
+
+
+class IncrementalJSONParser:
+    """
+    Reads a JSON document chunk by chunk, as an LLM streams it, and reports
+    every value up to `max_depth` levels deep as soon as it is complete:
+
+        parser.feed('{"user_name": "Ja')     -> []
+        parser.feed('ne", "skills": {"Te')   -> [(("user_name",), "Jane")]
+        parser.feed('chnicalSkills": ["Python"]')
+            -> [(("skills", "TechnicalSkills"), ["Python"])]
+
+    Deeper values are reported as part of their container. Each character is
+    looked at once; only completed values are decoded. Text before the first
+    `{` or `[` (e.g. a code fence) is skipped.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self.done = False
+        self._text = ""
+        self._position = 0
+        self._stack: List[_Frame] = []
+        self._started = False
+        self._in_string = self._escaped = False
+        self._string_start = 0
+        self._scalar_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[JSONPath, Any]]:
+        self._text += chunk
+        events: List[Tuple[JSONPath, Any]] = []
+        text = self._text
+        for position in range(self._position, len(text)):
+            if self.done:
+                break
+            self._step(text, position, text[position], events)
+        self._position = len(text)
+        return events
+
+    def _step(self, text: str, position: int, char: str, events: list) -> None:
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                frame = self._stack[-1] if self._stack else None
+                if frame is not None and frame.expecting_key:
+                    frame.key = json.loads(text[self._string_start:position + 1])
+                    frame.expecting_key = False
+                else:
+                    self._complete(self._string_start, position + 1, events)
+            return
+
+        if not self._started:
+            if char in "{[":
+                self._started = True
+            else:
+                return
+
+        if self._scalar_start is not None and (char.isspace() or char in ",]}"):
+            self._complete(self._scalar_start, position, events)
+            self._scalar_start = None
+
+        if char == '"':
+            self._in_string = True
+            self._string_start = position
+        elif char in "{[":
+            self._stack.append(_Frame(char, position))
+        elif char in "}]":
+            if self._stack:
+                frame = self._stack.pop()
+                self._complete(frame.start, position + 1, events)
+            if not self._stack:
+                self.done = True
+        elif char == ",":
+            if self._stack:
+                frame = self._stack[-1]
+                if frame.opener == "{":
+                    frame.expecting_key = True
+                else:
+                    frame.key += 1
+        elif not char.isspace() and char != ":" and self._scalar_start is None:
+            self._scalar_start = position
+
+    def _complete(self, start: int, end: int, events: list) -> None:
+        depth = len(self._stack)
+        if not 1 <= depth <= self.max_depth:
+            return
+        try:
+            value = json.loads(self._text[start:end])
+        except ValueError:
+            # Not valid JSON after all; the full answer gets repaired at the end.
+            return
+        events.append((tuple(frame.key for frame in self._stack), value))
+
+
+def read_stream(pieces: Iterable[str], on_field: Callable[[JSONPath, Any], None], max_depth: int = 2) -> str:
+    """
+    Joins a streamed answer, calling `on_field(path, value)` for every value
+    `IncrementalJSONParser` completes on the way. The values are raw JSON:
+    validate the full answer (returned) before relying on them.
+    """
+    parser = IncrementalJSONParser(max_depth)
+    for piece in pieces:
+        for path, value in parser.feed(piece):
+            on_field(path, value)
+    return parser.text
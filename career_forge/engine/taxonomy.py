@@ -0,0 +1,106 @@
+# career_forge/engine/taxonomy.py
+
+import hashlib
+import json
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# The taxonomy that ships with the code. Deployments can point
+# CAREER_FORGE_SKILL_TAXONOMY_PATH at their own file with the same layout.
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parents[1] / "data" / "skill_taxonomy.json"
+
+
+def normalize_surface(text: str) -> str:
+    """The lookup form of a skill mention: case-folded, single-spaced."""
+    return " ".join(text.casefold().split())
+
+
+class SkillTaxonomy:
+    """
+    An indexed, read-only view of the skill taxonomy file.
+
+    Each skill gets a dense integer index. Everything else is stored in flat
+    per-index columns, so a 50k-entry taxonomy stays a handful of lists
+    instead of 50k objects:
+
+    - `ids[i]` / `names[i]`: canonical ID and display name.
+    - `_membership[i]`: a bitmask over `categories` (a skill can belong to
+      several categories, e.g. Java is PROGRAMMING and MOBILE_DEVELOPMENT).
+    - `_lookup`: normalized name/alias -> index, for O(1) normalization.
+
+    When two entries claim the same alias, the first one in the file wins.
+    """
+    __slots__ = ("version", "fingerprint", "categories", "ids", "names", "_membership", "_lookup")
+
+    MAX_CATEGORIES = 64
+
+    def __init__(self, version: str, categories: List[str], skills: Iterable[dict], fingerprint: str):
+        if len(categories) > self.MAX_CATEGORIES:
+            raise ValueError(f"A skill taxonomy supports at most {self.MAX_CATEGORIES} categories.")
+        self.version = version
+        self.fingerprint = fingerprint
+        self.categories: Tuple[str, ...] = tuple(categories)
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self._membership = array("Q")
+        self._lookup: Dict[str, int] = {}
+
+        category_bits = {category: 1 << position for position, category in enumerate(self.categories)}
+        for entry in skills:
+            index = len(self.ids)
+            self.ids.append(entry["id"])
+            self.names.append(entry["name"])
+            mask = 0
+            for category in entry.get("categories", ()):
+                if category not in category_bits:
+                    raise ValueError(f"Skill '{entry['id']}' uses undeclared category '{category}'.")
+                mask |= category_bits[category]
+            self._membership.append(mask)
+            for surface in (entry["name"], *entry.get("aliases", ())):
+                self._lookup.setdefault(normalize_surface(surface), index)
+
+    # --- Loading ---
+
+    @classmethod
+    def from_dict(cls, data: dict, fingerprint: Optional[str] = None) -> "SkillTaxonomy":
+        if fingerprint is None:
+            payload = json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+            fingerprint = hashlib.sha256(payload).hexdigest()
+        return cls(data.get("version", "unversioned"), data["categories"], data["skills"], fingerprint)
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TAXONOMY_PATH) -> "SkillTaxonomy":
+        raw = Path(path).read_bytes()
+        return cls.from_dict(json.loads(raw), fingerprint=hashlib.sha256(raw).hexdigest())
+
+    # --- Lookups (all O(1)) ---
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def lookup(self, surface: str) -> Optional[int]:
+        """Maps any spelling of a skill ('k8s', 'JS', 'python') to its index."""
+        return self._lookup.get(normalize_surface(surface))
+
+    def canonical_name(self, surface: str) -> Optional[str]:
+        index = self.lookup(surface)
+        return self.names[index] if index is not None else None
+
+    def categories_of(self, index: int) -> List[str]:
+        mask = self._membership[index]
+        return [category for position, category in enumerate(self.categories) if mask >> position & 1]
+
+    # --- Views used to build matchers ---
+
+    def surface_forms(self) -> Iterator[Tuple[str, int]]:
+        """Every normalized name and alias with the index it resolves to."""
+        return iter(self._lookup.items())
+
+    def category_patterns(self) -> Dict[str, List[str]]:
+        """The taxonomy as the old `{category: [skill name, ...]}` dictionary."""
+        patterns: Dict[str, List[str]] = {category: [] for category in self.categories}
+        for index, name in enumerate(self.names):
+            for category in self.categories_of(index):
+                patterns[category].append(name)
+        return patterns
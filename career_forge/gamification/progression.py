@@ -0,0 +1,117 @@
+# career_forge/gamification/progression.py
+
+import hashlib
+import json
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from career_forge.schemas.quest import Quest
+
+# -----------------------------------------------------------------------------
+# XP, levels and ranks
+# -----------------------------------------------------------------------------
+# Skills level up on a rising curve: going from level L to L + 1 takes
+# 100 * L XP, so a skill's level follows from its total XP alone and is never
+# stored. The main level is different: the resume analysis sets the starting
+# rank (E to S) and level (1 to 99), and earned XP moves it up from there,
+# MAIN_LEVEL_XP per level. Past level 99 the profile is promoted to the next
+# rank at level 1. Nothing here ever takes a level away.
+
+RANKS = ("E", "D", "C", "B", "A", "S")
+MAX_LEVEL = 99
+SKILL_LEVEL_XP = 100
+MAIN_LEVEL_XP = 500
+
+
+class SkillProgress(NamedTuple):
+    level: int
+    xp: int  # XP into the current level
+    xp_to_next_level: int
+
+
+def skill_progress(total_xp: int) -> SkillProgress:
+    """Level, XP into it and XP still needed, from a skill's total XP."""
+    level, remaining = 1, max(0, total_xp)
+    while remaining >= SKILL_LEVEL_XP * level:
+        remaining -= SKILL_LEVEL_XP * level
+        level += 1
+    return SkillProgress(level, remaining, SKILL_LEVEL_XP * level - remaining)
+
+
+# A rank letter on its own, as in "B", "b", "B-Rank" or "Rank A".
+_RANK_LETTER = re.compile(r"\b([EDCBAS])\b")
+
+
+def rank_index(rank: str) -> int:
+    """Position of a rank in RANKS; unknown ranks count as the lowest."""
+    match = _RANK_LETTER.search(rank.upper())
+    return RANKS.index(match.group(1)) if match else 0
+
+
+def add_main_xp(rank: str, level: int, xp: int, amount: int) -> Tuple[str, int, int]:
+    """The main (rank, level, xp into the level) after earning `amount` XP."""
+    index, level, xp = rank_index(rank), min(max(level, 1), MAX_LEVEL), xp + max(0, amount)
+    while xp >= MAIN_LEVEL_XP:
+        if index == len(RANKS) - 1 and level == MAX_LEVEL:
+            break  # S99 is the top; keep the XP.
+        xp -= MAIN_LEVEL_XP
+        level += 1
+        if level > MAX_LEVEL:
+            index, level = index + 1, 1
+    return RANKS[index], level, xp
+
+
+def normalize_rank(rank: str) -> str:
+    """One of RANKS, from an LLM's free-text rank ("b" -> "B"); unknown ranks are "E"."""
+    return RANKS[rank_index(rank)]
+
+
+def higher_standing(current: Tuple[str, int], suggested: Tuple[str, int]) -> Tuple[str, int]:
+    """The better of two (rank, level) pairs, e.g. after a re-upload, with the rank normalized."""
+    rank, level = max(current, suggested, key=lambda standing: (rank_index(standing[0]), standing[1]))
+    return normalize_rank(rank), level
+
+
+# -----------------------------------------------------------------------------
+# Quest rewards
+# -----------------------------------------------------------------------------
+# Rewards are free text written by the quest generators ("+50 XP Python");
+# anything that isn't "<amount> XP <skill>" (a badge, a title) gives no XP.
+
+_XP_REWARD = re.compile(r"^\s*\+?\s*(\d{1,6})\s*XP\s+(.+?)\s*$", re.IGNORECASE)
+
+
+class XPAward(NamedTuple):
+    user_id: str
+    skill: str
+    xp: int
+    # Category for a skill the profile doesn't have yet.
+    category: Optional[str] = None
+
+
+def parse_reward(reward: str) -> Optional[Tuple[int, str]]:
+    match = _XP_REWARD.match(reward)
+    if match is None:
+        return None
+    return int(match.group(1)), match.group(2)
+
+
+def quest_id(quest: Quest) -> str:
+    """
+    A stable ID for a quest, from its content. A quest is only worth XP if it
+    was issued to the user, so a client that edits the rewards gets an ID
+    that was never issued.
+    """
+    content = json.dumps(quest.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+
+def quest_awards(user_id: str, quests: List[Quest]) -> List[XPAward]:
+    """The XP awards for a user's completed quests."""
+    awards = []
+    for quest in quests:
+        for reward in quest.rewards:
+            parsed = parse_reward(reward)
+            if parsed is not None:
+                awards.append(XPAward(user_id, parsed[1], parsed[0], quest.category))
+    return awards
@@ -0,0 +1,277 @@
+# career_forge/gamification/quest_catalog.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from career_forge.config import get_settings
+from career_forge.engine import metrics
+from career_forge.engine.llm_analyzer import LLMAnalysis
+from career_forge.engine.similarity import LSHIndex, MinHasher, jaccard
+from career_forge.engine.taxonomy import normalize_surface
+from career_forge.schemas.quest import Quest
+
+# -----------------------------------------------------------------------------
+# Quest catalog
+# -----------------------------------------------------------------------------
+# Profiles with similar skills (Python + Django + PostgreSQL) get near-identical
+# quests from the LLM. The catalog keeps every generated quest set together
+# with the skill set of the profile it was written for. Before asking the LLM,
+# the quests stage looks for an entry whose skill set is similar enough
+# (Jaccard >= CAREER_FORGE_QUEST_CATALOG_THRESHOLD) and reuses its quests.
+#
+# Lookups go through MinHash signatures in an LSH index (see
+# engine/similarity.py), so finding candidates is a handful of dict accesses
+# however large the catalog is; the candidates' exact Jaccard similarity then
+# picks the best one.
+#
+# Quests that name the original profile's person, projects or organizations
+# are personal and never enter the catalog.
+#
+# The entries live in SQLite and the index in memory. Entries added by other
+# processes sharing the file are picked up on the next lookup.
+
+
+def skill_set(analysis: LLMAnalysis) -> FrozenSet[str]:
+    return frozenset(
+        normalize_surface(skill) for skills in (analysis.skills or {}).values() for skill in skills if skill.strip()
+    )
+
+
+def _personal_phrases(analysis: LLMAnalysis) -> List[str]:
+    phrases = [analysis.user_name]
+    for experience in analysis.experiences:
+        phrases.extend((experience.title, experience.organization))
+    normalized = (normalize_surface(phrase) for phrase in phrases if phrase)
+    return [phrase for phrase in normalized if len(phrase) >= 4 and phrase not in ("n/a", "user")]
+
+
+def reusable_quests(analysis: LLMAnalysis, quests: List[Quest]) -> List[Quest]:
+    """The quests that don't mention anything personal from the analysis."""
+    phrases = _personal_phrases(analysis)
+    return [
+        quest for quest in quests
+        if not any(phrase in normalize_surface(f"{quest.title} {quest.description}") for phrase in phrases)
+    ]
+
+
+@dataclass
+class CatalogLookup:
+    """The outcome of one lookup; `quests` is set on a hit."""
+    similarity: float = 0.0
+    entry_id: Optional[int] = None
+    quests: Optional[List[Quest]] = None
+    # Estimated LLM time the hit saved.
+    saved_seconds: float = 0.0
+    # The closest entry's quests when it is below the threshold, usable as a fallback.
+    nearest: Optional[List[Quest]] = None
+
+    @property
+    def hit(self) -> bool:
+        return self.quests is not None
+
+    def to_header(self) -> str:
+        """Compact form for the X-Quest-Catalog response header."""
+        parts = ["hit" if self.hit else "miss", f"similarity={self.similarity:.2f}"]
+        if self.hit:
+            parts.append(f"saved_ms={self.saved_seconds * 1000:.0f}")
+        return ";".join(parts)
+
+
+class QuestCatalog:
+    # Quest sets whose skills are this similar to an existing entry's are not added again.
+    DUPLICATE_SIMILARITY = 0.9
+    # Weight of the newest LLM quest call in the average used to estimate savings.
+    _EWMA_ALPHA = 0.2
+
+    def __init__(self, path: str, threshold: float = 0.6, max_entries: int = 50000,
+                 num_perm: int = 96, bands: int = 32):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._hasher = MinHasher(num_perm)
+        self._index = LSHIndex(bands, num_perm // bands)
+        self._entries: Dict[int, Tuple[FrozenSet[str], Tuple[int, ...]]] = {}
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._counters = {"lookups": 0, "hits": 0, "added": 0, "saved_seconds": 0.0}
+        self._generation_seconds: Optional[float] = None
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quest_sets ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, skills TEXT NOT NULL, signature BLOB NOT NULL,"
+            " quests TEXT NOT NULL,"
+            " model_id TEXT NOT NULL, created_at REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quest_set_categories ("
+            " category TEXT NOT NULL, set_id INTEGER NOT NULL, PRIMARY KEY (category, set_id)) WITHOUT ROWID"
+        )
+        with self._lock:
+            self._sync()
+
+    def _sync(self) -> None:
+        # Indexes the entries added since the last call (by any process). Holds the lock.
+        rows = self._conn.execute(
+            "SELECT id, skills, signature FROM quest_sets WHERE id > ? ORDER BY id", (self._last_id,)).fetchall()
+        for entry_id, skills, stored in rows:
+            skills = frozenset(json.loads(skills))
+            signature = tuple(array("I", stored))
+            if len(signature) != self._hasher.num_perm:
+                # Written with other MinHash parameters.
+                signature = self._hasher.signature(skills)
+            self._entries[entry_id] = (skills, signature)
+            self._index.add(entry_id, signature)
+            self._last_id = entry_id
+
+    def _best(self, skills: FrozenSet[str]) -> Tuple[Optional[int], float]:
+        best_id, best_similarity = None, 0.0
+        for entry_id in self._index.candidates(self._hasher.signature(skills)):
+            similarity = jaccard(skills, self._entries[entry_id][0])
+            # Ties go to the newest entry.
+            if similarity > best_similarity or (similarity == best_similarity and (best_id is None or entry_id > best_id)):
+                best_id, best_similarity = entry_id, similarity
+        return best_id, best_similarity
+
+    def _load_quests(self, entry_id: int) -> List[Quest]:
+        row = self._conn.execute("SELECT quests FROM quest_sets WHERE id = ?", (entry_id,)).fetchone()
+        return [Quest.model_validate(quest) for quest in json.loads(row[0])] if row else []
+
+    # --- Lookups ---
+
+    def lookup(self, analysis: LLMAnalysis) -> CatalogLookup:
+        """The quests of the most similar entry, if it reaches the threshold."""
+        skills = skill_set(analysis)
+        result = CatalogLookup()
+        if not skills:
+            return result
+        with self._lock:
+            self._sync()
+            entry_id, result.similarity = self._best(skills)
+            self._counters["lookups"] += 1
+            if entry_id is not None:
+                quests = self._load_quests(entry_id)
+                if result.similarity >= self.threshold and quests:
+                    result.entry_id, result.quests = entry_id, quests
+                    result.saved_seconds = self._generation_seconds or 0.0
+                    self._counters["hits"] += 1
+                    self._counters["saved_seconds"] += result.saved_seconds
+                    self._conn.execute("UPDATE quest_sets SET hits = hits + 1 WHERE id = ?", (entry_id,))
+                else:
+                    result.nearest = quests or None
+        metrics.QUEST_CATALOG_LOOKUPS.labels("hit" if result.hit else "miss").inc()
+        if result.hit:
+            metrics.QUEST_CATALOG_SAVED.inc(result.saved_seconds)
+        return result
+
+    def record_generation(self, seconds: float) -> None:
+        """Reports how long an LLM quest call took; hits are credited with the recent average."""
+        with self._lock:
+            if self._generation_seconds is None:
+                self._generation_seconds = seconds
+            else:
+                self._generation_seconds += self._EWMA_ALPHA * (seconds - self._generation_seconds)
+
+    # --- Adding quest sets ---
+
+    def add(self, analysis: LLMAnalysis, quests: List[Quest], model_id: str = "") -> Optional[int]:
+        """
+        Files freshly generated quests under the analysis's skill set. Returns
+        the new entry's ID, or None when it wasn't added (too few reusable
+        quests, a near-duplicate entry exists, or the catalog is full).
+        """
+        skills = skill_set(analysis)
+        reusable = reusable_quests(analysis, quests)
+        if not skills or len(reusable) < 2:
+            return None
+        with self._lock:
+            self._sync()
+            if self._best(skills)[1] >= self.DUPLICATE_SIMILARITY or len(self._entries) >= self.max_entries:
+                return None
+            categories = sorted({quest.category for quest in reusable})
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                entry_id = self._conn.execute(
+                    "INSERT INTO quest_sets (skills, signature, quests, model_id, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (json.dumps(sorted(skills)), array("I", self._hasher.signature(skills)).tobytes(),
+                     json.dumps([quest.model_dump() for quest in reusable]), model_id, time.time()),
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO quest_set_categories (category, set_id) VALUES (?, ?)",
+                    [(category, entry_id) for category in categories])
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._sync()
+            self._counters["added"] += 1
+        return entry_id
+
+    # --- Browsing and administration ---
+
+    def by_category(self, category: str, limit: int = 20) -> List[dict]:
+        """The most reused entries with quests in a category."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.id, s.skills, s.quests, s.hits FROM quest_set_categories c"
+                " JOIN quest_sets s ON s.id = c.set_id WHERE c.category = ?"
+                " ORDER BY s.hits DESC, s.id DESC LIMIT ?", (category, limit)).fetchall()
+        return [{"id": entry_id, "skills": json.loads(skills), "quests": json.loads(quests), "hits": hits}
+                for entry_id, skills, quests, hits in rows]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM quest_set_categories")
+            self._conn.execute("DELETE FROM quest_sets")
+            self._entries.clear()
+            self._index.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            entries, average = len(self._entries), self._generation_seconds
+        lookups = counters["lookups"]
+        return {
+            "entries": entries,
+            "threshold": self.threshold,
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            "saved_seconds": round(counters["saved_seconds"], 3),
+            "average_llm_quest_seconds": round(average, 3) if average is not None else None,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# -----------------------------------------------------------------------------
+# Process-wide instance
+# -----------------------------------------------------------------------------
+
+_catalog: Optional[QuestCatalog] = None
+_catalog_built = False
+
+
+def get_quest_catalog() -> Optional[QuestCatalog]:
+    """
+    Returns the shared catalog, or None when it is disabled. Also used as a
+    FastAPI dependency so it can be overridden in benchmarks.
+    """
+    global _catalog, _catalog_built
+    if not _catalog_built:
+        settings = get_settings()
+        if settings.quest_catalog:
+            _catalog = QuestCatalog(settings.quest_catalog_path, settings.quest_catalog_threshold,
+                                    settings.quest_catalog_max_entries)
+        _catalog_built = True
+    return _catalog
@@ -1,29 +1,112 @@
 # career_forge/gamification/quest_generator.py
 
-import os
+import logging
 import json
-import google.generativeai as genai
 from typing import List
 from ..schemas.quest import Quest
 from ..engine.llm_analyzer import LLMAnalysis
-from dotenv import load_dotenv
+from ..engine.llm_client import get_llm_client, llm_configured
+from ..engine.llm_providers import TASK_QUESTS
+from ..engine.structured_output import MalformedOutput, parse_json_lenient, validate_partial
 
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+# The client's provider and model (LLMClient.model_id) and PROMPT_VERSION are
+# part of the quest cache key; bump PROMPT_VERSION when the prompt changes.
+# The model used to be gemini-1.5-flash; both prompts now share the client's model.
+# "2": the prompt gets the compact context from build_quest_context().
+PROMPT_VERSION = "2"
+
+# Returned when the LLM fails. It is never cached.
+FALLBACK_QUEST = Quest(
+    title="Explore Your Profile",
+    description="Review the skills and experiences identified in your profile. Think about which skill you'd like to improve first.",
+    category="Intelligence",
+    rewards=["+10 XP Self-Awareness"]
+)
+
+
+def parse_quests(data) -> List[Quest]:
+    """
+    The valid quests in a parsed LLM answer: a list of quests, or an object
+    with a "quests" list. Invalid quests are dropped, not the whole answer.
+    """
+    if isinstance(data, dict):
+        data = data.get("quests", [])
+    if not isinstance(data, list):
+        return []
+    quests = []
+    for item in data:
+        quest, _ = validate_partial(Quest, item)
+        if quest is not None:
+            quests.append(quest)
+    return quests
+
+
+def build_quest_context(analysis: LLMAnalysis) -> str:
+    """
+    The part of the analysis the quest prompt needs, as compact JSON. The
+    name, organizations and experience descriptions don't shape the quests,
+    and pretty-printing only adds tokens.
+    """
+    context = {
+        "job_title": analysis.job_title,
+        "rank": analysis.suggested_rank,
+        "level": analysis.suggested_level,
+        "summary": analysis.summary,
+        "skills": {category: skills for category, skills in analysis.skills.items() if skills},
+        "experiences": [f"{e.category}: {e.title}" for e in analysis.experiences],
+        "strengths": analysis.inferred_strengths,
+    }
+    return json.dumps(context, ensure_ascii=False, separators=(",", ":"))
+
+
+def generate_quests_locally(analysis: LLMAnalysis) -> List[Quest]:
+    """
+    Template quests built from the analysis without calling the LLM, for the
+    local analysis mode. Less personal, but instant and always available.
+    """
+    technical = analysis.skills.get("TechnicalSkills", [])
+    soft = analysis.skills.get("SoftSkills", []) + analysis.skills.get("Intelligence", [])
+    quests: List[Quest] = []
+
+    if technical:
+        quests.append(Quest(
+            title=f"Daily {technical[0]} Practice",
+            description=f"Spend 30 minutes solving one small problem with {technical[0]}.",
+            category="TechnicalSkills",
+            rewards=[f"+50 XP {technical[0]}"]
+        ))
+    if len(technical) >= 2:
+        quests.append(Quest(
+            title=f"Side Mission: {technical[0]} meets {technical[1]}",
+            description=f"Build a small project that combines {technical[0]} and {technical[1]}, and publish it.",
+            category="TechnicalSkills",
+            rewards=[f"+100 XP {technical[0]}", f"+100 XP {technical[1]}"]
+        ))
+    if analysis.experiences:
+        skill = soft[0] if soft else "Communication"
+        quests.append(Quest(
+            title="Weekly Challenge: Tell Your Story",
+            description=f"Write a short post about '{analysis.experiences[0].title}': the problem, what you did and the result.",
+            category="SoftSkills",
+            rewards=[f"+30 XP {skill}"]
+        ))
+
+    return quests or [FALLBACK_QUEST.model_copy()]
 
 
 def generate_quests_with_llm(analysis: LLMAnalysis) -> List[Quest]:
     """
     Generates personalized quests using the Gemini LLM based on the user's full profile analysis.
     """
-    if not os.environ.get("GOOGLE_API_KEY"):
+    if not llm_configured():
         # If the API key isn't set, return an empty list instead of crashing.
-        print("Warning: GOOGLE_API_KEY not set. Cannot generate LLM-based quests.")
+        logger.warning("GOOGLE_API_KEY not set. Cannot generate LLM-based quests.")
         return []
 
-    model = genai.GenerativeModel('gemini-1.5-flash')
-
     # Convert the analysis object to a string for the prompt
-    analysis_context = analysis.model_dump_json(indent=2)
+    analysis_context = build_quest_context(analysis)
 
     # This is the "Quest Master" prompt. It provides the full user context
     # and asks the AI to create relevant, actionable quests.
@@ -53,33 +136,19 @@ def generate_quests_with_llm(analysis: LLMAnalysis) -> List[Quest]:
     ]
     """
 
-    # A slightly higher temperature allows for more creative and varied quest suggestions.
-    generation_config = genai.types.GenerationConfig(
-        response_mime_type="application/json",
-        temperature=0.5
-    )
-
     try:
-        response = model.generate_content(
-            master_prompt,
-            generation_config=generation_config
-        )
-
-        # The response should be a JSON string representing a list of quests
-        quests_data = json.loads(response.text)
+        # A slightly higher temperature allows for more creative and varied quest suggestions.
+        response_text = get_llm_client().generate(master_prompt, temperature=0.5, task=TASK_QUESTS)
 
-        # Validate the data using our Pydantic model
-        validated_quests = [Quest(**q) for q in quests_data]
+        # The response should be a JSON string representing a list of quests;
+        # broken JSON is repaired and invalid quests are dropped.
+        quests_data, _ = parse_json_lenient(response_text)
+        validated_quests = parse_quests(quests_data)
+        if not validated_quests:
+            raise MalformedOutput("The LLM answer contained no valid quest.")
         return validated_quests
 
     except Exception as e:
-        print(f"Error generating quests with LLM: {e}")
+        logger.warning("Error generating quests with LLM: %s", e, extra={"error": type(e).__name__})
         # Return a fallback quest if the LLM fails
-        return [
-            Quest(
-                title="Explore Your Profile",
-                description="Review the skills and experiences identified in your profile. Think about which skill you'd like to improve first.",
-                category="Intelligence",
-                rewards=["+10 XP Self-Awareness"]
-            )
-        ]
\ No newline at end of file
+        return [FALLBACK_QUEST.model_copy()]
\ No newline at end of file
@@ -1,7 +1,7 @@
 # career_forge/schemas/analysis.py
 
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 from .user import UserProfile
 from .quest import Quest
 # Import the ExperienceDetail model from the analyzer
@@ -11,4 +11,10 @@ class AnalysisResult(BaseModel):
     """The final, combined response object for the main API endpoint."""
     profile: UserProfile = Field(description="The generated gamified user profile.")
     quests: List[Quest] = Field(description="A list of personalized quests for the user.")
-    experiences: List[ExperienceDetail] = Field(description="A detailed list of experiences from the resume.")
\ No newline at end of file
+    experiences: List[ExperienceDetail] = Field(description="A detailed list of experiences from the resume.")
+    analysis_id: Optional[str] = Field(
+        default=None,
+        description="Set when the quests or the LLM analysis are still running; use it to fetch them later.")
+    source: str = Field(
+        default="llm",
+        description="'llm' for the Gemini analysis, 'local' for the rule-based one.")
\ No newline at end of file
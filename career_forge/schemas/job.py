@@ -0,0 +1,31 @@
+# career_forge/schemas/job.py
+
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from .analysis import AnalysisResult
+
+class JobSubmitted(BaseModel):
+    """The answer to `POST /jobs`: where to follow the job."""
+    job_id: str = Field(description="The ID of the queued job.")
+    state: str = Field(description="Always 'queued' right after submitting.")
+    status_url: str = Field(description="Poll this URL for the state and results.")
+    events_url: str = Field(description="Server-sent events with the job's progress.")
+
+class JobStatus(BaseModel):
+    """The state of a background analysis job."""
+    job_id: str
+    state: str = Field(description="queued, running, done or failed.")
+    mode: str = Field(description="The analysis mode the job runs in.")
+    filename: str
+    created_at: float = Field(description="Unix time the job was submitted.")
+    started_at: Optional[float] = Field(default=None, description="Unix time the current attempt started.")
+    finished_at: Optional[float] = None
+    attempts: int = Field(description="Attempts started so far; transient failures are retried.")
+    position: Optional[int] = Field(default=None, description="Place in the queue (1 = next) while queued.")
+    stage: Optional[str] = Field(default=None, description="The pipeline stage that most recently started or finished.")
+    events: List[dict] = Field(default_factory=list, description="Progress events, oldest first.")
+    partial: Optional[AnalysisResult] = Field(
+        default=None,
+        description="The best result so far while the job runs, e.g. the profile before the quests.")
+    result: Optional[AnalysisResult] = Field(default=None, description="Set once the job is done.")
+    error: Optional[str] = Field(default=None, description="Set when the job failed.")
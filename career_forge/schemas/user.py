@@ -1,7 +1,9 @@
 # career_forge/schemas/user.py
 
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
+from .quest import Quest
+from ..engine.llm_analyzer import ExperienceDetail
 
 class Skill(BaseModel):
     """Represents a single, levelable skill in the user's profile."""
@@ -18,4 +20,42 @@ class UserProfile(BaseModel):
     main_rank: str = Field(description="The user's overall career rank (e.g., E, D, C, B, A, S).")
     level: int = Field(description="The user's main level within their current rank.")
     xp: int = Field(description="The user's main experience points.")
-    skills: List[Skill] = Field(description="A list of all skills identified for the user, each with its own level.")
\ No newline at end of file
+    skills: List[Skill] = Field(description="A list of all skills identified for the user, each with its own level.")
+
+class StoredProfile(BaseModel):
+    """A profile kept in the profile store, with the progress earned since the first upload."""
+    user_id: str
+    profile: UserProfile = Field(description="The profile; `xp` is the XP into the current main level.")
+    xp_to_next_level: int = Field(description="XP still needed for the next main level.")
+    total_xp: int = Field(description="All XP earned from quests so far.")
+    experiences: List[ExperienceDetail] = Field(description="Every experience from all uploaded resumes.")
+    resume_digest: str = Field(description="Digest of the most recently merged resume text.")
+    updated_at: float = Field(description="Unix time of the last change.")
+
+class LeaderboardEntry(BaseModel):
+    position: int = Field(description="1 for the leader; equal standings share a position.")
+    user_id: str
+    user_name: str
+    main_rank: str
+    level: int
+    xp: int
+
+class Leaderboard(BaseModel):
+    """One page of a leaderboard, best first."""
+    entries: List[LeaderboardEntry]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Pass as `after` for the next page; empty on the last page.")
+
+class XPAwardRequest(BaseModel):
+    user_id: str = Field(min_length=1, max_length=128)
+    skill: str = Field(min_length=1, description="The skill earning the XP; added to the profile if it is new.")
+    xp: int = Field(gt=0, le=100000)
+    category: Optional[str] = Field(default=None, description="Category for a new skill.")
+
+class XPAwardBatch(BaseModel):
+    """Awards applied together in one transaction, e.g. a nightly import of finished quests."""
+    awards: List[XPAwardRequest] = Field(max_length=10000)
+
+class CompletedQuests(BaseModel):
+    """Quests a user finished; their '+N XP Skill' rewards are applied."""
+    quests: List[Quest]
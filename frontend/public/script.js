@@ -1,5 +1,7 @@
 // --- Define the connection to your backend API ---
 const API_URL = 'http://127.0.0.1:8000/api/v1/hackrx/run';
+// Same analysis, streamed as NDJSON events so the dashboard fills in while the LLM writes
+const STREAM_URL = `${API_URL}/stream`;
 
 // --- Get references to all necessary DOM elements ---
 const [uploadView, dashboardView, questsView] = [document.getElementById('upload-view'), document.getElementById('dashboard-view'), document.getElementById('quests-view')];
@@ -65,26 +67,7 @@ analyzeBtn.addEventListener('click', async () => {
     formData.append('file', selectedFile);
 
     try {
-        const response = await fetch(API_URL, {
-            method: 'POST',
-            body: formData,
-        });
-
-        if (!response.ok) {
-            const errorData = await response.json();
-            throw new Error(errorData.detail || `HTTP error! Status: ${response.status}`);
-        }
-
-        const data = await response.json();
-        console.log("Backend response:", data); // For debugging
-
-        // Store quests globally if they exist
-        currentQuests = data.quests || [];
-
-        displayDashboard(data); // Render the dashboard with received data
-        displayQuests(currentQuests); // Render the quests view
-        showView(dashboardView); // Switch to dashboard view
-
+        await streamAnalysis(formData);
     } catch (error) {
         console.error('Error during analysis:', error);
         statusEl.textContent = `❌ Error: ${error.message}`;
@@ -97,6 +80,107 @@ analyzeBtn.addEventListener('click', async () => {
 });
 
 
+// --- Streaming analysis ---
+// The backend sends one JSON event per line: "field" events with each LLM field as soon as it is
+// written (a preview), then "profile", "quests" and finally "done" with the complete result.
+async function streamAnalysis(formData) {
+    const startedAt = performance.now();
+    let firstContentMs = null;
+    const draft = { profile: { skills: [] }, experiences: [], summary: undefined };
+    currentQuests = [];
+
+    // Renders at most once per frame, however many events arrive in between
+    let renderPending = false;
+    const scheduleRender = () => {
+        if (renderPending) return;
+        renderPending = true;
+        requestAnimationFrame(() => {
+            renderPending = false;
+            if (firstContentMs === null) {
+                firstContentMs = performance.now() - startedAt;
+                loader.style.display = 'none';
+                showView(dashboardView);
+            }
+            displayDashboard(draft);
+            displayQuests(currentQuests);
+        });
+    };
+
+    const handleEvent = (event) => {
+        switch (event.event) {
+            case 'field':
+                applyField(draft, event.path, event.value);
+                break;
+            case 'preview':
+            case 'profile':
+                // Validated data replaces the previews
+                Object.assign(draft, { profile: event.profile, experiences: event.experiences, summary: event.summary });
+                break;
+            case 'quests':
+                currentQuests = event.quests;
+                break;
+            case 'done':
+                currentQuests = event.result.quests || [];
+                console.log('Analysis timing:', {
+                    ...event.timing,
+                    client_first_content_ms: Math.round(firstContentMs ?? performance.now() - startedAt),
+                    client_total_ms: Math.round(performance.now() - startedAt),
+                });
+                break;
+            case 'error':
+                throw new Error(event.detail || `HTTP error! Status: ${event.status}`);
+        }
+        scheduleRender();
+    };
+
+    const response = await fetch(STREAM_URL, { method: 'POST', body: formData });
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.detail || `HTTP error! Status: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        buffered += decoder.decode(value || new Uint8Array(), { stream: !done });
+        const lines = buffered.split('\n');
+        buffered = lines.pop(); // An incomplete last line waits for the next chunk
+        lines.filter(line => line.trim()).forEach(line => handleEvent(JSON.parse(line)));
+        if (done) break;
+    }
+    if (buffered.trim()) handleEvent(JSON.parse(buffered));
+}
+
+// Maps a streamed LLM field (e.g. ["skills", "TechnicalSkills"]) onto the dashboard's data shape
+function applyField(draft, path, value) {
+    const [field, key] = path;
+    const profile = draft.profile;
+    if (field === 'user_name' || field === 'job_title') {
+        profile[field] = value;
+    } else if (field === 'suggested_rank') {
+        profile.main_rank = value;
+    } else if (field === 'suggested_level') {
+        profile.level = value;
+    } else if (field === 'summary') {
+        draft.summary = value;
+    } else if (field === 'skills' && typeof value === 'object' && value !== null) {
+        const categories = key === undefined ? Object.entries(value) : [[key, value]];
+        categories.filter(([, names]) => Array.isArray(names)).forEach(([category, names]) => {
+            profile.skills = profile.skills.filter(skill => skill.category !== category)
+                .concat(names.map(name => ({ name, category })));
+        });
+    } else if (field === 'experiences') {
+        if (key === undefined && Array.isArray(value)) draft.experiences = value;
+        else if (typeof key === 'number') draft.experiences[key] = value;
+    } else if (field === 'quests') {
+        if (key === undefined && Array.isArray(value)) currentQuests = value;
+        else if (typeof key === 'number') currentQuests[key] = value;
+    }
+}
+
+
 // --- Display Functions (to render data into HTML) ---
 function displayDashboard(data) {
     const { profile, experiences = [], summary = "No summary generated." } = data;
@@ -184,7 +268,7 @@ function displayQuests(quests) {
                 <div class="quest-item">
                     <h3>${quest.title}</h3>
                     <p>${quest.description}</p>
-                    <small><b>Rewards:</b> ${quest.rewards.join(', ')}</small>
+                    <small><b>Rewards:</b> ${(quest.rewards || []).join(', ')}</small>
                 </div>`).join('');
         } else {
             questsContentEl.innerHTML = '<p>No quests generated at this time. Keep improving your profile!</p>';
@@ -0,0 +1,41 @@
+# tests/test_admin.py
+
+import dataclasses
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from career_forge.api import admin
+from career_forge.config import get_settings
+
+
+def client(monkeypatch, token: str) -> TestClient:
+    settings = dataclasses.replace(get_settings(), admin_token=token)
+    monkeypatch.setattr(admin, "get_settings", lambda: settings)
+    app = FastAPI()
+
+    @app.delete("/cache", dependencies=[Depends(admin.require_admin)])
+    def clear():
+        return {"cleared": True}
+
+    return TestClient(app)
+
+
+def test_disabled_without_a_token(monkeypatch):
+    response = client(monkeypatch, "").delete("/cache", headers={"Authorization": "Bearer "})
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("header", [None, "s3cret", "Basic s3cret", "Bearer wrong", "Bearer s3cret2"])
+def test_rejects_a_missing_or_wrong_token(monkeypatch, header):
+    headers = {"Authorization": header} if header else {}
+    response = client(monkeypatch, "s3cret").delete("/cache", headers=headers)
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+def test_accepts_the_token(monkeypatch):
+    response = client(monkeypatch, "s3cret").delete("/cache", headers={"Authorization": "bearer s3cret"})
+    assert response.status_code == 200
+    assert response.json() == {"cleared": True}
@@ -0,0 +1,71 @@
+# tests/test_cache.py
+
+import dataclasses
+
+import pytest
+
+from career_forge.config import get_settings
+from career_forge.engine import cache as cache_module
+from career_forge.engine.cache import AnalysisCache, MemoryLRUBackend, resume_digest
+from career_forge.engine.llm_analyzer import LLMAnalysis
+
+DIGEST = resume_digest("Jane Doe\nPython developer")
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """Lets a test change settings the cache reads when it builds keys."""
+    current = {"settings": get_settings()}
+
+    def use(**changes):
+        current["settings"] = dataclasses.replace(current["settings"], **changes)
+
+    monkeypatch.setattr(cache_module, "get_settings", lambda: current["settings"])
+    return use
+
+
+@pytest.fixture
+def cache():
+    return AnalysisCache(MemoryLRUBackend(), ttl=60)
+
+
+def analysis(name: str = "Jane Doe") -> LLMAnalysis:
+    return LLMAnalysis(user_name=name, job_title="Engineer", summary="", suggested_rank="E", suggested_level=1,
+                       skills={}, experiences=[], inferred_strengths=[])
+
+
+def test_analysis_round_trip(cache):
+    assert cache.get_analysis(DIGEST) is None
+    cache.set_analysis(DIGEST, analysis())
+    assert cache.get_analysis(DIGEST) == analysis()
+    assert cache.stats()["counters"]["analysis"] == {"hits": 1, "misses": 1}
+
+
+def test_token_budget_is_part_of_the_analysis_key(cache, settings):
+    settings(llm_token_budget=1500)
+    cache.set_analysis(DIGEST, analysis())
+    settings(llm_token_budget=3000)
+    assert cache.get_analysis(DIGEST) is None
+    settings(llm_token_budget=1500)
+    assert cache.get_analysis(DIGEST) == analysis()
+
+
+def test_invalidate_drops_every_entry_of_the_resume(cache, settings):
+    for budget in (1500, 3000):
+        settings(llm_token_budget=budget)
+        cache.set_analysis(DIGEST, analysis())
+    assert cache.invalidate(DIGEST) == 2
+    assert cache.get_analysis(DIGEST) is None
+
+
+def test_single_call_answers_have_their_own_keys(cache, settings):
+    settings(llm_single_call=False)
+    cache.set_analysis(DIGEST, analysis("Two calls"))
+    cache.set_quests(DIGEST, [])
+    settings(llm_single_call=True)
+    assert cache.get_analysis(DIGEST) is None
+    assert cache.get_quests(DIGEST) is None
+    cache.set_analysis(DIGEST, analysis("One call"))
+    assert cache.get_analysis(DIGEST).user_name == "One call"
+    settings(llm_single_call=False)
+    assert cache.get_analysis(DIGEST).user_name == "Two calls"
@@ -0,0 +1,54 @@
+# tests/test_jobs.py
+
+import asyncio
+import io
+
+from starlette.datastructures import Headers, UploadFile
+
+from career_forge.engine.jobs import JobFailed, JobQueue, JobState, JobStore
+
+
+def upload() -> UploadFile:
+    return UploadFile(io.BytesIO(b"resume"), filename="resume.pdf",
+                      headers=Headers({"content-type": "application/pdf"}))
+
+
+async def run_jobs(tmp_path, handler, count: int = 3) -> JobStore:
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    queue = JobQueue(store, handler, str(tmp_path / "uploads"), workers=2, poll_interval=0.05)
+    queue.start()
+    try:
+        jobs = [await queue.submit(upload(), 1024, "llm") for _ in range(count)]
+        while any(store.get(job.job_id).state not in (JobState.DONE, JobState.FAILED) for job in jobs):
+            await queue.wait_for_change(0.1)
+    finally:
+        await queue.stop()
+    return store
+
+
+def test_events_are_saved_in_order_before_the_job_finishes(tmp_path):
+    async def handler(job, report):
+        for step in range(20):
+            report({"type": "stage", "stage": f"step-{step}", "state": "finished"}, {"step": step})
+            await asyncio.sleep(0)
+        return {"steps": 20}
+
+    store = asyncio.run(run_jobs(tmp_path, handler))
+    for (job_id,) in store._conn.execute("SELECT job_id FROM jobs"):
+        job = store.get(job_id)
+        assert job.state == JobState.DONE
+        assert job.result == {"steps": 20}
+        assert [event["stage"] for event in job.events] == [f"step-{step}" for step in range(20)]
+        assert job.partial == {"step": 19}
+
+
+def test_failed_jobs_keep_their_events(tmp_path):
+    async def handler(job, report):
+        report({"type": "stage", "stage": "parse", "state": "started"}, None)
+        raise JobFailed("Not a resume.")
+
+    store = asyncio.run(run_jobs(tmp_path, handler, count=1))
+    (job_id,), = store._conn.execute("SELECT job_id FROM jobs").fetchall()
+    job = store.get(job_id)
+    assert (job.state, job.error) == (JobState.FAILED, "Not a resume.")
+    assert [event["stage"] for event in job.events] == ["parse"]
@@ -0,0 +1,279 @@
+# tests/test_profile_store.py
+
+import random
+from typing import List, Optional
+
+import pytest
+
+from career_forge.engine.llm_analyzer import ExperienceDetail, LLMAnalysis
+from career_forge.engine.profile_store import SQLiteProfileStore, UnknownUser, profile_score
+from career_forge.gamification.progression import MAIN_LEVEL_XP, RANKS, XPAward
+from career_forge.schemas.quest import Quest
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteProfileStore(str(tmp_path / "profiles.sqlite3"))
+
+
+def analysis(rank: str = "E", level: int = 1, skills: Optional[List[str]] = None,
+             experiences: Optional[List[str]] = None, name: str = "Jane Doe") -> LLMAnalysis:
+    return LLMAnalysis(
+        user_name=name, job_title="Engineer", summary="",
+        suggested_rank=rank, suggested_level=level,
+        skills={"TechnicalSkills": skills or []},
+        experiences=[ExperienceDetail(category="Project", title=title, organization="Acme", description="")
+                     for title in experiences or []],
+        inferred_strengths=[],
+    )
+
+
+def quest(title: str, *rewards: str) -> Quest:
+    return Quest(title=title, description="", category="PROGRAMMING", rewards=list(rewards))
+
+
+# -----------------------------------------------------------------------------
+# Resume merges
+# -----------------------------------------------------------------------------
+
+def test_first_merge_creates_the_profile(store):
+    stored, diff = store.merge_analysis("u1", "d1", analysis("C", 40, ["Python", "python", "SQL"], ["Ranker"]))
+    assert diff.created and diff.to_header() == "created"
+    assert diff.new_skills == ["Python", "SQL"]
+    assert diff.new_experiences == ["Ranker"]
+    assert (stored.profile.main_rank, stored.profile.level, stored.profile.xp) == ("C", 40, 0)
+    assert store.resume_digest("u1") == "d1"
+
+
+def test_same_digest_is_unchanged(store):
+    store.merge_analysis("u1", "d1", analysis(skills=["Python"]))
+    stored, diff = store.merge_analysis("u1", "d1", analysis("S", 99, ["Go"]))
+    assert diff.unchanged and diff.to_header() == "unchanged"
+    assert [skill.name for skill in stored.profile.skills] == ["Python"]
+
+
+def test_merge_adds_only_what_is_new(store):
+    store.merge_analysis("u1", "d1", analysis(skills=["Python"], experiences=["Ranker"]))
+    store.award([XPAward("u1", "Python", 150)])
+    stored, diff = store.merge_analysis("u1", "d2", analysis(skills=["PYTHON", "Go"], experiences=["ranker", "Bot"]))
+    assert diff.new_skills == ["Go"]
+    assert diff.new_experiences == ["Bot"]
+    assert diff.promoted is None
+    assert diff.to_header() == "skills=+1;experiences=+1"
+    skills = {skill.name: skill for skill in stored.profile.skills}
+    # Known skills keep their spelling and XP.
+    assert (skills["Python"].level, skills["Python"].xp) == (2, 50)
+    assert [e.title for e in stored.experiences] == ["Ranker", "Bot"]
+
+
+def test_higher_suggestion_promotes(store):
+    store.merge_analysis("u1", "d1", analysis("D", 10))
+    store.award([XPAward("u1", "Python", 120)])
+    stored, diff = store.merge_analysis("u1", "d2", analysis("B", 5))
+    assert diff.promoted == (("D", 10), ("B", 5))
+    assert diff.to_header() == "skills=+0;experiences=+0;promoted=B5"
+    assert (stored.profile.main_rank, stored.profile.level, stored.profile.xp) == ("B", 5, 0)
+    assert stored.total_xp == 120
+
+
+def test_lower_suggestion_never_demotes(store):
+    store.merge_analysis("u1", "d1", analysis("B", 5))
+    store.award([XPAward("u1", "Python", 120)])
+    stored, diff = store.merge_analysis("u1", "d2", analysis("C", 99))
+    assert diff.promoted is None
+    assert (stored.profile.main_rank, stored.profile.level, stored.profile.xp) == ("B", 5, 120)
+
+
+def test_analysis_is_kept_for_the_merged_resume(store):
+    first = analysis(skills=["Python"])
+    store.merge_analysis("u1", "d1", first)
+    assert store.stored_analysis("u1", "d1") == first
+    assert store.stored_analysis("u1", "d2") is None
+    assert store.stored_analysis("u2", "d1") is None
+
+    second = analysis(skills=["Go"])
+    store.merge_analysis("u1", "d2", second)
+    assert store.stored_analysis("u1", "d2") == second
+    assert store.stored_analysis("u1", "d1") is None
+
+
+def test_fallback_analysis_is_not_kept(store):
+    store.merge_analysis("u1", "d1", analysis(skills=["Python"]))
+    store.merge_analysis("u1", "d2", analysis(skills=["Go"]), keep_analysis=False)
+    assert store.stored_analysis("u1", "d2") is None
+    assert store.stored_analysis("u1", "d1") is None
+    # The LLM analysis of the same resume, merged later, is kept.
+    store.merge_analysis("u1", "d2", analysis(skills=["Go", "SQL"]))
+    assert store.stored_analysis("u1", "d2").skills == {"TechnicalSkills": ["Go", "SQL"]}
+
+
+def test_delete_drops_the_kept_analysis(store):
+    store.merge_analysis("u1", "d1", analysis())
+    store.delete("u1")
+    assert store.stored_analysis("u1", "d1") is None
+
+
+@pytest.mark.parametrize("suggested, expected", [("A-Rank", "A"), ("rank b", "B"), ("s", "S"), ("unknown", "E")])
+def test_suggested_rank_is_normalized(store, suggested, expected):
+    stored, _ = store.merge_analysis("u1", "d1", analysis(suggested, 3))
+    assert stored.profile.main_rank == expected
+    assert [entry.user_id for entry in store.leaderboard(expected).entries] == ["u1"]
+
+
+# -----------------------------------------------------------------------------
+# XP awards
+# -----------------------------------------------------------------------------
+
+def test_award_batches_per_user(store):
+    store.merge_analysis("u1", "d1", analysis(skills=["Python"]))
+    store.merge_analysis("u2", "d1", analysis())
+    applied = store.award([
+        XPAward("u1", "Python", 300),
+        XPAward("u1", "python ", 250),
+        XPAward("u1", "Docker", 40, "DevOps"),
+        XPAward("u2", "SQL", 20),
+        XPAward("ghost", "SQL", 20),
+        # Ignored: no XP or no skill.
+        XPAward("u2", "SQL", 0),
+        XPAward("u2", " ", 50),
+    ])
+    assert applied == {"u1": 590, "u2": 20}
+
+    stored = store.get("u1")
+    assert (stored.profile.level, stored.profile.xp, stored.total_xp) == (2, 590 - MAIN_LEVEL_XP, 590)
+    skills = {skill.name: skill for skill in stored.profile.skills}
+    # 100 XP for level 2, 200 more for level 3.
+    assert (skills["Python"].level, skills["Python"].xp) == (3, 250)
+    assert skills["Docker"].category == "DevOps"
+    assert store.get("ghost") is None
+
+
+def test_award_spans_parameter_chunks(store):
+    users = [f"u{index:04d}" for index in range(1100)]
+    for user_id in users:
+        store.merge_analysis(user_id, "d1", analysis())
+    applied = store.award([XPAward(user_id, "Python", 10) for user_id in users] + [XPAward(users[-1], "Go", 5)])
+    assert len(applied) == len(users)
+    assert applied[users[-1]] == 15
+    assert store.get(users[0]).total_xp == 10
+
+
+def test_award_to_unknown_users_applies_nothing(store):
+    assert store.award([XPAward("ghost", "Python", 10)]) == {}
+    assert store.award([]) == {}
+
+
+# -----------------------------------------------------------------------------
+# Quests
+# -----------------------------------------------------------------------------
+
+def test_only_issued_open_quests_award_xp(store):
+    store.merge_analysis("u1", "d1", analysis())
+    issued = [quest("Build an API", "+50 XP Python"), quest("Write docs", "+30 XP Writing", "A badge")]
+    assert len(store.issue_quests("u1", issued)) == 2
+
+    # A quest that was never issued, and an issued one with a forged reward.
+    forged = quest("Build an API", "+5000 XP Python")
+    assert store.complete_quests("u1", [quest("Invented", "+100 XP Go"), forged]) == []
+    assert store.get("u1").total_xp == 0
+
+    assert len(store.complete_quests("u1", issued + issued)) == 2
+    assert store.get("u1").total_xp == 80
+    # Completing again awards nothing, and re-issuing doesn't reopen them.
+    store.issue_quests("u1", issued)
+    assert store.complete_quests("u1", issued) == []
+    assert store.get("u1").total_xp == 80
+
+
+def test_open_quests_leave_out_completed_ones(store):
+    store.merge_analysis("u1", "d1", analysis())
+    issued = [quest("Build an API", "+50 XP Python"), quest("Write docs", "+30 XP Writing")]
+    store.issue_quests("u1", issued)
+    assert sorted(q.title for q in store.open_quests("u1")) == ["Build an API", "Write docs"]
+    store.complete_quests("u1", issued[:1])
+    assert store.open_quests("u1") == issued[1:]
+    assert store.open_quests("u2") == []
+
+
+def test_quests_are_per_user(store):
+    store.merge_analysis("u1", "d1", analysis())
+    store.merge_analysis("u2", "d1", analysis())
+    issued = [quest("Build an API", "+50 XP Python")]
+    store.issue_quests("u1", issued)
+    assert store.complete_quests("u2", issued) == []
+    assert len(store.complete_quests("u1", issued)) == 1
+
+
+# -----------------------------------------------------------------------------
+# Leaderboards
+# -----------------------------------------------------------------------------
+
+@pytest.fixture
+def filled(store):
+    rng = random.Random(3)
+    for index in range(120):
+        # Few ranks and levels, so many profiles share a band and some share a score.
+        store.merge_analysis(f"u{index:03d}", "d1", analysis(rng.choice(RANKS[:3]), rng.randint(1, 3)))
+    store.award([XPAward(f"u{index:03d}", "Python", rng.choice([10, 20, 450]))
+                 for index in range(120) if rng.random() < 0.6])
+    return store
+
+
+def standings(store, rank: Optional[str] = None):
+    """(score, user_id) of every profile, best first, computed without the store's indexes."""
+    rows = []
+    for index in range(len(store)):
+        profile = store.get(f"u{index:03d}").profile
+        if rank is None or profile.main_rank == rank:
+            rows.append((profile_score(profile.main_rank, profile.level, profile.xp), f"u{index:03d}"))
+    return sorted(rows, reverse=True)
+
+
+def walk(store, rank: Optional[str], limit: int):
+    entries, after = [], None
+    while True:
+        page = store.leaderboard(rank, limit, after)
+        entries += page.entries
+        if page.next_cursor is None:
+            return entries
+        after = page.next_cursor
+
+
+@pytest.mark.parametrize("rank", [None, "E", "D", "C", "S"])
+@pytest.mark.parametrize("limit", [1, 7, 500])
+def test_leaderboard_pages_match_brute_force(filled, rank, limit):
+    expected = standings(filled, rank)
+    entries = walk(filled, rank, limit)
+    assert [entry.user_id for entry in entries] == [user_id for _, user_id in expected]
+    for entry, (score, _) in zip(entries, expected):
+        # Equal scores share a position: one more than the profiles strictly ahead.
+        assert entry.position == 1 + sum(other > score for other, _ in expected)
+
+
+def test_positions_match_brute_force(filled):
+    overall = standings(filled)
+    for score, user_id in overall:
+        rank = filled.get(user_id).profile.main_rank
+        in_rank = standings(filled, rank)
+        assert filled.position(user_id) == 1 + sum(other > score for other, _ in overall)
+        assert filled.position(user_id, within_rank=True) == 1 + sum(other > score for other, _ in in_rank)
+
+
+def test_positions_follow_awards(filled):
+    last = standings(filled)[-1][1]
+    filled.award([XPAward(last, "Python", 100 * MAIN_LEVEL_XP * len(RANKS))])
+    assert filled.position(last) == 1
+    assert walk(filled, None, 10)[0].user_id == last
+
+
+def test_leaderboard_rejects_bad_cursors(filled):
+    with pytest.raises(ValueError):
+        filled.leaderboard(after="not-a-cursor")
+
+
+def test_delete_removes_from_the_leaderboard(filled):
+    assert filled.delete("u000")
+    assert not filled.delete("u000")
+    with pytest.raises(UnknownUser):
+        filled.position("u000")
+    assert "u000" not in [entry.user_id for entry in walk(filled, None, 50)]
@@ -0,0 +1,122 @@
+# tests/test_structured_output.py
+
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from career_forge.engine.structured_output import (
+    IncrementalJSONParser, MalformedOutput, parse_json_lenient, validate_partial,
+)
+
+
+class Item(BaseModel):
+    name: str
+    years: int
+
+
+class Answer(BaseModel):
+    title: str
+    scores: List[int]
+    items: List[Item]
+
+
+# -----------------------------------------------------------------------------
+# JSON repair
+# -----------------------------------------------------------------------------
+
+def test_valid_json_is_not_repaired():
+    assert parse_json_lenient('{"a": [1, 2]}') == ({"a": [1, 2]}, False)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Cut off inside a list: closed after the last complete element.
+    ('{"a": 1, "b": [1, 2, 3', {"a": 1, "b": [1, 2, 3]}),
+    # Cut off inside a string: the partial string is kept.
+    ('{"a": 1, "name": "Ja', {"a": 1, "name": "Ja"}),
+    # Cut off after a key: the dangling key is dropped.
+    ('{"a": 1, "b":', {"a": 1}),
+    # Cut off inside a nested object: it is closed empty (validation drops it).
+    ('{"a": {"b": [{"c": 1}, {"c"', {"a": {"b": [{"c": 1}, {}]}}),
+])
+def test_truncated_output_is_closed(text, expected):
+    assert parse_json_lenient(text) == (expected, True)
+
+
+@pytest.mark.parametrize("text", [
+    '```json\n{"a": [1, 2]}\n```',
+    '```\n{"a": [1, 2]}\n```',
+    'Here is the analysis:\n```JSON\n{"a": [1, 2]}\n```\nLet me know if you need more.',
+])
+def test_fences_and_prose_are_dropped(text):
+    assert parse_json_lenient(text) == ({"a": [1, 2]}, True)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": [1, 2,], }', {"a": [1, 2]}),
+    ('[{"a": 1,\n},\n]', [{"a": 1}]),
+    # A comma inside a string is not a trailing comma.
+    ('{"a": "x,]",}', {"a": "x,]"}),
+])
+def test_trailing_commas_are_removed(text, expected):
+    assert parse_json_lenient(text) == (expected, True)
+
+
+@pytest.mark.parametrize("text", ["", "no json here", "```json\n```", None])
+def test_unrecoverable_output_raises(text):
+    with pytest.raises(MalformedOutput):
+        parse_json_lenient(text)
+
+
+# -----------------------------------------------------------------------------
+# Partial validation
+# -----------------------------------------------------------------------------
+
+def test_bad_list_items_are_dropped():
+    data = {
+        "title": "Engineer",
+        "scores": [1, "two", 3],
+        "items": [{"name": "Python", "years": 3}, {"name": "Go", "years": "many"}, "SQL"],
+    }
+    answer, problems = validate_partial(Answer, data)
+    assert answer == Answer(title="Engineer", scores=[1, 3], items=[Item(name="Python", years=3)])
+    assert any(problem.startswith("scores[1]: dropped") for problem in problems)
+    assert any(problem.startswith("items[1].years: dropped") for problem in problems)
+    assert any(problem.startswith("items[2]: dropped") for problem in problems)
+
+
+def test_missing_fields_come_from_defaults():
+    answer, problems = validate_partial(Answer, {"title": "Engineer", "scores": [1]}, defaults={"items": []})
+    assert answer == Answer(title="Engineer", scores=[1], items=[])
+    assert problems == ["items: missing"]
+
+
+def test_required_field_without_fallback_fails():
+    answer, problems = validate_partial(Answer, {"scores": [1], "items": []})
+    assert answer is None
+    assert problems == ["title: missing"]
+
+
+def test_non_object_fails():
+    assert validate_partial(Answer, [1, 2]) == (None, ["Answer: expected an object, got list"])
+
+
+def test_repaired_truncated_answer_validates():
+    text = '```json\n{"title": "Engineer", "scores": [1, 2,], "items": [{"name": "Python", "years": 3}, {"name": "G'
+    data, repaired = parse_json_lenient(text)
+    answer, _ = validate_partial(Answer, data)
+    assert repaired
+    assert answer == Answer(title="Engineer", scores=[1, 2], items=[Item(name="Python", years=3)])
+
+
+# -----------------------------------------------------------------------------
+# Incremental parsing
+# -----------------------------------------------------------------------------
+
+def test_fields_are_reported_when_complete():
+    parser = IncrementalJSONParser()
+    assert parser.feed('```json\n{"user_name": "Ja') == []
+    assert parser.feed('ne", "skills": {"Te') == [(("user_name",), "Jane")]
+    assert parser.feed('chnicalSkills": ["Python"]') == [(("skills", "TechnicalSkills"), ["Python"])]
+    assert parser.feed("}}") == [(("skills",), {"TechnicalSkills": ["Python"]})]
+    assert parser.done